@@ -7,7 +7,7 @@ from datetime import datetime
 from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
 from contextlib import asynccontextmanager
-from typing import Any, Callable, Dict, cast
+from typing import Any, Awaitable, Callable, Dict, List, cast
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -33,6 +33,7 @@ from locveil_bridge.infrastructure.wb_device.service import WBVirtualDeviceServi
 from locveil_bridge.domain.rooms.service import RoomManager
 from locveil_bridge.domain.scenarios.service import ScenarioManager
 from locveil_bridge.domain.scenarios.proxy import ScenarioProxy
+from locveil_bridge.domain.scenarios.projection import ScenarioStateDelta
 from locveil_bridge.infrastructure.scenarios.wb_adapter import ScenarioWBAdapter
 from locveil_bridge.infrastructure.capabilities.loader import attach_capability_maps, validate_command_exposure
 from locveil_bridge.infrastructure.maintenance.wirenboard_guard import WirenboardMaintenanceGuard
@@ -43,10 +44,11 @@ from locveil_bridge.domain.reports.service import ReportService
 
 # Import routers
 from locveil_bridge.presentation.api.routers import (
-    system, devices, mqtt, scenarios, rooms, state, events, reports
+    system, devices, mqtt, scenarios, rooms, state, events, reports, metrics
 )
-from locveil_bridge.presentation.api.catalog import build_catalog
+from locveil_bridge.presentation.api.manifest_cache import manifest_cache
 from locveil_bridge.presentation.api.sse_manager import sse_manager, SSEChannel
+from locveil_bridge.presentation.api.state_coalescer import DeviceStateCoalescer
 
 from locveil_bridge.__version__ import __version__
 
@@ -273,7 +275,14 @@ def create_app() -> FastAPI:
             # Initialize state store after config but before device manager
             db_path = Path(system_config.persistence.db_path)
             db_path.parent.mkdir(parents=True, exist_ok=True)
-            state_store = SQLiteStateStore(db_path=str(db_path))
+            persistence_cfg = system_config.persistence
+            state_store = SQLiteStateStore(
+                db_path=str(db_path),
+                write_behind_ms=persistence_cfg.write_behind_ms,
+                wal=persistence_cfg.wal,
+                synchronous=persistence_cfg.synchronous,
+                layout=persistence_cfg.layout,
+            )
             await state_store.initialize()
             logger.info(f"State persistence initialized with SQLite at {db_path}")
         
@@ -298,7 +307,9 @@ def create_app() -> FastAPI:
                 'port': mqtt_broker_config.port,
                 'client_id': mqtt_broker_config.client_id,
                 'keepalive': mqtt_broker_config.keepalive,
-                'auth': mqtt_broker_config.auth
+                'auth': mqtt_broker_config.auth,
+                'dispatch_queue_depth': mqtt_broker_config.dispatch_queue_depth,
+                'dispatch_overflow': mqtt_broker_config.dispatch_overflow,
             }, maintenance_guard=maintenance_guard)
 
             # Problem-report evidence rings (problem_reports_bridge.md B-2): always on,
@@ -312,8 +323,14 @@ def create_app() -> FastAPI:
             mqtt_client.traffic_observer = mqtt_window.record
         
             # Initialize device manager with state repository
-            device_manager = DeviceManager(state_repository=state_store)
-            await device_manager.load_device_modules()
+            startup_cfg = system_config.startup
+            device_manager = DeviceManager(
+                state_repository=state_store,
+                setup_concurrency=startup_cfg.device_setup_concurrency,
+                setup_timeout=startup_cfg.device_setup_timeout_s,
+            )
+            # Only the drivers a device config names are imported (and their deps).
+            await device_manager.load_device_modules(config_manager.get_all_device_configs())
         
             # Log the number of typed configurations
             typed_configs = config_manager.get_all_typed_configs()
@@ -325,7 +342,11 @@ def create_app() -> FastAPI:
             # `mqtt_client` (to subscribe to state_topic + meta/error) and the service to
             # decide whether to register the WB virtual device (which they skip via
             # `enable_wb_emulation=False`).
-            wb_service = WBVirtualDeviceService(message_bus=mqtt_client)
+            wb_service = WBVirtualDeviceService(
+                message_bus=mqtt_client, resync_concurrency=mqtt_broker_config.resync_concurrency
+            )
+            # Broker restarts drop retained topics: republish every WB device's meta + values.
+            mqtt_client.on_connect_callbacks.append(wb_service.resync)
             logger.info("Created WB virtual device service")
             device_manager.set_runtime_services(mqtt_client=mqtt_client, wb_service=wb_service)
 
@@ -339,16 +360,30 @@ def create_app() -> FastAPI:
             # is the composition root, allowed to know infrastructure types; cast
             # to BaseDevice so pyright sees the BaseDevice attribute surface.
             from locveil_bridge.infrastructure.devices.base import BaseDevice as _BaseDevice  # local: keep domain/ import-pure
-            for device_id, port_device in device_manager.devices.items():
-                device = cast(_BaseDevice, port_device)
-                device.mqtt_client = mqtt_client
-                device.wb_service = wb_service
-                device.event_publisher = sse_manager  # SSE fan-out via EventPublisherPort
-                device.dispatch_ring = dispatch_ring  # problem-report evidence (B-2)
-                logger.info(f"Device {device_id} initialized with typed configuration and WB service")
-
-            # Attach Layer 1 capability maps from config/capabilities/ (hot-fixable JSON).
-            attach_capability_maps(device_manager.devices, Path(config_manager.config_dir) / "capabilities")
+            # Device state events go through the per-device delta coalescer; a fresh or
+            # resynced /events/devices stream gets every device's full state first.
+            state_coalescer = DeviceStateCoalescer(sse_manager, frame_ms=system_config.sse.state_frame_ms)
+            fleet = device_manager.devices  # live dict: /reload re-populates it in place
+            state_coalescer.install(
+                lambda: [cast(_BaseDevice, d).state_event_data() for d in fleet.values()]
+            )
+            capabilities_dir = Path(config_manager.config_dir) / "capabilities"
+
+            # Shared with /reload, which runs it over every device it (re)builds.
+            def _wire_devices(
+                devs: Dict[str, Any], client: MQTTClient, service: WBVirtualDeviceService
+            ) -> None:
+                for device_id, port_device in devs.items():
+                    device = cast(_BaseDevice, port_device)
+                    device.mqtt_client = client
+                    device.wb_service = service
+                    device.event_publisher = state_coalescer  # SSE fan-out via EventPublisherPort
+                    device.dispatch_ring = dispatch_ring  # problem-report evidence (B-2)
+                    logger.info(f"Device {device_id} initialized with typed configuration and WB service")
+                # Attach Layer 1 capability maps from config/capabilities/ (hot-fixable JSON).
+                attach_capability_maps(devs, capabilities_dir)
+
+            _wire_devices(device_manager.devices, mqtt_client, wb_service)
             logger.info("Attached capability maps to devices")
 
             _exposure_violations = validate_command_exposure(device_manager.devices)
@@ -414,7 +449,8 @@ def create_app() -> FastAPI:
                 device_manager=device_manager,
                 room_manager=room_manager,
                 state_repository=state_store,
-                scenario_dir=Path(config_manager.config_dir) / "scenarios"
+                scenario_dir=Path(config_manager.config_dir) / "scenarios",
+                parallel_reconcile=system_config.scenarios.parallel_reconcile,
             )
             await scenario_manager.initialize()
             logger.info("Scenario manager initialized")
@@ -448,6 +484,7 @@ def create_app() -> FastAPI:
                 }
                 if active is not None:
                     payload["state"] = scenario_manager.get_scenario_state(active.scenario_id).model_dump()
+                    payload["version"] = scenario_manager.state_projection.version(room_id)
                 await sse_manager.broadcast(
                     channel=SSEChannel.SCENARIOS,
                     event_type="scenario_switched" if active else "scenario_shutdown",
@@ -456,12 +493,36 @@ def create_app() -> FastAPI:
 
             scenario_manager.active_changed_observers.append(_scenario_sse_observer)
 
+            # Between switches the scenarios channel carries deltas of the room's state
+            # projection: one event per device change that alters it, so an open scenario
+            # page patches its cached ScenarioState instead of re-polling /scenario/state.
+            def _scenario_delta_observer(delta: ScenarioStateDelta) -> Awaitable[None]:
+                return sse_manager.broadcast(
+                    channel=SSEChannel.SCENARIOS,
+                    event_type="scenario_state_delta",
+                    data={
+                        "scenario_id": delta.scenario_id,
+                        "room_id": delta.room_id,
+                        "version": delta.version,
+                        "device_id": delta.device_id,
+                        "state": delta.state.model_dump() if delta.state is not None else None,
+                        "timestamp": datetime.now().isoformat(),
+                    },
+                )
+
+            scenario_manager.state_projection.delta_observers.append(_scenario_delta_observer)
+
             # Problem-report service (problem_reports_bridge.md): the collector behind
             # POST /reports (filing, opt-in) and GET /reports/evidence (B-11, always on).
             # Cross-layer inputs go in as callables so the domain service stays import-pure.
             import platform as _platform
             assert state_store is not None  # set earlier in this lifespan; narrows for the closure below
             _report_state_store = state_store
+
+            async def _persisted_device_states(device_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+                stored = await _report_state_store.load_many([f"device:{did}" for did in device_ids])
+                return {key.split(":", 1)[1]: state for key, state in stored.items()}
+
             report_sink = None
             if reports_cfg.enabled:
                 assert reports_cfg.repo is not None  # ReportsConfig validator: enabled requires repo
@@ -482,9 +543,9 @@ def create_app() -> FastAPI:
                 sink=report_sink,
                 dispatch_ring=dispatch_ring,
                 mqtt_window=mqtt_window,
-                persisted_state=lambda did: _report_state_store.get(f"device:{did}"),
+                persisted_states=_persisted_device_states,
                 system_config=lambda: system_config.model_dump(mode="json"),
-                catalog_version=lambda: build_catalog(device_manager, room_manager, scenario_proxy).version,
+                catalog_version=lambda: system.current_catalog().version,
                 bridge_version=__version__,
                 platform=f"{_platform.system()}-{_platform.machine()}",
             )
@@ -526,7 +587,7 @@ def create_app() -> FastAPI:
                 if mqtt_client is None:
                     return
                 try:
-                    catalog = build_catalog(device_manager, room_manager, scenario_proxy)
+                    catalog = system.current_catalog()
                     await mqtt_client.publish(
                         system.CATALOG_VERSION_TOPIC, catalog.version, retain=True
                     )
@@ -560,7 +621,9 @@ def create_app() -> FastAPI:
                     'port': broker.port,
                     'client_id': broker.client_id,
                     'keepalive': broker.keepalive,
-                    'auth': broker.auth
+                    'auth': broker.auth,
+                    'dispatch_queue_depth': broker.dispatch_queue_depth,
+                    'dispatch_overflow': broker.dispatch_overflow,
                 }, maintenance_guard=maintenance_guard)
                 client.traffic_observer = mqtt_window.record
                 return client
@@ -573,7 +636,11 @@ def create_app() -> FastAPI:
                 mqtt.initialize(mqtt_client)
                 scenarios.initialize(scenario_manager, room_manager, mqtt_client)
                 new_client.on_connect_callbacks.append(_publish_catalog_version)
-                return WBVirtualDeviceService(message_bus=new_client)
+                new_wb_service = WBVirtualDeviceService(
+                    message_bus=new_client, resync_concurrency=_reload_cfg_manager.get_mqtt_broker_config().resync_concurrency
+                )
+                new_client.on_connect_callbacks.append(new_wb_service.resync)
+                return new_wb_service
 
             async def _rebuild_scenario_cards(
                 new_client: MQTTClient, new_wb_service: WBVirtualDeviceService
@@ -596,8 +663,14 @@ def create_app() -> FastAPI:
                 on_new_client=_adopt_mqtt_client,
                 rebuild_scenario_cards=_rebuild_scenario_cards,
                 publish_catalog_version=_publish_catalog_version,
+                prepare_devices=_wire_devices,
+                scenario_manager=scenario_manager,
+                incremental=system_config.reload.incremental,
             )
             reload_service.mqtt_client = mqtt_client
+            reload_service.wb_service = wb_service
+            # Catalog + layout manifests are cached per config generation.
+            manifest_cache.set_generation_source(lambda: reload_service.generation)
             system.set_reload_service(reload_service)
 
             logger.info("System startup complete")
@@ -645,6 +718,9 @@ def create_app() -> FastAPI:
             logger.info("Flushing pending persistence before shutdown...")
             try:
                 await device_manager.wait_for_persistence_tasks(timeout=2.0)
+                # Commit the write-behind window now rather than at close(), so the
+                # last operating state is on disk before any teardown step can fail.
+                await state_store.flush()
             except asyncio.CancelledError:
                 logger.warning("Persistence flush interrupted by cancellation")
 
@@ -737,6 +813,7 @@ def create_app() -> FastAPI:
     app.include_router(state.router)
     app.include_router(events.router)
     app.include_router(reports.router)
+    app.include_router(metrics.router)
 
     _install_openapi_with_state_models(app)
 
@@ -1,6 +1,13 @@
+import argparse
+import sys
+
+
 def main() -> None:
     """Bridge entry point.
 
+    ``--profile-imports`` prints the per-driver import-time report
+    (``cli/import_profile.py``) for the configured devices and exits instead.
+
     Uses uvicorn's low-level Config + Server API (not the high-level
     `uvicorn.run(...)`) so we can hand the live `Server` instance to the
     SSE manager. SSE generators poll `server.should_exit` in their loop;
@@ -11,6 +18,24 @@ def main() -> None:
     Without this hookup the 1st Ctrl-C hangs forever on the long-lived
     SSE connections (see action_plan.md §5.1 #8).
     """
+    parser = argparse.ArgumentParser(prog="locveil-bridge", description="Locveil bridge service")
+    parser.add_argument(
+        "--profile-imports",
+        action="store_true",
+        help="Print an -X importtime breakdown per configured device driver and exit",
+    )
+    parser.add_argument(
+        "--all-drivers",
+        action="store_true",
+        help="With --profile-imports: profile every registered driver, configured or not",
+    )
+    parser.add_argument("--config-dir", default="config", help="With --profile-imports: config directory")
+    args = parser.parse_args()
+    if args.profile_imports:
+        from locveil_bridge.cli.import_profile import run
+
+        sys.exit(run(config_dir=args.config_dir, all_drivers=args.all_drivers))
+
     import uvicorn
     from locveil_bridge.presentation.api.sse_manager import sse_manager
 
@@ -22,12 +22,34 @@ shaped on its own side:
 - ``publish_catalog_version`` is the same guarded closure startup uses; the
   explicit call at the end preserves the reload's guaranteed post-reload
   catalog-version nudge.
+- ``prepare_devices`` wires freshly built devices exactly like startup does
+  (client, WB service, SSE event publisher, dispatch ring, capability maps).
+
+With ``incremental`` on, a reload is a diff instead of a teardown: the new
+typed configs and capability maps are compared against the live fleet
+(``diff_fleet``) and only added, changed and removed devices are shut down /
+rebuilt, together with their MQTT subscriptions and WB virtual devices.
+Everything else — the MQTT client, the scenario cards, the LG TV websocket,
+the eMotiva session — keeps running. A changed ``topology.json`` is swapped
+into the scenario manager in place. The full teardown remains the fallback
+when the broker settings changed or there is no live client to keep.
 """
 
 import logging
-from typing import Awaitable, Callable, Dict, Optional, cast
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, cast
 
+from locveil_bridge.domain.devices.config import BaseDeviceConfig
 from locveil_bridge.domain.devices.service import DeviceManager
+from locveil_bridge.domain.ports import DevicePort
+from locveil_bridge.domain.scenarios.service import ScenarioManager
+from locveil_bridge.domain.topology.loader import load_topology
+from locveil_bridge.infrastructure.capabilities.loader import (
+    enrich_state_topics_from_map,
+    load_capability_map,
+)
 from locveil_bridge.infrastructure.config.manager import ConfigManager
 from locveil_bridge.infrastructure.devices.base import BaseDevice
 from locveil_bridge.infrastructure.mqtt.client import MQTTClient
@@ -35,11 +57,87 @@ from locveil_bridge.infrastructure.wb_device.service import WBVirtualDeviceServi
 
 logger = logging.getLogger(__name__)
 
+PrepareDevices = Callable[[Dict[str, DevicePort], MQTTClient, WBVirtualDeviceService], None]
+
+
+@dataclass
+class FleetDiff:
+    """Device ids grouped by what a reload has to do with them."""
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def rebuild(self) -> List[str]:
+        """Devices to (re)build from the new configs."""
+        return self.added + self.changed
+
+    @property
+    def retire(self) -> List[str]:
+        """Live devices to shut down."""
+        return self.changed + self.removed
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.added)} added, {len(self.changed)} changed, "
+            f"{len(self.removed)} removed, {len(self.unchanged)} unchanged"
+        )
+
+
+def diff_fleet(
+    devices: Mapping[str, DevicePort],
+    configs: Mapping[str, BaseDeviceConfig],
+    capabilities_dir: Path,
+) -> FleetDiff:
+    """Compare freshly loaded configs + capability maps against the live fleet.
+
+    A device is *changed* when its typed config or its resolved capability map
+    differs from what the running instance holds. The new config is enriched from
+    its map first (``enrich_state_topics_from_map``), the same way the live one was
+    when it was attached, so the enrichment itself never reads as a change. A device
+    that is configured but not running (failed to instantiate) counts as *added*.
+    """
+    diff = FleetDiff()
+    for device_id, config in configs.items():
+        device = devices.get(device_id)
+        if device is None:
+            diff.added.append(device_id)
+            continue
+        cap_map = load_capability_map(
+            config.device_class,
+            device_id,
+            capabilities_dir,
+            getattr(config, "capability_profile", None),
+        )
+        enrich_state_topics_from_map(SimpleNamespace(config=config, capabilities=cap_map))
+        live_config = getattr(device, "config", None)
+        live_map = getattr(device, "capabilities", None)
+        if (
+            live_config is None
+            or live_map is None
+            or live_config.model_dump() != config.model_dump()
+            or live_map.model_dump() != cap_map.model_dump()
+        ):
+            diff.changed.append(device_id)
+        else:
+            diff.unchanged.append(device_id)
+    diff.removed = [device_id for device_id in devices if device_id not in configs]
+    return diff
+
+
+def _handler_owner(handler: Callable[..., Any]) -> Any:
+    """The object a subscription handler is bound to (bound method or ``partial``)."""
+    return getattr(getattr(handler, "func", handler), "__self__", None)
+
 
 class ReloadService:
-    """Owns the /reload sequence: stop the current client, reload configs and
-    device classes, build + adopt a replacement client, re-initialize the
-    fleet, re-subscribe, redo WB emulation, republish the catalog version."""
+    """Owns the /reload sequence: reload configs and device classes, then either
+    rebuild just the devices whose inputs changed (incremental) or stop the
+    current client, build + adopt a replacement, re-initialize the fleet,
+    re-subscribe and redo WB emulation (full). Both end by republishing the
+    catalog version."""
 
     def __init__(
         self,
@@ -49,6 +147,9 @@ class ReloadService:
         on_new_client: Callable[[MQTTClient], WBVirtualDeviceService],
         rebuild_scenario_cards: Callable[[MQTTClient, WBVirtualDeviceService], Awaitable[None]],
         publish_catalog_version: Callable[[], Awaitable[None]],
+        prepare_devices: Optional[PrepareDevices] = None,
+        scenario_manager: Optional[ScenarioManager] = None,
+        incremental: bool = False,
     ):
         self._config_manager = config_manager
         self._device_manager = device_manager
@@ -56,93 +157,201 @@ class ReloadService:
         self._on_new_client = on_new_client
         self._rebuild_scenario_cards = rebuild_scenario_cards
         self._publish_catalog_version = publish_catalog_version
-        # The current live client — seeded by bootstrap at startup, swapped
-        # here on every reload.
+        self._prepare_devices = prepare_devices
+        self._scenario_manager = scenario_manager
+        self.incremental = incremental
+        # The current live client + its WB service — seeded by bootstrap at
+        # startup, swapped here on every full reload.
         self.mqtt_client: Optional[MQTTClient] = None
+        self.wb_service: Optional[WBVirtualDeviceService] = None
+        # What the last incremental reload did (None after a full one).
+        self.last_diff: Optional[FleetDiff] = None
+        # Config generation: bumped once per reload, after the fleet is rebuilt.
+        # Keys the presentation-side catalog/layout manifest cache.
+        self.generation = 0
 
     async def reload(self) -> None:
         """Reload configurations and device modules (background task)."""
         try:
-            if self.mqtt_client:
-                await self.mqtt_client.stop()
+            broker_before = self._broker_settings() if self.incremental else None
 
             self._config_manager.reload_configs()
-            await self._device_manager.load_device_modules()
-
-            new_client = self._client_factory()
-            self.mqtt_client = new_client
-            wb_service = self._on_new_client(new_client)
-
-            # Shutdown any existing devices, then re-initialize with typed
-            # configs. Wire the shared MQTT client BEFORE `initialize_devices`
-            # so WB-passthrough devices' setup() can register their
-            # state_topic + meta/error subscriptions on the right client.
-            # Existing AV drivers don't use mqtt_client in setup() so this is
-            # a no-op for them.
-            await self._device_manager.shutdown_devices()
-            self._device_manager.set_runtime_services(
-                mqtt_client=new_client, wb_service=wb_service
-            )
-            await self._device_manager.initialize_devices(
-                self._config_manager.get_all_device_configs()
-            )
+            await self._device_manager.load_device_modules(self._config_manager.get_all_device_configs())
 
-            # Safety-net assignment (already set in the constructor; idempotent).
-            for device in self._device_manager.devices.values():
-                cast(BaseDevice, device).mqtt_client = new_client
-
-            # Create topic to handler mapping
-            topic_handlers: Dict[str, Callable] = {}
-            for device_id, device in self._device_manager.devices.items():
-                handler = self._device_manager.get_message_handler(device_id)
-                if handler:
-                    for topic in device.subscribe_topics():
-                        topic_handlers[topic] = handler
-
-            # Connect to MQTT broker with topics and handlers
-            if topic_handlers:
-                await new_client.connect_and_subscribe(topic_handlers)
+            reason = self._full_reload_reason(broker_before)
+            if reason is None:
+                await self._reload_changed()
             else:
-                await new_client.connect()
-
-            # Wait for MQTT connection to be fully established
-            logger.info("Waiting for MQTT connection to be established after reload...")
-            connection_success = await new_client.wait_for_connection(timeout=30.0)
-            if not connection_success:
-                logger.error(
-                    "Failed to establish MQTT connection within timeout after "
-                    "reload - WB emulation and scenario cards will be skipped"
-                )
-            else:
-                logger.info("MQTT connection established successfully after reload")
-
-                # Now that MQTT is connected, set up Wirenboard virtual device
-                # emulation for all devices
-                logger.info("Setting up Wirenboard virtual device emulation after reload...")
-                for device_id, device in self._device_manager.devices.items():
-                    try:
-                        await cast(BaseDevice, device).setup_wb_emulation_if_enabled()
-                        logger.debug(
-                            f"WB emulation setup completed for device {device_id} after reload"
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to setup WB emulation for device {device_id} "
-                            f"after reload: {str(e)}"
-                        )
-
-                # Rebuild the per-room scenario cards over the new client —
-                # their publishes, subscriptions, and the on_active_changed
-                # hook were all bound to the old one. Needs the live
-                # connection, same as startup.
-                await self._rebuild_scenario_cards(new_client, wb_service)
+                if self.incremental:
+                    logger.info(f"Falling back to a full reload: {reason}")
+                await self._reload_everything()
+            # Point the scenario-state projection at the rebuilt devices (and away from
+            # the retired ones) before anyone reads it; the changes go out as deltas.
+            if self._scenario_manager is not None:
+                self._scenario_manager.state_projection.resync()
 
             # Bump the retained catalog version so catalog-aware subscribers
-            # refetch. Done at the END so the post-reload hash is published;
-            # the closure guards its own failures (never masks a successful
-            # reload).
+            # refetch. Done at the END (after the generation bump) so the
+            # post-reload hash is published; the closure guards its own
+            # failures (never masks a successful reload).
+            self.generation += 1
             await self._publish_catalog_version()
 
             logger.info("System reload completed successfully")
         except Exception:
+            # A reload that died half-way may still have changed the fleet.
+            self.generation += 1
             logger.exception("Error during system reload")
+
+    def _broker_settings(self) -> Dict[str, Any]:
+        return self._config_manager.get_mqtt_broker_config().model_dump()
+
+    def _full_reload_reason(self, broker_before: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Why this reload cannot be incremental, or None if it can."""
+        if not self.incremental:
+            return "incremental reload disabled"
+        if self.mqtt_client is None or not self.mqtt_client.connected:
+            return "no live MQTT client to keep"
+        if self.wb_service is None:
+            return "no WB service to keep"
+        if broker_before != self._broker_settings():
+            return "MQTT broker settings changed"
+        return None
+
+    def _reload_topology(self) -> bool:
+        """Swap a changed ``topology.json`` into the scenario manager. True if it changed."""
+        if self._scenario_manager is None:
+            return False
+        topology = load_topology(Path(self._config_manager.config_dir) / "topology.json")
+        if topology.model_dump() == self._scenario_manager.topology.model_dump():
+            return False
+        self._scenario_manager.topology = topology
+        logger.info(
+            f"Reloaded topology: {len(topology.links)} links, {len(topology.ordering)} ordering edges"
+        )
+        return True
+
+    async def _reload_changed(self) -> None:
+        """Incremental reload: retire and rebuild only the devices whose inputs changed."""
+        client = cast(MQTTClient, self.mqtt_client)
+        wb_service = cast(WBVirtualDeviceService, self.wb_service)
+        configs = self._config_manager.get_all_device_configs()
+        fleet = self._device_manager.devices
+        # Everything that can fail on bad input (capability JSON, topology JSON)
+        # is evaluated before anything is torn down.
+        diff = diff_fleet(fleet, configs, Path(self._config_manager.config_dir) / "capabilities")
+        self._reload_topology()
+        self.last_diff = diff
+        logger.info(f"Incremental reload: {diff.summary()}")
+
+        for device_id in diff.retire:
+            device = cast(BaseDevice, fleet[device_id])
+            for topic in [t for t, h in client.message_handlers.items() if _handler_owner(h) is device]:
+                await client.unsubscribe(topic)
+            if device_id in diff.removed:
+                await device.cleanup_wb_device_state()
+                client.remove_device_will_messages(device_id)
+            device.release_metrics()
+        await self._device_manager.remove_devices(diff.retire)
+
+        if not diff.rebuild:
+            return
+        rebuild = set(diff.rebuild)
+        await self._device_manager.initialize_devices(
+            {device_id: config for device_id, config in configs.items() if device_id in rebuild}
+        )
+        self._device_manager.order_devices(configs)
+        fresh = {device_id: fleet[device_id] for device_id in diff.rebuild if device_id in fleet}
+        if self._prepare_devices is not None:
+            self._prepare_devices(fresh, client, wb_service)
+
+        for device_id, port_device in fresh.items():
+            device = cast(BaseDevice, port_device)
+            handler = self._device_manager.get_message_handler(device_id)
+            if handler:
+                for topic in device.subscribe_topics():
+                    await client.subscribe(topic, handler)
+            try:
+                await device.setup_wb_emulation_if_enabled()
+            except Exception as e:
+                logger.error(f"Failed to setup WB emulation for device {device_id} after reload: {str(e)}")
+
+    async def _reload_everything(self) -> None:
+        """Full reload: new client, whole fleet re-initialized, scenario cards rebuilt."""
+        self.last_diff = None
+        if self.mqtt_client:
+            await self.mqtt_client.stop()
+
+        new_client = self._client_factory()
+        self.mqtt_client = new_client
+        wb_service = self._on_new_client(new_client)
+        self.wb_service = wb_service
+        self._reload_topology()
+
+        # Shutdown any existing devices, then re-initialize with typed
+        # configs. Wire the shared MQTT client BEFORE `initialize_devices`
+        # so WB-passthrough devices' setup() can register their
+        # state_topic + meta/error subscriptions on the right client.
+        # Existing AV drivers don't use mqtt_client in setup() so this is
+        # a no-op for them.
+        for device in self._device_manager.devices.values():
+            cast(BaseDevice, device).release_metrics()
+        await self._device_manager.shutdown_devices()
+        self._device_manager.set_runtime_services(
+            mqtt_client=new_client, wb_service=wb_service
+        )
+        await self._device_manager.initialize_devices(
+            self._config_manager.get_all_device_configs()
+        )
+
+        # Safety-net assignment (already set in the constructor; idempotent).
+        for device in self._device_manager.devices.values():
+            cast(BaseDevice, device).mqtt_client = new_client
+        if self._prepare_devices is not None:
+            self._prepare_devices(self._device_manager.devices, new_client, wb_service)
+
+        # Create topic to handler mapping
+        topic_handlers: Dict[str, Callable] = {}
+        for device_id, device in self._device_manager.devices.items():
+            handler = self._device_manager.get_message_handler(device_id)
+            if handler:
+                for topic in device.subscribe_topics():
+                    topic_handlers[topic] = handler
+
+        # Connect to MQTT broker with topics and handlers
+        if topic_handlers:
+            await new_client.connect_and_subscribe(topic_handlers)
+        else:
+            await new_client.connect()
+
+        # Wait for MQTT connection to be fully established
+        logger.info("Waiting for MQTT connection to be established after reload...")
+        connection_success = await new_client.wait_for_connection(timeout=30.0)
+        if not connection_success:
+            logger.error(
+                "Failed to establish MQTT connection within timeout after "
+                "reload - WB emulation and scenario cards will be skipped"
+            )
+            return
+        logger.info("MQTT connection established successfully after reload")
+
+        # Now that MQTT is connected, set up Wirenboard virtual device
+        # emulation for all devices
+        logger.info("Setting up Wirenboard virtual device emulation after reload...")
+        for device_id, device in self._device_manager.devices.items():
+            try:
+                await cast(BaseDevice, device).setup_wb_emulation_if_enabled()
+                logger.debug(
+                    f"WB emulation setup completed for device {device_id} after reload"
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to setup WB emulation for device {device_id} "
+                    f"after reload: {str(e)}"
+                )
+
+        # Rebuild the per-room scenario cards over the new client —
+        # their publishes, subscriptions, and the on_active_changed
+        # hook were all bound to the old one. Needs the live
+        # connection, same as startup.
+        await self._rebuild_scenario_cards(new_client, wb_service)
@@ -70,9 +70,6 @@ class DeviceTestCLI:
             self.device_manager = DeviceManager()
             self.device_manager._mqtt_client = self.mqtt_client  # mirrors bootstrap
 
-            # Load device modules
-            await self.device_manager.load_device_modules()
-
             # Get all device configurations
             device_configs = self.config_manager.get_all_device_configs()
 
@@ -81,8 +78,9 @@ class DeviceTestCLI:
                 logger.error(f"Device ID '{device_id}' not found in configuration")
                 return False
 
-            # Initialize only the specified device
+            # Load only the specified device's driver and initialize it
             filtered_configs = {device_id: device_configs[device_id]}
+            await self.device_manager.load_device_modules(filtered_configs)
             await self.device_manager.initialize_devices(filtered_configs)
 
             # Set MQTT client for the device (cast away the DevicePort narrow
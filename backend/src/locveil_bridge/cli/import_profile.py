@@ -0,0 +1,150 @@
+"""``locveil-bridge --profile-imports`` — what each device driver costs to import.
+
+Startup imports only the drivers a device config names (``load_device_modules``),
+but a configured driver still drags in its whole dependency tree (pyatv,
+asyncwebostv, broadlink + pyOpenSSL, the UPnP stack ...). This report shows where
+that time goes, the way ``python -X importtime`` would for each driver alone: every
+driver module is imported in a fresh interpreter under ``-X importtime``, the
+modules any bare interpreter imports anyway are discounted, and the remaining self
+times are summed per top-level package.
+
+Fresh interpreters make the numbers independent — a dependency shared by two drivers
+is charged to both — so they add up to more than one startup actually pays.
+"""
+
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from locveil_bridge.domain.devices.service import DEVICE_ENTRY_POINTS
+from locveil_bridge.infrastructure.config.manager import ConfigManager
+from locveil_bridge.utils.entry_points import entry_points_by_attr
+
+_HEADER = "import time:"
+
+
+@dataclass
+class DriverImportProfile:
+    """Import cost of one driver module in a fresh interpreter (times in ms)."""
+
+    device_class: str
+    entry_point: str
+    module: str
+    configured: bool
+    total_ms: float = 0.0
+    modules: int = 0
+    packages: List[Tuple[str, float]] = field(default_factory=list)  # heaviest first
+    error: Optional[str] = None
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """``(module, self_us, cumulative_us)`` per ``-X importtime`` line, in output order."""
+    records: List[Tuple[str, int, int]] = []
+    for line in stderr.splitlines():
+        if not line.startswith(_HEADER):
+            continue
+        parts = line[len(_HEADER):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        try:
+            records.append((name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue  # the column header line
+    return records
+
+
+def _importtime(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def summarize(
+    profile: DriverImportProfile, records: List[Tuple[str, int, int]], baseline: Set[str]
+) -> DriverImportProfile:
+    """Fill ``profile`` from the driver's importtime records, minus ``baseline`` modules."""
+    by_package: Dict[str, int] = {}
+    total_us = 0
+    count = 0
+    for name, self_us, _cumulative_us in records:
+        if name in baseline:
+            continue
+        count += 1
+        total_us += self_us
+        package = name.split(".", 1)[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+    profile.total_ms = round(total_us / 1000.0, 1)
+    profile.modules = count
+    profile.packages = sorted(
+        ((package, round(us / 1000.0, 1)) for package, us in by_package.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    return profile
+
+
+def profile_driver_imports(
+    configured_classes: Set[str], all_drivers: bool = False
+) -> Tuple[List[DriverImportProfile], List[str]]:
+    """Profile the configured drivers (every registered one with ``all_drivers``).
+
+    Returns the profiles, slowest first, and the class names of the registered
+    drivers that were not profiled.
+    """
+    baseline = {name for name, _, _ in parse_importtime(_importtime("pass").stderr)}
+    profiles: List[DriverImportProfile] = []
+    skipped: List[str] = []
+    for class_name, entry_point in sorted(entry_points_by_attr(DEVICE_ENTRY_POINTS).items()):
+        configured = class_name in configured_classes
+        if not (configured or all_drivers):
+            skipped.append(class_name)
+            continue
+        profile = DriverImportProfile(
+            device_class=class_name,
+            entry_point=entry_point.name,
+            module=entry_point.module,
+            configured=configured,
+        )
+        result = _importtime(f"import {entry_point.module}")
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines()
+            profile.error = lines[-1] if lines else f"exit code {result.returncode}"
+        summarize(profile, parse_importtime(result.stderr), baseline)
+        profiles.append(profile)
+    profiles.sort(key=lambda p: p.total_ms, reverse=True)
+    return profiles, skipped
+
+
+def format_report(
+    profiles: List[DriverImportProfile], skipped: List[str], top: int = 8
+) -> str:
+    lines = ["Driver import profile (-X importtime, one fresh interpreter per driver)", ""]
+    for p in profiles:
+        marker = "configured" if p.configured else "not configured"
+        lines.append(
+            f"{p.device_class} ({p.entry_point}, {marker}): {p.total_ms:.1f} ms, {p.modules} modules"
+        )
+        if p.error:
+            lines.append(f"    import failed: {p.error}")
+        for package, ms in p.packages[:top]:
+            lines.append(f"    {ms:9.1f} ms  {package}")
+        lines.append("")
+    total = sum(p.total_ms for p in profiles if p.configured)
+    lines.append(f"Configured drivers: {total:.1f} ms (shared dependencies counted per driver)")
+    if skipped:
+        lines.append(f"Not imported at startup: {', '.join(skipped)}")
+    return "\n".join(lines)
+
+
+def run(config_dir: str = "config", all_drivers: bool = False) -> int:
+    """Print the report for the devices configured in ``config_dir``."""
+    configs = ConfigManager(config_dir=config_dir).get_all_device_configs()
+    configured = {c for c in (getattr(cfg, "device_class", None) for cfg in configs.values()) if c}
+    profiles, skipped = profile_driver_imports(configured, all_drivers=all_drivers)
+    print(format_report(profiles, skipped))
+    return 1 if any(p.error for p in profiles) else 0
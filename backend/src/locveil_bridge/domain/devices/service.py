@@ -2,11 +2,16 @@ import logging
 import inspect
 import asyncio
 import json
-from typing import Dict, Any, Callable, List, Optional, Type, cast
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, Any, Callable, Iterable, List, Mapping, Optional, Set, Tuple, Type, cast
 from locveil_bridge.domain.ports import DevicePort
 from locveil_bridge.domain.devices.config import BaseDeviceConfig
 from locveil_bridge.utils.serialization_utils import safely_serialize, describe_serialization_issues
-from locveil_bridge.utils.entry_points import dynamic_loader
+from locveil_bridge.utils.entry_points import dynamic_loader, entry_points_by_attr
+from locveil_bridge.utils.metrics import registry
 from locveil_bridge.domain.ports import StateRepositoryPort
 
 # NOTE: This module now uses the 'device_class' field directly from device configurations
@@ -14,14 +19,93 @@ from locveil_bridge.domain.ports import StateRepositoryPort
 
 logger = logging.getLogger(__name__)
 
+DEVICE_ENTRY_POINTS = "locveil_bridge.devices"
+
+_PERSIST_QUEUE_DEPTH = registry.gauge(
+    "locveil_persistence_queue_depth", "Devices with a state change not yet handed to the state repository"
+).labels()
+_PERSIST_SECONDS = registry.histogram(
+    "locveil_persistence_save_seconds", "Serialize + save of one device state by the persistence drain"
+).labels()
+
+
+@dataclass
+class DeviceSetupTiming:
+    """One device's bring-up in the startup timeline (times in ms).
+
+    ``status``: ``pending`` → ``ready`` | ``failed``; ``connecting`` while a setup that
+    overran the timeout keeps running in the background (it then ends ``ready`` or
+    ``failed`` with ``background=True``).
+    """
+
+    device_id: str
+    device_class: str
+    status: str = "pending"
+    queued_ms: float = 0.0  # waiting for a setup slot, from the start of initialize_devices
+    restore_ms: float = 0.0
+    setup_ms: Optional[float] = None  # None until setup() returns
+    background: bool = False
+
+
+@dataclass
+class DriverImport:
+    """What loading one driver entry point cost (``load_device_modules``).
+
+    ``modules`` counts the modules that were first imported by this driver, so a
+    dependency shared with an earlier driver is charged to that one.
+    """
+
+    device_class: str
+    entry_point: str
+    import_ms: float
+    modules: int
+
+
+@dataclass
+class StartupTimeline:
+    """Report of the last ``initialize_devices`` run."""
+
+    started_at: str
+    concurrency: int
+    setup_timeout_s: Optional[float]
+    total_ms: Optional[float] = None  # until every foreground setup settled
+    devices: List[DeviceSetupTiming] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
 class DeviceManager:
-    """Manages device modules and their message handlers."""
+    """Manages device modules and their message handlers.
+
+    Args:
+        state_repository: Persistence port for device state (None disables persistence).
+        setup_concurrency: How many devices run restore+setup() at once during
+            ``initialize_devices`` (1 = one after another).
+        setup_timeout: Seconds ``initialize_devices`` waits for one device's setup();
+            a slower device keeps connecting in the background. None = wait forever.
+    """
     
-    def __init__(self, state_repository: Optional[StateRepositoryPort] = None):
+    def __init__(
+        self,
+        state_repository: Optional[StateRepositoryPort] = None,
+        setup_concurrency: int = 1,
+        setup_timeout: Optional[float] = None,
+    ):
+        if setup_concurrency < 1:
+            raise ValueError(f"setup_concurrency must be >= 1, got {setup_concurrency}")
         self.device_classes: Dict[str, Type[DevicePort]] = {}  # Stores class definitions
         self.devices: Dict[str, DevicePort] = {}  # Stores device instances
         self.state_repository = state_repository  # State persistence port
         self._persistence_tasks = set()  # Track active persistence tasks
+        # Devices with a state change not yet handed to the repository, drained by ONE
+        # task at a time: a burst of changes (slider drag, sensor churn) costs one
+        # serialize+save per device per drain pass instead of one task per change.
+        # Value = the changed fields accumulated since the last save (None = save the
+        # whole state, e.g. when a callback did not say what changed).
+        self._dirty_devices: Dict[str, Optional[Set[str]]] = {}
+        self._persist_drain_task: Optional[asyncio.Task] = None
+        _PERSIST_QUEUE_DEPTH.set_function(lambda: len(self._dirty_devices))
         self._shutting_down = False  # Flag to indicate shutdown in progress
         # Shared MQTT client + WB-virtual-device service wired in at bootstrap (or /reload)
         # via `set_runtime_services()` BEFORE `initialize_devices` runs, so device
@@ -30,27 +114,49 @@ class DeviceManager:
         # these in `setup()`; WB-passthrough subscribes via them.
         self._mqtt_client = None
         self._wb_service = None
+        self.setup_concurrency = setup_concurrency
+        self.setup_timeout = setup_timeout
+        # Setups that overran `setup_timeout` and are still connecting.
+        self._background_setups: Set[asyncio.Task] = set()
+        self.startup_timeline: Optional[StartupTimeline] = None
+        # device_class -> import cost, for the drivers the last load_device_modules loaded.
+        self.driver_imports: Dict[str, DriverImport] = {}
 
     def set_runtime_services(self, mqtt_client=None, wb_service=None) -> None:
         """Wire the shared MQTT client + WB service before `initialize_devices` runs."""
         self._mqtt_client = mqtt_client
         self._wb_service = wb_service
     
-    async def load_device_modules(self):
-        """Load all device classes from entry points (the core-py registry, CORE-7)."""
-        logger.info("Loading device classes from entry points")
+    async def load_device_modules(self, configs: Optional[Mapping[str, BaseDeviceConfig]] = None):
+        """Load device classes from entry points (the core-py registry, CORE-7).
 
+        Args:
+            configs: Device configs whose ``device_class`` values select the drivers
+                to import; drivers nobody configured (and their pyatv / broadlink /
+                UPnP dependency trees) stay unimported. None loads every entry point.
+        """
         # Fresh discovery on every call — startup, POST /reload, and the device-test
         # CLI all expect a re-read, matching the pre-CORE-7 inline scan.
         dynamic_loader.clear_cache()
+        self.driver_imports = {}
+
+        if configs is None:
+            self._load_all_device_modules()
+        else:
+            wanted = sorted({c for c in (getattr(cfg, "device_class", None) for cfg in configs.values()) if c})
+            self._load_configured_device_modules(wanted)
 
+        for ep_name, reason in dynamic_loader.get_discovery_failures(DEVICE_ENTRY_POINTS).items():
+            logger.error(f"Device entry point '{ep_name}' failed discovery: {reason}")
+
+        logger.info(f"Loaded device classes: {list(self.device_classes.keys())}")
+
+    def _load_all_device_modules(self) -> None:
+        logger.info("Loading all device classes from entry points")
         # The shared engine does discovery + validation: a loaded object that is not
         # a DevicePort subclass lands in the failure ledger with a reason instead of
-        # being returned (enabled= stays None — all entry points; config-driven
-        # activation is a separate task).
-        discovered = dynamic_loader.discover_providers(
-            "locveil_bridge.devices", base_class=DevicePort
-        )
+        # being returned.
+        discovered = dynamic_loader.discover_providers(DEVICE_ENTRY_POINTS, base_class=DevicePort)
 
         for ep_name, loaded in discovered.items():
             # The registry keys by CLASS name — device configs carry
@@ -60,11 +166,36 @@ class DeviceManager:
             self.device_classes[device_class.__name__] = device_class
             logger.info(f"Registered device class: {device_class.__name__} from entry point '{ep_name}'")
 
-        for ep_name, reason in dynamic_loader.get_discovery_failures("locveil_bridge.devices").items():
-            logger.error(f"Device entry point '{ep_name}' failed discovery: {reason}")
+    def _load_configured_device_modules(self, device_class_names: List[str]) -> None:
+        logger.info(f"Loading configured device classes from entry points: {device_class_names}")
+        registered = entry_points_by_attr(DEVICE_ENTRY_POINTS)
+        for class_name in device_class_names:
+            entry_point = registered.get(class_name)
+            if entry_point is None:
+                logger.error(f"No '{DEVICE_ENTRY_POINTS}' entry point provides device class {class_name}")
+                continue
+            modules_before = len(sys.modules)
+            started = time.perf_counter()
+            # Only this entry point is imported; its siblings stay untouched.
+            loaded = dynamic_loader.get_provider_class(
+                DEVICE_ENTRY_POINTS, entry_point.name, base_class=DevicePort
+            )
+            import_ms = round((time.perf_counter() - started) * 1000.0, 2)
+            if loaded is None:
+                continue
+            device_class = cast(Type[DevicePort], loaded)
+            self.device_classes[device_class.__name__] = device_class
+            self.driver_imports[class_name] = DriverImport(
+                device_class=class_name,
+                entry_point=entry_point.name,
+                import_ms=import_ms,
+                modules=len(sys.modules) - modules_before,
+            )
+            logger.info(
+                f"Registered device class: {class_name} from entry point '{entry_point.name}' "
+                f"({import_ms}ms, {len(sys.modules) - modules_before} new modules)"
+            )
 
-        logger.info(f"Loaded device classes: {list(self.device_classes.keys())}")
-    
     def _load_device_class(self, device_class_name: str) -> Optional[Type[DevicePort]]:
         """
         Load a device implementation class from loaded classes.
@@ -84,10 +215,24 @@ class DeviceManager:
         
         This method instantiates device objects based on their device_class field
         in the configuration, dynamically loading the classes as needed.
+
+        Instantiation and registration run in config order. The slow part -- restoring
+        the persisted state, then ``setup()`` (TLS handshakes, SSDP, discovery retries)
+        -- runs for up to ``setup_concurrency`` devices at once; each device still
+        restores before its own setup. A setup that outlasts ``setup_timeout`` is left
+        connecting in the background. Per-device timings land in ``startup_timeline``.
         
         Args:
             configs: Dictionary of device configurations mapped by device_id
         """
+        started = time.monotonic()
+        timeline = StartupTimeline(
+            started_at=datetime.now().isoformat(),
+            concurrency=self.setup_concurrency,
+            setup_timeout_s=self.setup_timeout,
+        )
+        self.startup_timeline = timeline
+        bring_up: List[Tuple[str, DevicePort, DeviceSetupTiming]] = []
         for device_id, config in configs.items():
             try:
                 # Get the device class name directly from the config
@@ -142,48 +287,108 @@ class DeviceManager:
                 # reference it still load, it stays visible in the API/UI, and it can reconnect
                 # later — instead of an off-at-boot device vanishing until a full restart.
                 self.devices[device_id] = device
+                timing = DeviceSetupTiming(device_id=device_id, device_class=device_class_name)
+                timeline.devices.append(timing)
+                bring_up.append((device_id, device, timing))
+                
+            except Exception as e:
+                logger.error(f"Failed to initialize device {device_id}: {str(e)}")
+                logger.exception(e)
 
-                # Re-hydrate the last-good assumed state BEFORE setup(): setup may query the
-                # live device (fresher than the snapshot, must win), and the post-setup persist
-                # below would otherwise overwrite the snapshot with boot defaults — losing the
-                # assumed state the reconciler diffs against (a restart would then emit e.g. a
-                # power toggle that turns an actually-ON blind device OFF).
-                await self._restore_persisted_state(device_id, device)
+        snapshots = await self._preload_persisted_states([device_id for device_id, _, _ in bring_up])
+        slots = asyncio.Semaphore(self.setup_concurrency)
+        await asyncio.gather(*(
+            self._bring_up_device(device_id, device, timing, slots, started, snapshots)
+            for device_id, device, timing in bring_up
+        ))
+        timeline.total_ms = (time.monotonic() - started) * 1000.0
+        connecting = [t.device_id for t in timeline.devices if t.status == "connecting"]
+        logger.info(
+            f"Device bring-up took {timeline.total_ms:.0f} ms for {len(bring_up)} device(s)"
+            + (f"; still connecting in background: {', '.join(connecting)}" if connecting else "")
+        )
 
-                try:
-                    success = await device.setup()
-                except Exception as e:
-                    logger.warning(
-                        f"Device {device_id} ({device_class_name}) setup raised: {str(e)}; "
-                        f"kept registered as disconnected"
-                    )
-                    success = False
-
-                if not success:
-                    logger.warning(
-                        f"Device {device_id} ({device_class_name}) failed setup; kept registered "
-                        f"as disconnected (skipping initial-state persist so the last-good assumed "
-                        f"state is preserved)"
-                    )
-                    continue
+    async def _bring_up_device(
+        self,
+        device_id: str,
+        device: DevicePort,
+        timing: DeviceSetupTiming,
+        slots: asyncio.Semaphore,
+        started: float,
+        snapshots: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """Restore then set up one device inside a concurrency slot (never raises)."""
+        async with slots:
+            timing.queued_ms = (time.monotonic() - started) * 1000.0
+            # Re-hydrate the last-good assumed state BEFORE setup(): setup may query the
+            # live device (fresher than the snapshot, must win), and the post-setup persist
+            # below would otherwise overwrite the snapshot with boot defaults — losing the
+            # assumed state the reconciler diffs against (a restart would then emit e.g. a
+            # power toggle that turns an actually-ON blind device OFF).
+            restore_started = time.monotonic()
+            try:
+                await self._restore_persisted_state(device_id, device, snapshots)
+            except Exception as e:
+                logger.error(f"Failed to restore persisted state for device {device_id}: {str(e)}")
+            timing.restore_ms = (time.monotonic() - restore_started) * 1000.0
 
-                logger.info(f"Initialized device {device_id} of type {device_class_name}")
+            setup = asyncio.create_task(
+                self._setup_device(device_id, device, timing), name=f"device-setup:{device_id}"
+            )
+            try:
+                # shield: a timeout stops the wait, not the setup.
+                await asyncio.wait_for(asyncio.shield(setup), timeout=self.setup_timeout)
+            except asyncio.TimeoutError:
+                timing.status = "connecting"
+                timing.background = True
+                self._background_setups.add(setup)
+                setup.add_done_callback(self._background_setups.discard)
+                logger.warning(
+                    f"Device {device_id} ({timing.device_class}) setup exceeded "
+                    f"{self.setup_timeout}s; continuing to connect in the background"
+                )
 
-                # Persist the initial state ONLY for successfully set-up devices, so a boot-time
-                # error/disconnected state never overwrites a device's last-good persisted state.
-                if self.state_repository:
-                    try:
-                        await self._persist_state(device_id)
-                        logger.info(f"Persisted initial state for device {device_id}")
-                    except Exception as e:
-                        logger.error(f"Failed to persist initial state for device {device_id}: {str(e)}")
-                
+    async def _setup_device(self, device_id: str, device: DevicePort, timing: DeviceSetupTiming) -> None:
+        """Run setup() and, on success, persist the initial state. Records the outcome."""
+        setup_started = time.monotonic()
+        try:
+            success = await device.setup()
+        except Exception as e:
+            logger.warning(
+                f"Device {device_id} ({timing.device_class}) setup raised: {str(e)}; "
+                f"kept registered as disconnected"
+            )
+            success = False
+        timing.setup_ms = (time.monotonic() - setup_started) * 1000.0
+        timing.status = "ready" if success else "failed"
+
+        if not success:
+            logger.warning(
+                f"Device {device_id} ({timing.device_class}) failed setup; kept registered "
+                f"as disconnected (skipping initial-state persist so the last-good assumed "
+                f"state is preserved)"
+            )
+            return
+
+        logger.info(f"Initialized device {device_id} of type {timing.device_class} in {timing.setup_ms:.0f} ms")
+
+        # Persist the initial state ONLY for successfully set-up devices, so a boot-time
+        # error/disconnected state never overwrites a device's last-good persisted state.
+        if self.state_repository:
+            try:
+                await self._persist_state(device_id)
+                logger.info(f"Persisted initial state for device {device_id}")
             except Exception as e:
-                logger.error(f"Failed to initialize device {device_id}: {str(e)}")
-                logger.exception(e)
+                logger.error(f"Failed to persist initial state for device {device_id}: {str(e)}")
     
     async def shutdown_devices(self):
         """Shutdown all devices."""
+        # Stop setups still connecting in the background before tearing devices down.
+        background = list(self._background_setups)
+        for task in background:
+            task.cancel()
+        if background:
+            await asyncio.gather(*background, return_exceptions=True)
         for device_name, device in self.devices.items():
             try:
                 await device.shutdown()
@@ -191,6 +396,39 @@ class DeviceManager:
             except Exception as e:
                 logger.error(f"Error shutting down device {device_name}: {str(e)}")
     
+    async def remove_devices(self, device_ids: Iterable[str]) -> None:
+        """Shut down and unregister ``device_ids`` (unknown ids are skipped).
+
+        The incremental /reload path: the rest of the fleet keeps running. A setup
+        still connecting in the background for one of these devices is cancelled first.
+        """
+        doomed = [d for d in device_ids if d in self.devices]
+        names = {f"device-setup:{d}" for d in doomed}
+        background = [t for t in self._background_setups if t.get_name() in names]
+        for task in background:
+            task.cancel()
+        if background:
+            await asyncio.gather(*background, return_exceptions=True)
+        for device_id in doomed:
+            device = self.devices.pop(device_id)
+            try:
+                await device.shutdown()
+                logger.info(f"Shutdown device: {device_id}")
+            except Exception as e:
+                logger.error(f"Error shutting down device {device_id}: {str(e)}")
+
+    def order_devices(self, device_ids: Iterable[str]) -> None:
+        """Re-order ``devices`` in place to follow ``device_ids`` (others go last).
+
+        Devices rebuilt by an incremental reload are re-registered at the end of the
+        dict; this puts them back in config order. In place, because the dict is
+        shared by reference (SSE snapshot provider, scenario manager).
+        """
+        rank = {device_id: i for i, device_id in enumerate(device_ids)}
+        ordered = sorted(self.devices.items(), key=lambda item: rank.get(item[0], len(rank)))
+        self.devices.clear()
+        self.devices.update(ordered)
+
     def get_device(self, device_id: str) -> Optional[DevicePort]:
         """Get a device instance by its ID."""
         return self.devices.get(device_id)
@@ -250,9 +488,12 @@ class DeviceManager:
         
         return state_dict
         
-    async def _persist_state(self, device_id: str):
+    async def _persist_state(self, device_id: str, fields: Optional[Set[str]] = None):
         """
-        Persist full device.state dict under key "device:{device_id}".
+        Persist device.state under key "device:{device_id}".
+
+        With ``fields`` and a repository that supports per-field updates, only those
+        fields are serialized and written; otherwise the full state dict is saved.
         """
         if not self.state_repository:
             logger.debug(f"State repository not available, skipping persistence for device: {device_id}")
@@ -267,7 +508,14 @@ class DeviceManager:
         state_obj = None
         try:
             state_obj = device.get_current_state()
-            
+
+            if fields and getattr(self.state_repository, 'supports_field_updates', False):
+                await self.state_repository.save_fields(
+                    f"device:{device_id}", self._serialize_state_fields(state_obj, fields)
+                )
+                logger.debug(f"Persisted {len(fields)} field(s) for device: {device_id}")
+                return
+
             # Use the safe serialization method to handle all state types
             state_dict = self._safely_serialize_state(state_obj)
             
@@ -294,19 +542,27 @@ class DeviceManager:
             except Exception:
                 logger.error(f"Could not inspect state object structure for {device_id}")
             
+    def _serialize_state_fields(self, state_obj: Any, fields: Set[str]) -> Dict[str, Any]:
+        """Serialized values of just ``fields``, encoded exactly as the full save encodes them.
+
+        State models override ``model_dump`` (ignoring ``include``), so the state is
+        dumped whole and subset; the saving is in the JSON encoding and the write.
+        """
+        state_dict = safely_serialize(state_obj)
+        return {field: state_dict[field] for field in fields if field in state_dict}
+
     def _persist_state_callback(self, device_id: str, changed_fields: Optional[List[str]] = None):
         """
         Callback to handle device state changes. Schedules the state to be persisted.
         Registered on every device by ``register_state_change_callback`` during init.
 
-        Persistence saves the **full** device state (idempotent), so ``changed_fields`` is
-        accepted but not read — its presence is for the chokepoint signature shared with
-        per-field-aware callbacks (e.g. the WB-publish callback). The ``Optional`` default
-        keeps older test mocks calling ``cb(device_id)`` working.
+        ``changed_fields`` is accumulated per device until the drain task saves it, so a
+        repository with a per-field layout writes only what changed. Without it (older
+        test mocks call ``cb(device_id)``) the full state is saved.
 
         Args:
             device_id: The ID of the device whose state changed.
-            changed_fields: Field names that changed (not used; see above).
+            changed_fields: Field names that changed, if known.
         """
         # DEBUG: Log all state change callbacks
         logger.debug(f"[STATE_DEBUG] _persist_state_callback triggered for {device_id}")
@@ -324,18 +580,36 @@ class DeviceManager:
             logger.debug(f"Skipping persistence for {device_id} during shutdown (preserve assumed state)")
             return
 
-        # Normal operation mode: use asyncio.create_task to persist state asynchronously without blocking
+        # Normal operation mode: mark the device dirty and make sure the drain task runs
+        # (asynchronously, without blocking the state change that triggered us).
+        pending = self._dirty_devices.get(device_id, set())
+        if pending is None or not changed_fields:
+            self._dirty_devices[device_id] = None  # full save wins
+        else:
+            self._dirty_devices[device_id] = pending | set(changed_fields)
+        if self._persist_drain_task is not None and not self._persist_drain_task.done():
+            return
         try:
             # DEBUG: Log task creation for all devices
             logger.debug(f"[STATE_DEBUG] Creating persistence task for {device_id}")
             
-            task = asyncio.create_task(self._persist_state(device_id))
+            task = asyncio.create_task(self._drain_dirty_states())
+            self._persist_drain_task = task
             # Track the task and automatically remove it when done
             self._persistence_tasks.add(task)
             task.add_done_callback(lambda t: self._persistence_tasks.discard(t))
         except RuntimeError as e:
             # We're not in an event loop, log a warning
+            self._dirty_devices.pop(device_id, None)
             logger.warning(f"Cannot persist state for {device_id}: {str(e)}")
+
+    async def _drain_dirty_states(self) -> None:
+        """Persist every dirty device; changes arriving mid-drain join the same pass."""
+        while self._dirty_devices:
+            device_id = next(iter(self._dirty_devices))
+            started = time.perf_counter()
+            await self._persist_state(device_id, self._dirty_devices.pop(device_id))
+            _PERSIST_SECONDS.observe(time.perf_counter() - started)
             
     async def wait_for_persistence_tasks(self, timeout: float = 5.0) -> bool:
         """
@@ -424,18 +698,43 @@ class DeviceManager:
             logger.error(f"Error performing action '{action}' on device {device_id}: {str(e)}")
             return {"success": False, "error": str(e)}
             
-    async def _restore_persisted_state(self, device_id: str, device: DevicePort) -> None:
+    async def _preload_persisted_states(self, device_ids: List[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Every device snapshot in one bulk read (``device:{id}`` -> state).
+
+        None when there is nothing to read, the repository has no ``load_many``, or
+        the bulk read failed; the restore then falls back to one load per device.
+        """
+        load_many = getattr(self.state_repository, "load_many", None)
+        if load_many is None or not device_ids:
+            return None
+        try:
+            return await load_many([f"device:{device_id}" for device_id in device_ids])
+        except Exception as e:
+            logger.error(f"Bulk load of persisted device states failed, loading one by one: {str(e)}")
+            return None
+
+    async def _restore_persisted_state(
+        self,
+        device_id: str,
+        device: DevicePort,
+        snapshots: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
         """Re-hydrate a device's assumed state from its persisted snapshot.
 
         Called from initialize_devices() per device, BEFORE setup() — restore must precede
         the post-setup initial persist (which would clobber the snapshot with boot defaults)
         and lets anything setup() learns live overwrite the snapshot. Failures degrade to
         boot-default state; they never block device initialization.
+
+        ``snapshots`` is the bulk preload; without it the snapshot is loaded here.
         """
         if not self.state_repository:
             return
         try:
-            snapshot = await self.state_repository.load(f"device:{device_id}")
+            if snapshots is not None:
+                snapshot = snapshots.get(f"device:{device_id}")
+            else:
+                snapshot = await self.state_repository.load(f"device:{device_id}")
         except Exception as e:
             logger.error(f"Error loading persisted state for device {device_id}: {str(e)}")
             return
@@ -5,7 +5,7 @@ with external systems. These are implemented by adapters in the infrastructure l
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Awaitable, Callable, Dict, Generic, List, Mapping, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, Generic, Iterable, List, Mapping, Optional, Union
 
 from locveil_bridge.domain.devices.config import BaseCommandConfig
 from locveil_bridge.domain.reports.models import ReportFiling, ReportFilingResult
@@ -38,6 +38,19 @@ class MessageBusPort(ABC):
             retain: Whether the message should be retained
         """
         pass
+
+    async def publish_confirmed(
+        self,
+        topic: str,
+        payload: Optional[Union[str, int, float, bytes]],
+        qos: int = 1,
+        retain: bool = False,
+    ) -> bool:
+        """Publish and report whether the bus accepted the message (for QoS >= 1: the
+        broker acknowledged it). The default can only assume success; adapters that
+        see acknowledgements override it."""
+        await self.publish(topic, payload, qos=qos, retain=retain)
+        return True
     
     @abstractmethod
     async def subscribe(
@@ -184,6 +197,10 @@ class StateRepositoryPort(ABC):
     Used by: DeviceManager, ScenarioManager
     Implemented by: infrastructure/persistence/sqlite.SQLiteStateStore
     """
+
+    # True when `save_fields` writes only the given fields natively. Callers use it to
+    # decide whether a partial serialization is worth doing at all.
+    supports_field_updates: bool = False
     
     @abstractmethod
     async def load(self, entity_id: str) -> Optional[Dict[str, Any]]:
@@ -207,6 +224,50 @@ class StateRepositoryPort(ABC):
         """
         pass
     
+    async def load_many(self, entity_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Load the states of several entities at once.
+
+        The default loads them one by one; repositories that can read a batch in one
+        query override it.
+
+        Args:
+            entity_ids: Identifiers to load
+
+        Returns:
+            entity_id -> state for the entities that have one (missing ones are absent)
+        """
+        states: Dict[str, Dict[str, Any]] = {}
+        for entity_id in entity_ids:
+            state = await self.load(entity_id)
+            if state is not None:
+                states[entity_id] = state
+        return states
+
+    async def load_prefix(self, prefix: str) -> Dict[str, Dict[str, Any]]:
+        """Load every entity whose ID starts with ``prefix`` (e.g. ``"device:"``).
+
+        Returns:
+            entity_id -> state
+        """
+        return await self.load_many(
+            [entity_id for entity_id in await self.list_entities() if entity_id.startswith(prefix)]
+        )
+
+    async def save_fields(self, entity_id: str, fields: Dict[str, Any]) -> None:
+        """Save only some fields of an entity's state, keeping the rest as stored.
+
+        The default is a read-merge-write through ``load``/``save``; repositories
+        with a per-field layout override it.
+
+        Args:
+            entity_id: Unique identifier for the entity
+            fields: Field name -> serialized value for the fields that changed
+        """
+        state = await self.load(entity_id) or {}
+        state.pop('_timestamp', None)
+        state.update(fields)
+        await self.save(entity_id, state)
+
     @abstractmethod
     async def bulk_save(self, states: Dict[str, Dict[str, Any]]) -> None:
         """Save multiple entity states in a single operation.
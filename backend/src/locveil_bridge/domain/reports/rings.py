@@ -7,8 +7,8 @@ inward at these per the hexagonal rule.
 """
 
 import time
-from collections import deque
-from typing import Any, Deque, Dict, List, Optional
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 
 class DispatchRing:
@@ -47,6 +47,10 @@ class MqttWindow:
     Bounded two ways (B-9): entries older than ``max_age_s`` are pruned, and the
     window never holds more than ``max_entries``. Dedup keeps only the LATEST
     message per (direction, topic) — sensor value churn collapses to one row.
+
+    Fed every broker message, so ``record`` is O(1): entries live in an
+    ``OrderedDict`` keyed by (direction, topic), re-inserted at the end on every
+    message, which keeps it ordered by arrival (oldest first) for the prune.
     """
 
     def __init__(self, max_age_s: int = 60, max_entries: int = 500,
@@ -54,31 +58,31 @@ class MqttWindow:
         self._max_age_s = max_age_s
         self._max_entries = max_entries
         self._prefix = topic_prefix
-        self._entries: Deque[Dict[str, Any]] = deque()
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
 
     def record(self, direction: str, topic: str, payload: str) -> None:
         if not topic.startswith(self._prefix):
             return
-        # per-topic dedup: drop the older entry for the same (direction, topic)
-        for i, e in enumerate(self._entries):
-            if e["topic"] == topic and e["direction"] == direction:
-                del self._entries[i]
-                break
-        self._entries.append({
-            "ts": time.time(),
+        now = time.time()
+        key = (direction, topic)
+        # per-topic dedup: the older entry for the same (direction, topic) goes
+        self._entries.pop(key, None)
+        self._entries[key] = {
+            "ts": now,
             "direction": direction,  # "in" | "out"
             "topic": topic,
             "payload": payload if len(payload) <= 512 else payload[:512] + "…",
-        })
-        self._prune()
+        }
+        self._prune(now)
 
-    def _prune(self) -> None:
-        cutoff = time.time() - self._max_age_s
-        while self._entries and self._entries[0]["ts"] < cutoff:
-            self._entries.popleft()
-        while len(self._entries) > self._max_entries:
-            self._entries.popleft()
+    def _prune(self, now: Optional[float] = None) -> None:
+        cutoff = (time.time() if now is None else now) - self._max_age_s
+        entries = self._entries
+        while len(entries) > self._max_entries:
+            entries.popitem(last=False)
+        while entries and next(iter(entries.values()))["ts"] < cutoff:
+            entries.popitem(last=False)
 
     def snapshot(self) -> List[Dict[str, Any]]:
         self._prune()
-        return list(self._entries)
+        return list(self._entries.values())
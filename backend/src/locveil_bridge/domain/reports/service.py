@@ -57,7 +57,7 @@ class ReportService:
         sink: Optional[ReportSinkPort],
         dispatch_ring: DispatchRing,
         mqtt_window: MqttWindow,
-        persisted_state: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+        persisted_states: Callable[[List[str]], Awaitable[Dict[str, Dict[str, Any]]]],
         system_config: Callable[[], Dict[str, Any]],
         catalog_version: Callable[[], str],
         bridge_version: str,
@@ -69,7 +69,7 @@ class ReportService:
         self._sink = sink
         self._dispatch_ring = dispatch_ring
         self._mqtt_window = mqtt_window
-        self._persisted_state = persisted_state
+        self._persisted_states = persisted_states
         self._system_config = system_config
         self._catalog_version = catalog_version
         self._bridge_version = bridge_version
@@ -106,12 +106,13 @@ class ReportService:
                 states[did] = {"_error": str(e)}
 
         state_diffs: Dict[str, Any] = {}
+        try:
+            persisted_states = await self._persisted_states(scoped) if scoped else {}
+        except Exception as e:  # noqa: BLE001
+            persisted_states = {}
+            state_diffs = {did: {"_error": str(e)} for did in scoped}
         for did in scoped:
-            try:
-                persisted = await self._persisted_state(did)
-            except Exception as e:  # noqa: BLE001
-                state_diffs[did] = {"_error": str(e)}
-                continue
+            persisted = persisted_states.get(did)
             if not persisted:
                 continue
             live = states.get(did, {})
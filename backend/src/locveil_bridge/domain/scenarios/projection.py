@@ -0,0 +1,269 @@
+"""Per-room materialized ``ScenarioState`` — kept current from device state-change callbacks.
+
+``get_scenario_state`` used to rebuild the whole state on every call: one ``model_dump()`` plus
+field probing per device of the active scenario, for every UI poll of ``/scenario/state``, every
+catalog build and every SSE switch event. The projection holds one entry per room with an active
+scenario, filled once when the room's active scenario changes; after that ONLY the device whose
+state-change callback fired is re-read. Each entry also keeps its JSON body (assembled from
+per-device JSON fragments), so the REST endpoint serves bytes without re-serializing, and every
+device change that alters an entry is handed to the delta observers (the scenarios SSE channel).
+A reload that rebuilds or removes devices calls ``resync`` so the entries follow the new objects.
+
+Devices without a state-change callback chain (``register_state_change_callback``) cannot announce
+their changes; they are re-read on every query, exactly as before.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from locveil_bridge.domain.scenarios.models import DeviceState, ManualStep, ScenarioState
+from locveil_bridge.domain.scenarios.scenario import Scenario
+
+logger = logging.getLogger(__name__)
+
+# Base fields every device state carries, plus the ones mapped onto DeviceState.power/.input.
+_EXCLUDED_EXTRA_FIELDS = frozenset({
+    "device_id", "device_name", "last_command", "error",
+    "power", "input", "input_source", "video_input", "audio_input",
+})
+
+
+def convert_device_state(state: Any) -> DeviceState:
+    """
+    Convert a device's Pydantic state model to a standardized DeviceState.
+
+    Uses the safe field access of the Scenario class so field-name variations
+    (input_source, video_input, ...) are handled the same way across the system.
+
+    Args:
+        state: Pydantic device state model (e.g., LgTvState, EmotivaXMC2State)
+
+    Returns:
+        DeviceState: Standardized state representation
+    """
+    # Extract and convert power state using the shared safe field access
+    power_value = None
+    raw_power = Scenario._safe_get_device_field(state, "power")
+    if raw_power is not None:
+        if isinstance(raw_power, bool):
+            power_value = raw_power
+        elif isinstance(raw_power, str):
+            # Convert string power states to boolean
+            power_value = raw_power.lower() in ("on", "true", "1", "powered_on", "active")
+
+    # Extract input using safe field access (handles variations automatically)
+    input_value = Scenario._safe_get_device_field(state, "input")
+
+    extra = {}
+    if hasattr(state, "model_dump"):
+        for field_name, field_value in state.model_dump().items():
+            if field_name not in _EXCLUDED_EXTRA_FIELDS and field_value is not None:
+                extra[field_name] = field_value
+
+    return DeviceState(power=power_value, input=input_value, extra=extra)
+
+
+def _json(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+@dataclass(frozen=True)
+class ScenarioStateDelta:
+    """One device's changed entry in a room's projection."""
+    room_id: str
+    scenario_id: str
+    version: int  # per-room counter, bumped on every change to the entry
+    device_id: str
+    state: Optional[DeviceState]  # None: the device is gone (removed by a reload)
+
+
+@dataclass
+class _RoomEntry:
+    scenario_id: str
+    device_ids: List[str]
+    devices: Dict[str, DeviceState] = field(default_factory=dict)
+    fragments: Dict[str, bytes] = field(default_factory=dict)  # device_id -> DeviceState JSON
+    sources: Dict[str, Any] = field(default_factory=dict)  # device_id -> device object read
+    live: Set[str] = field(default_factory=set)  # no callback chain: re-read on every query
+    manual_steps: List[ManualStep] = field(default_factory=list)
+    version: int = 0
+    body: Optional[bytes] = None
+
+
+DeltaObserver = Callable[[ScenarioStateDelta], Any]
+
+
+class ScenarioStateProjection:
+    """Room -> materialized ScenarioState of the room's active scenario."""
+
+    def __init__(self, device_manager: Any):
+        self.device_manager = device_manager
+        self._rooms: Dict[str, _RoomEntry] = {}
+        # device_id -> the device object whose callback chain we joined
+        self._watching: Dict[str, Any] = {}
+        # Invoked with a ScenarioStateDelta after a device change altered a room's entry;
+        # sync or async callables accepted (async ones run as tasks).
+        self.delta_observers: List[DeltaObserver] = []
+        self._pending: Set["asyncio.Task[Any]"] = set()
+
+    def track(self, room_id: str, scenario_id: str, device_ids: Sequence[str]) -> None:
+        """Make ``room_id``'s entry follow ``scenario_id``. A no-op if it already does."""
+        entry = self._rooms.get(room_id)
+        if entry is not None and entry.scenario_id == scenario_id and entry.device_ids == list(device_ids):
+            return
+        self.activate(room_id, scenario_id, device_ids)
+
+    def activate(self, room_id: str, scenario_id: str, device_ids: Sequence[str]) -> None:
+        """(Re)build ``room_id``'s entry from the live state of every device of the scenario."""
+        entry = _RoomEntry(scenario_id=scenario_id, device_ids=list(device_ids))
+        if room_id in self._rooms:
+            entry.version = self._rooms[room_id].version + 1
+        for device_id in entry.device_ids:
+            self._load(entry, device_id, self.device_manager.get_device(device_id))
+        self._rooms[room_id] = entry
+        self._sync_watches()
+
+    def drop(self, room_id: str) -> None:
+        """Forget ``room_id`` (its scenario was deactivated)."""
+        if self._rooms.pop(room_id, None) is not None:
+            self._sync_watches()
+
+    def clear(self) -> None:
+        self._rooms.clear()
+        self._sync_watches()
+
+    def resync(self) -> None:
+        """Re-read every followed device from the device manager and re-join the callback
+        chains. Called after a reload replaced or removed devices: the retired objects are
+        let go, the rebuilt ones watched, and every resulting change is emitted as a delta."""
+        for room_id, entry in self._rooms.items():
+            for device_id in entry.device_ids:
+                self._reload(room_id, entry, device_id, self.device_manager.get_device(device_id))
+        self._sync_watches()
+
+    def scenario_in(self, room_id: str) -> Optional[str]:
+        entry = self._rooms.get(room_id)
+        return entry.scenario_id if entry else None
+
+    def version(self, room_id: str) -> Optional[int]:
+        entry = self._rooms.get(room_id)
+        return entry.version if entry else None
+
+    def state(self, room_id: str, manual_steps: Sequence[ManualStep]) -> ScenarioState:
+        """The room's current ScenarioState. Raises KeyError if the room is not tracked."""
+        entry = self._refresh(room_id, manual_steps)
+        return ScenarioState(
+            scenario_id=entry.scenario_id,
+            devices={d: entry.devices[d] for d in entry.device_ids if d in entry.devices},
+            manual_steps=list(entry.manual_steps),
+        )
+
+    def body(self, room_id: str, manual_steps: Sequence[ManualStep]) -> bytes:
+        """``state()`` as JSON bytes, re-assembled only after the entry changed."""
+        entry = self._refresh(room_id, manual_steps)
+        if entry.body is None:
+            devices = b",".join(
+                _json(d) + b":" + entry.fragments[d] for d in entry.device_ids if d in entry.fragments
+            )
+            entry.body = (
+                b'{"scenario_id":' + _json(entry.scenario_id)
+                + b',"devices":{' + devices + b'}'
+                + b',"manual_steps":' + _json([step.model_dump() for step in entry.manual_steps])
+                + b"}"
+            )
+        return entry.body
+
+    def _refresh(self, room_id: str, manual_steps: Sequence[ManualStep]) -> _RoomEntry:
+        """Bring the read-time inputs up to date: the manual steps, the devices that have no
+        callback chain, and (as a fallback to ``resync``) devices replaced under the same id."""
+        entry = self._rooms[room_id]
+        if list(manual_steps) != entry.manual_steps:
+            entry.manual_steps = list(manual_steps)
+            entry.body = None
+        swapped = False
+        for device_id in entry.device_ids:
+            device = self.device_manager.get_device(device_id)
+            if device is not entry.sources.get(device_id):
+                swapped = True
+                self._reload(room_id, entry, device_id, device)
+            elif device_id in entry.live:
+                self._reload(room_id, entry, device_id, device)
+        if swapped:
+            self._sync_watches()
+        return entry
+
+    def _reload(self, room_id: str, entry: _RoomEntry, device_id: str, device: Any) -> None:
+        """``_load`` one device and emit the delta if the entry changed."""
+        if self._load(entry, device_id, device):
+            self._emit(ScenarioStateDelta(
+                room_id=room_id,
+                scenario_id=entry.scenario_id,
+                version=entry.version,
+                device_id=device_id,
+                state=entry.devices.get(device_id),
+            ))
+
+    def _load(self, entry: _RoomEntry, device_id: str, device: Any) -> bool:
+        """Re-read one device into ``entry``. True if the entry changed."""
+        entry.sources[device_id] = device
+        if device is None:
+            entry.live.discard(device_id)
+            entry.fragments.pop(device_id, None)
+            if entry.devices.pop(device_id, None) is None:
+                return False
+        else:
+            if hasattr(device, "register_state_change_callback"):
+                entry.live.discard(device_id)
+            else:
+                entry.live.add(device_id)
+            state = convert_device_state(device.get_current_state())
+            if entry.devices.get(device_id) == state:
+                return False
+            entry.devices[device_id] = state
+            entry.fragments[device_id] = state.model_dump_json().encode()
+        entry.version += 1
+        entry.body = None
+        return True
+
+    def _sync_watches(self) -> None:
+        """Join exactly the callback chains of the devices some entry follows."""
+        wanted: Dict[str, Any] = {}
+        for entry in self._rooms.values():
+            for device_id, device in entry.sources.items():
+                if device is not None and device_id not in entry.live:
+                    wanted[device_id] = device
+        for device_id, device in list(self._watching.items()):
+            if wanted.get(device_id) is not device:
+                unregister = getattr(device, "unregister_state_change_callback", None)
+                if unregister is not None:
+                    unregister(self._on_device_change)
+                del self._watching[device_id]
+        for device_id, device in wanted.items():
+            if device_id not in self._watching:
+                device.register_state_change_callback(self._on_device_change)
+                self._watching[device_id] = device
+
+    def _on_device_change(self, device_id: str, _changed_fields: List[str]) -> None:
+        device = self.device_manager.get_device(device_id)
+        swapped = False
+        for room_id, entry in self._rooms.items():
+            if device_id not in entry.sources or device_id in entry.live:
+                continue
+            swapped = swapped or device is not entry.sources[device_id]
+            self._reload(room_id, entry, device_id, device)
+        if swapped:
+            self._sync_watches()
+
+    def _emit(self, delta: ScenarioStateDelta) -> None:
+        for observer in list(self.delta_observers):
+            try:
+                result = observer(delta)
+                if result is not None and hasattr(result, "__await__"):
+                    task = asyncio.ensure_future(result)
+                    self._pending.add(task)
+                    task.add_done_callback(self._pending.discard)
+            except Exception as e:
+                logger.error(f"scenario-state delta observer failed for '{delta.room_id}': {str(e)}")
@@ -19,6 +19,7 @@ This module is pure: it reads capability maps and assumed state and returns a pl
 import asyncio
 import heapq
 import logging
+import time
 from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set, Tuple
@@ -32,6 +33,19 @@ logger = logging.getLogger(__name__)
 DISPATCH_TIMEOUT_S = 60.0
 
 from locveil_bridge.domain.topology.models import Topology, TopologyLink
+from locveil_bridge.utils.metrics import registry
+
+_STEP_DISPATCH_SECONDS = registry.histogram(
+    "locveil_scenario_step_dispatch_seconds", "Reconcile step dispatch (execute_action) latency", ("outcome",)
+)
+_STEP_GATE_SECONDS = registry.histogram(
+    "locveil_scenario_step_gate_seconds", "Reconcile step gate wait (state confirmation or settle delay)", ("confirmed",)
+)
+_DISPATCH_OK = _STEP_DISPATCH_SECONDS.labels("ok")
+_DISPATCH_FAILED = _STEP_DISPATCH_SECONDS.labels("failed")
+_DISPATCH_TIMEOUT = _STEP_DISPATCH_SECONDS.labels("timeout")
+_GATE_CONFIRMED = _STEP_GATE_SECONDS.labels("true")
+_GATE_UNCONFIRMED = _STEP_GATE_SECONDS.labels("false")
 
 
 @dataclass
@@ -67,6 +81,9 @@ class ReconcilePlan:
     manual_steps: List[ManualStep] = field(default_factory=list)
     already_satisfied: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
+    # action index -> indices of the actions that must complete first (power-before-input
+    # and topology ordering edges). Indices refer to ``actions``, always lower than the key.
+    dependencies: Dict[int, List[int]] = field(default_factory=dict)
 
 
 # --- 1. resolve desired state from the topology ------------------------------
@@ -79,23 +96,65 @@ def _adjacency(topology: Topology) -> Dict[str, List[TopologyLink]]:
     return adj
 
 
-def _find_path(
-    adj: Dict[str, List[TopologyLink]], source: str, target: str, signal: str
-) -> Optional[List[TopologyLink]]:
-    """DFS for a path ``source`` -> ``target`` following links that carry ``signal``."""
-    stack: List[Tuple[str, List[TopologyLink]]] = [(source, [])]
-    visited: Set[str] = set()
-    while stack:
-        node, path = stack.pop()
-        if node == target:
-            return path
-        if node in visited:
-            continue
-        visited.add(node)
-        for link in adj.get(node, []):
-            if signal in link.carries and link.dst_node not in visited:
-                stack.append((link.dst_node, path + [link]))
-    return None
+class TopologyIndex:
+    """Path lookups over one ``Topology``, computed once and memoized.
+
+    ``resolve_targets`` runs on every plan, preview, switch and ``/scenario/state``
+    poll, always against the same topology. The index walks each ``(source, signal)``
+    once, keeping a parent link per reachable node — the DFS visit order of the old
+    per-call search, so every path is the one it would have found — and memoizes the
+    ``source -> sink`` paths and the ``resolve_targets`` result per scenario route.
+    """
+
+    def __init__(self, topology: Topology):
+        self.topology = topology
+        self.manual_nodes = frozenset(topology.nodes)
+        self._adj = _adjacency(topology)
+        # (source, signal) -> node -> link it was first reached over (None = source)
+        self._parents: Dict[Tuple[str, str], Dict[str, Optional[TopologyLink]]] = {}
+        self._paths: Dict[Tuple[str, str, str], Optional[Tuple[TopologyLink, ...]]] = {}
+        # (source, display, audio) -> resolve_targets result (never handed out directly)
+        self._resolved: Dict[Tuple[Optional[str], ...], Tuple[Any, ...]] = {}
+
+    @classmethod
+    def of(cls, topology: Topology) -> "TopologyIndex":
+        """The index of ``topology``, built on first use."""
+        index = topology._index
+        if index is None:
+            index = topology._index = cls(topology)
+        return index
+
+    def _reach(self, source: str, signal: str) -> Dict[str, Optional[TopologyLink]]:
+        key = (source, signal)
+        parents = self._parents.get(key)
+        if parents is None:
+            parents = self._parents[key] = {}
+            stack: List[Tuple[str, Optional[TopologyLink]]] = [(source, None)]
+            while stack:
+                node, via = stack.pop()
+                if node in parents:
+                    continue
+                parents[node] = via
+                for link in self._adj.get(node, []):
+                    if signal in link.carries and link.dst_node not in parents:
+                        stack.append((link.dst_node, link))
+        return parents
+
+    def path(self, source: str, target: str, signal: str) -> Optional[Tuple[TopologyLink, ...]]:
+        """Links ``source`` -> ``target`` that all carry ``signal``; None if unreachable."""
+        key = (source, target, signal)
+        if key not in self._paths:
+            parents = self._reach(source, signal)
+            path: Optional[Tuple[TopologyLink, ...]] = None
+            if target in parents:
+                links: List[TopologyLink] = []
+                node = target
+                while (link := parents[node]) is not None:
+                    links.append(link)
+                    node = link.src_node
+                path = tuple(reversed(links))
+            self._paths[key] = path
+        return self._paths[key]
 
 
 def resolve_targets(scenario, topology: Topology):
@@ -116,10 +175,31 @@ def resolve_targets(scenario, topology: Topology):
     that allowlist. Conflict resolution: dst wins for mid-chain devices (a device that
     is destination of one link and source of the next keeps its dst_port target; the
     src-port slot is skipped via the ``not in source_targets and not in input_targets``
-    guards below).
+    guards in ``_resolve_targets``).
+
+    Memoized on the topology's ``TopologyIndex`` per ``(source, display, audio)`` —
+    the only scenario fields the walk reads; each call gets its own copies.
     """
-    adj = _adjacency(topology)
-    manual_nodes = set(topology.nodes)
+    index = TopologyIndex.of(topology)
+    key = (scenario.source, scenario.display, scenario.audio)
+    resolved = index._resolved.get(key)
+    if resolved is None:
+        resolved = index._resolved[key] = _resolve_targets(scenario, index)
+    # Callers own what they get back (build_plan hands manual_steps to the plan).
+    input_targets, source_targets, involved, manual_steps, warnings, used_ports = resolved
+    return (
+        dict(input_targets),
+        dict(source_targets),
+        set(involved),
+        list(manual_steps),
+        list(warnings),
+        {device: set(ports) for device, ports in used_ports.items()},
+    )
+
+
+def _resolve_targets(scenario, index: TopologyIndex):
+    topology = index.topology
+    manual_nodes = index.manual_nodes
     input_targets: Dict[str, str] = {}
     source_targets: Dict[str, str] = {}
     involved: Set[str] = set()
@@ -135,7 +215,7 @@ def resolve_targets(scenario, topology: Topology):
     def walk(target_node: Optional[str], signal: str) -> None:
         if not target_node or not scenario.source:
             return
-        path = _find_path(adj, scenario.source, target_node, signal)
+        path = index.path(scenario.source, target_node, signal)
         if path is None:
             warnings.append(f"no {signal} path from '{scenario.source}' to '{target_node}'")
             return
@@ -402,11 +482,14 @@ def _matches(action: PlannedAction, key: str) -> bool:
     return action.device_id == device and action.domain == domain
 
 
-def _order(actions: List[PlannedAction], topology: Topology) -> List[PlannedAction]:
+def _order(
+    actions: List[PlannedAction], topology: Topology
+) -> Tuple[List[PlannedAction], Dict[int, List[int]]]:
     """Topologically order actions by power-before-input + topology ordering edges.
 
     Stable: ties break by original index. ``delay_ms`` from an ordering edge becomes the
-    successor action's ``pre_delay_ms``.
+    successor action's ``pre_delay_ms``. Also returns the ordering edges as
+    ``ReconcilePlan.dependencies`` (positions in the ordered list).
     """
     n = len(actions)
     succ: Dict[int, Set[int]] = defaultdict(set)
@@ -447,9 +530,21 @@ def _order(actions: List[PlannedAction], topology: Topology) -> List[PlannedActi
             if indeg[j] == 0:
                 heapq.heappush(ready, j)
 
-    if len(order) != n:  # cycle (shouldn't happen); fall back to input order
+    if len(order) != n:  # cycle (shouldn't happen); fall back to input order, one at a time
         order = list(range(n))
+        return _with_pre_delays(actions, order, pre_delay), {j: [j - 1] for j in range(1, n)}
 
+    position = {idx: pos for pos, idx in enumerate(order)}
+    deps: Dict[int, List[int]] = defaultdict(list)
+    for i in range(n):
+        for j in succ[i]:
+            deps[position[j]].append(position[i])
+    return _with_pre_delays(actions, order, pre_delay), {j: sorted(p) for j, p in deps.items()}
+
+
+def _with_pre_delays(
+    actions: List[PlannedAction], order: List[int], pre_delay: List[int]
+) -> List[PlannedAction]:
     result: List[PlannedAction] = []
     for idx in order:
         actions[idx].pre_delay_ms = pre_delay[idx]
@@ -522,7 +617,7 @@ def build_plan(scenario, topology: Topology, devices: Dict[str, Any]) -> Reconci
                 else:
                     plan.already_satisfied.append(f"{device_id}.input")
 
-    plan.actions = _order(raw, topology)
+    plan.actions, plan.dependencies = _order(raw, topology)
     return plan
 
 
@@ -586,7 +681,7 @@ def build_forced_device_plan(scenario, topology: Topology, devices: Dict[str, An
         if action is not None:
             raw.append(action)
 
-    plan.actions = _order(raw, topology)
+    plan.actions, plan.dependencies = _order(raw, topology)
     return plan
 
 
@@ -674,11 +769,24 @@ def build_reconcile_preview(scenario, topology: Topology, devices: Dict[str, Any
 # --- execution ---------------------------------------------------------------
 
 
+@dataclass
+class StepTiming:
+    """Latency of one dispatched step, both measured from the start of its dispatch:
+    ``ack_ms`` until the driver acknowledged the command, ``confirmed_ms`` until the
+    gate saw the target state. ``confirmed_ms`` is None for a step without feedback
+    (nothing to confirm) and for one whose gate timed out."""
+
+    action: PlannedAction
+    ack_ms: float
+    confirmed_ms: Optional[float] = None
+
+
 @dataclass
 class ExecutionResult:
     executed: List[PlannedAction] = field(default_factory=list)
     failures: List[Tuple[PlannedAction, str]] = field(default_factory=list)
     manual_steps: List[ManualStep] = field(default_factory=list)
+    timings: List[StepTiming] = field(default_factory=list)
 
     @property
     def success(self) -> bool:
@@ -701,29 +809,233 @@ def _gate_reached(observed: Any, action: PlannedAction) -> bool:
     return _satisfies(observed, action.target, action.value_table)
 
 
+def _target_reached(device: Any, action: PlannedAction) -> bool:
+    assert action.state_field is not None
+    return _gate_reached(getattr(device.get_current_state(), action.state_field, None), action)
+
+
 async def _gate(device: Any, action: PlannedAction, poll_interval_ms: int) -> bool:
-    """Wait for an action to take effect: poll feedback devices to the target value (up to
-    ``poll_timeout_ms``); otherwise wait the fixed ``delay_ms``. Returns False on poll timeout."""
+    """Wait for an action to take effect: feedback devices until the state field reaches
+    the target (up to ``poll_timeout_ms``); otherwise the fixed ``delay_ms``. Returns
+    False on timeout.
+
+    A device with a state-change callback chain (``register_state_change_callback`` +
+    ``unregister_state_change_callback``, the chokepoint the canonical endpoint's echo
+    wait rides) is watched, so the gate opens on the update that reaches the target
+    instead of up to ``poll_interval_ms`` later. Devices without it are polled."""
     if action.feedback and action.state_field and action.poll_timeout_ms:
-        elapsed = 0
-        while elapsed < action.poll_timeout_ms:
-            observed = getattr(device.get_current_state(), action.state_field, None)
-            if _gate_reached(observed, action):
-                return True
-            await asyncio.sleep(poll_interval_ms / 1000)
-            elapsed += poll_interval_ms
-        return False
+        if _target_reached(device, action):
+            return True
+        register = getattr(device, "register_state_change_callback", None)
+        unregister = getattr(device, "unregister_state_change_callback", None)
+        if register is None or unregister is None:
+            return await _poll_gate(device, action, poll_interval_ms)
+        return await _watch_gate(device, action, register, unregister)
     if action.delay_ms:
         await asyncio.sleep(action.delay_ms / 1000)
     return True
 
 
+async def _poll_gate(device: Any, action: PlannedAction, poll_interval_ms: int) -> bool:
+    """Fallback for devices that emit no state-change callbacks."""
+    assert action.poll_timeout_ms is not None
+    elapsed = 0
+    while elapsed < action.poll_timeout_ms:
+        await asyncio.sleep(poll_interval_ms / 1000)
+        elapsed += poll_interval_ms
+        if _target_reached(device, action):
+            return True
+    return False
+
+
+async def _watch_gate(device: Any, action: PlannedAction, register: Any, unregister: Any) -> bool:
+    """Re-check the target on every state change of ``device`` until it is reached."""
+    assert action.poll_timeout_ms is not None
+    changed = asyncio.Event()
+
+    def _on_change(_device_id: str, changed_fields: Any) -> None:
+        if not changed_fields or action.state_field in changed_fields:
+            changed.set()
+
+    register(_on_change)
+    try:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + action.poll_timeout_ms / 1000
+        while True:
+            # clear → check → wait with no await in between: no update can slip past.
+            changed.clear()
+            if _target_reached(device, action):
+                return True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=remaining)
+            except TimeoutError:
+                # Last look: a driver may have set the field without notifying.
+                return _target_reached(device, action)
+    finally:
+        unregister(_on_change)
+
+
+@dataclass
+class _StepOutcome:
+    """What running one action produced; folded into ``ExecutionResult`` in plan order."""
+
+    executed: bool = False
+    failure: Optional[str] = None
+    timing: Optional[StepTiming] = None
+
+
+async def _run_step(action: PlannedAction, devices: Dict[str, Any], poll_interval_ms: int) -> _StepOutcome:
+    """Pre-delay, dispatch, check the response, gate — one action."""
+    if action.pre_delay_ms:
+        await asyncio.sleep(action.pre_delay_ms / 1000)
+
+    device = devices.get(action.device_id)
+    if device is None:
+        return _StepOutcome(failure="device not found")
+
+    dispatched = time.monotonic()
+    dispatch_metric = _DISPATCH_FAILED
+    try:
+        resp = await asyncio.wait_for(
+            device.execute_action(action.command, action.params, source="scenario"),
+            timeout=DISPATCH_TIMEOUT_S,
+        )
+        ok, err = _response_ok(resp)
+        if ok:
+            dispatch_metric = _DISPATCH_OK
+    except TimeoutError:
+        # SCN-17: a wedged/hung driver must cost one failed step, not the plan.
+        ok, err = False, f"dispatch timeout: no response within {DISPATCH_TIMEOUT_S:.0f}s"
+        dispatch_metric = _DISPATCH_TIMEOUT
+    except Exception as exc:  # noqa: BLE001 - surface any driver error as a failure
+        ok, err = False, str(exc)
+    acked = time.monotonic()
+    dispatch_metric.observe(acked - dispatched)
+
+    if not ok:
+        logger.error(
+            "scenario step failed: %s %s(%s) -> %s",
+            action.device_id, action.command, action.params, err,
+        )
+        return _StepOutcome(failure=err or "command failed")
+
+    outcome = _StepOutcome(executed=True)
+    outcome.timing = StepTiming(action, ack_ms=(acked - dispatched) * 1000.0)
+    confirmed = await _gate(device, action, poll_interval_ms)
+    (_GATE_CONFIRMED if confirmed else _GATE_UNCONFIRMED).observe(time.monotonic() - acked)
+    if confirmed and action.feedback and action.state_field and action.poll_timeout_ms:
+        outcome.timing.confirmed_ms = (time.monotonic() - dispatched) * 1000.0
+    if not confirmed:
+        outcome.failure = (
+            f"gate timeout: {action.domain} did not reach {action.target!r} "
+            f"within {action.poll_timeout_ms}ms (device reported state never confirmed)"
+        )
+        logger.error("scenario step not confirmed: %s %s -> %s",
+                     action.device_id, action.command, outcome.failure)
+    return outcome
+
+
+def _lane(action: PlannedAction, devices: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    """What one step occupies while it runs: the physical transport it goes out on
+    when the device reports a shared one (several IR devices fire through one
+    blaster), otherwise the device itself."""
+    device = devices.get(action.device_id) if devices else None
+    transport_key = getattr(device, "transport_key", None)
+    transport = transport_key(action.command) if callable(transport_key) else None
+    if isinstance(transport, str) and transport:
+        return ("transport", transport)
+    return ("device", action.device_id)
+
+
+def _predecessors(plan: ReconcilePlan, devices: Optional[Dict[str, Any]] = None) -> List[List[int]]:
+    """Per action: its plan dependencies plus the previous action on the same lane
+    (device, or shared transport — see ``_lane``), so neither a device nor an IR
+    blaster ever runs two steps at once."""
+    preds: List[List[int]] = []
+    last_on_lane: Dict[Tuple[str, str], int] = {}
+    for j, action in enumerate(plan.actions):
+        before = set(plan.dependencies.get(j, ()))
+        lane = _lane(action, devices)
+        previous = last_on_lane.get(lane)
+        if previous is not None:
+            before.add(previous)
+        last_on_lane[lane] = j
+        preds.append(sorted(before))
+    return preds
+
+
+def _step_cost_ms(action: PlannedAction) -> int:
+    """Worst-case wall clock of one action: its pre-delay plus its gate (feedback
+    devices may wait up to ``poll_timeout_ms``; feedback-less ones sleep ``delay_ms``)."""
+    gate = action.poll_timeout_ms if (action.feedback and action.poll_timeout_ms) else action.delay_ms
+    return action.pre_delay_ms + gate
+
+
+def critical_path_eta_ms(plan: ReconcilePlan, devices: Optional[Dict[str, Any]] = None) -> int:
+    """Worst-case wall clock of ``plan`` under the parallel executor: the longest chain
+    of ``_step_cost_ms`` through the dependency DAG (same-device steps chained; with
+    ``devices``, steps sharing a transport too)."""
+    finish: List[int] = []
+    for j, preds in enumerate(_predecessors(plan, devices)):
+        start = max((finish[i] for i in preds), default=0)
+        finish.append(start + _step_cost_ms(plan.actions[j]))
+    return max(finish, default=0)
+
+
+async def _run_sequential(
+    plan: ReconcilePlan, devices: Dict[str, Any], abort_on_failure: bool, poll_interval_ms: int
+) -> List[Optional[_StepOutcome]]:
+    outcomes: List[Optional[_StepOutcome]] = [None] * len(plan.actions)
+    for j, action in enumerate(plan.actions):
+        outcomes[j] = outcome = await _run_step(action, devices, poll_interval_ms)
+        if outcome.failure and abort_on_failure:
+            break
+    return outcomes
+
+
+async def _run_dag(
+    plan: ReconcilePlan, devices: Dict[str, Any], abort_on_failure: bool, poll_interval_ms: int
+) -> List[Optional[_StepOutcome]]:
+    """Start every action as soon as its predecessors have finished (gate passed or
+    failed — like the sequential path, a failure does not hold back its successors).
+
+    With ``abort_on_failure`` a failure stops every action that has not started yet;
+    steps already in flight on other devices run to completion (a dispatched command
+    cannot be recalled)."""
+    preds = _predecessors(plan, devices)
+    finished = [asyncio.Event() for _ in plan.actions]
+    outcomes: List[Optional[_StepOutcome]] = [None] * len(plan.actions)
+    aborted = False
+
+    async def run(j: int) -> None:
+        nonlocal aborted
+        try:
+            for i in preds[j]:
+                await finished[i].wait()
+            if aborted:
+                return
+            outcomes[j] = outcome = await _run_step(plan.actions[j], devices, poll_interval_ms)
+            if outcome.failure and abort_on_failure:
+                aborted = True
+        finally:
+            finished[j].set()
+
+    async with asyncio.TaskGroup() as group:
+        for j in range(len(plan.actions)):
+            group.create_task(run(j), name=f"reconcile-step:{j}")
+    return outcomes
+
+
 async def execute_plan(
     plan: ReconcilePlan,
     devices: Dict[str, Any],
     *,
     abort_on_failure: bool = False,
     poll_interval_ms: int = 200,
+    parallel: bool = False,
 ) -> ExecutionResult:
     """Execute an ordered plan: honor pre-delays, dispatch the native command, check success
     (failures are surfaced, not swallowed -- fixes RC2), then gate before the next step.
@@ -733,52 +1045,24 @@ async def execute_plan(
     ``tv_on_speakers`` reported success twice while ARC never engaged). Such a step
     appears in BOTH ``executed`` (it was dispatched and acked) and ``failures`` (it
     did not take effect); ``success`` keys off ``failures``. Feedback-less steps keep
-    the optimistic path — there is nothing to know."""
-    result = ExecutionResult(manual_steps=list(plan.manual_steps))
+    the optimistic path — there is nothing to know.
 
-    for action in plan.actions:
-        if action.pre_delay_ms:
-            await asyncio.sleep(action.pre_delay_ms / 1000)
+    ``parallel`` runs the plan as a DAG (``plan.dependencies`` + one step at a time per
+    device and per shared transport, e.g. an IR blaster) instead of one step after another; wall clock drops from the sum of the
+    gates to ``critical_path_eta_ms``. Results are reported in plan order either way.
 
-        device = devices.get(action.device_id)
-        if device is None:
-            result.failures.append((action, "device not found"))
-            if abort_on_failure:
-                break
-            continue
+    Every acked step gets a ``StepTiming`` (dispatch → ack, dispatch → confirmed)."""
+    result = ExecutionResult(manual_steps=list(plan.manual_steps))
+    run = _run_dag if parallel else _run_sequential
+    outcomes = await run(plan, devices, abort_on_failure, poll_interval_ms)
 
-        try:
-            resp = await asyncio.wait_for(
-                device.execute_action(action.command, action.params, source="scenario"),
-                timeout=DISPATCH_TIMEOUT_S,
-            )
-            ok, err = _response_ok(resp)
-        except TimeoutError:
-            # SCN-17: a wedged/hung driver must cost one failed step, not the plan.
-            ok, err = False, f"dispatch timeout: no response within {DISPATCH_TIMEOUT_S:.0f}s"
-        except Exception as exc:  # noqa: BLE001 - surface any driver error as a failure
-            ok, err = False, str(exc)
-
-        if not ok:
-            result.failures.append((action, err or "command failed"))
-            logger.error(
-                "scenario step failed: %s %s(%s) -> %s",
-                action.device_id, action.command, action.params, err,
-            )
-            if abort_on_failure:
-                break
+    for action, outcome in zip(plan.actions, outcomes):
+        if outcome is None:
             continue
-
-        result.executed.append(action)
-        if not await _gate(device, action, poll_interval_ms):
-            err = (
-                f"gate timeout: {action.domain} did not reach {action.target!r} "
-                f"within {action.poll_timeout_ms}ms (device reported state never confirmed)"
-            )
-            result.failures.append((action, err))
-            logger.error("scenario step not confirmed: %s %s -> %s",
-                         action.device_id, action.command, err)
-            if abort_on_failure:
-                break
-
+        if outcome.executed:
+            result.executed.append(action)
+        if outcome.timing is not None:
+            result.timings.append(outcome.timing)
+        if outcome.failure:
+            result.failures.append((action, outcome.failure))
     return result
@@ -3,8 +3,9 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
-from locveil_bridge.domain.scenarios.models import ScenarioDefinition, ScenarioState, DeviceState, ManualStep
+from locveil_bridge.domain.scenarios.models import ScenarioDefinition, ScenarioState, ManualStep
 from locveil_bridge.domain.scenarios.scenario import Scenario, ScenarioError
+from locveil_bridge.domain.scenarios.projection import ScenarioStateProjection
 from locveil_bridge.domain.devices.service import DeviceManager
 from locveil_bridge.domain.rooms.service import RoomManager
 from locveil_bridge.domain.ports import StateRepositoryPort
@@ -40,7 +41,8 @@ class ScenarioManager:
                  device_manager: DeviceManager, 
                  room_manager: RoomManager,
                  state_repository: StateRepositoryPort,
-                 scenario_dir: Path):
+                 scenario_dir: Path,
+                 parallel_reconcile: bool = False):
         """
         Initialize the scenario manager.
         
@@ -49,11 +51,14 @@ class ScenarioManager:
             room_manager: Manager for room definitions
             store: State persistence store
             scenario_dir: Directory containing scenario JSON files
+            parallel_reconcile: Execute reconcile plans as a DAG across independent
+                devices instead of one step after another
         """
         self.device_manager = device_manager
         self.room_manager = room_manager
         self.state_repository = state_repository
         self.scenario_dir = scenario_dir
+        self.parallel_reconcile = parallel_reconcile
         
         self.scenario_map: Dict[str, Scenario] = {}  # scenario_id -> Scenario
         self.scenario_definitions: Dict[str, ScenarioDefinition] = {}  # scenario_id -> definition
@@ -74,6 +79,9 @@ class ScenarioManager:
         # card adapter's value-topic publisher; sync or async callables accepted.
         self.on_active_changed: Optional[Any] = None  # legacy single slot (the WB card adapter)
         self.active_changed_observers: List[Any] = []  # additional observers (SSE fan-out, ...)
+        # Per-room materialized ScenarioState of the active scenarios, kept current from the
+        # devices' state-change callbacks; its delta_observers get per-device changes.
+        self.state_projection = ScenarioStateProjection(device_manager)
     
     async def initialize(self) -> None:
         """
@@ -294,8 +302,13 @@ class ScenarioManager:
         outgoing_involved = self._involved_devices(outgoing) if outgoing else set()
         to_power_off = (outgoing_involved - incoming_involved) if graceful else outgoing_involved
 
-        teardown = await execute_plan(build_power_off_plan(sorted(to_power_off), devices), devices)
-        activation = await execute_plan(build_plan(incoming.definition, self.topology, devices), devices)
+        parallel = self.parallel_reconcile
+        teardown = await execute_plan(
+            build_power_off_plan(sorted(to_power_off), devices), devices, parallel=parallel
+        )
+        activation = await execute_plan(
+            build_plan(incoming.definition, self.topology, devices), devices, parallel=parallel
+        )
 
         self.active[room] = incoming
         # Capture the activation's manual notes; get_scenario_state() threads them into the
@@ -306,6 +319,12 @@ class ScenarioManager:
         await self._persist_state(room)
         await self._notify_active_changed(room)
 
+        confirmed = [t for t in teardown.timings + activation.timings if t.confirmed_ms is not None]
+        if confirmed:
+            logger.info(
+                f"Scenario '{incoming.scenario_id}' step latency (dispatch→confirmed): "
+                + ", ".join(f"{t.action.device_id}.{t.action.command}={t.confirmed_ms:.0f}ms" for t in confirmed)
+            )
         failures = [
             {"device": a.device_id, "command": a.command, "error": err}
             for a, err in (teardown.failures + activation.failures)
@@ -372,7 +391,7 @@ class ScenarioManager:
             "force-reconcile '%s' in scenario '%s': %d action(s)",
             device_id, scenario_id, len(plan.actions),
         )
-        result = await execute_plan(plan, devices)
+        result = await execute_plan(plan, devices, parallel=self.parallel_reconcile)
         return plan, result
 
     async def execute_role_action(self, role: str, command: str, params: Dict[str, Any]) -> Any:
@@ -432,6 +451,11 @@ class ScenarioManager:
         (REST, canonical scenario.set, restore, deactivate) — observers must
         not assume which path fired it.
         """
+        active = self.active.get(room_id)
+        if active is not None:
+            self.state_projection.activate(room_id, active.scenario_id, active.definition.devices)
+        else:
+            self.state_projection.drop(room_id)
         observers = ([self.on_active_changed] if self.on_active_changed else []) + list(
             self.active_changed_observers
         )
@@ -560,7 +584,9 @@ class ScenarioManager:
             try:
                 devices = self.device_manager.devices
                 involved = sorted(resolve_targets(sc.definition, self.topology)[2])
-                exec_result = await execute_plan(build_power_off_plan(involved, devices), devices)
+                exec_result = await execute_plan(
+                    build_power_off_plan(involved, devices), devices, parallel=self.parallel_reconcile
+                )
                 result["powered_off"].extend(involved)
                 result["failures"].extend(
                     {"device": a.device_id, "command": a.command, "error": err}
@@ -598,6 +624,7 @@ class ScenarioManager:
             )
         self.active.clear()
         self._activation_manual_steps.clear()
+        self.state_projection.clear()
 
     def get_scenario_state(self, scenario_id: str) -> ScenarioState:
         """
@@ -612,29 +639,9 @@ class ScenarioManager:
         Raises:
             ValueError: If scenario_id doesn't exist
         """
-        # Check if scenario exists
-        if scenario_id not in self.scenario_map:
-            raise ValueError(f"Scenario '{scenario_id}' not found")
-        
-        # For an active scenario: read each device's LIVE state fresh on every call. The single
-        # source of truth is device.get_current_state(); we hold no snapshot. manual_steps are
-        # activation-scoped (not derivable from device state) and threaded in from the room's
-        # slot in self._activation_manual_steps so transition notes (Dodocus hub, "press Play",
-        # etc.) survive every query. See ui_backend_contract.md "Scenario state binding".
-        scenario = self.scenario_map[scenario_id]
-        room = self._room_of(scenario)
-        active = self.active.get(room)
-        if active and active.scenario_id == scenario_id:
-            device_states: Dict[str, DeviceState] = {}
-            for dev_id in active.definition.devices:
-                device = self.device_manager.get_device(dev_id)
-                if device:
-                    device_states[dev_id] = self._convert_device_state(device.get_current_state())
-            return ScenarioState(
-                scenario_id=scenario_id,
-                devices=device_states,
-                manual_steps=list(self._activation_manual_steps.get(room, [])),
-            )
+        room = self._projected_room(scenario_id)
+        if room is not None:
+            return self.state_projection.state(room, self._activation_manual_steps.get(room, []))
 
         # For inactive scenarios, return a basic state without device states
         # since we can't get real-time device states for inactive scenarios
@@ -642,48 +649,32 @@ class ScenarioManager:
             scenario_id=scenario_id,
             devices={}  # Empty device states for inactive scenarios
         )
-    
-    def _convert_device_state(self, state) -> DeviceState:
-        """
-        Convert a device's Pydantic state model to a standardized DeviceState.
-        
-        This reuses the safe field access logic from the Scenario class
-        to ensure consistent handling across the system.
-        
-        Args:
-            state: Pydantic device state model (e.g., LgTvState, EmotivaXMC2State)
-            
-        Returns:
-            DeviceState: Standardized state representation
+
+    def get_scenario_state_json(self, scenario_id: str) -> bytes:
+        """``get_scenario_state(scenario_id)`` serialized to JSON — the active scenario's body is
+        cached by the projection until one of its devices changes. Raises ValueError likewise."""
+        room = self._projected_room(scenario_id)
+        if room is not None:
+            return self.state_projection.body(room, self._activation_manual_steps.get(room, []))
+        return ScenarioState(scenario_id=scenario_id, devices={}).model_dump_json().encode()
+
+    def _projected_room(self, scenario_id: str) -> Optional[str]:
+        """The room whose active scenario is ``scenario_id`` (None if it is inactive), with the
+        room's projection following it.
+
+        The active scenario's state is a live view of its devices' states (the single source of
+        truth is device.get_current_state(); see ui_backend_contract.md "Scenario state
+        binding"). The projection keeps that view materialized: built when the room's active
+        scenario changes, then updated per device from state-change callbacks. manual_steps are
+        activation-scoped (not derivable from device state) and threaded in from the room's
+        slot in self._activation_manual_steps so transition notes (Dodocus hub, "press Play",
+        etc.) survive every query.
         """
-        # Extract and convert power state using the shared safe field access
-        power_value = None
-        raw_power = Scenario._safe_get_device_field(state, "power")
-        if raw_power is not None:
-            if isinstance(raw_power, bool):
-                power_value = raw_power
-            elif isinstance(raw_power, str):
-                # Convert string power states to boolean
-                power_value = raw_power.lower() in ("on", "true", "1", "powered_on", "active")
-
-        # Extract input using safe field access (handles variations automatically)
-        input_value = Scenario._safe_get_device_field(state, "input")
-
-        # Build extra dict with all other fields, excluding base fields and already mapped ones
-        base_fields = {"device_id", "device_name", "last_command", "error"}
-        mapped_fields = {"power", "input", "input_source", "video_input", "audio_input"}
-        excluded_fields = base_fields | mapped_fields
-
-        extra = {}
-        if hasattr(state, "model_dump"):
-            # Get all fields from the Pydantic model
-            all_fields = state.model_dump()
-            for field_name, field_value in all_fields.items():
-                if field_name not in excluded_fields and field_value is not None:
-                    extra[field_name] = field_value
-
-        return DeviceState(
-            power=power_value,
-            input=input_value,
-            extra=extra
-        )
\ No newline at end of file
+        if scenario_id not in self.scenario_map:
+            raise ValueError(f"Scenario '{scenario_id}' not found")
+        room = self._room_of(self.scenario_map[scenario_id])
+        active = self.active.get(room)
+        if active is None or active.scenario_id != scenario_id:
+            return None
+        self.state_projection.track(room, scenario_id, active.definition.devices)
+        return room
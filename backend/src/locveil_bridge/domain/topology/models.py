@@ -5,9 +5,9 @@ this is only the validator. A link's destination port is the input value to sele
 on the sink device; ordering edges are unambiguous ``first -> then``.
 """
 
-from typing import Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 SignalKind = Literal["video", "audio", "arc"]
 
@@ -84,3 +84,7 @@ class Topology(BaseModel):
     nodes: Dict[str, ManualNode] = Field(default_factory=dict)
     links: List[TopologyLink] = Field(default_factory=list)
     ordering: List[OrderingEdge] = Field(default_factory=list)
+
+    # The reconciler's ``TopologyIndex``, built on first use. A topology is never
+    # edited in place — a reload loads a new ``Topology`` — so the index cannot go stale.
+    _index: Any = PrivateAttr(default=None)
@@ -22,6 +22,14 @@ class MQTTBrokerConfig(BaseModel):
     client_id: str
     auth: Optional[Dict[str, str]] = None
     keepalive: int = 60
+    dispatch_queue_depth: int = Field(default=100, ge=1, description="Capacity of each per-device receive dispatch queue")
+    dispatch_overflow: Literal["backpressure", "drop_oldest"] = Field(
+        default="backpressure",
+        description="Full dispatch queue policy: wait for room (backpressure) or evict the oldest queued message (drop_oldest)",
+    )
+    resync_concurrency: int = Field(
+        default=16, ge=1, description="QoS-1 publishes in flight while republishing WB retained state after a broker (re)connect"
+    )
 
 class EmotivaConfig(BaseModel):
     """Schema for Emotiva XMC2 device configuration."""
@@ -435,6 +443,27 @@ class AuralicDeviceConfig(BaseDeviceConfig):
 class PersistenceConfig(BaseModel):
     """Configuration for the persistence layer."""
     db_path: str = Field(default="data/state_store.db", description="Path to the SQLite database file")
+    write_behind_ms: int = Field(default=250, ge=0, description="Coalescing window for state writes in milliseconds (repeated writes to a key collapse, one commit per window); 0 = write-through")
+    wal: bool = Field(default=True, description="Open the state database in WAL journal mode")
+    synchronous: Optional[Literal["OFF", "NORMAL", "FULL", "EXTRA"]] = Field(default="NORMAL", description="SQLite PRAGMA synchronous level (None = SQLite default)")
+    layout: Literal["blob", "fields"] = Field(default="fields", description="State table layout: 'blob' = one JSON row per entity, 'fields' = one row per state field so a change rewrites only the fields it touched (existing blobs are migrated once)")
+
+class StartupConfig(BaseModel):
+    """Configuration for device bring-up at startup (and on /reload)."""
+    device_setup_concurrency: int = Field(default=4, ge=1, description="How many devices restore state and run setup() concurrently")
+    device_setup_timeout_s: Optional[float] = Field(default=15.0, gt=0, description="Seconds to wait for one device's setup() before leaving it connecting in the background (None = wait indefinitely)")
+
+class ReloadConfig(BaseModel):
+    """Configuration for POST /reload."""
+    incremental: bool = Field(default=True, description="Rebuild only the devices whose config or capability map changed, keeping the MQTT client and every other device connected; False = always tear down and rebuild everything")
+
+class ScenariosConfig(BaseModel):
+    """Configuration for scenario transitions."""
+    parallel_reconcile: bool = Field(default=True, description="Run reconcile plans as a dependency graph: steps on independent devices start as soon as their ordering predecessors are done (one step at a time per device and per shared transport such as an IR blaster); False = strictly one step after another")
+
+class SSEConfig(BaseModel):
+    """Configuration for the Server-Sent Events streams."""
+    state_frame_ms: int = Field(default=50, ge=0, description="Per-device coalescing window for device state events in milliseconds: changes inside one frame are sent as a single JSON-patch `state_delta`; 0 = send every change immediately")
 
 class MaintenanceConfig(BaseModel):
     """Configuration for system maintenance settings (the wb-rules restart guard)."""
@@ -473,6 +502,10 @@ class SystemConfig(BaseModel):
     # Remove devices dictionary from required fields and make it optional
     devices: Optional[Dict[str, Dict[str, Any]]] = None
     persistence: PersistenceConfig = Field(default_factory=PersistenceConfig)
+    sse: SSEConfig = Field(default_factory=SSEConfig, description="Server-Sent Events settings")
+    startup: StartupConfig = Field(default_factory=StartupConfig, description="Device bring-up settings")
+    reload: ReloadConfig = Field(default_factory=ReloadConfig, description="Hot-reload settings")
+    scenarios: ScenariosConfig = Field(default_factory=ScenariosConfig, description="Scenario transition settings")
     maintenance: Optional[MaintenanceConfig] = Field(default=None, description="Maintenance configuration settings")
     reports: ReportsConfig = Field(default_factory=ReportsConfig, description="Problem-reporting settings")
     # Add explicit device directory configuration
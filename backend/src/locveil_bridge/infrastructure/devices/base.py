@@ -3,6 +3,8 @@ from typing import Dict, Any, List, Mapping, Optional, cast, Union, Generic, Tup
 import logging
 import json
 import re
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from socket import socket, AF_INET, SOCK_DGRAM, SOL_SOCKET, SO_BROADCAST
@@ -16,6 +18,7 @@ from locveil_bridge.domain.capabilities.models import CapabilityMap
 from locveil_bridge.domain.reports.rings import DispatchRing
 from locveil_bridge.domain.devices.types import StateT, CommandResult, CommandResponse, ActionHandler
 from locveil_bridge.domain.ports import DevicePort, EventPublisherPort
+from locveil_bridge.utils.metrics import HistogramChild, registry
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +30,12 @@ logger = logging.getLogger(__name__)
 # in-memory state + SSE event still carry last_command, so the UI sees the latest action.
 _EPHEMERAL_STATE_FIELDS = frozenset({"last_command"})
 
+_ACTION_SECONDS = registry.histogram(
+    "locveil_device_action_seconds", "execute_action latency, per device and action", ("device", "action")
+)
+# Label for action names the device does not define (keeps API typos from adding series).
+_UNKNOWN_ACTION = "<unknown>"
+
 # State fields that must never be re-hydrated from a persisted snapshot: identity comes from
 # the live config (device_id/device_name), last_command is ephemeral bookkeeping (see above),
 # and a persisted error describes a long-gone condition — restoring it would show a stale
@@ -34,6 +43,19 @@ _EPHEMERAL_STATE_FIELDS = frozenset({"last_command"})
 # reconciler relies on surviving a restart (power, input, volume, ...).
 _NON_RESTORABLE_STATE_FIELDS = frozenset({"device_id", "device_name", "last_command", "error"})
 
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class _CommandIndex:
+    """Lookups over one ``get_available_commands()`` mapping (rebuilt when it is replaced)."""
+
+    commands: Mapping[str, BaseCommandConfig]
+    # command topic -> [(cmd_name, cmd_config), ...] in config order
+    by_topic: Dict[str, List[Tuple[str, BaseCommandConfig]]]
+    # WB control (command name) -> handler of its action, for commands that have one
+    handlers: Dict[str, ActionHandler]
+
 class BaseDevice(DevicePort[StateT], ABC, Generic[StateT]):
     """Base class for all device implementations."""
 
@@ -70,6 +92,8 @@ class BaseDevice(DevicePort[StateT], ABC, Generic[StateT]):
             device_name=self.device_name
         ))
         self._action_handlers: Dict[str, ActionHandler] = {}  # Cache for action handlers
+        self._command_index_cache: Optional[_CommandIndex] = None  # see _command_index()
+        self._action_timers: Dict[str, HistogramChild] = {}  # action -> latency child
         self.mqtt_client = mqtt_client
         self.wb_service = wb_service  # Injected WB virtual device service
         # Event publisher (SSE fan-out) injected at bootstrap; None until then.
@@ -139,15 +163,14 @@ class BaseDevice(DevicePort[StateT], ABC, Generic[StateT]):
         """Command executor callback for WB service - routes to BaseDevice execution logic."""
         try:
             # Find corresponding command configuration
-            available_commands = self.get_available_commands()
-            if control_name not in available_commands:
+            index = self._command_index()
+            cmd_config = index.commands.get(control_name)
+            if cmd_config is None:
                 logger.warning(f"No command configuration found for WB control: {control_name}")
                 return
             
-            cmd_config = available_commands[control_name]
-            
             # Check if command has a handler
-            if not cmd_config.action or cmd_config.action not in self._action_handlers:
+            if not cmd_config.action or control_name not in index.handlers:
                 logger.warning(f"No handler found for WB control: {control_name} (action: {cmd_config.action})")
                 return
             
@@ -358,6 +381,29 @@ class BaseDevice(DevicePort[StateT], ABC, Generic[StateT]):
     def get_command_topic(self, handler_name: str, cmd_config: BaseCommandConfig) -> str:
         """Get auto-generated topic for command following WB conventions."""
         return f"/devices/{self.device_id}/controls/{handler_name}"
+
+    def _command_index(self) -> _CommandIndex:
+        """Topic and WB-control lookups for the current commands, built on first use.
+
+        Keyed on the identity of the ``get_available_commands()`` mapping: a config
+        swapped in by a reload brings a new mapping, which rebuilds the index.
+        """
+        commands = self.get_available_commands()
+        index = self._command_index_cache
+        if index is None or index.commands is not commands:
+            by_topic: Dict[str, List[Tuple[str, BaseCommandConfig]]] = {}
+            handlers: Dict[str, ActionHandler] = {}
+            for cmd_name, cmd in commands.items():
+                by_topic.setdefault(self.get_command_topic(cmd_name, cmd), []).append((cmd_name, cmd))
+                handler = self._action_handlers.get(cmd.action) if cmd.action else None
+                if handler is not None:
+                    handlers[cmd_name] = handler
+            index = self._command_index_cache = _CommandIndex(commands, by_topic, handlers)
+        return index
+
+    def _commands_for_topic(self, topic: str) -> List[Tuple[str, BaseCommandConfig]]:
+        """The ``(cmd_name, cmd_config)`` pairs whose command topic is ``topic``."""
+        return self._command_index().by_topic.get(topic, [])
     
     async def handle_message(self, topic: str, payload: str):
         """Handle incoming MQTT messages for this device."""
@@ -377,13 +423,7 @@ class BaseDevice(DevicePort[StateT], ABC, Generic[StateT]):
                 # Continue to legacy handling as fallback
         
         # Find matching command configuration based on topic
-        matching_commands = []
-        for cmd_name, cmd in self.get_available_commands().items():
-            # Use get_command_topic for consistent topic resolution
-            expected_topic = self.get_command_topic(cmd_name, cmd)
-            if expected_topic == topic:
-                # Add command to matches when topic matches
-                matching_commands.append((cmd_name, cmd))
+        matching_commands = self._commands_for_topic(topic)
         
         if not matching_commands:
             logger.warning(f"No command configuration found for topic: {topic}")
@@ -706,59 +746,77 @@ class BaseDevice(DevicePort[StateT], ABC, Generic[StateT]):
     def update_state(self, **updates):
         """Update the device state using keyword arguments.
         Each keyword argument will update the corresponding attribute in the state.
-        
-        This method now includes validation to detect non-serializable fields early.
+
+        Only the incoming fields are validated (with the field's own pydantic validator,
+        so coercion and constraints still apply) and diffed against the current values;
+        the state is replaced by a shallow copy carrying them, so a reference to the
+        previous state stays a snapshot. Updates that change nothing return before any
+        copy or validation. Non-serializable values are reported for the changed fields;
+        the whole-state serializability sweep only runs with DEBUG logging on.
+
         Only triggers state change notification if the state actually changes.
         """
         # Skip empty updates
         if not updates:
             return
-        
-        # Validate updates for serializability
-        is_valid, errors = self._validate_state_updates(updates)
-        if not is_valid:
-            # Log warnings for non-serializable fields
-            for error in errors:
-                logger.warning(f"Device {self.device_id}: {error}")
-            
-            # Log a summary warning
-            logger.warning(f"Device {self.device_id}: Updating state with {len(errors)} potentially non-serializable fields")
-        
-        # Store current state for comparison
-        previous_state = self.state.dict(exclude_unset=True)
 
-        # Create a new state object with updated values
-        updated_data = self.state.dict(exclude_unset=True)
-        updated_data.update(updates)
+        state = self.state
+        current = self._state_values(state)
+        fields = type(state).model_fields
+        extra_allowed = type(state).model_config.get("extra") == "allow"
+
+        # Cheap pre-check: the same value of the same type cannot validate to anything new.
+        pending = {
+            key: value for key, value in updates.items()
+            if not (type(current.get(key, _MISSING)) is type(value) and current[key] == value)
+        }
+        if not pending:
+            return
 
-        # Build the list of fields whose values actually changed (callbacks consume this to
-        # know which controls to republish, etc. — empty list ⇒ early-return; full list ⇒
-        # republish-everything).
-        changed_fields = [
-            key for key, value in updates.items()
-            if key not in previous_state or previous_state[key] != value
-        ]
+        new_state = state.model_copy()
+        validator = new_state.__pydantic_validator__
+        changed_fields: List[str] = []
+        for key, value in pending.items():
+            if key not in fields and not extra_allowed:
+                logger.warning(f"Device {self.device_id}: ignoring unknown state field '{key}'")
+                continue
+            validator.validate_assignment(new_state, key, value)
+            if self._state_values(new_state).get(key, _MISSING) != current.get(key, _MISSING):
+                changed_fields.append(key)
 
         # If no changes, exit early
         if not changed_fields:
-            # logger.debug(f"No actual state changes for {self.device_name}")
             return
 
-        # Preserve the concrete state type when updating
-        state_cls = type(self.state)  # Get the actual class of the current state
-        self.state = state_cls(**updated_data)  # Create a new instance of the same class
+        # Validate the changed values for serializability
+        is_valid, errors = self._validate_state_updates({key: updates[key] for key in changed_fields})
+        if not is_valid:
+            # Log warnings for non-serializable fields
+            for error in errors:
+                logger.warning(f"Device {self.device_id}: {error}")
+
+            # Log a summary warning
+            logger.warning(f"Device {self.device_id}: Updating state with {len(errors)} potentially non-serializable fields")
 
-        # Validate complete state after update
-        if hasattr(self.state, 'validate_serializable'):
-            is_state_valid, state_errors = self.state.validate_serializable()
-            if not is_state_valid:
-                logger.warning(f"Device {self.device_id}: State contains non-serializable fields after update: {', '.join(state_errors)}")
+        self.state = new_state
 
-        logger.debug(f"Updated state for {self.device_name}: {updates}")
+        # Validate complete state after update (debug only: O(all fields) per update)
+        if logger.isEnabledFor(logging.DEBUG):
+            if hasattr(new_state, 'validate_serializable'):
+                is_state_valid, state_errors = new_state.validate_serializable()
+                if not is_state_valid:
+                    logger.warning(f"Device {self.device_id}: State contains non-serializable fields after update: {', '.join(state_errors)}")
+            logger.debug(f"Updated state for {self.device_name}: {updates}")
 
         # Notify about state change only if there were actual changes
         self._notify_state_change(changed_fields)
-    
+
+    @staticmethod
+    def _state_values(state: BaseDeviceState) -> Mapping[str, Any]:
+        """Declared + extra field values of ``state``, unserialized."""
+        extra = state.__pydantic_extra__
+        return {**state.__dict__, **extra} if extra else state.__dict__
+
     def _notify_state_change(self, changed_fields: List[str]):
         """Dispatch a state change to every registered callback + emit the SSE event.
 
@@ -787,23 +845,12 @@ class BaseDevice(DevicePort[StateT], ABC, Generic[StateT]):
         try:
             import asyncio
 
-            # Get current state for broadcast
-            current_state = self.get_current_state()
-
-            # Prepare state event data
-            state_event_data = {
-                "device_id": self.device_id,
-                "device_name": self.device_name,
-                "state": current_state.dict() if hasattr(current_state, 'dict') else current_state,
-                "timestamp": datetime.now().isoformat()
-            }
-
             # Create task to broadcast state change
             if self.event_publisher is not None:
                 asyncio.create_task(
                     self.event_publisher.publish_device_event(
                         event_type="state_change",
-                        data=state_event_data,
+                        data=self.state_event_data(),
                     )
                 )
 
@@ -812,11 +859,27 @@ class BaseDevice(DevicePort[StateT], ABC, Generic[StateT]):
         except Exception as e:
             logger.error(f"Error emitting state change SSE event for device {self.device_id}: {str(e)}")
 
+    def state_event_data(self) -> Dict[str, Any]:
+        """Payload of a full ``state_change`` SSE event for the current state."""
+        current_state = self.get_current_state()
+        return {
+            "device_id": self.device_id,
+            "device_name": self.device_name,
+            "state": current_state.dict() if hasattr(current_state, 'dict') else current_state,
+            "timestamp": datetime.now().isoformat()
+        }
+
     def register_state_change_callback(self, callback: Callable[[str, List[str]], Any]):
         """Append a state-change callback. Multiple callbacks may be registered; all are
         invoked on every state change with ``(device_id, changed_fields)``."""
         self._state_change_callbacks.append(callback)
 
+    def unregister_state_change_callback(self, callback: Callable[[str, List[str]], Any]) -> None:
+        """Remove a callback added by ``register_state_change_callback`` (no-op if absent).
+        For short-lived waiters (the canonical echo wait, the scenario gate)."""
+        if callback in self._state_change_callbacks:
+            self._state_change_callbacks.remove(callback)
+
     def restore_state(self, snapshot: Dict[str, Any]) -> List[str]:
         """Re-hydrate assumed state from a persisted snapshot (DevicePort contract).
 
@@ -859,7 +922,9 @@ class BaseDevice(DevicePort[StateT], ABC, Generic[StateT]):
         Returns:
             CommandResponse: Response containing success status, device state, and any additional data
         """
+        started = time.perf_counter()
         response = await self._execute_action_impl(action, params, source)
+        self._action_timer(action).observe(time.perf_counter() - started)
         ring = self.dispatch_ring
         if ring is not None:
             try:
@@ -875,6 +940,19 @@ class BaseDevice(DevicePort[StateT], ABC, Generic[StateT]):
                 logger.exception("dispatch ring record failed")
         return response
 
+    def _action_timer(self, action: str) -> HistogramChild:
+        timer = self._action_timers.get(action)
+        if timer is None:
+            if action not in self._command_index().commands:
+                return _ACTION_SECONDS.labels(self.device_id, _UNKNOWN_ACTION)
+            timer = self._action_timers[action] = _ACTION_SECONDS.labels(self.device_id, action)
+        return timer
+
+    def release_metrics(self) -> None:
+        """Stop exporting this device's per-action series (the device is being retired)."""
+        self._action_timers.clear()
+        _ACTION_SECONDS.remove_matching(device=self.device_id)
+
     async def _execute_action_impl(
         self,
         action: str,
@@ -1095,6 +1173,14 @@ class BaseDevice(DevicePort[StateT], ABC, Generic[StateT]):
     def get_available_commands(self) -> Mapping[str, BaseCommandConfig]:
         """Return the list of available commands for this device."""
         return self.config.commands
+
+    def transport_key(self, action: str) -> Optional[str]:
+        """The physical link ``action`` goes out on when other devices share it.
+
+        ``None`` (the default) means the device owns its link; the scenario executor
+        then only keeps this device's own steps one at a time.
+        """
+        return None
     
     async def emit_progress(self, message: str, event_type: str = "progress") -> bool:
         """Emit a progress message via Server-Sent Events.
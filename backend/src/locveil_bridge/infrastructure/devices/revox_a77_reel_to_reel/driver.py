@@ -285,19 +285,11 @@ class RevoxA77ReelToReel(BaseDevice[RevoxA77ReelToReelState]):
         """
         try:
             # Find matching command
-            matching_cmd_name: Optional[str] = None
-            matching_cmd_config = None
-
-            for cmd_name, cmd_config in self.get_available_commands().items():
-                auto_generated_topic = f"/devices/{self.device_id}/controls/{cmd_name}"
-                if topic == auto_generated_topic:
-                    matching_cmd_name = cmd_name
-                    matching_cmd_config = cmd_config
-                    break
-
-            if not matching_cmd_name or not matching_cmd_config:
+            matches = self._commands_for_topic(topic)
+            if not matches:
                 logger.warning(f"No command configuration found for topic: {topic}")
                 return
+            matching_cmd_name, matching_cmd_config = matches[0]
 
             if payload.lower() in ["1", "true", "on"]:
                 handler = self._action_handlers.get(matching_cmd_name)
@@ -99,6 +99,17 @@ class WirenboardIRDevice(BaseDevice[WirenboardIRState]):
         # Use the original format without /on suffix
         return f"/devices/{location}/controls/Play from ROM{rom_position}/on"
     
+    def transport_key(self, action: str) -> Optional[str]:
+        """The IR blaster (``location``) that fires ``action``.
+
+        Every IR device wired to one blaster shares its emitter and RS-485 link, so
+        presses from different devices must not overlap.
+        """
+        for cmd_name, cmd_config in self.config.commands.items():
+            if (cmd_config.action or cmd_name) == action and cmd_config.location:
+                return f"ir:{cmd_config.location}"
+        return None
+
     def _validate_parameter(self, 
                            param_name: str, 
                            param_value: Any, 
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union
 import json
 
@@ -7,10 +8,44 @@ from aiomqtt import Client, MqttError, Will
 from asyncio.exceptions import CancelledError
 
 from locveil_bridge.infrastructure.maintenance.wirenboard_guard import SystemMaintenanceGuard
+from locveil_bridge.infrastructure.mqtt.dispatch import KeyedDispatcher
+from locveil_bridge.infrastructure.mqtt.topic_router import TopicRouter, is_wildcard_filter
 from locveil_bridge.domain.ports import MessageBusPort
+from locveil_bridge.utils.metrics import CounterChild, HistogramChild, registry
 
 logger = logging.getLogger(__name__)
 
+_MESSAGES = registry.counter(
+    "locveil_mqtt_messages_total", "MQTT messages received/published, by topic prefix", ("direction", "prefix")
+)
+_HANDLER_SECONDS = registry.histogram(
+    "locveil_mqtt_handler_seconds", "Time spent in the handlers of one received MQTT message", ("prefix",)
+)
+
+
+def topic_prefix(topic: str) -> str:
+    """The first two levels of ``topic`` (``/devices/lg_tv``, ``bridge/catalog``) — the
+    metrics label, bounded by the configured devices rather than by their controls."""
+    start = 1 if topic.startswith("/") else 0
+    first = topic.find("/", start)
+    if first == -1:
+        return topic
+    second = topic.find("/", first + 1)
+    return topic if second == -1 else topic[:second]
+
+
+class _TopicMetrics:
+    """The metric children of one topic, bound on first use."""
+
+    __slots__ = ("received", "published", "handler")
+
+    def __init__(self, topic: str):
+        prefix = topic_prefix(topic)
+        self.received: CounterChild = _MESSAGES.labels("in", prefix)
+        self.published: CounterChild = _MESSAGES.labels("out", prefix)
+        self.handler: HistogramChild = _HANDLER_SECONDS.labels(prefix)
+
+
 class MQTTClient(MessageBusPort):
     """Asynchronous MQTT client for the web service."""
     
@@ -39,13 +74,27 @@ class MQTTClient(MessageBusPort):
         auth = config_dict.get('auth', {})
         self.username = auth.get('username')
         self.password = auth.get('password')
+
+        # Receive-loop dispatch: handlers run on per-device worker queues so one slow
+        # handler can't stall every other device's traffic (see mqtt/dispatch.py).
+        self._dispatcher = KeyedDispatcher(
+            self._dispatch,
+            queue_depth=config_dict.get('dispatch_queue_depth', 100),
+            overflow=config_dict.get('dispatch_overflow', 'backpressure'),
+        )
         
         # Message handlers
         self.message_handlers: Dict[str, Callable] = {}
+        # Segment trie over the wildcard keys of `message_handlers` -- the receive
+        # loop's fallback when the exact-topic lookup misses. Kept in sync by
+        # `_set_handler`; holds filter strings only (handlers stay in the dict).
+        self._wildcard_router = TopicRouter()
         # Problem-report MQTT window (B-2): a sync observer fed every in/out message
         # ("in"|"out", topic, payload). Set by bootstrap; None = recording disabled.
         # Must never raise into the publish/receive paths (guarded at call sites).
         self.traffic_observer: Optional[Callable[[str, str, str], None]] = None
+        # topic -> its metric children; topics are bounded by subscriptions + WB controls.
+        self._topic_metrics: Dict[str, _TopicMetrics] = {}
         # Map of topics to devices that have subscribed to them
         self.topic_subscribers: Dict[str, List[str]] = {}
         # Topics whose retained-on-subscribe message MUST be dispatched (opt-in). The
@@ -122,7 +171,7 @@ class MQTTClient(MessageBusPort):
             # Store topic handlers
             for topic, handler in topic_handlers.items():
                 logger.debug(f"Registered handler for topic: {topic}")
-                self.message_handlers[topic] = handler
+                self._set_handler(topic, handler)
             
             # Start the MQTT client task
             listener_task = asyncio.create_task(self._run_mqtt_client(client_args, list(topic_handlers.keys())))
@@ -228,8 +277,12 @@ class MQTTClient(MessageBusPort):
                     # handlers queued via `subscribe()` *before* the connection came up
                     # (e.g. WB-passthrough devices' state_topic subscriptions registered in
                     # their `setup()`). The pre-queued ones used to be stored but never
-                    # actually subscribed on the broker -- surfaced by §P3.7 #18.
-                    union_topics = list({*topics_to_subscribe, *self.message_handlers.keys()})
+                    # actually subscribed on the broker -- surfaced by §P3.7 #18. A topic
+                    # dropped via `unsubscribe()` since then stays dropped on reconnect.
+                    union_topics = list({
+                        *(t for t in topics_to_subscribe if t in self.message_handlers),
+                        *self.message_handlers.keys(),
+                    })
                     for topic in union_topics:
                         await client.subscribe(topic)
                         logger.info(f"Subscribed to topic: {topic}")
@@ -285,6 +338,7 @@ class MQTTClient(MessageBusPort):
                             continue
                         
                         logger.debug(f"Received message on {topic}: {payload}")
+                        self._metrics_for(topic).received.inc()
 
                         if self.traffic_observer is not None:
                             try:
@@ -292,31 +346,9 @@ class MQTTClient(MessageBusPort):
                             except Exception:  # noqa: BLE001 - evidence collection must never break the receive loop
                                 logger.exception("MQTT traffic observer failed (in)")
 
-                        # DEBUG: Enhanced logging for control topics (broader filtering)
-                        if "controls" in topic or "processor" in topic or "tv" in topic or "soundbar" in topic:
-                            logger.debug(f"[MQTT_DEBUG] Processing message: topic={topic}, payload='{payload}', timestamp={asyncio.get_event_loop().time()}")
-                        
-                        # Find handler for this exact topic
-                        handler = self.message_handlers.get(topic)
-                        if handler:
-                            try:
-                                # DEBUG: Log handler execution for control topics
-                                if "controls" in topic or "processor" in topic or "tv" in topic or "soundbar" in topic:
-                                    logger.debug(f"[MQTT_DEBUG] Executing exact topic handler for {topic} (payload='{payload}')")
-                                await handler(topic, payload)
-                            except Exception as e:
-                                logger.error(f"Error in message handler for topic {topic}: {str(e)}")
-                        else:
-                            # If no exact match, check for wildcard handlers
-                            for subscribed_topic, subscribed_handler in self.message_handlers.items():
-                                if self._topic_matches(subscribed_topic, topic):
-                                    try:
-                                        # DEBUG: Log wildcard handler execution for control topics
-                                        if "controls" in topic or "processor" in topic or "tv" in topic or "soundbar" in topic:
-                                            logger.debug(f"[MQTT_DEBUG] Executing wildcard handler for {topic} (subscribed to {subscribed_topic}, payload='{payload}')")
-                                        await subscribed_handler(topic, payload)
-                                    except Exception as e:
-                                        logger.error(f"Error in wildcard handler for topic {topic} (subscribed to {subscribed_topic}): {str(e)}")
+                        # Hand off to the topic's worker queue: handlers for different
+                        # devices run concurrently, same-device messages stay in order.
+                        await self._dispatcher.submit(topic, payload)
                 
             except MqttError as e:
                 logger.error(f"MQTT error: {str(e)}")
@@ -363,6 +395,7 @@ class MQTTClient(MessageBusPort):
                 task.cancel()
         
         self.tasks = []
+        await self._dispatcher.stop()
         self.connected = False
         self.client = None
         self._connection_event.clear()  # Clear connection event on disconnect
@@ -390,7 +423,7 @@ class MQTTClient(MessageBusPort):
     
     def register_handler(self, device_name: str, handler: Callable):
         """Register a message handler for a device."""
-        self.message_handlers[device_name] = handler
+        self._set_handler(device_name, handler)
         logger.info(f"Registered message handler for device: {device_name}")
     
     async def publish(
@@ -401,9 +434,20 @@ class MQTTClient(MessageBusPort):
         retain: bool = False,
     ) -> None:
         """Publish a message to a topic. See MessageBusPort.publish."""
+        await self.publish_confirmed(topic, payload, qos=qos, retain=retain)
+
+    async def publish_confirmed(
+        self,
+        topic: str,
+        payload: Optional[Union[str, int, float, bytes]],
+        qos: int = 1,
+        retain: bool = False,
+    ) -> bool:
+        """Publish; True once the broker accepted it (aiomqtt returns after the PUBACK
+        for QoS 1). False when disconnected or the publish failed."""
         if not self.connected or not self.client:
             logger.error("Cannot publish: Not connected to MQTT broker")
-            return
+            return False
 
         try:
             # WB convention: a None payload on a pushbutton-style write becomes "1".
@@ -420,8 +464,11 @@ class MQTTClient(MessageBusPort):
                 except Exception:  # noqa: BLE001 - evidence collection must never break publishing
                     logger.exception("MQTT traffic observer failed (out)")
             await self.client.publish(topic, actual_payload, qos=qos, retain=retain)
+            self._metrics_for(topic).published.inc()
+            return True
         except MqttError as e:
             logger.error(f"Failed to publish to {topic}: {str(e)}")
+            return False
 
     async def subscribe(
         self,
@@ -441,7 +488,7 @@ class MQTTClient(MessageBusPort):
                 subscriptions where the retained payload IS the current value.
         """
         # Register the callback for this topic
-        self.message_handlers[topic] = callback
+        self._set_handler(topic, callback)
         if process_retained:
             self._retained_allowed_topics.add(topic)
         
@@ -454,9 +501,83 @@ class MQTTClient(MessageBusPort):
                 logger.error(f"Failed to subscribe to {topic}: {str(e)}")
         else:
             logger.debug(f"Queued subscription for topic: {topic} (not connected yet)")
-    
+
+    async def unsubscribe(self, topic: str) -> None:
+        """Drop the handler for ``topic`` and, if connected, its broker subscription.
+
+        Used by the incremental /reload to retire the topics of a removed or rebuilt
+        device without touching anyone else's. Unknown topics are a no-op.
+        """
+        if self.message_handlers.pop(topic, None) is None:
+            return
+        self._wildcard_router.remove(topic)
+        self._retained_allowed_topics.discard(topic)
+        if self.connected and self.client:
+            try:
+                await self.client.unsubscribe(topic)
+                logger.debug(f"Unsubscribed from topic: {topic}")
+            except MqttError as e:
+                logger.error(f"Failed to unsubscribe from {topic}: {str(e)}")
+
+    def _metrics_for(self, topic: str) -> _TopicMetrics:
+        metrics = self._topic_metrics.get(topic)
+        if metrics is None:
+            metrics = self._topic_metrics[topic] = _TopicMetrics(topic)
+        return metrics
+
+    async def _dispatch(self, topic: str, payload: str) -> None:
+        """Run the handlers for one received message (called by the dispatch workers)."""
+        started = time.perf_counter()
+        try:
+            await self._run_handlers(topic, payload)
+        finally:
+            self._metrics_for(topic).handler.observe(time.perf_counter() - started)
+
+    async def _run_handlers(self, topic: str, payload: str) -> None:
+        # DEBUG: Enhanced logging for control topics (broader filtering)
+        if "controls" in topic or "processor" in topic or "tv" in topic or "soundbar" in topic:
+            logger.debug(f"[MQTT_DEBUG] Processing message: topic={topic}, payload='{payload}', timestamp={asyncio.get_event_loop().time()}")
+        
+        # Find handler for this exact topic
+        handler = self.message_handlers.get(topic)
+        if handler:
+            try:
+                # DEBUG: Log handler execution for control topics
+                if "controls" in topic or "processor" in topic or "tv" in topic or "soundbar" in topic:
+                    logger.debug(f"[MQTT_DEBUG] Executing exact topic handler for {topic} (payload='{payload}')")
+                await handler(topic, payload)
+            except Exception as e:
+                logger.error(f"Error in message handler for topic {topic}: {str(e)}")
+        else:
+            # If no exact match, dispatch to every matching wildcard
+            # filter (trie lookup, registration order).
+            for subscribed_topic in self._wildcard_router.match(topic):
+                subscribed_handler = self.message_handlers.get(subscribed_topic)
+                if subscribed_handler is not None:
+                    try:
+                        # DEBUG: Log wildcard handler execution for control topics
+                        if "controls" in topic or "processor" in topic or "tv" in topic or "soundbar" in topic:
+                            logger.debug(f"[MQTT_DEBUG] Executing wildcard handler for {topic} (subscribed to {subscribed_topic}, payload='{payload}')")
+                        await subscribed_handler(topic, payload)
+                    except Exception as e:
+                        logger.error(f"Error in wildcard handler for topic {topic} (subscribed to {subscribed_topic}): {str(e)}")
+
+    def dispatch_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-dispatch-key queue depth, drop and lag counters."""
+        return self._dispatcher.stats()
+
+    def _set_handler(self, topic: str, handler: Callable) -> None:
+        """Register ``handler`` for ``topic``, indexing wildcard filters for dispatch."""
+        self.message_handlers[topic] = handler
+        if is_wildcard_filter(topic):
+            self._wildcard_router.add(topic)
+
     def _topic_matches(self, subscription, topic):
-        """Check if topic matches subscription pattern (with + and # wildcards)."""
+        """Check if topic matches subscription pattern (with + and # wildcards).
+
+        Reference matcher: the receive loop routes wildcards through
+        ``TopicRouter``, which implements exactly these semantics.
+        """
         # Split subscription pattern into segments
         sub_segments = subscription.split('/')
         topic_segments = topic.split('/')
@@ -0,0 +1,199 @@
+"""Keyed dispatch workers for the MQTT receive loop.
+
+The receive loop used to ``await`` every handler inline, so one slow handler (an
+eMotiva readiness hold, an LG TV reconnect, a WB-passthrough echo that ends in a
+persistence write) stalled the traffic of every other device. ``KeyedDispatcher``
+decouples the two: the loop enqueues ``(topic, payload)`` onto a bounded queue per
+dispatch key and returns to the broker immediately; one worker task per key drains
+its queue in FIFO order. Messages for the same key (one WB device) therefore keep
+their order, while different devices are handled in parallel.
+
+Workers are spawned on demand and exit when their queue runs dry, taking the queue
+with them, so an idle key costs nothing beyond its stats row; those rows are capped
+(``stats_limit``), the least recently active idle key's row going first.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Literal, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+OverflowPolicy = Literal["backpressure", "drop_oldest"]
+
+_WB_DEVICES_PREFIX = "/devices/"
+
+
+def dispatch_key(topic: str) -> str:
+    """Serialization key for ``topic``.
+
+    WB-convention topics (``/devices/<id>/...``) key on the device, so a device's
+    controls, meta and ``/on`` writes are handled in arrival order. Anything else
+    keys on the full topic.
+    """
+    if topic.startswith(_WB_DEVICES_PREFIX):
+        end = topic.find("/", len(_WB_DEVICES_PREFIX))
+        return topic if end == -1 else topic[:end]
+    return topic
+
+
+@dataclass
+class DispatchQueueStats:
+    """Per-key counters. ``lag`` = enqueue → handler start, in milliseconds."""
+
+    depth: int = 0
+    max_depth: int = 0
+    enqueued: int = 0
+    processed: int = 0
+    dropped: int = 0
+    last_lag_ms: float = 0.0
+    max_lag_ms: float = 0.0
+
+
+_Item = Tuple[str, str, float]
+
+
+class KeyedDispatcher:
+    """Bounded per-key FIFO queues, each drained by its own worker task.
+
+    Args:
+        handler: ``async (topic, payload)`` run by the workers; must not raise
+            (exceptions are logged and swallowed so a worker never dies).
+        queue_depth: Capacity of each key's queue.
+        overflow: What ``submit`` does when a key's queue is full —
+            ``"backpressure"`` waits for room (the receive loop stops reading, the
+            broker buffers), ``"drop_oldest"`` evicts the oldest queued message of
+            that key and counts it in ``dropped``.
+        stats_limit: Most stats rows kept. Non-WB topics each get their own key, so
+            beyond this the row of the least recently active idle key is dropped.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str, str], Awaitable[None]],
+        queue_depth: int = 100,
+        overflow: OverflowPolicy = "backpressure",
+        stats_limit: int = 1024,
+    ):
+        if queue_depth < 1:
+            raise ValueError(f"queue_depth must be >= 1, got {queue_depth}")
+        if overflow not in ("backpressure", "drop_oldest"):
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+        if stats_limit < 1:
+            raise ValueError(f"stats_limit must be >= 1, got {stats_limit}")
+        self._handler = handler
+        self.queue_depth = queue_depth
+        self.overflow: OverflowPolicy = overflow
+        self.stats_limit = stats_limit
+        self._queues: Dict[str, "asyncio.Queue[_Item]"] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        # Least recently submitted first; a retiring worker's key may lose its queue
+        # only while no `submit` of that key is waiting in `put`.
+        self._stats: Dict[str, DispatchQueueStats] = {}
+        self._putting: Dict[str, int] = {}
+
+    async def submit(self, topic: str, payload: str) -> None:
+        """Queue a message for its key's worker (starting the worker if idle)."""
+        key = dispatch_key(topic)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = asyncio.Queue(maxsize=self.queue_depth)
+        stats = self._stats.pop(key, None)
+        if stats is None:
+            stats = DispatchQueueStats()
+        self._stats[key] = stats
+        if len(self._stats) > self.stats_limit:
+            self._evict_idle_stats()
+
+        item: _Item = (topic, payload, time.monotonic())
+        if queue.full() and self.overflow == "drop_oldest":
+            dropped_topic, _, _ = queue.get_nowait()
+            queue.task_done()
+            stats.dropped += 1
+            logger.warning(f"MQTT dispatch queue '{key}' full; dropped oldest message on {dropped_topic}")
+        # Start the worker before a backpressure wait, or nothing would ever drain...
+        self._ensure_worker(key, queue)
+        self._putting[key] = self._putting.get(key, 0) + 1
+        try:
+            await queue.put(item)
+        finally:
+            if self._putting[key] == 1:
+                del self._putting[key]
+            else:
+                self._putting[key] -= 1
+        # ...and again after it: a put that had to wait resumes only after the worker
+        # freed the slot, by which time the worker may have found the queue empty
+        # and retired.
+        self._ensure_worker(key, queue)
+        stats.enqueued += 1
+        depth = queue.qsize()
+        stats.depth = depth
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+
+    def _ensure_worker(self, key: str, queue: "asyncio.Queue[_Item]") -> None:
+        worker = self._workers.get(key)
+        if worker is None or worker.done():
+            self._workers[key] = asyncio.create_task(
+                self._drain(key, queue), name=f"mqtt-dispatch:{key}"
+            )
+
+    async def _drain(self, key: str, queue: "asyncio.Queue[_Item]") -> None:
+        stats = self._stats[key]
+        while not queue.empty():
+            topic, payload, enqueued_at = queue.get_nowait()
+            stats.depth = queue.qsize()
+            lag_ms = (time.monotonic() - enqueued_at) * 1000.0
+            stats.last_lag_ms = lag_ms
+            if lag_ms > stats.max_lag_ms:
+                stats.max_lag_ms = lag_ms
+            try:
+                await self._handler(topic, payload)
+            except Exception:  # noqa: BLE001 - a handler bug must not kill the key's worker
+                logger.exception(f"MQTT dispatch handler failed for {topic}")
+            finally:
+                stats.processed += 1
+                queue.task_done()
+        # Queue ran dry: retire (no await between the empty-check and here). `submit`
+        # restarts a worker for the next message, including one whose put was waiting
+        # for room while this worker drained -- that put still holds the queue, so it
+        # is only dropped when none is waiting.
+        self._workers.pop(key, None)
+        if key not in self._putting and self._queues.get(key) is queue:
+            del self._queues[key]
+            if len(self._stats) > self.stats_limit:
+                self._evict_idle_stats()
+
+    def _evict_idle_stats(self) -> None:
+        """Drop the rows of the least recently active keys without a queue until at
+        most ``stats_limit`` are left (rows of busy keys are never dropped)."""
+        excess = max(len(self._stats) - self.stats_limit, 0)
+        for key in list(islice((k for k in self._stats if k not in self._queues), excess)):
+            del self._stats[key]
+
+    async def join(self) -> None:
+        """Wait until every message queued so far has been handled."""
+        for queue in list(self._queues.values()):
+            await queue.join()
+
+    async def stop(self) -> None:
+        """Cancel the workers and discard whatever is still queued."""
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+        for stats in self._stats.values():
+            stats.depth = 0
+
+    def stats(self, key: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Per-key queue counters (all keys, or just ``key``)."""
+        if key is not None:
+            stats = self._stats.get(key)
+            return {key: asdict(stats)} if stats is not None else {}
+        return {k: asdict(s) for k, s in self._stats.items()}
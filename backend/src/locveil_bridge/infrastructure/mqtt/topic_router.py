@@ -0,0 +1,136 @@
+"""Compiled MQTT subscription-filter router.
+
+The receive loop resolves a topic to its handlers in two steps: an exact
+``message_handlers`` dict hit, else every wildcard filter that matches. The second
+step used to be a linear ``_topic_matches`` scan over all handlers (re-splitting
+both strings per handler, per message). ``TopicRouter`` indexes the wildcard
+filters once, at subscribe time, in a segment trie: a lookup splits the topic once
+and walks it level by level, so the cost is bounded by the topic depth instead of
+the number of subscriptions.
+
+Matching semantics are identical to ``MQTTClient._topic_matches``: ``+`` matches
+exactly one level, a trailing ``#`` matches its parent level and any number of
+child levels, and a ``#`` anywhere else is a literal segment.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+
+def is_wildcard_filter(topic_filter: str) -> bool:
+    """True if the filter has a ``+`` level or a trailing ``#`` level."""
+    segments = topic_filter.split("/")
+    return segments[-1] == "#" or "+" in segments
+
+
+class _Node:
+    """One trie level. ``children`` is keyed by literal segment or ``+``."""
+
+    __slots__ = ("children", "terminal", "multi")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        # Filter that ends exactly at this level (e.g. "/devices/+/meta/error").
+        self.terminal: Optional[str] = None
+        # Filter whose trailing "#" hangs off this level (e.g. "/devices/#").
+        self.multi: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return not self.children and self.terminal is None and self.multi is None
+
+
+class TopicRouter:
+    """Segment trie over wildcard subscription filters.
+
+    Stores filter strings only; the handlers stay in ``MQTTClient.message_handlers``
+    so there is a single source of truth for "what is subscribed". ``match`` returns
+    every matching filter in registration order — the order the linear scan over
+    ``message_handlers`` used to dispatch in — so overlapping subscriptions (e.g.
+    ``/devices/+/meta/error`` and ``/devices/#``) all fire, deterministically.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._order: Dict[str, int] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, topic_filter: object) -> bool:
+        return topic_filter in self._order
+
+    def add(self, topic_filter: str) -> None:
+        """Index a filter. Re-adding an indexed filter keeps its original position."""
+        if topic_filter in self._order:
+            return
+        segments = topic_filter.split("/")
+        trailing_hash = segments[-1] == "#"
+        if trailing_hash:
+            segments = segments[:-1]
+        node = self._root
+        for segment in segments:
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = _Node()
+            node = child
+        if trailing_hash:
+            node.multi = topic_filter
+        else:
+            node.terminal = topic_filter
+        self._order[topic_filter] = self._seq
+        self._seq += 1
+
+    def remove(self, topic_filter: str) -> None:
+        """Drop a filter and prune the levels it alone kept alive. Unknown = no-op."""
+        if self._order.pop(topic_filter, None) is None:
+            return
+        segments = topic_filter.split("/")
+        trailing_hash = segments[-1] == "#"
+        if trailing_hash:
+            segments = segments[:-1]
+        path: List[Tuple[_Node, str]] = []
+        node = self._root
+        for segment in segments:
+            path.append((node, segment))
+            node = node.children[segment]
+        if trailing_hash:
+            node.multi = None
+        else:
+            node.terminal = None
+        for parent, segment in reversed(path):
+            if not parent.children[segment].is_empty():
+                break
+            del parent.children[segment]
+
+    def clear(self) -> None:
+        self._root = _Node()
+        self._order.clear()
+
+    def match(self, topic: str) -> List[str]:
+        """Every indexed filter matching ``topic``, in registration order."""
+        segments = topic.split("/")
+        depth_end = len(segments)
+        found: List[str] = []
+        stack: List[Tuple[_Node, int]] = [(self._root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if node.multi is not None:
+                found.append(node.multi)
+            if depth == depth_end:
+                if node.terminal is not None:
+                    found.append(node.terminal)
+                continue
+            children = node.children
+            if not children:
+                continue
+            segment = segments[depth]
+            child = children.get(segment)
+            if child is not None:
+                stack.append((child, depth + 1))
+            if segment != "+":
+                child = children.get("+")
+                if child is not None:
+                    stack.append((child, depth + 1))
+        if len(found) > 1:
+            found.sort(key=self._order.__getitem__)
+        return found
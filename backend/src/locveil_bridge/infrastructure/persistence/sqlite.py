@@ -1,14 +1,24 @@
-from typing import Protocol, Optional, Dict, Any, List
+from typing import Protocol, Optional, Dict, Any, Callable, Iterable, List, Literal, Sequence, Set, Tuple
+import asyncio
 import json
+import time
 import aiosqlite
 import logging
 from pathlib import Path
 from datetime import datetime
 
 from locveil_bridge.domain.ports import StateRepositoryPort
+from locveil_bridge.utils.metrics import registry
 
 logger = logging.getLogger(__name__)
 
+_COMMIT_SECONDS = registry.histogram(
+    "locveil_state_store_commit_seconds", "SQLite state store COMMIT latency"
+).labels()
+_PENDING_WRITES = registry.gauge(
+    "locveil_state_store_pending_writes", "Keys waiting in the state store's write-behind buffer"
+).labels()
+
 class StateStore(Protocol):
     """Protocol defining the interface for state persistence."""
     
@@ -33,6 +43,69 @@ class StateStore(Protocol):
         ...
 
 
+_UPSERT_SQL = '''
+    INSERT INTO state_store (key, timestamp, value)
+    VALUES (?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET 
+        timestamp = excluded.timestamp,
+        value = excluded.value
+'''
+
+_FIELD_UPSERT_SQL = '''
+    INSERT INTO state_fields (key, field, value, ts)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(key, field) DO UPDATE SET
+        value = excluded.value,
+        ts = excluded.ts
+'''
+
+_TIMESTAMP_FORMAT = '%d-%m-%Y %H:%M:%S'
+
+# `PRAGMA user_version` while `state_fields` holds the state (0: `state_store` does).
+_FIELDS_SCHEMA_VERSION = 1
+
+# Pre-envelope keys whose blob is a bare JSON scalar: the field the scalar becomes when
+# the blob moves to the per-field layout. The legacy global `active_scenario` slot held
+# the bare scenario id; ScenarioManager moves it to its room's key on restore.
+_LEGACY_SCALAR_FIELDS = {"active_scenario": "scenario_id"}
+
+StorageLayout = Literal["blob", "fields"]
+
+# Field-layout pending entry: field -> (JSON text, timestamp).
+_EncodedFields = Dict[str, Tuple[str, str]]
+
+
+# Keys per `WHERE key IN (...)` of a bulk read; stays under SQLite's historical
+# 999-variable limit.
+_BULK_READ_CHUNK = 500
+
+
+def _latest_timestamp(timestamps: Iterable[str]) -> str:
+    """Most recent of several 'DD-MM-YYYY HH:MM:SS' stamps (not lexically sortable)."""
+    return max(timestamps, key=lambda ts: datetime.strptime(ts, _TIMESTAMP_FORMAT))
+
+
+def _decode_blob(text: str, timestamp: str) -> Any:
+    value_data = json.loads(text)
+    # Add timestamp to the returned data
+    if isinstance(value_data, dict):
+        value_data['_timestamp'] = timestamp
+    return value_data
+
+
+def _decode_fields(rows: _EncodedFields) -> Dict[str, Any]:
+    value_data: Dict[str, Any] = {field: json.loads(text) for field, (text, _) in rows.items()}
+    if rows:
+        value_data['_timestamp'] = _latest_timestamp(ts for _, ts in rows.values())
+    return value_data
+
+
+def _prefix_range(prefix: str) -> Tuple[str, str]:
+    """``key >= lo AND key < hi`` selects exactly the keys starting with ``prefix``
+    (a range on the primary key, unlike ``LIKE``, which would also need escaping)."""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
 class SQLiteStateStore(StateRepositoryPort):
     """
     Implements StateStore using an SQLite database for JSON blobs.
@@ -40,11 +113,65 @@ class SQLiteStateStore(StateRepositoryPort):
       - key TEXT PRIMARY KEY
       - timestamp TEXT NOT NULL (format: 'DD-MM-YYYY HH:MM:SS')
       - value TEXT NOT NULL (JSON-encoded)
+
+    Field layout (``layout="fields"``): state lives in a second table,
+      - key TEXT, field TEXT, value TEXT (JSON-encoded), ts TEXT; PRIMARY KEY (key, field)
+    so ``save_fields`` upserts only the fields a state change touched instead of
+    re-encoding the whole blob (LG TV app lists, Auralic source caches). ``get``
+    reassembles the full dict, with ``_timestamp`` = the newest field's stamp. Only the
+    active layout's table holds rows: on the first open in the field layout the
+    ``state_store`` rows are moved over once (tracked by ``PRAGMA user_version``), and
+    reopening in the blob layout moves them back, so the table switched away from never
+    lingers with stale state.
+
+    Write-behind (``write_behind_ms > 0``): ``set``/``save`` serialize the value and
+    park it in an in-memory pending map instead of committing. Repeated writes to the
+    same key inside the window collapse to the latest one, and the window ends in a
+    single ``executemany`` transaction — one fsync per window instead of one per state
+    change (volume-slider drags and HVAC sensor churn on the WB7's eMMC). Reads and
+    ``list_entities`` see pending values; ``flush()`` and ``close()`` commit them.
+    ``write_behind_ms=0`` (the default) keeps the write-through behaviour.
+
+    Args:
+        db_path: SQLite database file (``:memory:`` for tests).
+        write_behind_ms: Coalescing window in milliseconds; 0 disables write-behind.
+        wal: Open the database in WAL journal mode (readers never block the writer,
+            and a commit appends to the log instead of rewriting pages).
+        synchronous: ``PRAGMA synchronous`` level (``"NORMAL"`` is durable against
+            corruption in WAL mode and skips the per-commit fsync of ``"FULL"``);
+            None leaves SQLite's default.
+        layout: ``"blob"`` (one JSON row per key) or ``"fields"`` (one row per field).
     """
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        write_behind_ms: int = 0,
+        wal: bool = False,
+        synchronous: Optional[str] = None,
+        layout: StorageLayout = "blob",
+    ):
+        if layout not in ("blob", "fields"):
+            raise ValueError(f"Unknown state store layout: {layout!r}")
         self.db_path = db_path
+        self.layout: StorageLayout = layout
+        self.supports_field_updates = layout == "fields"
         self.connection = None
         self._closing = False  # Flag to indicate the connection is being closed
+        self.write_behind_ms = write_behind_ms
+        self.wal = wal
+        self.synchronous = synchronous
+        # Write-behind buffer: key -> (timestamp, JSON text), latest write wins.
+        self._pending: Dict[str, Tuple[str, str]] = {}
+        # Field-layout buffer: key -> staged fields; keys in `_pending_replace` had a
+        # full `set` staged, so their stored rows are dropped before the upsert.
+        self._pending_fields: Dict[str, _EncodedFields] = {}
+        self._pending_replace: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        # Serializes commits (flush vs delete) so a delete can't interleave with a
+        # batch that still carries the deleted key.
+        self._write_lock = asyncio.Lock()
+        self.commit_count = 0  # Transactions committed by set/bulk_save/flush
+        _PENDING_WRITES.set_function(self.pending_count)
 
     async def initialize(self) -> None:
         """Open database connection and create table if needed."""
@@ -53,6 +180,12 @@ class SQLiteStateStore(StateRepositoryPort):
             Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
             
             self.connection = await aiosqlite.connect(self.db_path)
+            if self.wal:
+                await self.connection.execute('PRAGMA journal_mode=WAL')
+            if self.synchronous:
+                if self.synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+                    raise ValueError(f"Invalid synchronous level: {self.synchronous}")
+                await self.connection.execute(f'PRAGMA synchronous={self.synchronous.upper()}')
             await self.connection.execute(
                 '''
                 CREATE TABLE IF NOT EXISTS state_store (
@@ -62,15 +195,102 @@ class SQLiteStateStore(StateRepositoryPort):
                 )
                 '''
             )
+            if self.layout == "fields":
+                await self.connection.execute(
+                    '''
+                    CREATE TABLE IF NOT EXISTS state_fields (
+                      key TEXT NOT NULL,
+                      field TEXT NOT NULL,
+                      value TEXT NOT NULL,
+                      ts TEXT NOT NULL,
+                      PRIMARY KEY (key, field)
+                    )
+                    '''
+                )
+                await self._migrate_blobs_to_fields()
+            else:
+                await self._migrate_fields_to_blobs()
             await self.connection.commit()
-            logger.info(f"SQLite state store initialized at {self.db_path}")
-        except aiosqlite.Error as e:
+            logger.info(f"SQLite state store initialized at {self.db_path} ({self.layout} layout)")
+        except (aiosqlite.Error, ValueError) as e:
             logger.critical(f"SQLite error during initialization: {e}")
             raise RuntimeError(f"Failed to initialize database: {e}")
 
+    async def _schema_version(self) -> int:
+        assert self.connection is not None
+        cursor = await self.connection.execute('PRAGMA user_version')
+        row = await cursor.fetchone()
+        await cursor.close()
+        return row[0] if row else 0
+
+    async def _migrate_blobs_to_fields(self) -> None:
+        """One-shot move of every ``state_store`` blob into ``state_fields`` rows.
+
+        Runs inside initialize()'s transaction. The blob table is emptied and
+        ``user_version`` marks the move done, so a later start never re-imports
+        (possibly stale) blobs over newer field rows.
+        """
+        assert self.connection is not None
+        if await self._schema_version() >= _FIELDS_SCHEMA_VERSION:
+            return
+        cursor = await self.connection.execute('SELECT key, timestamp, value FROM state_store')
+        blobs = list(await cursor.fetchall())
+        await cursor.close()
+        field_rows = []
+        for key, timestamp, text in blobs:
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError as e:
+                logger.error(f"Dropping undecodable state blob '{key}' during field migration: {e}")
+                continue
+            if not isinstance(data, dict):
+                field = _LEGACY_SCALAR_FIELDS.get(key)
+                if field is None:
+                    logger.error(f"Dropping non-dict state blob '{key}' during field migration")
+                    continue
+                data = {field: data}
+            field_rows.extend(
+                (key, field, json.dumps(value), timestamp) for field, value in data.items()
+            )
+        await self.connection.executemany(
+            'INSERT OR IGNORE INTO state_fields (key, field, value, ts) VALUES (?, ?, ?, ?)',
+            field_rows,
+        )
+        await self.connection.execute('DELETE FROM state_store')
+        await self.connection.execute(f'PRAGMA user_version = {_FIELDS_SCHEMA_VERSION}')
+        logger.info(f"Migrated {len(blobs)} state blob(s) to the per-field layout")
+
+    async def _migrate_fields_to_blobs(self) -> None:
+        """The reverse move, for a database last opened in the field layout: reassemble
+        each key's ``state_fields`` rows into one ``state_store`` blob (stamped with its
+        newest field) and empty the field table. Runs inside initialize()'s transaction."""
+        assert self.connection is not None
+        if await self._schema_version() < _FIELDS_SCHEMA_VERSION:
+            return
+        cursor = await self.connection.execute('SELECT key, field, value, ts FROM state_fields')
+        by_key: Dict[str, _EncodedFields] = {}
+        for key, field, text, ts in await cursor.fetchall():
+            by_key.setdefault(key, {})[field] = (text, ts)
+        await cursor.close()
+        blob_rows = []
+        for key, rows in by_key.items():
+            data = {field: json.loads(text) for field, (text, _) in rows.items()}
+            blob_rows.append((key, _latest_timestamp(ts for _, ts in rows.values()), json.dumps(data)))
+        await self.connection.executemany(_UPSERT_SQL, blob_rows)
+        await self.connection.execute('DELETE FROM state_fields')
+        await self.connection.execute('PRAGMA user_version = 0')
+        logger.info(f"Migrated {len(blob_rows)} state key(s) back to the blob layout")
+
     async def close(self) -> None:
-        """Close database connection."""
+        """Flush pending write-behind values, then close the database connection."""
         if self.connection:
+            # Guaranteed flush: stop the window timer (a batch it was committing is
+            # re-queued on cancellation) and commit everything still pending.
+            flush_task, self._flush_task = self._flush_task, None
+            if flush_task is not None and not flush_task.done():
+                flush_task.cancel()
+                await asyncio.gather(flush_task, return_exceptions=True)
+            await self.flush()
             self._closing = True
             logger.info("Closing SQLite state store connection")
             try:
@@ -92,23 +312,23 @@ class SQLiteStateStore(StateRepositoryPort):
             return None
             
         try:
-            cursor = await self.connection.execute(
-                'SELECT value, timestamp FROM state_store WHERE key = ?', (key,)
-            )
-            row = await cursor.fetchone()
-            await cursor.close()
+            if self.layout == "fields":
+                return await self._get_fields(key)
+            row = self._pending.get(key)
+            if row is not None:
+                timestamp, text = row
+                row = (text, timestamp)
+            else:
+                cursor = await self.connection.execute(
+                    'SELECT value, timestamp FROM state_store WHERE key = ?', (key,)
+                )
+                row = await cursor.fetchone()
+                await cursor.close()
             
             if not row:
                 return None
-                
-            value_data = json.loads(row[0])
-            timestamp = row[1]
-            
-            # Add timestamp to the returned data
-            if isinstance(value_data, dict):
-                value_data['_timestamp'] = timestamp
-                
-            return value_data
+
+            return _decode_blob(row[0], row[1])
         except aiosqlite.Error as e:
             logger.error(f"SQLite error during get operation for key '{key}': {e}")
             return None
@@ -119,6 +339,143 @@ class SQLiteStateStore(StateRepositoryPort):
             logger.error(f"Unexpected error during get operation for key '{key}': {e}")
             return None
 
+    async def _get_fields(self, key: str) -> Optional[Dict[str, Any]]:
+        """Field layout: reassemble the stored rows plus anything staged for ``key``."""
+        assert self.connection is not None
+        rows: _EncodedFields = {}
+        if key not in self._pending_replace:
+            cursor = await self.connection.execute(
+                'SELECT field, value, ts FROM state_fields WHERE key = ?', (key,)
+            )
+            for field, text, ts in await cursor.fetchall():
+                rows[field] = (text, ts)
+            await cursor.close()
+        rows.update(self._pending_fields.get(key, {}))
+        if not rows and key not in self._pending_replace:
+            return None
+        return _decode_fields(rows)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """``get`` for several keys: one ``SELECT ... WHERE key IN (...)`` per chunk of
+        keys instead of one query (and one aiosqlite thread hop) per key."""
+        wanted = list(dict.fromkeys(keys))
+        if not wanted or not self._readable("get_many"):
+            return {}
+        states: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(wanted), _BULK_READ_CHUNK):
+            chunk = wanted[start:start + _BULK_READ_CHUNK]
+            chunk_set = set(chunk)
+            where = f"key IN ({','.join('?' * len(chunk))})"
+            states.update(await self._select_states(where, chunk, chunk_set.__contains__))
+        return states
+
+    async def get_prefix(self, prefix: str) -> Dict[str, Dict[str, Any]]:
+        """Every key starting with ``prefix``, in one range query on the primary key."""
+        if not self._readable("get_prefix"):
+            return {}
+        if not prefix:
+            return await self._select_states("1", (), lambda key: True)
+        return await self._select_states("key >= ? AND key < ?", _prefix_range(prefix), lambda key: key.startswith(prefix))
+
+    def _readable(self, operation: str) -> bool:
+        if not self.connection:
+            logger.error(f"Database connection not initialized during {operation} operation")
+            return False
+        if self._closing:
+            logger.warning(f"Attempted {operation} while database is closing")
+            return False
+        return True
+
+    async def _select_states(
+        self, where: str, params: Sequence[Any], wanted: Callable[[str], bool]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Decoded states of the stored keys matching ``where`` plus the pending keys
+        matching ``wanted`` (the same predicate), pending values winning. A key that
+        fails to load is logged and left out."""
+        assert self.connection is not None
+        raw: Dict[str, Any]
+        decode: Callable[[Any], Any]
+        try:
+            if self.layout == "fields":
+                rows: Dict[str, _EncodedFields] = {}
+                cursor = await self.connection.execute(
+                    f'SELECT key, field, value, ts FROM state_fields WHERE {where}', params
+                )
+                for key, field, text, ts in await cursor.fetchall():
+                    if key not in self._pending_replace:
+                        rows.setdefault(key, {})[field] = (text, ts)
+                await cursor.close()
+                for key in self._pending_replace:
+                    if wanted(key):
+                        rows.setdefault(key, {})
+                for key, fields in self._pending_fields.items():
+                    if wanted(key):
+                        rows.setdefault(key, {}).update(fields)
+                raw, decode = rows, _decode_fields
+            else:
+                cursor = await self.connection.execute(
+                    f'SELECT key, value, timestamp FROM state_store WHERE {where}', params
+                )
+                blobs = {key: (text, ts) for key, text, ts in await cursor.fetchall()}
+                await cursor.close()
+                for key, (ts, text) in self._pending.items():
+                    if wanted(key):
+                        blobs[key] = (text, ts)
+                raw, decode = blobs, lambda blob: _decode_blob(*blob)
+        except aiosqlite.Error as e:
+            logger.error(f"SQLite error during bulk read ({where}): {e}")
+            return {}
+        states: Dict[str, Dict[str, Any]] = {}
+        for key, encoded in raw.items():
+            try:
+                states[key] = decode(encoded)
+            except json.JSONDecodeError as e:
+                logger.error(f"JSON decode error for key '{key}': {e}")
+        return states
+
+    def _stage_fields(self, key: str, fields: Dict[str, Any], replace: bool) -> None:
+        """Field layout: encode ``fields`` now and stage them for the next flush."""
+        timestamp = datetime.now().strftime(_TIMESTAMP_FORMAT)
+        encoded = {field: (json.dumps(value), timestamp) for field, value in fields.items()}
+        if replace:
+            self._pending_replace.add(key)
+            self._pending_fields[key] = encoded
+        else:
+            self._pending_fields.setdefault(key, {}).update(encoded)
+
+    async def _commit_staged(self) -> bool:
+        """Flush now (write-through) or let the window do it (write-behind)."""
+        if self.write_behind_ms > 0:
+            self._schedule_flush()
+            return True
+        return await self.flush()
+
+    async def set_fields(self, key: str, fields: Dict[str, Any]) -> bool:
+        """Upsert only ``fields`` of ``key``'s state, leaving the other fields as stored.
+
+        On the blob layout this degrades to a read-merge-write of the whole blob.
+
+        Returns:
+            bool: True if successful (or staged), False otherwise
+        """
+        if not self.connection:
+            logger.error("Database connection not initialized during set_fields operation")
+            return False
+        if self._closing:
+            logger.warning(f"Attempted to set fields of key '{key}' while database is closing")
+            return False
+        if self.layout == "blob":
+            current = await self.get(key) or {}
+            current.pop('_timestamp', None)
+            current.update(fields)
+            return await self.set(key, current)
+        try:
+            self._stage_fields(key, fields, replace=False)
+        except Exception as e:
+            logger.error(f"Unexpected error during set_fields operation for key '{key}': {e}")
+            return False
+        return await self._commit_staged()
+
     async def set(self, key: str, value: Dict[str, Any]) -> bool:
         """
         Persist `value` as JSON under `key`. Overwrite if exists.
@@ -136,20 +493,22 @@ class SQLiteStateStore(StateRepositoryPort):
             
         try:
             # Generate current timestamp in 'DD-MM-YYYY HH:MM:SS' format
-            timestamp = datetime.now().strftime('%d-%m-%Y %H:%M:%S')
-            
+            timestamp = datetime.now().strftime(_TIMESTAMP_FORMAT)
+
+            if self.layout == "fields":
+                self._stage_fields(key, value, replace=True)
+                return await self._commit_staged()
+
             text = json.dumps(value)
-            await self.connection.execute(
-                '''
-                INSERT INTO state_store (key, timestamp, value)
-                VALUES (?, ?, ?)
-                ON CONFLICT(key) DO UPDATE SET 
-                    timestamp = excluded.timestamp,
-                    value = excluded.value
-                ''',
-                (key, timestamp, text)
-            )
-            await self.connection.commit()
+            if self.write_behind_ms > 0:
+                # Serialized now (the caller may mutate `value` later); committed by
+                # the window's flush together with every other key written meanwhile.
+                self._pending[key] = (timestamp, text)
+                self._schedule_flush()
+                return True
+            await self.connection.execute(_UPSERT_SQL, (key, timestamp, text))
+            await self._commit()
+            self.commit_count += 1
             return True
         except aiosqlite.Error as e:
             logger.error(f"SQLite error during set operation for key '{key}': {e}")
@@ -178,8 +537,14 @@ class SQLiteStateStore(StateRepositoryPort):
             return
 
         try:
-            await self.connection.execute('DELETE FROM state_store WHERE key = ?', (entity_id,))
-            await self.connection.commit()
+            async with self._write_lock:
+                self._pending.pop(entity_id, None)
+                self._pending_fields.pop(entity_id, None)
+                self._pending_replace.discard(entity_id)
+                await self.connection.execute('DELETE FROM state_store WHERE key = ?', (entity_id,))
+                if self.layout == "fields":
+                    await self.connection.execute('DELETE FROM state_fields WHERE key = ?', (entity_id,))
+                await self._commit()
         except aiosqlite.Error as e:
             logger.error(f"SQLite error during delete operation for key '{entity_id}': {e}")
         except Exception as e:
@@ -190,15 +555,125 @@ class SQLiteStateStore(StateRepositoryPort):
         """Load state for an entity by ID."""
         return await self.get(entity_id)
     
+    async def load_many(self, entity_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Load several entities in one query (see ``get_many``)."""
+        return await self.get_many(entity_ids)
+
+    async def load_prefix(self, prefix: str) -> Dict[str, Dict[str, Any]]:
+        """Load every entity whose ID starts with ``prefix`` in one query."""
+        return await self.get_prefix(prefix)
+
     async def save(self, entity_id: str, state: Dict[str, Any]) -> None:
         """Save state for an entity."""
         await self.set(entity_id, state)
+
+    async def save_fields(self, entity_id: str, fields: Dict[str, Any]) -> None:
+        """Save only the given fields of an entity's state."""
+        await self.set_fields(entity_id, fields)
     
     async def bulk_save(self, states: Dict[str, Dict[str, Any]]) -> None:
-        """Save multiple entity states in a single operation."""
+        """Save multiple entity states in a single transaction.
+
+        Goes through the write-behind buffer and flushes it immediately, so the batch
+        (plus anything already pending) lands in one ``executemany`` + one commit.
+        """
+        if not self.connection or self._closing:
+            logger.error("Database connection not available during bulk_save operation")
+            return
+        timestamp = datetime.now().strftime(_TIMESTAMP_FORMAT)
         for entity_id, state in states.items():
-            await self.save(entity_id, state)
+            try:
+                if self.layout == "fields":
+                    self._stage_fields(entity_id, state, replace=True)
+                else:
+                    self._pending[entity_id] = (timestamp, json.dumps(state))
+            except Exception as e:
+                logger.error(f"Unexpected error serializing state for key '{entity_id}': {e}")
+        await self.flush()
+
+    def _schedule_flush(self) -> None:
+        """Start the window timer unless one is already running."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.write_behind_ms / 1000.0)
+        await self.flush()
+
+    async def _commit(self) -> None:
+        assert self.connection is not None
+        started = time.perf_counter()
+        await self.connection.commit()
+        _COMMIT_SECONDS.observe(time.perf_counter() - started)
+
+    def pending_count(self) -> int:
+        """Number of keys waiting in the write-behind buffer."""
+        return len(self._pending) + len(self._pending_fields)
+
+    async def flush(self) -> bool:
+        """Commit every pending write-behind value in one transaction.
+
+        Returns:
+            bool: True if the buffer is empty afterwards, False if the commit failed
+            (the failed batch is re-queued behind any newer writes to the same keys).
+        """
+        if not self._pending and not self._pending_fields:
+            return True
+        if not self.connection:
+            logger.error("Database connection not initialized during flush operation")
+            return False
+        async with self._write_lock:
+            batch, self._pending = self._pending, {}
+            field_batch, self._pending_fields = self._pending_fields, {}
+            replace_batch, self._pending_replace = self._pending_replace, set()
+            if not batch and not field_batch:
+                return True
+            try:
+                if batch:
+                    await self.connection.executemany(
+                        _UPSERT_SQL,
+                        [(key, timestamp, text) for key, (timestamp, text) in batch.items()],
+                    )
+                if replace_batch:
+                    await self.connection.executemany(
+                        'DELETE FROM state_fields WHERE key = ?', [(key,) for key in replace_batch]
+                    )
+                if field_batch:
+                    await self.connection.executemany(
+                        _FIELD_UPSERT_SQL,
+                        [
+                            (key, field, text, ts)
+                            for key, fields in field_batch.items()
+                            for field, (text, ts) in fields.items()
+                        ],
+                    )
+                await self._commit()
+                self.commit_count += 1
+                logger.debug(f"Flushed {len(batch) + len(field_batch)} pending state write(s)")
+                return True
+            except (Exception, asyncio.CancelledError) as e:
+                for key, row in batch.items():
+                    self._pending.setdefault(key, row)
+                self._requeue_fields(field_batch, replace_batch)
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+                logger.error(f"Error flushing {len(batch) + len(field_batch)} pending state write(s): {e}")
+                try:
+                    await self.connection.rollback()
+                except Exception:
+                    pass
+                return False
     
+    def _requeue_fields(self, field_batch: Dict[str, _EncodedFields], replace_batch: Set[str]) -> None:
+        """Put a failed field batch back underneath whatever was staged since."""
+        for key, fields in field_batch.items():
+            if key in self._pending_replace:
+                continue  # superseded by a newer full write
+            merged = dict(fields)
+            merged.update(self._pending_fields.get(key, {}))
+            self._pending_fields[key] = merged
+        self._pending_replace |= replace_batch
+
     async def list_entities(self) -> List[str]:
         """List all entity IDs that have persisted state."""
         if not self.connection:
@@ -206,9 +681,17 @@ class SQLiteStateStore(StateRepositoryPort):
             return []
             
         try:
-            cursor = await self.connection.execute('SELECT key FROM state_store')
+            if self.layout == "fields":
+                cursor = await self.connection.execute('SELECT DISTINCT key FROM state_fields')
+                pending: Iterable[str] = self._pending_fields
+            else:
+                cursor = await self.connection.execute('SELECT key FROM state_store')
+                pending = self._pending
             rows = await cursor.fetchall()
-            return [row[0] for row in rows]
+            keys = [row[0] for row in rows]
+            stored = set(keys)
+            keys.extend(key for key in pending if key not in stored)
+            return keys
         except aiosqlite.Error as e:
             logger.error(f"SQLite error during list_entities operation: {e}")
             return []
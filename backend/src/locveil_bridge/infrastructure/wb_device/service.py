@@ -1,10 +1,14 @@
 """WB Virtual Device Service - Config-driven abstraction for WB virtual device operations."""
 
+import asyncio
 import json
 import logging
 import re
+import time
+from dataclasses import dataclass
+from functools import partial
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union, Awaitable
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union, Awaitable
 
 from locveil_bridge.domain.ports import MessageBusPort
 from locveil_bridge.infrastructure.config.models import BaseDeviceConfig
@@ -28,6 +32,22 @@ _WB_EXCLUDED_DOMAINS = {"pointer"}
 # the heuristics stay byte-equivalent to the historical behavior.
 _DOMAIN_GROUP_ALIAS = {"input": "inputs"}
 
+# (topic, payload, cache key) of one retained message. A callable payload is resolved
+# when the message is sent, so a control value published in between is not overwritten;
+# the cache key names the control value the payload came from (None for metadata).
+RetainedMessage = Tuple[str, Union[str, Callable[[], str]], Optional[Tuple[str, str]]]
+
+
+@dataclass(frozen=True)
+class ResyncReport:
+    """Outcome of one retained-state republish (``WBVirtualDeviceService.resync``)."""
+
+    devices: int
+    messages: int
+    acked: int
+    failed: int
+    duration_ms: float
+
 
 def _commands_by_domain(capabilities: Any) -> Dict[str, str]:
     """Map each native command name -> its capability domain. Walks actions / zones / select /
@@ -65,10 +85,23 @@ def _commands_by_domain(capabilities: Any) -> Dict[str, str]:
 class WBVirtualDeviceService:
     """Infrastructure service for WB virtual device operations using existing config schemas."""
     
-    def __init__(self, message_bus: MessageBusPort):
+    def __init__(self, message_bus: MessageBusPort, resync_concurrency: int = 16):
+        if resync_concurrency < 1:
+            raise ValueError(f"resync_concurrency must be >= 1, got {resync_concurrency}")
         self.message_bus = message_bus
+        # QoS-1 publishes kept in flight at once while republishing retained state.
+        self.resync_concurrency = resync_concurrency
+        self.last_resync: Optional[ResyncReport] = None
+        self.resync_count = 0
         self._active_devices: Dict[str, Dict[str, Any]] = {}  # Track active WB devices
         self._command_executors: Dict[str, CommandExecutor] = {}  # Device ID -> executor mapping
+        # (wb_device_id, control) -> payload last published retained to its value topic.
+        # A write of the same payload is skipped: the broker already holds it, and every
+        # retained publish wakes wb-rules and the WB web UI. Cleared per device on
+        # cleanup; a broker (re)connect republishes them (see ``resync``).
+        self._published_values: Dict[Tuple[str, str], str] = {}
+        self.published_value_hits = 0
+        self.published_value_misses = 0
     
     async def setup_wb_device_from_config(
         self,
@@ -133,6 +166,12 @@ class WBVirtualDeviceService:
                 for warning in validation_results['warnings']:
                     logger.warning(f"WB setup warning for {config_device_id}: {warning}")
             
+            # Compile what every state change and reconnect needs once, here: the WB
+            # controls (meta + initial state) and the state-field -> control map. Both
+            # derive from the whole config; a reload re-runs this setup.
+            controls = self.build_wb_controls_from_config(config, capabilities)
+            state_field_controls = self._build_state_field_to_control_map(config)
+
             # Store device info and executor (use tracking_device_id for internal state)
             self._active_devices[tracking_device_id] = {
                 "config": config,
@@ -142,6 +181,9 @@ class WBVirtualDeviceService:
                 "wb_device_id": wb_device_id,   # Store virtual WB device ID for MQTT operations
                 "config_device_id": config_device_id,  # Store original config device ID for reference
                 "state_provider": state_provider,  # zero-arg callable → current device state (Invariant B chokepoint)
+                "controls": controls,  # control_name -> {"meta", "initial_state"}
+                "state_field_controls": state_field_controls,  # state field -> [control_name, ...]
+                "device_meta": self._wb_device_meta_payload(wb_device_name, driver_name, device_type),
             }
             self._command_executors[tracking_device_id] = command_executor
             
@@ -149,7 +191,7 @@ class WBVirtualDeviceService:
             await self._publish_wb_device_meta(wb_device_id, wb_device_name, driver_name, device_type)
             
             # Publish control metadata and initial states (use virtual WB device ID)
-            await self._publish_wb_control_metas(wb_device_id, config, capabilities)
+            await self._publish_wb_control_metas(wb_device_id, config, capabilities, controls=controls)
             
             # Set up Last Will Testament for offline detection (use virtual WB device ID)
             await self._setup_wb_last_will(wb_device_id)
@@ -186,6 +228,7 @@ class WBVirtualDeviceService:
             
             # Remove from active devices (use tracking device ID)
             del self._active_devices[tracking_device_id]
+            self.invalidate_published_values(wb_device_id)
             if tracking_device_id in self._command_executors:
                 del self._command_executors[tracking_device_id]
             
@@ -333,51 +376,128 @@ class WBVirtualDeviceService:
             return False
     
     async def handle_mqtt_reconnection(self, device_id: str) -> bool:
-        """Handle MQTT reconnection for a specific device."""
+        """Republish one device's retained meta and current control values."""
         try:
             if device_id not in self._active_devices:
                 logger.warning(f"Device {device_id} not found in active devices")
                 return False
-            
-            device_info = self._active_devices[device_id]
-            config = device_info["config"]
-            device_name = device_info["device_name"]
-            driver_name = device_info["driver_name"]
-            device_type = device_info["device_type"]
-            
+
             logger.info(f"Handling MQTT reconnection for WB device {device_id}")
-            
-            # Republish device metadata
-            await self._publish_wb_device_meta(device_id, device_name, driver_name, device_type)
-            
-            # Republish control metadata
-            await self._publish_wb_control_metas(device_id, config)
-            
-            # Re-setup Last Will Testament
-            await self._setup_wb_last_will(device_id)
-            
+            messages = list(self._retained_messages(self._active_devices[device_id]))
+            acked, failed = await self._publish_pipelined(messages)
+            if failed:
+                logger.warning(f"Restored WB device {device_id}: {failed}/{len(messages)} publishes not acknowledged")
+                return False
             logger.info(f"Successfully restored WB device state for {device_id}")
             return True
-            
+
         except Exception as e:
             logger.error(f"Error handling MQTT reconnection for {device_id}: {str(e)}")
             return False
-    
+
+    async def resync(self) -> ResyncReport:
+        """Republish the retained state of every WB virtual device (scenario cards included).
+
+        Registered as an MQTT on-connect callback: a broker restart loses retained
+        topics (the WB7 runs mosquitto without persistence). Device meta, control metas,
+        the values last published (initial state if none yet) and the availability
+        topics of all devices are collected first, then sent as QoS-1 retained
+        publishes with ``resync_concurrency`` in flight at a time. Control values are
+        read from the last-published cache when their publish goes out, not when the
+        list is collected, so a newer value published meanwhile is never overwritten.
+        """
+        started = time.monotonic()
+        entries = list(self._active_devices.values())
+        messages = [m for entry in entries for m in self._retained_messages(entry)]
+        acked, failed = await self._publish_pipelined(messages)
+        report = ResyncReport(
+            devices=len(entries),
+            messages=len(messages),
+            acked=acked,
+            failed=failed,
+            duration_ms=round((time.monotonic() - started) * 1000.0, 2),
+        )
+        self.last_resync = report
+        self.resync_count += 1
+        log = logger.warning if failed else logger.info
+        log(
+            f"WB resync #{self.resync_count}: {report.messages} retained messages for "
+            f"{report.devices} devices in {report.duration_ms}ms ({report.acked} acked, {report.failed} failed)"
+        )
+        return report
+
+    def _retained_messages(self, entry: Dict[str, Any]) -> Iterable[RetainedMessage]:
+        """Every retained message that makes up one WB device, in publish order."""
+        wb_device_id = entry["wb_device_id"]
+        base = f"/devices/{wb_device_id}"
+        device_meta = entry.get("device_meta") or self._wb_device_meta_payload(
+            entry["device_name"], entry["driver_name"], entry["device_type"]
+        )
+        yield f"{base}/meta", device_meta, None
+        for control_name, control in (entry.get("controls") or {}).items():
+            yield f"{base}/controls/{control_name}/meta", json.dumps(control["meta"]), None
+            yield f"{base}/controls/{control_name}", partial(
+                self._current_control_value, wb_device_id, control_name, control
+            ), (wb_device_id, control_name)
+        yield f"{base}/meta/online", "1", None
+        yield f"{base}/meta/available", "1", None
+
+    def _current_control_value(self, wb_device_id: str, control_name: str, control: Dict[str, Any]) -> str:
+        """The value last published for a control (its initial state if none yet)."""
+        key = (wb_device_id, control_name)
+        value = self._published_values.get(key)
+        if value is None:
+            value = self._published_values[key] = str(control["initial_state"]) or "0"
+        return value
+
+    async def _publish_pipelined(self, messages: List[RetainedMessage]) -> Tuple[int, int]:
+        """Publish retained QoS-1 ``messages`` through ``resync_concurrency`` workers.
+
+        Returns ``(acked, failed)``. Ordering between different topics is not kept;
+        every topic appears once, so the broker ends up with the same retained set.
+        """
+        pending = iter(messages)
+        acked = failed = 0
+
+        async def worker() -> None:
+            nonlocal acked, failed
+            for topic, payload, key in pending:
+                try:
+                    if callable(payload):
+                        payload = payload()
+                    ok = await self.message_bus.publish_confirmed(topic, payload, qos=1, retain=True)
+                except Exception as e:
+                    logger.error(f"Error republishing {topic}: {str(e)}")
+                    ok = False
+                if ok:
+                    acked += 1
+                else:
+                    failed += 1
+                    if key is not None:
+                        self._forget_published_value(key, payload)
+
+        workers = min(self.resync_concurrency, len(messages))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return acked, failed
+
     # Private methods - extracted and adapted from BaseDevice
     
     async def _publish_wb_device_meta(self, device_id: str, device_name: str, driver_name: str, device_type: Optional[str]):
         """Publish WB device metadata."""
+        topic = f"/devices/{device_id}/meta"
+        payload = self._wb_device_meta_payload(device_name, driver_name, device_type)
+        await self.message_bus.publish(topic, payload, retain=True, qos=1)
+        logger.debug(f"Published WB device meta for {device_id}")
+
+    @staticmethod
+    def _wb_device_meta_payload(device_name: str, driver_name: str, device_type: Optional[str]) -> str:
         device_meta = {
             "driver": driver_name,
             "title": {"en": device_name}
         }
-        
         if device_type:
             device_meta["type"] = device_type
-        
-        topic = f"/devices/{device_id}/meta"
-        await self.message_bus.publish(topic, json.dumps(device_meta), retain=True, qos=1)
-        logger.debug(f"Published WB device meta for {device_id}")
+        return json.dumps(device_meta)
     
     def build_wb_controls_from_config(
         self,
@@ -446,10 +566,21 @@ class WBVirtualDeviceService:
             }
         return controls
 
-    async def _publish_wb_control_metas(self, device_id: str, config: Union[BaseDeviceConfig, Dict[str, Any]], capabilities: Any = None):
-        """Publish WB control metadata for configured commands only."""
+    async def _publish_wb_control_metas(
+        self,
+        device_id: str,
+        config: Union[BaseDeviceConfig, Dict[str, Any]],
+        capabilities: Any = None,
+        controls: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """Publish WB control metadata for configured commands only.
+
+        ``controls`` is a precompiled ``build_wb_controls_from_config`` result; built
+        from ``config``/``capabilities`` when omitted."""
         try:
-            for control_name, control in self.build_wb_controls_from_config(config, capabilities).items():
+            if controls is None:
+                controls = self.build_wb_controls_from_config(config, capabilities)
+            for control_name, control in controls.items():
                 # Publish control metadata
                 meta_topic = f"/devices/{device_id}/controls/{control_name}/meta"
                 await self.message_bus.publish(meta_topic, json.dumps(control["meta"]), retain=True, qos=1)
@@ -457,7 +588,9 @@ class WBVirtualDeviceService:
                 # Publish initial control state. Never publish an empty retained payload —
                 # that clears the retained value and the WB UI won't render the control.
                 state_topic = f"/devices/{device_id}/controls/{control_name}"
-                await self.message_bus.publish(state_topic, str(control["initial_state"]) or "0", retain=True, qos=1)
+                initial = str(control["initial_state"]) or "0"
+                await self.message_bus.publish(state_topic, initial, retain=True, qos=1)
+                self._published_values[(device_id, control_name)] = initial
 
                 logger.debug(f"Published WB control meta for {device_id}/{control_name}")
 
@@ -798,11 +931,53 @@ class WBVirtualDeviceService:
             # Never publish an empty retained payload — it clears the retained value and the
             # WB UI then drops the control. Substitute "0" for an empty/None state update.
             safe_payload = payload if (payload is not None and payload != "") else "0"
-            await self.message_bus.publish(state_topic, safe_payload, retain=True, qos=1)
+            key = (device_id, control_name)
+            if self._published_values.get(key) == safe_payload:
+                self.published_value_hits += 1
+                return
+            self.published_value_misses += 1
+            # Cached before the publish goes out: a resync worker sending this control
+            # meanwhile must republish the new value, not the one it replaces.
+            self._published_values[key] = safe_payload
+            try:
+                ok = await self.message_bus.publish_confirmed(state_topic, safe_payload, qos=1, retain=True)
+            except Exception:
+                self._forget_published_value(key, safe_payload)
+                raise
+            if not ok:
+                self._forget_published_value(key, safe_payload)
+                logger.warning(f"WB control state for {device_id}/{control_name} not confirmed by the broker")
+                return
             logger.debug(f"Updated WB control state for {device_id}/{control_name}: {safe_payload}")
         except Exception as e:
             logger.error(f"Error updating WB control state for {device_id}/{control_name}: {str(e)}")
 
+    def _forget_published_value(self, key: Tuple[str, str], payload: Any) -> None:
+        """Drop a cached value whose publish failed — unknown on the broker, so the next
+        write must go out. A newer value cached meanwhile is left alone."""
+        if self._published_values.get(key) == payload:
+            del self._published_values[key]
+
+    def invalidate_published_values(self, wb_device_id: Optional[str] = None) -> None:
+        """Forget the last-published control values (of one WB device, or all).
+
+        Anything previously published that may no longer be retained by the broker
+        must not suppress the next write.
+        """
+        if wb_device_id is None:
+            self._published_values.clear()
+            return
+        for key in [k for k in self._published_values if k[0] == wb_device_id]:
+            del self._published_values[key]
+
+    def published_value_stats(self) -> Dict[str, int]:
+        """Hit/miss counters of the last-published value cache."""
+        return {
+            "hits": self.published_value_hits,
+            "misses": self.published_value_misses,
+            "entries": len(self._published_values),
+        }
+
     # ------------------------------------------------------------------------
     # Invariant B chokepoint: republish WB control value topics after device state changes.
     # Registered as a state-change callback on every WB-enabled device by BaseDevice
@@ -853,8 +1028,11 @@ class WBVirtualDeviceService:
                 logger.warning(f"Cannot extract state dict from {type(state_obj).__name__} for {device_id}")
                 return
 
-            config = device_info["config"]
-            field_to_controls = self._build_state_field_to_control_map(config)
+            field_to_controls = device_info.get("state_field_controls")
+            if field_to_controls is None:
+                field_to_controls = device_info["state_field_controls"] = (
+                    self._build_state_field_to_control_map(device_info["config"])
+                )
 
             for field in changed_fields:
                 control_names = field_to_controls.get(field)
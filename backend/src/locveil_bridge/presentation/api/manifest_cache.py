@@ -0,0 +1,122 @@
+"""Pre-serialized, generation-keyed cache for the config-derived GET payloads.
+
+``/system/catalog``, ``/devices/{id}/layout`` and ``/scenario/{id}/layout`` are pure
+projections of configs + capability maps: ``build_catalog`` re-projects every device
+and SHA-256-hashes the result, the layout engine re-places every control. Their
+inputs only change on ``/reload``, yet the UI and Irene poll them.
+
+``ManifestCache`` builds each payload once per *config generation* (a counter the
+reload service bumps after every reload), keeps the JSON bytes plus a strong ETag,
+and answers ``If-None-Match`` with ``304 Not Modified``. A generation change drops
+every entry at once, so a device removed by a reload cannot be served stale.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedManifest:
+    """One serialized payload: the model it came from, its JSON bytes and ETag."""
+
+    model: Any
+    body: bytes
+    etag: str
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 ``If-None-Match``: ``*`` or any listed tag (weak comparison)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ManifestCache:
+    """``key -> CachedManifest`` for the current config generation.
+
+    Args:
+        generation: Returns the current config generation. Anything that changes
+            the inputs of a cached payload must bump it.
+    """
+
+    def __init__(self, generation: Optional[Callable[[], int]] = None):
+        self._generation_source: Callable[[], int] = generation or (lambda: 0)
+        self._generation: Optional[int] = None
+        self._entries: Dict[Hashable, CachedManifest] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def set_generation_source(self, generation: Callable[[], int]) -> None:
+        """Re-point the generation counter (the reload service exists after the routers)."""
+        self._generation_source = generation
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._entries.clear()
+        self._generation = None
+
+    def get(
+        self, key: Hashable, build: Callable[[], BaseModel], exclude_none: bool = False
+    ) -> CachedManifest:
+        """The cached payload for ``key``, building and serializing it on a miss.
+
+        Serialized the way FastAPI renders a ``response_model`` (by alias), so the
+        bytes are identical in content to the uncached response. A ``build`` that
+        raises caches nothing.
+        """
+        generation = self._generation_source()
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        model = build()
+        body = model.model_dump_json(by_alias=True, exclude_none=exclude_none).encode()
+        entry = CachedManifest(model=model, body=body, etag=_etag(body))
+        self._entries[key] = entry
+        return entry
+
+    def respond(
+        self,
+        request: Request,
+        key: Hashable,
+        build: Callable[[], BaseModel],
+        exclude_none: bool = False,
+    ) -> Response:
+        """``200`` with the cached bytes, or ``304`` when ``If-None-Match`` matches."""
+        entry = self.get(key, build, exclude_none=exclude_none)
+        # no-cache: clients may store it but must revalidate, which costs them a 304.
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "generation": self._generation,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Global cache shared by the system, devices and scenarios routers.
+manifest_cache = ManifestCache()
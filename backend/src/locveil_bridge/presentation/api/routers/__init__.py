@@ -9,9 +9,10 @@ This package contains FastAPI router modules that organize API endpoints by func
 - rooms: Room management endpoints (/room/*)
 - state: State-related endpoints (/devices/*/state, /devices/*/persisted_state, /devices/persisted_states, /scenario/state)
 - events: Server-Sent Events endpoints (/events/devices, /events/scenarios, /events/system)
+- metrics: Prometheus text-format metrics (/metrics)
 """
 
-from . import system, devices, mqtt, scenarios, rooms, state, events, reports
+from . import system, devices, mqtt, scenarios, rooms, state, events, reports, metrics
 
 __all__ = [
     "system",
@@ -20,5 +21,6 @@ __all__ = [
     "scenarios",
     "rooms",
     "state",
-    "events"
+    "events",
+    "metrics",
 ] 
\ No newline at end of file
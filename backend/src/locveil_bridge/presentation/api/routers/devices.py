@@ -2,7 +2,7 @@ import asyncio
 import logging
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
 
 from locveil_bridge.domain.devices.config import BaseDeviceConfig
 from locveil_bridge.domain.scenarios.proxy import (
@@ -19,6 +19,7 @@ from locveil_bridge.presentation.api.schemas import (
 )
 from locveil_bridge.presentation.api.layout_engine import build_device_manifest
 from locveil_bridge.presentation.api.layout_manifest import LayoutManifest
+from locveil_bridge.presentation.api.manifest_cache import manifest_cache
 from locveil_bridge.domain.devices.types import CommandResponse
 from locveil_bridge.domain.capabilities.models import RESERVED_PARAMS
 
@@ -131,6 +132,7 @@ def initialize(cfg_manager, dev_manager, mqt_client, scenario_prx=None):
     device_manager = dev_manager
     mqtt_client = mqt_client
     scenario_proxy = scenario_prx
+    manifest_cache.invalidate()  # new managers = new manifest inputs
 
 @router.get("/config/device/{device_id}", response_model=BaseDeviceConfig)
 async def get_device_config(device_id: str):
@@ -624,9 +626,9 @@ async def dispatch_device_canonical(
             state=state, error=None, executed_on=executed_on,
         )
     finally:
-        callbacks = getattr(device, "_state_change_callbacks", None)
-        if callbacks is not None and _waiter in callbacks:
-            callbacks.remove(_waiter)
+        unregister = getattr(device, "unregister_state_change_callback", None)
+        if unregister is not None:
+            unregister(_waiter)
 
 
 _OPTIONS_KIND_TO_CAPABILITY = {"inputs": "input", "apps": "apps"}
@@ -671,20 +673,25 @@ async def get_device_options(device_id: str, kind: str):
 
 
 @router.get("/devices/{device_id}/layout", response_model=LayoutManifest, response_model_exclude_none=True)
-async def get_device_layout(device_id: str):
+async def get_device_layout(device_id: str, request: Request):
     """Layer-3 layout manifest for a device — the backend-computed remote layout the UI renders at
     runtime (replaces build-time codegen). Built from the device's capability map by the placement
     engine (``presentation/api/layout_engine.py``).
 
     ``response_model_exclude_none=True`` omits null fields so the payload matches the build-time
     codegen contract (absent = not present). The UI checks ``content.xDropdown !== undefined``; an
-    explicit ``null`` would read as "present" and trigger a spurious fetch (Step-2 hardening)."""
+    explicit ``null`` would read as "present" and trigger a spurious fetch (Step-2 hardening).
+
+    Served from the manifest cache (built once per config generation) with a strong ETag;
+    ``If-None-Match`` gets a 304."""
     if not device_manager:
         raise HTTPException(status_code=503, detail="Service not fully initialized")
     device = device_manager.devices.get(device_id)
     if device is None:
         raise HTTPException(status_code=404, detail=f"Device {device_id} not found")
     try:
-        return build_device_manifest(device)
+        return manifest_cache.respond(
+            request, ("device_layout", device_id), lambda: build_device_manifest(device), exclude_none=True
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to build layout manifest: {e}")
\ No newline at end of file
@@ -0,0 +1,19 @@
+"""``GET /metrics`` — the in-process metrics registry in Prometheus text format.
+
+Scraped by Prometheus (or read with curl); not part of the UI/Irene REST contract,
+so it is left out of the OpenAPI schema. See ``utils/metrics.py`` for the registry.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from locveil_bridge.utils.metrics import registry
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
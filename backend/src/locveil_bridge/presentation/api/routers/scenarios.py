@@ -1,16 +1,18 @@
 import logging
 from typing import Dict, Any, List, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
 
 from locveil_bridge.domain.scenarios.models import ScenarioDefinition
+from locveil_bridge.domain.scenarios.reconciler import critical_path_eta_ms
 from locveil_bridge.domain.scenarios.scenario import ScenarioError, ScenarioExecutionError
 from locveil_bridge.domain.scenarios.service import ScenarioManager
 from locveil_bridge.domain.rooms.service import RoomManager
 
 from locveil_bridge.presentation.api.layout_engine import build_scenario_manifest
 from locveil_bridge.presentation.api.layout_manifest import LayoutManifest
+from locveil_bridge.presentation.api.manifest_cache import manifest_cache
 
 # Note: the module-level mqtt_client global is typed Any deliberately --
 # importing the concrete MQTTClient class from infrastructure here would
@@ -39,6 +41,7 @@ def initialize(scenario_mgr: ScenarioManager, room_mgr: RoomManager, mqt_client:
     scenario_manager = scenario_mgr
     room_manager = room_mgr
     mqtt_client = mqt_client
+    manifest_cache.invalidate()  # new managers = new manifest inputs
 
 
 def _require_scenario_manager() -> ScenarioManager:
@@ -159,19 +162,26 @@ async def get_scenario_definition(id: str):
 
 
 @router.get("/scenario/{id}/layout", response_model=LayoutManifest, response_model_exclude_none=True)
-async def get_scenario_layout(id: str):
+async def get_scenario_layout(id: str, request: Request):
     """Layer-3 layout manifest for a scenario — the composite remote (one renderer;
     controls carry their canonical capability/action and dispatch against the manifest's
     `canonicalEntityId`; the power zone is the scenario lifecycle). Built from the
     scenario definition + the role devices' capability maps by the placement engine. The
-    `inputs` role is intentionally not rendered (reconciler-derived)."""
+    `inputs` role is intentionally not rendered (reconciler-derived). Cached per config
+    generation with a strong ETag, like the device layout."""
     check_initialized()
     assert scenario_manager is not None  # narrowed by check_initialized() above
     sdef = scenario_manager.scenario_definitions.get(id)
     if sdef is None:
         raise HTTPException(status_code=404, detail=f"Scenario '{id}' not found")
     try:
-        return build_scenario_manifest(sdef, scenario_manager.device_manager)
+        device_manager = scenario_manager.device_manager
+        return manifest_cache.respond(
+            request,
+            ("scenario_layout", id),
+            lambda: build_scenario_manifest(sdef, device_manager),
+            exclude_none=True,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to build scenario layout manifest: {e}")
 
@@ -187,16 +197,6 @@ def _plan_step(action: Any) -> ReconcilePlanStep:
     )
 
 
-def _eta_ms(actions: List[Any]) -> int:
-    """Worst-case wall clock for a forced chain: pre-delays + per-action gate
-    (feedback devices may poll up to poll_timeout_ms; no-feedback wait delay_ms)."""
-    total = 0
-    for a in actions:
-        total += a.pre_delay_ms
-        total += a.poll_timeout_ms if (a.feedback and a.poll_timeout_ms) else a.delay_ms
-    return total
-
-
 @router.get("/scenario/{id}/reconcile_preview", response_model=ReconcilePreviewResponse)
 async def get_reconcile_preview(id: str):
     """Believed-vs-desired state per involved device of the ACTIVE scenario, plus the
@@ -227,7 +227,7 @@ async def get_reconcile_preview(id: str):
             in_sync=p.in_sync,
             reconcilable=bool(p.plan.actions),
             steps=[_plan_step(a) for a in p.plan.actions],
-            eta_ms=_eta_ms(p.plan.actions),
+            eta_ms=critical_path_eta_ms(p.plan, mgr.device_manager.devices),
         ))
     return ReconcilePreviewResponse(scenario_id=id, devices=rows)
 
@@ -1,7 +1,7 @@
 import logging
 from typing import Dict, Any, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from pydantic import RootModel
 
 from locveil_bridge.domain.devices.models import BaseDeviceState
@@ -115,26 +115,23 @@ async def get_all_persisted_states():
     try:
         # Get all device IDs
         device_ids = device_manager.get_all_devices() if device_manager else []
-        
-        # Create an empty result dictionary
-        result = {}
-        
-        # For each device, try to get its persisted state
-        for device_id in device_ids:
-            try:
-                state = await state_store.get(f"device:{device_id}")
-                if state:
-                    result[device_id] = state
-            except Exception as e:
-                logger.warning(f"Error retrieving persisted state for device {device_id}: {str(e)}")
-                # Continue with other devices even if one fails
-                continue
-        
-        return result
+
+        # One bulk read for every device (undecodable entries are logged and skipped)
+        stored = await state_store.load_many([f"device:{device_id}" for device_id in device_ids])
+        return {
+            device_id: stored[f"device:{device_id}"]
+            for device_id in device_ids
+            if stored.get(f"device:{device_id}")
+        }
     except Exception as e:
         logger.error(f"Error retrieving all persisted states: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+def _scenario_state_response(scenario_id: str) -> Response:
+    """The scenario's state as the manager's cached JSON (the shape of ``ScenarioState``)."""
+    assert scenario_manager is not None
+    return Response(content=scenario_manager.get_scenario_state_json(scenario_id), media_type="application/json")
+
 @router.get("/scenario/state", response_model=ScenarioState)
 async def get_scenario_state(room: Optional[str] = Query(None, description="Room to read the active scenario of")):
     """
@@ -158,7 +155,7 @@ async def get_scenario_state(room: Optional[str] = Query(None, description="Room
         active = scenario_manager.active_in_room(room)
         if not active:
             raise HTTPException(status_code=404, detail=f"No active scenario in room '{room}'")
-        return scenario_manager.get_scenario_state(active.scenario_id)
+        return _scenario_state_response(active.scenario_id)
 
     active_all = list(scenario_manager.active.values())
     if not active_all:
@@ -169,8 +166,7 @@ async def get_scenario_state(room: Optional[str] = Query(None, description="Room
             detail=f"Multiple rooms have active scenarios ({sorted(scenario_manager.active)}); pass ?room=",
         )
 
-    # Always recompute live from device states. The manager holds no scenario-state snapshot.
-    return scenario_manager.get_scenario_state(active_all[0].scenario_id)
+    return _scenario_state_response(active_all[0].scenario_id)
 
 @router.get("/scenario/{scenario_id}/state", response_model=ScenarioState)
 async def get_specific_scenario_state(scenario_id: str):
@@ -194,8 +190,7 @@ async def get_specific_scenario_state(scenario_id: str):
         raise HTTPException(status_code=503, detail="Service not fully initialized")
     
     try:
-        scenario_state = scenario_manager.get_scenario_state(scenario_id)
-        return scenario_state
+        return _scenario_state_response(scenario_id)
         
     except ValueError as e:
         # scenario_id doesn't exist
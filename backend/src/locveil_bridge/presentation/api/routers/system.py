@@ -1,8 +1,9 @@
 import logging
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
 
 from locveil_bridge.presentation.api.catalog import build_catalog
+from locveil_bridge.presentation.api.manifest_cache import manifest_cache
 from locveil_bridge.presentation.api.schemas import (
     CatalogResponse,
     SystemConfigResponse,
@@ -44,6 +45,7 @@ def initialize(cfg_manager, dev_manager, mqt_client, state_st=None, scenario_mgr
     scenario_manager = scenario_mgr
     room_manager = room_mgr
     scenario_proxy = scenario_prx
+    manifest_cache.invalidate()  # new managers = new catalog inputs
 
 def set_reload_service(service):
     """Wire the app-layer reload service (CORE-1). Separate from initialize()
@@ -78,12 +80,15 @@ async def get_system_info():
         room_definitions = room_manager.list()
         rooms = [room.room_id for room in room_definitions]
     
+    timeline = device_manager.startup_timeline
+
     return SystemInfo(
         version="1.0.0",
         mqtt_broker=config_manager.get_mqtt_broker_config(),
         devices=device_manager.get_all_devices(),
         scenarios=scenarios,
-        rooms=rooms
+        rooms=rooms,
+        startup=timeline.to_dict() if timeline else None,
     )
 
 @router.get("/config/system", response_model=SystemConfigResponse)
@@ -103,7 +108,7 @@ async def get_system_config():
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/system/catalog", response_model=CatalogResponse)
-async def get_system_catalog():
+async def get_system_catalog(request: Request):
     """Voice-friendly catalog of devices + rooms.
 
     Flat capability-shaped projection of the whole house for any non-UI consumer
@@ -115,12 +120,27 @@ async def get_system_catalog():
 
     NOT the Layer-3 layout manifest -- that one is UI-shaped (panels, sliders,
     positions). The catalog is the contract for capability-aware callers.
+
+    Built once per config generation and served as cached bytes; the ETag is strong
+    and `If-None-Match` gets a 304, so polling costs no projection.
     """
     if not device_manager or not room_manager:
         raise HTTPException(status_code=503, detail="Service not fully initialized")
+    return manifest_cache.respond(request, _CATALOG_KEY, _build_catalog)
+
+
+_CATALOG_KEY = ("catalog",)
+
+
+def _build_catalog() -> CatalogResponse:
     return build_catalog(device_manager, room_manager, scenario_proxy)
 
 
+def current_catalog() -> CatalogResponse:
+    """The catalog for the current config generation (cached; see `manifest_cache`)."""
+    return manifest_cache.get(_CATALOG_KEY, _build_catalog).model
+
+
 @router.post("/reload", response_model=ReloadResponse)
 async def reload_system(background_tasks: BackgroundTasks):
     """Reload configurations and device modules."""
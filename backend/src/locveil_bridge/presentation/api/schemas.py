@@ -351,6 +351,30 @@ class CatalogResponse(BaseModel):
     rooms: List[CatalogRoom]
     devices: List[CatalogDevice]
 
+class DeviceSetupTiming(BaseModel):
+    """One device's bring-up in the startup timeline."""
+    device_id: str
+    device_class: str
+    status: Literal["pending", "ready", "failed", "connecting"] = Field(
+        ...,
+        description="`connecting` = setup outlasted the startup timeout and continues in the "
+                    "background; it later turns `ready` or `failed`.",
+    )
+    queued_ms: float = Field(..., description="Wait for a setup slot, from the start of device bring-up")
+    restore_ms: float = Field(..., description="Restoring the persisted state")
+    setup_ms: Optional[float] = Field(None, description="setup() duration; null while still running")
+    background: bool = Field(False, description="Setup finished (or is running) after bring-up stopped waiting")
+
+
+class StartupTimeline(BaseModel):
+    """Per-device setup durations of the last device bring-up (startup or /reload)."""
+    started_at: str
+    concurrency: int = Field(..., description="Devices set up concurrently")
+    setup_timeout_s: Optional[float] = Field(None, description="Per-device wait before continuing in the background")
+    total_ms: Optional[float] = Field(None, description="Until every device finished or was backgrounded")
+    devices: List[DeviceSetupTiming] = Field(default_factory=list)
+
+
 class SystemInfo(BaseModel):
     """Schema for system information."""
     version: str = __version__
@@ -358,6 +382,7 @@ class SystemInfo(BaseModel):
     devices: List[str] = Field(default_factory=list, description="List of available devices")
     scenarios: List[str] = Field(default_factory=list, description="List of available scenarios")
     rooms: List[str] = Field(default_factory=list, description="List of available rooms")
+    startup: Optional[StartupTimeline] = Field(None, description="Device bring-up timeline; null before the first bring-up")
 
 class ServiceInfo(BaseModel):
     """Schema for service information."""
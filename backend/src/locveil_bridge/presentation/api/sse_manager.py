@@ -1,22 +1,62 @@
+"""Server-Sent Events fan-out.
+
+Each channel keeps a bounded, append-only log of events that are serialized to
+bytes exactly once, when published. A subscriber is just a cursor (the next
+sequence number it wants) into that log, so ``broadcast`` never waits on any
+client: a stalled tab simply falls behind. When a cursor drops off the back of
+the ring, the subscriber gets a single ``resync`` event (refetch your state) and
+jumps to the head instead of replaying a gap it can no longer see.
+
+Event ids are ``<epoch>-<seq>``, with ``epoch`` fixed per process. A reconnecting
+EventSource sends its last id in the ``Last-Event-ID`` header; if that id is still
+in the log, the stream replays everything after it, otherwise (evicted, or from a
+previous process) it starts with ``resync``.
+
+A channel may register a snapshot provider (the devices channel does: one full
+``state_change`` per device). Its events are sent, id-less, to every stream that
+starts fresh or resyncs, so the client has a baseline for the deltas that follow.
+"""
+
 import asyncio
+import itertools
 import json
 import logging
-from typing import Dict, Set, Any, Optional
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Set, Any, Optional, Tuple
 from datetime import datetime
 from enum import Enum
 from fastapi import Request
 from fastapi.responses import StreamingResponse
 
 from locveil_bridge.domain.ports import EventPublisherPort
+from locveil_bridge.utils.metrics import registry
 
 logger = logging.getLogger(__name__)
 
+_SUBSCRIBERS = registry.gauge("locveil_sse_subscribers", "Open SSE streams", ("channel",))
+_QUEUE_DEPTH = registry.gauge(
+    "locveil_sse_queue_depth", "Events the slowest subscriber of a channel has not read yet", ("channel",)
+)
+_EVENTS = registry.counter("locveil_sse_events_total", "Events broadcast", ("channel",))
+_DROPPED = registry.counter(
+    "locveil_sse_dropped_events_total", "Events lagging subscribers lost to the ring (replaced by a resync)", ("channel",)
+)
+_RESYNCS = registry.counter("locveil_sse_resyncs_total", "resync events sent", ("channel", "reason"))
+
 class SSEChannel(str, Enum):
     """Available SSE channels"""
     DEVICES = "devices"
     SCENARIOS = "scenarios" 
     SYSTEM = "system"
 
+# Events retained per channel for slow subscribers and Last-Event-ID resume.
+DEFAULT_LOG_SIZE = 256
+
+# `() -> [(event_type, data), ...]`: the full current state of a channel.
+SnapshotProvider = Callable[[], List[Tuple[str, Any]]]
+
 class SSEEvent:
     """Represents a Server-Sent Event"""
     
@@ -27,11 +67,15 @@ class SSEEvent:
         self.id = id or str(int(datetime.now().timestamp() * 1000))
         self.timestamp = datetime.now()
     
-    def format(self) -> str:
-        """Format the event for SSE transmission with embedded event type"""
+    def format(self, include_id: bool = True) -> str:
+        """Format the event for SSE transmission with embedded event type.
+
+        Per-connection control events (``connected``, ``keepalive``) pass
+        ``include_id=False`` so they do not move the client's Last-Event-ID.
+        """
         lines = []
         
-        if self.id:
+        if include_id and self.id:
             lines.append(f"id: {self.id}")
         
         # Embed event type in the data payload instead of separate event field
@@ -59,16 +103,74 @@ class SSEEvent:
         # SSE events must end with CRLF double newline for proxy compatibility
         return "\r\n".join(lines) + "\r\n\r\n"
 
+class _ChannelLog:
+    """Ring of ``(seq, encoded event)`` for one channel, plus a wake-up event.
+
+    ``_appended`` is replaced on every append, so a reader that grabbed it before
+    finding nothing new cannot miss the wake-up for the next event.
+    """
+
+    def __init__(self, capacity: int):
+        self._entries: Deque[Tuple[int, bytes]] = deque(maxlen=capacity)
+        self.next_seq = 1
+        self._appended = asyncio.Event()
+
+    @property
+    def oldest_seq(self) -> int:
+        return self._entries[0][0] if self._entries else self.next_seq
+
+    def append(self, encoded: bytes) -> None:
+        self._entries.append((self.next_seq, encoded))
+        self.next_seq += 1
+        self._appended.set()
+        self._appended = asyncio.Event()
+
+    def read(self, cursor: int) -> List[bytes]:
+        """Encoded events with ``seq >= cursor`` (caller checks for lag first)."""
+        count = self.next_seq - cursor
+        if count <= 0:
+            return []
+        newest_first = itertools.islice(reversed(self._entries), count)
+        return [encoded for _, encoded in newest_first][::-1]
+
+    async def wait(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._appended.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+@dataclass(eq=False)
+class _Subscriber:
+    """One open stream: a cursor into its channel's log."""
+
+    channel: SSEChannel
+    cursor: int
+
+
 class SSEManager(EventPublisherPort):
     """Manages Server-Sent Event connections and broadcasting"""
     
-    def __init__(self):
-        # Active connections per channel
-        self._connections: Dict[SSEChannel, Set[asyncio.Queue]] = {
+    def __init__(self, log_size: int = DEFAULT_LOG_SIZE):
+        # Active subscribers per channel
+        self._connections: Dict[SSEChannel, Set[_Subscriber]] = {
             SSEChannel.DEVICES: set(),
             SSEChannel.SCENARIOS: set(),
             SSEChannel.SYSTEM: set()
         }
+        self._logs: Dict[SSEChannel, _ChannelLog] = {
+            channel: _ChannelLog(log_size) for channel in SSEChannel
+        }
+        # Process-unique prefix of every event id: a Last-Event-ID from before a
+        # restart can never be mistaken for a position in the new logs.
+        self._epoch = format(time.time_ns() // 1_000_000, "x")
+        self.resync_count = 0
+        self._events_sent = {channel: _EVENTS.labels(channel.value) for channel in SSEChannel}
+        self._events_dropped = {channel: _DROPPED.labels(channel.value) for channel in SSEChannel}
+        for channel in SSEChannel:
+            _SUBSCRIBERS.labels(channel.value).set_function(lambda c=channel: len(self._connections[c]))
+            _QUEUE_DEPTH.labels(channel.value).set_function(lambda c=channel: self._queue_depth(c))
+        self._snapshot_providers: Dict[SSEChannel, SnapshotProvider] = {}
         self._connection_lock = asyncio.Lock()
         self._shutdown_event = asyncio.Event()
         self._is_shutting_down = False
@@ -89,6 +191,27 @@ class SSEManager(EventPublisherPort):
         `server.should_exit`. Called once from app.main at startup."""
         self._uvicorn_server = server
 
+    def set_snapshot_provider(self, channel: SSEChannel, provider: Optional[SnapshotProvider]) -> None:
+        """Register (or, with None, drop) the full-state snapshot sent on connect/resync."""
+        if provider is None:
+            self._snapshot_providers.pop(channel, None)
+        else:
+            self._snapshot_providers[channel] = provider
+
+    def _snapshot_events(self, channel: SSEChannel) -> List[bytes]:
+        provider = self._snapshot_providers.get(channel)
+        if provider is None:
+            return []
+        try:
+            snapshot = provider()
+        except Exception as e:
+            logger.error(f"SSE snapshot provider for {channel.value} failed: {e}")
+            return []
+        return [
+            SSEEvent(event_type, data, channel).format(include_id=False).encode("utf-8")
+            for event_type, data in snapshot
+        ]
+
     def _shutdown_signaled(self) -> bool:
         """True if EITHER the in-process shutdown ran OR uvicorn was asked to
         exit. The uvicorn check is what makes 1st-Ctrl-C work — `should_exit`
@@ -102,16 +225,16 @@ class SSEManager(EventPublisherPort):
             return True
         return False
     
-    async def add_connection(self, channel: SSEChannel, queue: asyncio.Queue) -> None:
+    async def add_connection(self, channel: SSEChannel, subscriber: _Subscriber) -> None:
         """Add a new SSE connection to a channel"""
         async with self._connection_lock:
-            self._connections[channel].add(queue)
+            self._connections[channel].add(subscriber)
             logger.info(f"New SSE connection added to {channel.value} channel. Total: {len(self._connections[channel])}")
     
-    async def remove_connection(self, channel: SSEChannel, queue: asyncio.Queue) -> None:
+    async def remove_connection(self, channel: SSEChannel, subscriber: _Subscriber) -> None:
         """Remove an SSE connection from a channel"""
         async with self._connection_lock:
-            self._connections[channel].discard(queue)
+            self._connections[channel].discard(subscriber)
             logger.info(f"SSE connection removed from {channel.value} channel. Total: {len(self._connections[channel])}")
     
     async def publish_device_event(
@@ -121,39 +244,92 @@ class SSEManager(EventPublisherPort):
         await self.broadcast(SSEChannel.DEVICES, event_type, data, event_id)
 
     async def broadcast(self, channel: SSEChannel, event_type: str, data: Any, event_id: Optional[str] = None) -> None:
-        """Broadcast an event to all connections on a channel"""
-        if channel not in self._connections:
+        """Broadcast an event to all connections on a channel.
+
+        The event is encoded once and appended to the channel log; subscribers pick
+        it up at their own pace, so this never waits on a client. The SSE id is the
+        log position (``event_id`` is ignored: resume needs ids the log can find).
+        """
+        log = self._logs.get(channel)
+        if log is None:
             logger.warning(f"Unknown SSE channel: {channel}")
             return
-        
-        event = SSEEvent(event_type, data, channel, event_id)
-        formatted_event = event.format()
-        
-        async with self._connection_lock:
-            connections = self._connections[channel].copy()
-        
-        if not connections:
-            logger.debug(f"No active connections for {channel.value} channel")
-            return
-        
-        logger.debug(f"Broadcasting {event_type} event to {len(connections)} connections on {channel.value} channel")
-        
-        # Send to all active connections
-        dead_connections = set()
-        for queue in connections:
-            try:
-                await queue.put(formatted_event)
-            except Exception as e:
-                logger.warning(f"Failed to send event to connection: {e}")
-                dead_connections.add(queue)
-        
-        # Clean up dead connections
-        if dead_connections:
-            async with self._connection_lock:
-                for dead_queue in dead_connections:
-                    self._connections[channel].discard(dead_queue)
-            logger.info(f"Removed {len(dead_connections)} dead connections from {channel.value} channel")
+
+        event = SSEEvent(event_type, data, channel, self._event_id(log.next_seq))
+        log.append(event.format().encode("utf-8"))
+        self._events_sent[channel].inc()
+        logger.debug(
+            f"Broadcast {event_type} event #{log.next_seq - 1} to "
+            f"{len(self._connections[channel])} connections on {channel.value} channel"
+        )
+
+    def _event_id(self, seq: int) -> str:
+        return f"{self._epoch}-{seq}"
+
+    def _resume_cursor(self, channel: SSEChannel, last_event_id: Optional[str]) -> Tuple[int, Optional[str]]:
+        """Starting cursor for a new stream, and how it must begin.
+
+        No Last-Event-ID: live events only, after a snapshot (``"snapshot"``). A
+        Last-Event-ID still covered by the log: replay what followed it (None).
+        Anything else (evicted, foreign epoch, garbage): the client missed events we
+        no longer have, so start at the head with a resync (``"resync"``).
+        """
+        log = self._logs[channel]
+        if not last_event_id:
+            return log.next_seq, "snapshot"
+        epoch, _, seq_text = last_event_id.strip().rpartition("-")
+        try:
+            seq = int(seq_text)
+        except ValueError:
+            return log.next_seq, "resync"
+        if epoch != self._epoch or seq >= log.next_seq or seq + 1 < log.oldest_seq:
+            return log.next_seq, "resync"
+        return seq + 1, None
+
+    def _resync_events(self, channel: SSEChannel, reason: str, missed: Optional[int] = None) -> List[bytes]:
+        """Tell a subscriber its view is incomplete, followed by the channel snapshot.
+
+        The resync carries the id of the newest logged event (if any), so a
+        reconnect right after it resumes from the head instead of resyncing again.
+        """
+        self.resync_count += 1
+        _RESYNCS.labels(channel.value, reason).inc()
+        log = self._logs[channel]
+        data: Dict[str, Any] = {"channel": channel.value, "reason": reason}
+        if missed is not None:
+            data["missed"] = missed
+        head = log.next_seq - 1
+        event = SSEEvent("resync", data, channel, self._event_id(head) if head else None)
+        return [event.format(include_id=head > 0).encode("utf-8"), *self._snapshot_events(channel)]
+
+    def _read_events(self, subscriber: _Subscriber) -> List[bytes]:
+        """Everything published since the subscriber's cursor, advancing it.
+
+        A cursor the ring has already overwritten turns into one ``resync`` (plus
+        snapshot) and a jump to the head.
+        """
+        log = self._logs[subscriber.channel]
+        if subscriber.cursor < log.oldest_seq:
+            missed = log.oldest_seq - subscriber.cursor
+            subscriber.cursor = log.next_seq
+            self._events_dropped[subscriber.channel].inc(missed)
+            logger.info(f"SSE subscriber on {subscriber.channel.value} fell {missed}+ events behind; resyncing")
+            return self._resync_events(subscriber.channel, "lagged", missed)
+        events = log.read(subscriber.cursor)
+        subscriber.cursor = log.next_seq
+        return events
     
+    def _queue_depth(self, channel: SSEChannel) -> int:
+        next_seq = self._logs[channel].next_seq
+        return max((next_seq - s.cursor for s in self._connections[channel]), default=0)
+
+    def get_log_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-channel log position: next sequence number and retained events."""
+        return {
+            channel.value: {"next_seq": log.next_seq, "retained": log.next_seq - log.oldest_seq}
+            for channel, log in self._logs.items()
+        }
+
     async def get_channel_stats(self) -> Dict[str, int]:
         """Get connection statistics for all channels"""
         async with self._connection_lock:
@@ -222,10 +398,23 @@ class SSEManager(EventPublisherPort):
         return self._is_shutting_down
     
     async def create_event_stream(self, channel: SSEChannel, request: Request):
-        """Create an SSE event stream for a specific channel"""
-        queue = asyncio.Queue(maxsize=100)  # Limit queue size to prevent memory issues
+        """Create an SSE event stream for a specific channel.
+
+        Honors the ``Last-Event-ID`` request header (sent by EventSource on
+        reconnect) by replaying the logged events that followed it; a fresh stream
+        starts with the channel snapshot instead.
+        """
+        cursor, opening = self._resume_cursor(channel, request.headers.get("last-event-id"))
+        # Taken now, at the cursor position, so events after it apply on top.
+        if opening == "resync":
+            opening_events = self._resync_events(channel, "unknown_last_event_id")
+        elif opening == "snapshot":
+            opening_events = self._snapshot_events(channel)
+        else:
+            opening_events = []
+        subscriber = _Subscriber(channel=channel, cursor=cursor)
         
-        await self.add_connection(channel, queue)
+        await self.add_connection(channel, subscriber)
         
         async def event_generator():
             try:
@@ -235,7 +424,9 @@ class SSEManager(EventPublisherPort):
                     data={"message": f"Connected to {channel.value} channel", "timestamp": datetime.now().isoformat()},
                     channel=channel
                 )
-                yield welcome_event.format()
+                yield welcome_event.format(include_id=False)
+                if opening_events:
+                    yield b"".join(opening_events)
                 
                 while True:
                     # Quick shutdown check first. _shutdown_signaled() checks BOTH the in-process
@@ -255,12 +446,16 @@ class SSEManager(EventPublisherPort):
                         pass
 
                     try:
-                        # Try to get an event from the queue with a short timeout
-                        try:
-                            event_data = await asyncio.wait_for(queue.get(), timeout=1.0)
-                            yield event_data
-                        except asyncio.TimeoutError:
-                            # No events in queue, send keepalive and check shutdown again
+                        events = self._read_events(subscriber)
+                        if not events:
+                            # Nothing new: wait (briefly) for the next append
+                            await self._logs[channel].wait(timeout=1.0)
+                            events = self._read_events(subscriber)
+                        if events:
+                            # One write for the whole backlog
+                            yield b"".join(events)
+                        else:
+                            # Still nothing, send keepalive and check shutdown again
                             if self._shutdown_signaled():
                                 break
 
@@ -269,7 +464,7 @@ class SSEManager(EventPublisherPort):
                                 data={"timestamp": datetime.now().isoformat()},
                                 channel=channel
                             )
-                            yield keepalive_event.format()
+                            yield keepalive_event.format(include_id=False)
 
                     except Exception as e:
                         logger.error(f"Error processing SSE event for {channel.value}: {e}")
@@ -281,7 +476,7 @@ class SSEManager(EventPublisherPort):
             except Exception as e:
                 logger.error(f"Error in SSE event stream for {channel.value}: {e}")
             finally:
-                await self.remove_connection(channel, queue)
+                await self.remove_connection(channel, subscriber)
         
         # Create a wrapper generator that tracks the task
         async def tracked_event_generator():
@@ -306,7 +501,7 @@ class SSEManager(EventPublisherPort):
                 "Connection": "keep-alive",
                 "Access-Control-Allow-Origin": "*",
                 "Access-Control-Allow-Methods": "GET",
-                "Access-Control-Allow-Headers": "Cache-Control",
+                "Access-Control-Allow-Headers": "Cache-Control, Last-Event-ID",
                 "Access-Control-Expose-Headers": "Cache-Control, Content-Type"
             }
         )
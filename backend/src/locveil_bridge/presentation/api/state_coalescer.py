@@ -0,0 +1,135 @@
+"""Per-device coalescing of SSE ``state_change`` events into deltas.
+
+Every ``update_state`` publishes a full state snapshot; a pointer drag or slider
+on the iPad remote produces ~16 of them a second, each differing from the last in
+one field (``last_command``, ``volume``). ``DeviceStateCoalescer`` sits between the
+devices and ``SSEManager`` as their ``EventPublisherPort``:
+
+- ``state_change`` events are held per device for one frame (``frame_ms``); only
+  the newest state of each device survives the frame.
+- At the end of the frame each device's state is diffed against the one last
+  broadcast and sent as a ``state_delta`` event whose ``patch`` is a list of
+  JSON-patch (RFC 6902) operations on the top-level fields. Nothing changed =
+  nothing sent. A device's first state is sent as a full ``state_change``.
+- Clients get their baseline from the devices-channel snapshot that
+  ``SSEManager`` sends on connect and on resync (see ``install``).
+
+Any other device event (``action_success`` ...) flushes that device's pending
+delta first, so a client never sees an action result before the state it caused.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from locveil_bridge.domain.ports import EventPublisherPort
+from locveil_bridge.presentation.api.sse_manager import SSEChannel, SSEManager
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def _pointer(field: str) -> str:
+    """JSON pointer (RFC 6901) to a top-level field."""
+    return "/" + field.replace("~", "~0").replace("/", "~1")
+
+
+def state_patch(previous: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """JSON-patch operations turning ``previous`` into ``current`` (top-level fields)."""
+    patch: List[Dict[str, Any]] = []
+    for field, value in current.items():
+        old = previous.get(field, _MISSING)
+        if old is _MISSING:
+            patch.append({"op": "add", "path": _pointer(field), "value": value})
+        elif old != value:
+            patch.append({"op": "replace", "path": _pointer(field), "value": value})
+    for field in previous:
+        if field not in current:
+            patch.append({"op": "remove", "path": _pointer(field)})
+    return patch
+
+
+class DeviceStateCoalescer(EventPublisherPort):
+    """Frame-based ``state_change`` → ``state_delta`` stage in front of ``SSEManager``.
+
+    Args:
+        sse_manager: Where the (coalesced) events are broadcast.
+        frame_ms: Coalescing window. 0 sends every change immediately (still as a
+            delta against the previous broadcast).
+    """
+
+    def __init__(self, sse_manager: SSEManager, frame_ms: int = 50):
+        if frame_ms < 0:
+            raise ValueError(f"frame_ms must be >= 0, got {frame_ms}")
+        self._sse = sse_manager
+        self.frame_ms = frame_ms
+        # device_id -> newest full `state_change` payload not yet broadcast
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # device_id -> state dict last broadcast (the base of the next delta)
+        self._broadcast: Dict[str, Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.received_count = 0
+        self.sent_count = 0
+
+    async def publish_device_event(
+        self, event_type: str, data: Any, event_id: Optional[str] = None
+    ) -> None:
+        device_id = data.get("device_id") if isinstance(data, dict) else None
+        if event_type != "state_change" or device_id is None or not isinstance(data.get("state"), dict):
+            if device_id is not None and device_id in self._pending:
+                await self._send(device_id, self._pending.pop(device_id))
+            await self._sse.publish_device_event(event_type, data, event_id)
+            return
+
+        self.received_count += 1
+        if self.frame_ms == 0:
+            await self._send(device_id, data)
+            return
+        self._pending[device_id] = data
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_frame())
+
+    async def _flush_after_frame(self) -> None:
+        await asyncio.sleep(self.frame_ms / 1000.0)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Send every pending device state now."""
+        pending, self._pending = self._pending, {}
+        for device_id, data in pending.items():
+            await self._send(device_id, data)
+
+    async def _send(self, device_id: str, data: Dict[str, Any]) -> None:
+        state = data["state"]
+        previous = self._broadcast.get(device_id)
+        self._broadcast[device_id] = state
+        if previous is None:
+            await self._sse.publish_device_event("state_change", data)
+            self.sent_count += 1
+            return
+        patch = state_patch(previous, state)
+        if not patch:
+            return
+        await self._sse.publish_device_event(
+            "state_delta",
+            {
+                "device_id": device_id,
+                "device_name": data.get("device_name"),
+                "patch": patch,
+                "timestamp": data.get("timestamp"),
+            },
+        )
+        self.sent_count += 1
+
+    def install(self, states: Callable[[], Iterable[Dict[str, Any]]]) -> None:
+        """Register the devices-channel snapshot on the wrapped ``SSEManager``.
+
+        Args:
+            states: Returns the full ``state_change`` payload of every device.
+        """
+
+        def snapshot() -> List[Tuple[str, Any]]:
+            return [("state_change", data) for data in states()]
+
+        self._sse.set_snapshot_provider(SSEChannel.DEVICES, snapshot)
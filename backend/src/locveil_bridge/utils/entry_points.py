@@ -12,6 +12,25 @@ The vendored engine beside this file is a strict pin: byte-identical to
 locveil-commons `packages/core-py`, re-tag, re-pin.
 """
 
+import logging
+from importlib.metadata import EntryPoint, entry_points
+
 from locveil_bridge.utils.entry_point_loader import DynamicLoader
 
+logger = logging.getLogger(__name__)
+
 dynamic_loader = DynamicLoader()
+
+
+def entry_points_by_attr(namespace: str) -> dict[str, EntryPoint]:
+    """``{object name: entry point}`` for a group, WITHOUT importing anything.
+
+    Device configs name the driver CLASS (``device_class: "LgTv"``) while the
+    loader keys on entry-point names (``lg_tv``); the ``module:Class`` value of
+    each entry point bridges the two before anything is loaded.
+    """
+    try:
+        return {ep.attr: ep for ep in entry_points(group=namespace) if ep.attr}
+    except Exception as e:
+        logger.error(f"Entry-points enumeration failed for namespace '{namespace}': {e}")
+        return {}
@@ -0,0 +1,247 @@
+"""In-process metrics registry rendered in the Prometheus text format (``GET /metrics``).
+
+Deliberately small: counters, gauges and histograms, no client library. Everything runs
+on the one asyncio loop, so there are no locks. The hot paths pay for an attribute
+increment (counter), or a ``bisect`` plus two increments (histogram):
+
+- ``family.labels(*values)`` returns a *child* bound to one label set. Resolve it once
+  (at construction, or memoized in the caller's own dict) and keep it; the child's
+  ``inc`` / ``observe`` allocate nothing.
+- Values that already live in an object (queue depths, subscriber counts) are read
+  at scrape time by a gauge ``set_function`` instead of being pushed on every change.
+
+Families are registered by name in ``registry`` (the process-wide instance);
+registering an existing name again returns the existing family, so objects that get
+rebuilt (the MQTT client on ``/reload``) can bind the same metrics again.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar, Union
+
+# Seconds. Spans a WB-MQTT handler (sub-ms) to a scenario gate (tens of seconds).
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _label_block(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class GaugeChild:
+    __slots__ = ("value", "function")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        """Read the value from ``function`` at scrape time (None = back to ``set``)."""
+        self.function = function
+
+    def get(self) -> float:
+        if self.function is not None:
+            try:
+                return float(self.function())
+            except Exception:  # noqa: BLE001 - a broken probe must not fail the scrape
+                return math.nan
+        return self.value
+
+
+class HistogramChild:
+    __slots__ = ("_bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # per bucket (not cumulative); last = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self._bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+ChildT = TypeVar("ChildT", CounterChild, GaugeChild, HistogramChild)
+
+
+class _Family(ABC, Generic[ChildT]):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], ChildT] = {}
+
+    @abstractmethod
+    def _new_child(self) -> ChildT: ...
+
+    def labels(self, *values: str) -> ChildT:
+        """The child bound to ``values`` (one per label name), created on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def remove(self, *values: str) -> None:
+        """Drop one label set (e.g. a device that a reload removed)."""
+        self._children.pop(values, None)
+
+    def remove_matching(self, **labels: str) -> None:
+        """Drop every label set that carries all of ``labels`` (e.g. one device's
+        series across all of its actions)."""
+        positions = [(self.labelnames.index(name), value) for name, value in labels.items()]
+        for values in [v for v in self._children if all(v[i] == value for i, value in positions)]:
+            del self._children[values]
+
+    @abstractmethod
+    def _samples(self) -> List[str]: ...
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Family[CounterChild]):
+    kind = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_label_block(self.labelnames, values)} {_format_value(child.value)}"
+            for values, child in self._children.items()
+        ]
+
+
+class Gauge(_Family[GaugeChild]):
+    kind = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_label_block(self.labelnames, values)} {_format_value(child.get())}"
+            for values, child in self._children.items()
+        ]
+
+
+class Histogram(_Family[HistogramChild]):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def _samples(self) -> List[str]:
+        lines: List[str] = []
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), child.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_label_block(self.labelnames, values, le)} {cumulative}")
+            labels = _label_block(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+AnyFamily = Union[Counter, Gauge, Histogram]
+FamilyT = TypeVar("FamilyT", Counter, Gauge, Histogram)
+
+
+class MetricsRegistry:
+    """Named metric families, rendered together by ``render``."""
+
+    def __init__(self) -> None:
+        self._families: Dict[str, AnyFamily] = {}
+
+    def _register(self, family: FamilyT) -> FamilyT:
+        existing = self._families.get(family.name)
+        if existing is None:
+            self._families[family.name] = family
+            return family
+        if type(existing) is not type(family) or existing.labelnames != family.labelnames:
+            raise ValueError(f"Metric {family.name} is already registered with a different shape")
+        return existing  # type: ignore[return-value]
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[AnyFamily]:
+        return self._families.get(name)
+
+    def render(self) -> str:
+        """Every family in the Prometheus text exposition format (0.0.4)."""
+        return "\n".join(family.render() for family in self._families.values()) + "\n"
+
+
+# Process-wide registry served by GET /metrics.
+registry = MetricsRegistry()
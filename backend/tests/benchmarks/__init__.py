@@ -0,0 +1,5 @@
+"""Micro-benchmarks for bridge hot paths.
+
+Not collected by pytest (``bench_*.py``); run one from ``backend/`` with
+``python -m tests.benchmarks.<module>``.
+"""
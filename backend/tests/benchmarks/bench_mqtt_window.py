@@ -0,0 +1,82 @@
+"""Evidence capture: ``MqttWindow.record`` with the linear dedup scan vs the keyed window.
+
+Models a busy Wiren Board bus: a few hundred controls publishing values, a steady
+share of them repeating the same topic (sensor churn), at the window's default
+500-entry cap — every message used to scan the window for its previous entry.
+
+    python -m tests.benchmarks.bench_mqtt_window [--topics N] [--messages N]
+"""
+
+import argparse
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from locveil_bridge.domain.reports.rings import MqttWindow
+
+
+class _LinearWindow:
+    """The pre-index window: deque + linear scan per message."""
+
+    def __init__(self, max_age_s: int = 60, max_entries: int = 500):
+        self._max_age_s = max_age_s
+        self._max_entries = max_entries
+        self._entries: Deque[Dict[str, Any]] = deque()
+
+    def record(self, direction: str, topic: str, payload: str) -> None:
+        if not topic.startswith("/devices/"):
+            return
+        for i, e in enumerate(self._entries):
+            if e["topic"] == topic and e["direction"] == direction:
+                del self._entries[i]
+                break
+        self._entries.append({"ts": time.time(), "direction": direction, "topic": topic,
+                              "payload": payload})
+        cutoff = time.time() - self._max_age_s
+        while self._entries and self._entries[0]["ts"] < cutoff:
+            self._entries.popleft()
+        while len(self._entries) > self._max_entries:
+            self._entries.popleft()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return list(self._entries)
+
+
+def _stream(topics: int, messages: int) -> List[Tuple[str, str, str]]:
+    rng = random.Random(7)
+    names = [f"/devices/wb-dev_{i // 8}/controls/C{i % 8}" for i in range(topics)]
+    hot = names[: max(1, topics // 10)]  # 10% of controls produce most of the traffic
+    stream = []
+    for n in range(messages):
+        topic = rng.choice(hot) if rng.random() < 0.7 else rng.choice(names)
+        stream.append(("out" if n % 20 == 0 else "in", topic, str(rng.randint(0, 1000))))
+    return stream
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--topics", type=int, default=800, help="distinct /devices/ topics")
+    parser.add_argument("--messages", type=int, default=50000, help="messages recorded")
+    args = parser.parse_args()
+
+    stream = _stream(args.topics, args.messages)
+    results = {}
+    for name, window in (("linear", _LinearWindow()), ("keyed", MqttWindow())):
+        started = time.perf_counter()
+        for direction, topic, payload in stream:
+            window.record(direction, topic, payload)
+        results[name] = (time.perf_counter() - started) / len(stream) * 1e6
+        snapshot = [(e["direction"], e["topic"], e["payload"]) for e in window.snapshot()]
+        results[name + "_snapshot"] = snapshot
+    assert results["linear_snapshot"] == results["keyed_snapshot"]
+
+    print(f"{args.messages} messages over {args.topics} topics, window cap 500")
+    for name in ("linear", "keyed"):
+        per_msg = results[name]
+        print(f"  {name:>6}: {per_msg:8.2f} µs/message ({1e6 / per_msg:,.0f} messages/s)")
+    print(f"  speedup: {results['linear'] / results['keyed']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
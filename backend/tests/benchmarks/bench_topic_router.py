@@ -0,0 +1,76 @@
+"""Wildcard dispatch: linear ``_topic_matches`` scan vs the ``TopicRouter`` trie.
+
+Models the live broker: a few hundred exact WB-passthrough / command handlers,
+a handful of wildcard filters (``/devices/+/meta/error`` and friends), and an
+inbound stream of topics that miss the exact lookup — the path that used to scan
+every handler per message.
+
+    python -m tests.benchmarks.bench_topic_router [--handlers N] [--rounds N]
+"""
+
+import argparse
+import timeit
+from typing import Callable, Dict, List
+
+from locveil_bridge.infrastructure.mqtt.client import MQTTClient
+
+
+def _noop(topic: str, payload: str) -> None:
+    return None
+
+
+def _build_client(exact_handlers: int) -> MQTTClient:
+    client = MQTTClient({"host": "localhost", "port": 1883, "client_id": "bench", "auth": {}})
+    for i in range(exact_handlers):
+        client._set_handler(f"/devices/wb-dev_{i}/controls/K{i % 6}", _noop)
+        client._set_handler(f"/devices/bridge_dev_{i}/controls/cmd_{i}/on", _noop)
+    for wildcard in (
+        "/devices/+/meta/error",
+        "/devices/+/meta/driver",
+        "/devices/wb-msw-v3_1/controls/+",
+        "/devices/wb-mr6c_51/#",
+        "/wbrules/#",
+    ):
+        client._set_handler(wildcard, _noop)
+    return client
+
+
+def _linear(client: MQTTClient, topic: str) -> List[Callable]:
+    return [h for f, h in client.message_handlers.items() if client._topic_matches(f, topic)]
+
+
+def _trie(client: MQTTClient, topic: str) -> List[Callable]:
+    handlers: Dict[str, Callable] = client.message_handlers
+    return [handlers[f] for f in client._wildcard_router.match(topic)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--handlers", type=int, default=200, help="exact handlers per family")
+    parser.add_argument("--rounds", type=int, default=2000, help="passes over the topic stream")
+    args = parser.parse_args()
+
+    client = _build_client(args.handlers)
+    topics = [
+        "/devices/wb-msw-v3_1/controls/Temperature",
+        "/devices/lg_tv_living/meta/error",
+        "/devices/wb-mr6c_51/controls/K4",
+        "/devices/unrelated_sensor/controls/Illuminance",
+        "/wbrules/log/info",
+    ]
+    for topic in topics:
+        assert len(_linear(client, topic)) == len(_trie(client, topic)), topic
+
+    n = args.rounds * len(topics)
+    results = {}
+    for name, fn in (("linear", _linear), ("trie", _trie)):
+        elapsed = timeit.timeit(lambda: [fn(client, t) for t in topics], number=args.rounds)
+        results[name] = elapsed / n * 1e6
+    print(f"{len(client.message_handlers)} handlers, {len(client._wildcard_router)} wildcard filters")
+    for name, per_msg in results.items():
+        print(f"  {name:>6}: {per_msg:8.2f} µs/message")
+    print(f"  speedup: {results['linear'] / results['trie']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
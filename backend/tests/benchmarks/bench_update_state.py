@@ -0,0 +1,115 @@
+"""``BaseDevice.update_state``: full-state rebuild vs the per-field fast path, per state class.
+
+Every echo, sensor value and ``last_command`` bump goes through ``update_state``.
+It used to dump the state twice, rebuild it with full validation and sweep every
+field for serializability; now it validates and diffs only the incoming fields.
+Each state class in ``domain/devices/models.py`` gets a realistic update mix:
+a power flip, a ``last_command`` bump and an echo of the current value.
+
+    python -m tests.benchmarks.bench_update_state [--rounds N]
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union, get_args, get_origin
+
+
+from locveil_bridge.domain.devices import models
+from locveil_bridge.domain.devices.models import BaseDeviceState, LastCommand
+from locveil_bridge.infrastructure.config.models import BaseDeviceConfig
+from locveil_bridge.infrastructure.devices.base import BaseDevice
+
+STATE_CLASSES = [
+    models.KitchenHoodState,
+    models.LgTvState,
+    models.WirenboardIRState,
+    models.RevoxA77ReelToReelState,
+    models.AppleTVState,
+    models.AuralicDeviceState,
+    models.EmotivaXMC2State,
+    models.MitsubishiHvacState,
+    models.WbPassthroughState,
+]
+
+_SAMPLES = {str: "x", int: 0, float: 0.0, bool: False}
+
+
+class _Device(BaseDevice):
+    async def setup(self) -> bool:
+        return True
+
+    async def shutdown(self) -> bool:
+        return True
+
+
+def _sample(annotation: Any) -> Any:
+    if get_origin(annotation) is Union:
+        return None if type(None) in get_args(annotation) else _sample(get_args(annotation)[0])
+    return _SAMPLES.get(annotation, None)
+
+
+def _state(cls: type) -> BaseDeviceState:
+    values: Dict[str, Any] = {"device_id": "bench", "device_name": "Bench"}
+    for name, field in cls.model_fields.items():
+        if field.is_required() and name not in values:
+            values[name] = _sample(field.annotation)
+    return cls(**values)
+
+
+def _legacy_update_state(device: BaseDevice, **updates: Any) -> Optional[List[str]]:
+    """The pre-fast-path algorithm (minus notification)."""
+    is_valid, errors = device._validate_state_updates(updates)
+    previous_state = device.state.dict(exclude_unset=True)
+    updated_data = device.state.dict(exclude_unset=True)
+    updated_data.update(updates)
+    changed = [k for k, v in updates.items() if k not in previous_state or previous_state[k] != v]
+    if not changed:
+        return None
+    device.state = type(device.state)(**updated_data)
+    device.state.validate_serializable()
+    return changed
+
+
+def _updates(n: int) -> Dict[str, Any]:
+    kind = n % 3
+    if kind == 0:
+        return {"power": "on" if n % 2 else "off"}
+    if kind == 1:
+        return {"last_command": LastCommand(action="volume_up", source="api", timestamp=datetime.now())}
+    return {"power": "on" if (n - 2) % 2 else "off"}  # echo of the previous flip
+
+
+def _run(cls: type, rounds: int, legacy: bool) -> float:
+    device = _Device(BaseDeviceConfig(
+        device_id="bench", names={"ru": "Bench", "en": "Bench"}, device_class="Bench",
+        config_class="BaseDeviceConfig", commands={},
+    ))
+    device.state = _state(cls)
+    device._notify_state_change = lambda changed: None  # type: ignore[method-assign]
+    update = (lambda **u: _legacy_update_state(device, **u)) if legacy else device.update_state
+    batches = [_updates(n) for n in range(rounds)]
+    started = time.perf_counter()
+    for batch in batches:
+        update(**batch)
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000, help="updates per state class")
+    args = parser.parse_args()
+    logging.getLogger("locveil_bridge").setLevel(logging.INFO)
+
+    print(f"{args.rounds} updates per class (power flip / last_command / echo)")
+    print(f"  {'state class':<26} {'fields':>6} {'rebuild':>10} {'fast path':>10} {'speedup':>8}")
+    for cls in STATE_CLASSES:
+        legacy = _run(cls, args.rounds, legacy=True)
+        fast = _run(cls, args.rounds, legacy=False)
+        print(f"  {cls.__name__:<26} {len(cls.model_fields):>6} {legacy:7.1f} µs {fast:7.1f} µs "
+              f"{legacy / fast:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""WB value-topic publish per state change: map re-derived per update vs compiled at setup.
+
+Every ``update_state`` of a WB-emulated device ends in
+``WBVirtualDeviceService._async_publish_state_changes``. It used to rebuild the
+state-field → control map (and with it every control's meta/type/order) from the
+whole config on each call, so a sensor tick on a 60-command device cost 60 control
+derivations. Now the map is compiled in ``setup_wb_device_from_config``.
+
+    python -m tests.benchmarks.bench_wb_state_publish [--updates N]
+"""
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Dict
+
+from locveil_bridge.infrastructure.wb_device.service import WBVirtualDeviceService
+
+
+class _NullBus:
+    async def publish(self, topic: str, payload: str, retain: bool = False, qos: int = 0) -> None:
+        return None
+
+
+def _config(commands: int) -> Dict[str, Any]:
+    cmds: Dict[str, Any] = {
+        "volume": {"action": "volume", "params": [
+            {"name": "level", "type": "range", "required": True, "min": 0, "max": 100, "default": 50}
+        ]},
+    }
+    for i in range(commands - 1):
+        cmds[f"cmd_{i}"] = {"action": f"cmd_{i}", "params": [
+            {"name": "value", "type": "boolean", "required": True, "default": False}
+        ]}
+    return {"device_id": "bench", "names": {"ru": "Bench", "en": "Bench"}, "commands": cmds}
+
+
+async def _per_update_us(commands: int, updates: int, compiled: bool) -> float:
+    service = WBVirtualDeviceService(_NullBus())  # type: ignore[arg-type]
+    state = SimpleNamespace(volume=0)
+
+    async def executor(*args: Any, **kwargs: Any) -> None:
+        return None
+
+    await service.setup_wb_device_from_config(
+        _config(commands), executor, state_provider=lambda: state
+    )
+    info = service._active_devices["bench"]
+    started = time.perf_counter()
+    for n in range(updates):
+        if not compiled:
+            info.pop("state_field_controls")  # force the pre-compilation path
+        state.volume = n % 100
+        await service._async_publish_state_changes("bench", ["volume"])
+    return (time.perf_counter() - started) / updates * 1e6
+
+
+async def _main(updates: int) -> None:
+    print(f"{updates} volume updates per device")
+    print(f"  {'commands':>8}  {'rebuilt':>10}  {'compiled':>10}")
+    for commands in (5, 20, 60, 150):
+        rebuilt = await _per_update_us(commands, updates, compiled=False)
+        compiled = await _per_update_us(commands, updates, compiled=True)
+        print(f"  {commands:>8}  {rebuilt:7.1f} µs  {compiled:7.1f} µs")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=2000, help="state changes per device size")
+    args = parser.parse_args()
+    asyncio.run(_main(args.updates))
+
+
+if __name__ == "__main__":
+    main()
@@ -156,3 +156,57 @@ async def test_state_round_trip_via_state_repository(env):
     loaded = await store.load(f"device:{device_id}")
     assert loaded is not None
     assert loaded["test_value"] == "before_reload"
+
+
+@pytest.mark.asyncio
+async def test_burst_of_state_changes_is_persisted_once(env):
+    """A burst of changes inside one loop tick is drained by a single persistence pass
+    (the callback marks the device dirty instead of spawning a task per change)."""
+    dm, store = env
+    device = dm.devices["test_device"]
+
+    saves = []
+    original_save = store.save
+
+    async def counting_save(entity_id, state):
+        saves.append(state["test_value"])
+        await original_save(entity_id, state)
+
+    store.save = counting_save
+    for i in range(10):
+        device.update_state(test_value=f"v{i}")
+    await dm.wait_for_persistence_tasks()
+
+    assert saves == ["v9"]
+    persisted = await store.get("device:test_device")
+    assert persisted["test_value"] == "v9"
+
+
+@pytest.mark.asyncio
+async def test_field_layout_persists_only_changed_fields():
+    """With a per-field store the drain hands over just the fields that changed."""
+    store = SQLiteStateStore(db_path=":memory:", layout="fields")
+    await store.initialize()
+    dm = DeviceManager(state_repository=store)
+    dm.device_classes["_MockDevice"] = _MockDevice
+    await dm.initialize_devices({"test_device": _make_config()})
+    try:
+        await dm.wait_for_persistence_tasks()
+        partial_writes = []
+        original_save_fields = store.save_fields
+
+        async def recording_save_fields(entity_id, fields):
+            partial_writes.append(fields)
+            await original_save_fields(entity_id, fields)
+
+        store.save_fields = recording_save_fields
+        dm.devices["test_device"].update_state(test_value="changed")
+        await dm.wait_for_persistence_tasks()
+
+        assert partial_writes == [{"test_value": "changed"}]
+        persisted = await store.get("device:test_device")
+        assert persisted["test_value"] == "changed"
+        assert persisted["device_id"] == "test_device"
+    finally:
+        await dm.shutdown_devices()
+        await store.close()
@@ -101,6 +101,9 @@ class _MockScenarioManager:
             return ScenarioState(scenario_id=scenario_id, devices={})
         return self._live_state
 
+    def get_scenario_state_json(self, scenario_id: str) -> bytes:
+        return self.get_scenario_state(scenario_id).model_dump_json().encode()
+
 
 class _MockRoomManager:
     """Mock RoomManager returning typed RoomDefinition objects."""
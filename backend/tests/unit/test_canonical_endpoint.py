@@ -64,6 +64,10 @@ class FakeDevice:
     def register_state_change_callback(self, cb) -> None:
         self._state_change_callbacks.append(cb)
 
+    def unregister_state_change_callback(self, cb) -> None:
+        if cb in self._state_change_callbacks:
+            self._state_change_callbacks.remove(cb)
+
     def _notify(self):
         for cb in list(self._state_change_callbacks):
             cb(self.device_id, [])
@@ -173,6 +177,7 @@ def test_wb_passthrough_async_echo_unblocks_waiter(faked):
     body = r.json()
     assert body["success"] is True
     assert body["state"]["mirrored"] == {"power": "1"}
+    assert dev._state_change_callbacks == []  # the waiter is unregistered once it resolves
 
 
 # ----- Each of the 6 error codes -------------------------------------------
@@ -245,6 +250,7 @@ def test_device_unreachable_returns_503_on_timeout(faked, monkeypatch):
     )
     assert r.status_code == 503
     assert r.json()["detail"]["error"]["code"] == "device_unreachable"
+    assert dev._state_change_callbacks == []
 
 
 def test_device_unreachable_returns_503_when_reachable_flips_false(faked):
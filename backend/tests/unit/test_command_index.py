@@ -0,0 +1,67 @@
+"""BaseDevice command index — topic -> commands and WB control -> handler as dict lookups.
+
+``handle_message`` used to call ``get_command_topic`` for every configured command on
+every message; IR devices carry dozens of commands, so each press was a linear scan.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from locveil_bridge.infrastructure.config.models import BaseDeviceConfig, StandardCommandConfig
+from locveil_bridge.infrastructure.devices.base import BaseDevice
+
+pytestmark = pytest.mark.unit
+
+
+class _IndexedDevice(BaseDevice):
+    async def setup(self) -> bool:  # pragma: no cover - not exercised
+        return True
+
+    async def shutdown(self) -> bool:  # pragma: no cover - not exercised
+        return True
+
+    async def handle_power(self, cmd_config, params):
+        return self.create_command_result(success=True)
+
+
+def _config(commands):
+    return BaseDeviceConfig(
+        device_id="ir_dev",
+        names={"ru": "IR", "en": "IR"},
+        device_class="TestDev",
+        config_class="BaseDeviceConfig",
+        commands={name: StandardCommandConfig(action=action) for name, action in commands.items()},
+    )
+
+
+@pytest.mark.asyncio
+async def test_handle_message_dispatches_via_the_topic_index():
+    device = _IndexedDevice(_config({f"key_{i}": "power" for i in range(40)}))
+    device._execute_single_action = AsyncMock()  # type: ignore[method-assign]
+
+    with patch.object(_IndexedDevice, "get_command_topic", autospec=True,
+                      side_effect=BaseDevice.get_command_topic) as topic_of:
+        await device.handle_message("/devices/ir_dev/controls/key_7", "1")
+        await device.handle_message("/devices/ir_dev/controls/key_31", "1")
+        await device.handle_message("/devices/ir_dev/controls/nope", "1")
+
+    # one pass over the commands to build the index, none per message
+    assert topic_of.call_count == 40
+    assert [c.args[0] for c in device._execute_single_action.call_args_list] == ["key_7", "key_31"]
+
+
+@pytest.mark.asyncio
+async def test_index_follows_a_replaced_config_and_gates_wb_controls_on_handlers():
+    device = _IndexedDevice(_config({"power": "power", "eject": "eject"}))
+    device._execute_single_action = AsyncMock()  # type: ignore[method-assign]
+
+    await device._execute_wb_command_from_service("power", "1", {})
+    await device._execute_wb_command_from_service("eject", "1", {})  # no handler for "eject"
+    assert [c.args[0] for c in device._execute_single_action.call_args_list] == ["power"]
+
+    device.config = _config({"standby": "power"})  # a reload swaps the config in
+    device._execute_single_action.reset_mock()
+    await device.handle_message("/devices/ir_dev/controls/power", "1")
+    await device.handle_message("/devices/ir_dev/controls/standby", "1")
+    assert [c.args[0] for c in device._execute_single_action.call_args_list] == ["standby"]
@@ -5,6 +5,8 @@ until a full restart. Keeping it registered (disconnected) lets scenarios load,
 device visible, and allows a later reconnect.
 """
 
+import asyncio
+import time
 from types import SimpleNamespace
 
 import pytest
@@ -72,3 +74,113 @@ def test_no_persistence_during_shutdown():
     dm._persist_state_callback("d")  # shutdown path: must NOT persist
 
     assert saved == []
+
+
+class _SlowDev(_Dev):
+    delay = 0.1
+    log: list = []
+
+    async def setup(self):
+        self.log.append(("setup", self.device_id))
+        await asyncio.sleep(self.delay)
+        return True
+
+
+def _configs(*ids, device_class="SlowDev"):
+    return {i: SimpleNamespace(device_class=device_class, device_id=i) for i in ids}
+
+
+@pytest.mark.asyncio
+async def test_setups_run_concurrently_and_restore_precedes_each_setup():
+    log = []
+
+    class _Repo:
+        supports_field_updates = False
+
+        async def load(self, key):
+            log.append(("restore", key.split(":", 1)[1]))
+            return None
+
+        async def save(self, key, state):
+            pass
+
+    _SlowDev.log = log
+    dm = DeviceManager(state_repository=_Repo(), setup_concurrency=3)
+    dm.device_classes["SlowDev"] = _SlowDev
+
+    started = time.monotonic()
+    await dm.initialize_devices(_configs("a", "b", "c"))
+    assert time.monotonic() - started < 0.25  # serial would be >= 0.3
+
+    assert list(dm.devices) == ["a", "b", "c"]  # registration keeps config order
+    for device_id in "abc":
+        assert log.index(("restore", device_id)) < log.index(("setup", device_id))
+    timeline = dm.startup_timeline
+    assert [t.status for t in timeline.devices] == ["ready"] * 3
+    assert all(t.setup_ms >= 90 for t in timeline.devices)
+    assert timeline.to_dict()["concurrency"] == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrency_bound_is_respected():
+    running = 0
+    peak = 0
+
+    class _Counting(_Dev):
+        async def setup(self):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return True
+
+    dm = DeviceManager(setup_concurrency=2)
+    dm.device_classes["Counting"] = _Counting
+    await dm.initialize_devices(_configs("a", "b", "c", "d", "e", device_class="Counting"))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_setup_past_timeout_continues_in_background():
+    release = asyncio.Event()
+
+    class _Hanging(_Dev):
+        async def setup(self):
+            await release.wait()
+            return True
+
+    dm = DeviceManager(setup_timeout=0.05)
+    dm.device_classes.update({"Hanging": _Hanging, "GoodDev": _GoodDev})
+    await dm.initialize_devices({
+        "tv": SimpleNamespace(device_class="Hanging", device_id="tv"),
+        "amp": SimpleNamespace(device_class="GoodDev", device_id="amp"),
+    })
+
+    tv, amp = dm.startup_timeline.devices
+    assert (tv.status, tv.background, tv.setup_ms) == ("connecting", True, None)
+    assert amp.status == "ready"
+    assert "tv" in dm.devices
+
+    release.set()
+    await asyncio.sleep(0)
+    await asyncio.gather(*dm._background_setups)
+    assert tv.status == "ready" and tv.setup_ms is not None
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_background_setups():
+    class _Hanging(_Dev):
+        async def setup(self):
+            await asyncio.sleep(60)
+            return True
+
+        async def shutdown(self):
+            return True
+
+    dm = DeviceManager(setup_timeout=0.01)
+    dm.device_classes["Hanging"] = _Hanging
+    await dm.initialize_devices(_configs("tv", device_class="Hanging"))
+    assert len(dm._background_setups) == 1
+    await dm.shutdown_devices()
+    assert not dm._background_setups
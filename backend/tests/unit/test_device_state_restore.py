@@ -221,3 +221,26 @@ async def test_restored_toggle_device_gets_no_power_toggle():
     assert len(actions) == 1
     assert actions[0].reason == "power on (toggle)"
     assert warnings == []
+
+
+@pytest.mark.asyncio
+async def test_startup_restore_reads_every_snapshot_in_one_bulk_load():
+    class _BulkStore(_Store):
+        def __init__(self, data=None):
+            super().__init__(data)
+            self.bulk_calls = []
+
+        async def load(self, key):  # pragma: no cover - must not be used at startup
+            raise AssertionError(f"per-device load of {key}")
+
+        async def load_many(self, keys):
+            self.bulk_calls.append(list(keys))
+            return {k: self.data[k] for k in keys if k in self.data}
+
+    store = _BulkStore({"device:a": {"power": "on"}})
+    dm = _manager(store)
+    await dm.initialize_devices({"a": _config("a"), "b": _config("b")})
+
+    assert store.bulk_calls == [["device:a", "device:b"]]
+    assert dm.devices["a"].power_at_setup == "on"
+    assert dm.devices["b"].power_at_setup == "off"
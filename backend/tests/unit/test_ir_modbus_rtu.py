@@ -0,0 +1,352 @@
+"""Native Modbus RTU transport of the WB-MSW v3 IR ROM tools (wb-rules/ir_common.py).
+
+The tools run on the controller with the serial port held open for the whole bus window
+instead of forking ``modbus_client`` per frame. Here the port is a pty whose other end
+is a fake WB-MSW v3 slave: ROM banks, the RAM code buffer, the BANK->RAM loader, the
+per-bank edit coils and the ROM size input registers.
+"""
+
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("termios")
+import pty  # noqa: E402  (POSIX only, like termios)
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "wb-rules"))
+
+import ir_archive  # noqa: E402
+import ir_backup  # noqa: E402
+import ir_common as ir  # noqa: E402
+import ir_restore  # noqa: E402
+import ir_verify  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+SLAVE = 207
+
+
+class FakeMswV3:
+    """A WB-MSW v3 slave on the far end of a pty, answering RTU frames from a thread."""
+
+    def __init__(self, slave: int, banks: dict):
+        self.slave = slave
+        self.rom = {bank: list(regs) for bank, regs in banks.items()}
+        self.ram = [0] * 2048
+        self.edit = set()
+        self.busy = 0          # answer the next N writes with exception 06
+        self.commits = []      # banks committed through their edit coil
+        self.ram_reads = 0     # 0x03 frames: what a dump costs
+        self._master, self._tty = pty.openpty()
+        self.port = os.ttyname(self._tty)
+        self._stop = False
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._stop = True
+        self._thread.join()
+        os.close(self._master)
+        os.close(self._tty)
+
+    def _read(self, n: int) -> bytes:
+        buf = b""
+        while len(buf) < n:
+            if self._stop:
+                raise EOFError
+            if select.select([self._master], [], [], 0.05)[0]:
+                buf += os.read(self._master, n - len(buf))
+        return buf
+
+    def _serve(self):
+        try:
+            while True:
+                frame = self._read(8)
+                if frame[1] == 0x10:
+                    frame += self._read(frame[6] + 1)
+                assert ir.crc16(frame[:-2]) == struct.unpack("<H", frame[-2:])[0]
+                if frame[0] != self.slave:
+                    continue  # another slave's frame: stay silent
+                try:
+                    pdu = self._handle(frame[1], frame[2:-2])
+                except LookupError as e:
+                    pdu = bytes([frame[1] | 0x80, e.args[0]])
+                reply = bytes([self.slave]) + pdu
+                os.write(self._master, reply + struct.pack("<H", ir.crc16(reply)))
+        except EOFError:
+            pass
+
+    def _size(self, bank: int) -> int:
+        return 2 * len(ir.code_part(self.rom.get(bank, [])))
+
+    def _handle(self, func: int, data: bytes) -> bytes:
+        addr, value = struct.unpack(">HH", data[:4])
+        if func in (0x05, 0x06, 0x10) and self.busy:
+            self.busy -= 1
+            raise LookupError(6)
+        if func == 0x01:
+            bits = [1 if addr + i - ir.COIL_EDIT_BASE in self.edit else 0 for i in range(value)]
+            packed = bytes(
+                sum(bit << j for j, bit in enumerate(bits[i:i + 8])) for i in range(0, value, 8)
+            )
+            return bytes([func, len(packed)]) + packed
+        if func == 0x03:
+            self.ram_reads += 1
+            regs = self.ram[addr - ir.REG_RAM_BASE:addr - ir.REG_RAM_BASE + value]
+            return bytes([func, 2 * value]) + struct.pack(f">{value}H", *regs)
+        if func == 0x04:
+            sizes = [self._size(addr - ir.REG_CODE_SIZE_BASE + 1 + i) for i in range(value)]
+            return bytes([func, 2 * value]) + struct.pack(f">{value}H", *sizes)
+        if func == 0x05:
+            bank = addr - ir.COIL_EDIT_BASE
+            if value:
+                self.edit.add(bank)
+                self._load(bank)
+            else:
+                self.edit.discard(bank)
+                self.rom[bank] = ir.code_part(self.ram)
+                self.commits.append(bank)
+            return bytes([func]) + data
+        if func == 0x06 and addr == ir.REG_BANK_TO_RAM:
+            self._load(value)
+            return bytes([func]) + data
+        if func == 0x10:
+            regs = struct.unpack(f">{value}H", data[5:])
+            self.ram[addr - ir.REG_RAM_BASE:addr - ir.REG_RAM_BASE + value] = regs
+            return bytes([func]) + data[:4]
+        raise LookupError(2)
+
+    def _load(self, bank: int):
+        self.ram = [0] * len(self.ram)
+        regs = self.rom.get(bank, [])
+        self.ram[:len(regs)] = regs
+
+
+@pytest.fixture
+def blaster():
+    fake = FakeMswV3(SLAVE, {5: [900, 450, 56, 170, 0, 0], 66: list(range(1, 301)) + [0, 0]})
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def bus(blaster):
+    args = SimpleNamespace(port=blaster.port, baud=9600, parity="N", stopbits=2, transport="native")
+    with ir.bus_window(False, settle=0, args=args) as bus:
+        yield bus
+
+
+def test_crc16_matches_the_modbus_reference_frame():
+    # read holding 0..9 from slave 1: 01 03 00 00 00 0A C5 CD
+    assert struct.pack("<H", ir.crc16(bytes.fromhex("01030000000a"))) == bytes.fromhex("c5cd")
+
+
+def test_backup_reads_every_bank_over_one_open_port(blaster, bus, tmp_path):
+    out = ir_backup.backup_blaster(
+        f"wb-msw-v3_{SLAVE}", list(range(1, 81)), bus.caller(SLAVE), tmp_path, sizes_only=False
+    )
+
+    rows = out.read_text().splitlines()[1:]
+    assert [row.split(",")[2] for row in rows] == ["5", "66"]
+    got = ir.b64_to_regs(rows[1].split(",")[4])
+    assert got == blaster.rom[66]  # 302 registers: three 125-register read frames
+    assert bus.rtu is not None and bus.rtu._fd >= 0
+
+
+def test_restore_rides_out_busy_and_commits_through_the_edit_coil(blaster, bus, monkeypatch):
+    monkeypatch.setattr(ir_restore.time, "sleep", lambda _s: None)
+    call = bus.caller(SLAVE)
+    code = ir.with_terminator([700 + i for i in range(250)])
+    blaster.busy = 2
+
+    ir_restore.write_bank(call, 12, code, settle=0)
+
+    assert blaster.rom[12] == code
+    assert not blaster.edit
+    assert ir.code_part(ir.read_bank(call, 12, len(code))) == code
+
+
+def test_stuck_edit_coils_are_read_as_bits_and_cleared(blaster, bus):
+    blaster.edit.update({3, 71})
+
+    assert ir_restore.clear_stuck_edit(bus.caller(SLAVE)) == [3, 71]
+    assert not blaster.edit
+
+
+def test_failures_come_back_as_replies_not_exceptions(blaster, bus):
+    reply = bus.caller(SLAVE)("0x06", 4000, write_vals=[1])
+    assert not ir.ok(reply) and "Illegal Data Address" in str(reply)
+
+    bus.rtu.timeout = 0.2
+    silent = bus.caller(SLAVE + 1)("0x04", ir.REG_CODE_SIZE_BASE, count=1)
+    assert ir.parse_regs(silent) is None and "timeout" in silent.error
+    # the next exchange is unaffected by the unanswered one
+    assert ir.read_size(bus.caller(SLAVE), 5) == 12
+
+
+def _tool_args(fakes, **extra):
+    """Bus args putting each fake blaster on its own pty, i.e. its own RS-485 port."""
+    return SimpleNamespace(
+        port=fakes[0].port, baud=9600, parity="N", stopbits=2, transport="native",
+        blaster_port=[f"wb-msw-v3_{f.slave}={f.port}" for f in fakes[1:]],
+        no_toggle_service=True, **extra,
+    )
+
+
+@pytest.fixture
+def two_ports(monkeypatch):
+    monkeypatch.setattr(ir.time, "sleep", lambda _s: None)
+    fakes = [
+        FakeMswV3(207, {5: [900, 450, 56, 170, 0, 0], 66: list(range(1, 301)) + [0, 0]}),
+        FakeMswV3(220, {7: [1200, 600, 0, 0]}),
+    ]
+    yield fakes
+    for fake in fakes:
+        fake.close()
+
+
+def test_backup_works_each_port_in_parallel_and_dumps_only_changed_banks(two_ports, tmp_path):
+    first, second = two_ports
+    args = _tool_args(two_ports, blasters=["wb-msw-v3_207", "wb-msw-v3_220"], out_dir=tmp_path,
+                      banks="1-80", sizes_only=False, incremental=True, archive=None)
+    assert ir.port_for(args, "wb-msw-v3_220") == second.port
+    assert ir_backup.run(args) == 0
+
+    first.rom[5] = [901, 450, 56, 170, 0, 0]  # re-learned at the same size: the fingerprint differs
+    first.ram_reads = 0
+    assert ir_backup.run(args) == 0
+
+    codes = ir_backup.load_previous(tmp_path / "ir_backup_wb-msw-v3_207.csv")
+    assert codes[5][:2] == struct.pack(">H", 901)
+    assert codes[66] == ir.regs_to_bytes(list(range(1, 301)) + [0, 0], 604)
+    assert first.ram_reads == 2  # one fingerprint frame per bank; the 302-register bank kept
+    assert list(ir_backup.load_previous(tmp_path / "ir_backup_wb-msw-v3_220.csv")) == [7]
+
+    first.rom[66] = [5, 5, 0, 0]  # re-learned: the size register changes
+    assert ir_backup.run(args) == 0
+    codes = ir_backup.load_previous(tmp_path / "ir_backup_wb-msw-v3_207.csv")
+    assert codes[66] == ir.regs_to_bytes([5, 5, 0, 0], first._size(66))  # re-dumped, not kept
+    assert codes[5][:2] == struct.pack(">H", 901)
+
+
+def test_restore_skips_banks_whose_hash_already_matches(two_ports, tmp_path):
+    first, second = two_ports
+    backup = _tool_args(two_ports, blasters=["wb-msw-v3_207", "wb-msw-v3_220"], out_dir=tmp_path,
+                        banks="1-80", sizes_only=False, incremental=False, archive=None)
+    ir_backup.run(backup)
+    first.rom[66] = []  # wiped by a firmware upgrade
+    second.rom.clear()
+
+    csvs = sorted(tmp_path.glob("ir_backup_*.csv"))
+    restore = _tool_args(two_ports, csv=csvs, only_rom=None, confirm=True, settle=0,
+                         tol=ir.JITTER_TOL, keep_going=False, force=False)
+    assert ir_restore.run(restore) == 0
+
+    assert first.commits == [66] and second.commits == [7]
+    assert first.rom[66] == list(range(1, 301)) + [0, 0]
+    verify = _tool_args(two_ports, csv=csvs, only_rom=None, tol=0, detail=False)
+    assert ir_verify.run(verify) == 0
+
+
+def test_archive_dedups_codes_and_feeds_verify_restore_and_csv_export(two_ports, tmp_path):
+    first, second = two_ports
+    second.rom[8] = list(first.rom[5])  # the same code learned on both blasters
+    archive_dir = tmp_path / "archive"
+    args = _tool_args(two_ports, blasters=["wb-msw-v3_207", "wb-msw-v3_220"], out_dir=tmp_path,
+                      banks="1-80", sizes_only=False, incremental=False, archive=archive_dir)
+    ir_backup.run(args)
+    first.ram_reads = 0
+    ir_backup.run(args)
+
+    archive = ir_archive.Archive(archive_dir)
+    assert len(archive.manifest_paths()) == 2
+    assert first.ram_reads == 2  # second run: fingerprints only
+    assert len([p for p in archive.blobs.rglob("*") if p.is_file()]) == 3
+
+    verify = _tool_args(two_ports, csv=[archive_dir], only_rom=None, tol=ir.JITTER_TOL, detail=False)
+    assert ir_verify.run(verify) == 0
+
+    export = SimpleNamespace(archive=archive_dir, archive_cmd="export", manifest=None, out_dir=tmp_path)
+    assert ir_archive.run(export) == 0
+    exported = ir.read_csv(tmp_path / "ir_backup_wb-msw-v3_207.csv")
+    assert [int(r["rom"]) for r in exported] == [5, 66]
+    assert exported[0]["code_sha256"] == ir.code_sha256(archive.previous("wb-msw-v3_207")[5])
+
+    second.rom.clear()
+    restore = _tool_args(two_ports, csv=[archive.manifest_paths()[-1]], only_rom=None, confirm=True,
+                         settle=0, tol=ir.JITTER_TOL, keep_going=False, force=False)
+    assert ir_restore.run(restore) == 0
+    assert second.commits == [7, 8] and first.commits == []
+
+
+def test_archive_dir_restores_blasters_and_banks_a_later_partial_run_skipped(two_ports, tmp_path):
+    first, second = two_ports
+    archive_dir = tmp_path / "archive"
+    both = _tool_args(two_ports, blasters=["wb-msw-v3_207", "wb-msw-v3_220"], out_dir=tmp_path,
+                      banks="1-80", sizes_only=False, incremental=False, archive=archive_dir)
+    ir_backup.run(both)
+    second.rom[9] = [700, 350, 0, 0]
+    ir_backup.run(_tool_args(two_ports, blasters=["wb-msw-v3_220"], out_dir=tmp_path,  # 220 only
+                             banks="1-80", sizes_only=False, incremental=False, archive=archive_dir))
+    first.rom[5] = [901, 450, 56, 170, 0, 0]
+    ir_backup.run(_tool_args(two_ports, blasters=["wb-msw-v3_207"], out_dir=tmp_path,  # bank 5 only
+                             banks="5", sizes_only=False, incremental=False, archive=archive_dir))
+
+    archive = ir_archive.Archive(archive_dir)
+    assert len(archive.manifest_paths()) == 3
+    rows = ir_archive.load_source_rows(archive_dir)
+    assert sorted((r["blaster"], int(r["rom"])) for r in rows) == [
+        ("wb-msw-v3_207", 5), ("wb-msw-v3_207", 66), ("wb-msw-v3_220", 7), ("wb-msw-v3_220", 9),
+    ]
+    assert archive.previous("wb-msw-v3_207")[5][:2] == struct.pack(">H", 901)
+
+    first.rom.clear()  # firmware upgrade wiped 207
+    restore = _tool_args(two_ports, csv=[archive_dir], only_rom=None, confirm=True,
+                         settle=0, tol=ir.JITTER_TOL, keep_going=False, force=False)
+    assert ir_restore.run(restore) == 0
+    assert first.commits == [5, 66] and second.commits == []
+
+
+def test_archive_run_with_bus_errors_keeps_the_last_good_codes(two_ports, tmp_path, monkeypatch):
+    first, second = two_ports
+    archive_dir = tmp_path / "archive"
+    args = _tool_args(two_ports, blasters=["wb-msw-v3_207"], out_dir=tmp_path,
+                      banks="1-80", sizes_only=False, incremental=False, archive=archive_dir)
+    ir_backup.run(args)
+    archive = ir_archive.Archive(archive_dir)
+    good = archive.previous("wb-msw-v3_207")
+
+    read_size, dump_if_changed = ir.read_size, ir.dump_if_changed
+
+    def flaky_size(call, bank):
+        if bank == 5:
+            raise TimeoutError("timeout")
+        return read_size(call, bank)
+
+    def flaky_dump(call, bank, size_bytes, prior):
+        if bank == 66:
+            raise TimeoutError("timeout")
+        return dump_if_changed(call, bank, size_bytes, prior)
+
+    monkeypatch.setattr(ir, "read_size", flaky_size)
+    monkeypatch.setattr(ir, "dump_if_changed", flaky_dump)
+    first.rom[7] = [1200, 600, 0, 0]  # learned since: still captured
+    ir_backup.run(args)
+
+    assert len(archive.manifest_paths()) == 2
+    latest = archive.previous("wb-msw-v3_207")
+    assert sorted(latest) == [5, 7, 66]
+    assert latest[5] == good[5] and latest[66] == good[66]
+
+    # a bank that reads back empty is the only thing that drops an archived code
+    monkeypatch.setattr(ir, "read_size", read_size)
+    monkeypatch.setattr(ir, "dump_if_changed", dump_if_changed)
+    del first.rom[66]
+    ir_backup.run(args)
+    assert sorted(archive.previous("wb-msw-v3_207")) == [5, 7]
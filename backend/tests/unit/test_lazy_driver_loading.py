@@ -0,0 +1,66 @@
+"""Driver activation is config-driven: only entry points a device config names are loaded.
+
+Importing every driver at boot pulled in pyatv, asyncwebostv, broadlink/pyOpenSSL and
+the UPnP stack even for drivers nobody configured. ``load_device_modules(configs)``
+maps each configured ``device_class`` to its entry point without importing anything
+and loads just those through ``get_provider_class``.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from locveil_bridge.cli.import_profile import DriverImportProfile, parse_importtime, summarize
+from locveil_bridge.domain.devices import service as device_service
+from locveil_bridge.domain.devices.service import DeviceManager
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.asyncio
+async def test_only_configured_driver_entry_points_are_loaded(monkeypatch):
+    loaded = []
+    real = device_service.dynamic_loader.get_provider_class
+
+    def spy(namespace, name, base_class=None):
+        loaded.append(name)
+        return real(namespace, name, base_class=base_class)
+
+    def no_bulk_discovery(*args, **kwargs):
+        raise AssertionError("every driver entry point was loaded")
+
+    monkeypatch.setattr(device_service.dynamic_loader, "get_provider_class", spy)
+    monkeypatch.setattr(device_service.dynamic_loader, "discover_providers", no_bulk_discovery)
+
+    dm = DeviceManager()
+    configs = {
+        "kitchen_light": SimpleNamespace(device_class="WbPassthroughDevice"),
+        "hall_light": SimpleNamespace(device_class="WbPassthroughDevice"),
+        "ghost": SimpleNamespace(device_class="NoSuchDevice"),
+    }
+    await dm.load_device_modules(configs)
+
+    assert loaded == ["wb_passthrough"]
+    assert list(dm.device_classes) == ["WbPassthroughDevice"]
+    timing = dm.driver_imports["WbPassthroughDevice"]
+    assert timing.entry_point == "wb_passthrough" and timing.import_ms >= 0
+
+
+def test_importtime_summary_discounts_the_bare_interpreter():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       300 |        300 |   _io",
+        "import time:      1000 |       1500 |   pyatv.const",
+        "import time:      2000 |       3500 | pyatv",
+        "import time:       500 |       4000 | locveil_bridge.infrastructure.devices.apple_tv.driver",
+        "Traceback (most recent call last):",
+    ])
+    records = parse_importtime(stderr)
+    assert records[1] == ("pyatv.const", 1000, 1500)
+
+    profile = summarize(
+        DriverImportProfile("AppleTVDevice", "apple_tv", "m", configured=True), records, baseline={"_io"}
+    )
+    assert profile.modules == 3
+    assert profile.total_ms == 3.5
+    assert profile.packages == [("pyatv", 3.0), ("locveil_bridge", 0.5)]
@@ -0,0 +1,80 @@
+"""ManifestCache — config-generation-keyed, pre-serialized GET payloads.
+
+The catalog and the layout manifests are pure projections of configs that only
+change on /reload. The cache builds each once per generation, serves the bytes
+with a strong ETag, and answers `If-None-Match` with a 304.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel, Field
+
+from locveil_bridge.presentation.api.manifest_cache import ManifestCache
+
+
+class _Manifest(BaseModel):
+    entity_id: str = Field(alias="entityId")
+    title: Optional[str] = None
+
+
+class _Request:
+    def __init__(self, if_none_match=None):
+        self.headers = {"if-none-match": if_none_match} if if_none_match else {}
+
+
+def test_payload_is_built_once_per_generation():
+    generation = {"n": 1}
+    cache = ManifestCache(lambda: generation["n"])
+    builds = []
+
+    def build():
+        builds.append(1)
+        return _Manifest(entityId="tv")
+
+    first = cache.get(("device_layout", "tv"), build)
+    assert cache.get(("device_layout", "tv"), build) is first
+    assert len(builds) == 1 and (cache.hits, cache.misses) == (1, 1)
+
+    generation["n"] = 2
+    assert cache.get(("device_layout", "tv"), build) is not first
+    assert len(builds) == 2
+
+
+def test_bytes_match_the_response_model_rendering():
+    cache = ManifestCache()
+    entry = cache.get("k", lambda: _Manifest(entityId="tv"), exclude_none=True)
+    assert entry.body == b'{"entityId":"tv"}'
+    assert entry.model == _Manifest(entityId="tv")
+
+
+def test_failed_build_is_not_cached():
+    cache = ManifestCache()
+
+    def broken():
+        raise ValueError("bad capability map")
+
+    with pytest.raises(ValueError):
+        cache.get("k", broken)
+    assert cache.stats()["entries"] == 0
+    assert cache.get("k", lambda: _Manifest(entityId="tv")).model.entity_id == "tv"
+
+
+@pytest.mark.parametrize("header, status", [
+    (None, 200),
+    ('"nope"', 200),
+    ("{etag}", 304),
+    ('"nope", {etag}', 304),
+    ("W/{etag}", 304),
+    ("*", 304),
+])
+def test_if_none_match(header, status):
+    cache = ManifestCache()
+    etag = cache.get("k", lambda: _Manifest(entityId="tv")).etag
+    response = cache.respond(
+        _Request(header.format(etag=etag) if header else None), "k", lambda: _Manifest(entityId="x")
+    )
+    assert response.status_code == status
+    assert response.headers["etag"] == etag
+    assert response.body == (b"" if status == 304 else b'{"entityId":"tv","title":null}')
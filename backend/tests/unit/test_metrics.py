@@ -0,0 +1,124 @@
+"""In-process metrics registry and ``GET /metrics``.
+
+Families render in the Prometheus text format; children are bound once and reused;
+gauges backed by a function are read at scrape time.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from locveil_bridge.infrastructure.mqtt.client import topic_prefix
+from locveil_bridge.presentation.api.routers import metrics as metrics_router
+from locveil_bridge.presentation.api.sse_manager import SSEChannel, SSEManager, _Subscriber
+from locveil_bridge.utils.metrics import MetricsRegistry, registry
+
+pytestmark = pytest.mark.unit
+
+
+def test_families_render_in_prometheus_text_format():
+    reg = MetricsRegistry()
+    messages = reg.counter("test_messages_total", "Messages", ("direction",))
+    inbound = messages.labels("in")
+    inbound.inc()
+    inbound.inc(2)
+    assert messages.labels("in") is inbound
+
+    depth = [3]
+    reg.gauge("test_depth", "Depth").labels().set_function(lambda: depth[0])
+    depth[0] = 5
+
+    latency = reg.histogram("test_seconds", "Latency", ("op",), buckets=(0.1, 1.0)).labels('say "hi"')
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    assert reg.render().splitlines() == [
+        "# HELP test_messages_total Messages",
+        "# TYPE test_messages_total counter",
+        'test_messages_total{direction="in"} 3',
+        "# HELP test_depth Depth",
+        "# TYPE test_depth gauge",
+        "test_depth 5",
+        "# HELP test_seconds Latency",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{op="say \\"hi\\"",le="0.1"} 2',
+        'test_seconds_bucket{op="say \\"hi\\"",le="1"} 3',
+        'test_seconds_bucket{op="say \\"hi\\"",le="+Inf"} 4',
+        'test_seconds_sum{op="say \\"hi\\""} 3.65',
+        'test_seconds_count{op="say \\"hi\\""} 4',
+    ]
+
+
+def test_reregistering_returns_the_same_family_and_rejects_a_new_shape():
+    reg = MetricsRegistry()
+    family = reg.counter("test_total", "Total", ("a",))
+    assert reg.counter("test_total", "Total", ("a",)) is family
+    with pytest.raises(ValueError):
+        reg.gauge("test_total", "Total", ("a",))
+    with pytest.raises(ValueError):
+        family.labels("x", "y")
+
+
+def test_a_failing_probe_renders_nan_instead_of_failing_the_scrape():
+    reg = MetricsRegistry()
+    gauge = reg.gauge("test_probe", "Probe", ("kind",))
+
+    def broken() -> float:
+        raise RuntimeError("probe target went away")
+
+    gauge.labels("broken").set_function(broken)
+    gauge.labels("up").set(float("inf"))
+    gauge.labels("down").set(float("-inf"))
+
+    assert reg.render().splitlines()[2:] == [
+        'test_probe{kind="broken"} NaN',
+        'test_probe{kind="up"} +Inf',
+        'test_probe{kind="down"} -Inf',
+    ]
+
+
+def test_remove_matching_drops_every_series_of_one_label_value():
+    reg = MetricsRegistry()
+    family = reg.histogram("test_action_seconds", "Latency", ("device", "action"))
+    for device, action in (("tv", "power"), ("tv", "input"), ("amp", "power")):
+        family.labels(device, action).observe(0.1)
+
+    family.remove_matching(device="tv")
+
+    rendered = reg.render()
+    assert 'device="tv"' not in rendered
+    assert 'test_action_seconds_count{device="amp",action="power"} 1' in rendered
+
+
+@pytest.mark.parametrize("topic,prefix", [
+    ("/devices/lg_tv/controls/power/on", "/devices/lg_tv"),
+    ("/devices/lg_tv", "/devices/lg_tv"),
+    ("bridge/catalog/version", "bridge/catalog"),
+    ("zigbee2mqtt", "zigbee2mqtt"),
+])
+def test_topic_prefix(topic, prefix):
+    assert topic_prefix(topic) == prefix
+
+
+def test_sse_drops_and_queue_depth_reach_the_endpoint():
+    manager = SSEManager(log_size=4)
+    lagging = _Subscriber(channel=SSEChannel.SYSTEM, cursor=1)
+    manager._connections[SSEChannel.SYSTEM].add(lagging)
+    for i in range(10):
+        manager._logs[SSEChannel.SYSTEM].append(f"event {i}".encode())
+    assert manager._queue_depth(SSEChannel.SYSTEM) == 10
+    dropped = registry.counter(
+        "locveil_sse_dropped_events_total", "", ("channel",)
+    ).labels("system")
+    before = dropped.value
+
+    manager._read_events(lagging)  # fell off the ring: 6 events lost, one resync
+
+    assert dropped.value - before == 6
+    app = FastAPI()
+    app.include_router(metrics_router.router)
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'locveil_sse_queue_depth{channel="system"} 0' in response.text
+    assert 'locveil_sse_resyncs_total{channel="system",reason="lagged"}' in response.text
@@ -0,0 +1,190 @@
+"""KeyedDispatcher — per-device worker queues behind the MQTT receive loop.
+
+The receive loop used to await each handler inline, so one slow handler (an eMotiva
+readiness hold, an LG TV reconnect) stalled every other device's traffic. Messages
+now go onto a bounded queue per dispatch key: same-key order is preserved, different
+keys run in parallel, and a full queue either backpressures or drops its oldest entry.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from locveil_bridge.infrastructure.mqtt.client import MQTTClient
+from locveil_bridge.infrastructure.mqtt.dispatch import KeyedDispatcher, dispatch_key
+
+
+@pytest.mark.parametrize("topic, key", [
+    ("/devices/lg_tv_living/controls/power_on/on", "/devices/lg_tv_living"),
+    ("/devices/wb-mr6c_51/meta/error", "/devices/wb-mr6c_51"),
+    ("/devices/wb-mr6c_51", "/devices/wb-mr6c_51"),
+    ("/wbrules/log/info", "/wbrules/log/info"),
+    ("zigbee2mqtt/bridge/state", "zigbee2mqtt/bridge/state"),
+])
+def test_dispatch_key_groups_wb_topics_by_device(topic, key):
+    assert dispatch_key(topic) == key
+
+
+@pytest.mark.asyncio
+async def test_same_key_messages_are_handled_in_order():
+    seen = []
+
+    async def handler(topic, payload):
+        await asyncio.sleep(0.001 * (5 - int(payload)))  # later messages finish faster
+        seen.append(payload)
+
+    d = KeyedDispatcher(handler)
+    for i in range(5):
+        await d.submit("/devices/tv/controls/volume", str(i))
+    await d.join()
+    assert seen == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_slow_device_does_not_block_other_devices():
+    release = asyncio.Event()
+    seen = []
+
+    async def handler(topic, payload):
+        if topic.startswith("/devices/slow/"):
+            await release.wait()
+        seen.append(topic)
+
+    d = KeyedDispatcher(handler)
+    await d.submit("/devices/slow/controls/power", "1")
+    await d.submit("/devices/fast/controls/power", "1")
+    await asyncio.sleep(0.01)
+    assert seen == ["/devices/fast/controls/power"]
+    release.set()
+    await d.join()
+    assert seen[-1] == "/devices/slow/controls/power"
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_evicts_and_counts():
+    release = asyncio.Event()
+    seen = []
+
+    async def handler(topic, payload):
+        await release.wait()
+        seen.append(payload)
+
+    d = KeyedDispatcher(handler, queue_depth=2, overflow="drop_oldest")
+    await d.submit("/devices/hvac/controls/temp", "busy")
+    await asyncio.sleep(0)  # worker takes "busy" and blocks on the event
+    for value in ("a", "b", "c", "d"):
+        await d.submit("/devices/hvac/controls/temp", value)
+    release.set()
+    await d.join()
+    assert seen == ["busy", "c", "d"]
+    stats = d.stats("/devices/hvac")["/devices/hvac"]
+    assert stats["dropped"] == 2
+    assert stats["enqueued"] == 5 and stats["processed"] == 3
+    assert stats["max_depth"] == 2 and stats["depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_backpressure_waits_for_room_and_loses_nothing():
+    release = asyncio.Event()
+    seen = []
+
+    async def handler(topic, payload):
+        await release.wait()
+        seen.append(payload)
+
+    d = KeyedDispatcher(handler, queue_depth=1, overflow="backpressure")
+    await d.submit("/devices/tv/controls/x", "0")
+    await asyncio.sleep(0)
+    await d.submit("/devices/tv/controls/x", "1")
+    blocked = asyncio.create_task(d.submit("/devices/tv/controls/x", "2"))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    release.set()
+    await blocked
+    await d.join()
+    assert seen == ["0", "1", "2"]
+    assert d.stats()["/devices/tv"]["dropped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_handler_exception_does_not_kill_the_worker():
+    seen = []
+
+    async def handler(topic, payload):
+        if payload == "boom":
+            raise RuntimeError("boom")
+        seen.append(payload)
+
+    d = KeyedDispatcher(handler)
+    await d.submit("/devices/tv/controls/x", "boom")
+    await d.submit("/devices/tv/controls/x", "ok")
+    await d.join()
+    assert seen == ["ok"]
+    assert d.stats()["/devices/tv"]["processed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_lag_is_recorded():
+    async def handler(topic, payload):
+        await asyncio.sleep(0.02)
+
+    d = KeyedDispatcher(handler)
+    await d.submit("/devices/tv/controls/x", "1")
+    await d.submit("/devices/tv/controls/x", "2")
+    await d.join()
+    assert d.stats()["/devices/tv"]["max_lag_ms"] >= 15
+
+
+@pytest.mark.asyncio
+async def test_drained_queues_are_released_and_stats_rows_capped():
+    async def handler(topic, payload):
+        await asyncio.sleep(0)
+
+    d = KeyedDispatcher(handler, stats_limit=3)
+    for i in range(5):
+        await d.submit(f"zigbee2mqtt/sensor_{i}", "1")
+    await d.join()
+    await asyncio.sleep(0)  # let the last worker retire
+
+    assert d._queues == {} and d._workers == {}
+    # only the most recently active keys keep a row
+    assert list(d.stats()) == ["zigbee2mqtt/sensor_2", "zigbee2mqtt/sensor_3", "zigbee2mqtt/sensor_4"]
+
+    await d.submit("zigbee2mqtt/sensor_2", "2")  # a known key comes back as most recent
+    await d.join()
+    assert list(d.stats())[-1] == "zigbee2mqtt/sensor_2"
+    assert d.stats("zigbee2mqtt/sensor_2")["zigbee2mqtt/sensor_2"]["processed"] == 2
+
+
+def test_invalid_configuration_is_rejected():
+    async def handler(topic, payload):
+        return None
+
+    with pytest.raises(ValueError):
+        KeyedDispatcher(handler, queue_depth=0)
+    with pytest.raises(ValueError):
+        KeyedDispatcher(handler, overflow="drop_newest")  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        KeyedDispatcher(handler, stats_limit=0)
+
+
+@pytest.mark.asyncio
+async def test_client_reads_dispatch_settings_and_stop_discards_queue():
+    c = MQTTClient({
+        "host": "localhost", "port": 1883, "client_id": "test", "auth": {},
+        "dispatch_queue_depth": 7, "dispatch_overflow": "drop_oldest",
+    })
+    assert c._dispatcher.queue_depth == 7
+    assert c._dispatcher.overflow == "drop_oldest"
+
+    release = asyncio.Event()
+
+    async def slow(topic, payload):
+        await release.wait()
+
+    await c.subscribe("/devices/tv/controls/x", slow)
+    await c._dispatcher.submit("/devices/tv/controls/x", "1")
+    await asyncio.sleep(0)
+    await c.disconnect()
+    assert c.dispatch_stats()["/devices/tv"]["depth"] == 0
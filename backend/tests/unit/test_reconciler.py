@@ -4,6 +4,7 @@ Pure planning, no execution: devices are fakes carrying a real CapabilityMap + a
 state. Verifies the movie_appletv plan, the manual-node path, ordering/delay, and diffing.
 """
 
+import asyncio
 import json
 from pathlib import Path
 from types import SimpleNamespace
@@ -16,12 +17,16 @@ import pytest
 from locveil_bridge.domain.scenarios.reconciler import (
     PlannedAction,
     ReconcilePlan,
+    TopologyIndex,
     build_plan,
     build_power_off_plan,
+    critical_path_eta_ms,
     execute_plan,
     resolve_targets,
 )
 from locveil_bridge.domain.topology.loader import load_topology
+from locveil_bridge.infrastructure.config.models import IRCommandConfig, WirenboardIRDeviceConfig
+from locveil_bridge.infrastructure.devices.wirenboard_ir_device.driver import WirenboardIRDevice
 from locveil_bridge.domain.topology.models import Topology
 
 ROOT = Path(__file__).resolve().parents[3]
@@ -205,6 +210,9 @@ def test_ordering_edge_delay_becomes_pre_delay():
     sink_input = _find(plan, "sink", "input")
     assert sink_input.pre_delay_ms == 4500
     assert _idx(plan, "src", "power") < _idx(plan, "sink", "input")
+    # the edges survive as plan dependencies (the parallel executor's DAG)
+    assert _idx(plan, "src", "power") in plan.dependencies[_idx(plan, "sink", "input")]
+    assert _idx(plan, "sink", "power") in plan.dependencies[_idx(plan, "sink", "input")]
 
 
 # --- execution ---------------------------------------------------------------
@@ -370,6 +378,77 @@ async def test_gate_timeout_is_a_failed_step(monkeypatch):
     assert action.target == "arc" and "gate timeout" in err
 
 
+class _NotifyingDevice:
+    """Feedback device whose `execute_action` lands the state change a little later
+    and announces it through the state-change callback chain, like `update_state`."""
+
+    def __init__(self, field, start, lands, delay_s=0.02):
+        self.state = SimpleNamespace(**{field: start})
+        self._field, self._lands, self._delay_s = field, lands, delay_s
+        self.callbacks = []
+
+    def get_current_state(self):
+        return self.state
+
+    def register_state_change_callback(self, cb):
+        self.callbacks.append(cb)
+
+    def unregister_state_change_callback(self, cb):
+        self.callbacks.remove(cb)
+
+    async def _land(self):
+        await asyncio.sleep(self._delay_s)
+        setattr(self.state, self._field, self._lands)
+        for cb in list(self.callbacks):
+            cb("d", [self._field])
+
+    async def execute_action(self, command, params, source="unknown"):
+        asyncio.get_running_loop().create_task(self._land())
+        return {"success": True}
+
+
+@pytest.mark.asyncio
+async def test_gate_opens_on_the_state_change_not_the_next_poll():
+    """A callback-capable device is watched: with a 10 s poll interval the step still
+    confirms within the echo delay, and the gate leaves no callback behind."""
+    device = _NotifyingDevice("input_source", "hdmi1", "HDMI_2")
+    plan = ReconcilePlan(actions=[_feedback_action("hdmi2")])
+
+    result = await asyncio.wait_for(
+        execute_plan(plan, {"d": device}, poll_interval_ms=10_000), timeout=2.0
+    )
+
+    assert result.success
+    assert device.callbacks == []
+    [timing] = result.timings
+    assert timing.ack_ms <= timing.confirmed_ms < 1000
+
+
+@pytest.mark.asyncio
+async def test_watched_gate_ignores_unrelated_fields_and_times_out():
+    device = _NotifyingDevice("volume", 10, 20)
+    device.state.input_source = "source2"
+    plan = ReconcilePlan(actions=[
+        PlannedAction("d", "input", "arc", "set_input", feedback=True,
+                      state_field="input_source", poll_timeout_ms=100),
+    ])
+
+    result = await execute_plan(plan, {"d": device})
+
+    assert not result.success and "gate timeout" in result.failures[0][1]
+    assert result.timings[0].confirmed_ms is None
+    assert device.callbacks == []
+
+
+@pytest.mark.asyncio
+async def test_timings_cover_feedbackless_steps_without_confirmation():
+    plan = ReconcilePlan(actions=[PlannedAction("d", "power", "on", "power_on")])
+    result = await execute_plan(plan, {"d": _static_device(power="off")})
+    [timing] = result.timings
+    assert timing.action.command == "power_on"
+    assert timing.ack_ms >= 0 and timing.confirmed_ms is None
+
+
 def test_preview_in_sync_across_wire_canonical_vocabularies():
     """REL-3 sitting #2 follow-up (DRV-33's tail): the SCN-11 dialog showed the TV
     'out of sync' with believed 'HDMI_2' vs desired 'hdmi2' — the preview compared
@@ -901,3 +980,221 @@ async def test_dispatch_timeout_fails_the_step_and_the_plan_continues(monkeypatc
     failed_action, err = result.failures[0]
     assert failed_action.device_id == "hung" and "dispatch timeout" in err
     assert [a.device_id for a in result.executed] == ["healthy"]
+
+
+# --- parallel (DAG) execution ---------------------------------------------------
+
+
+def _step(device_id, domain, delay_ms=0, pre_delay_ms=0):
+    return PlannedAction(device_id=device_id, domain=domain, target="on", command=f"{domain}_on",
+                         params={}, feedback=False, delay_ms=delay_ms, pre_delay_ms=pre_delay_ms)
+
+
+class _Recorder:
+    """Records (event, device_id, command) around each dispatch; flags overlap per device."""
+
+    def __init__(self):
+        self.log = []
+        self.busy = set()
+        self.overlapped = False
+
+    def device(self, device_id, fail=()):
+        async def execute_action(command, params, source):
+            if device_id in self.busy:
+                self.overlapped = True
+            self.busy.add(device_id)
+            self.log.append(("start", device_id, command))
+            await asyncio.sleep(0.01)
+            self.busy.discard(device_id)
+            return {"success": command not in fail}
+
+        return SimpleNamespace(execute_action=execute_action)
+
+
+@pytest.mark.asyncio
+async def test_parallel_runs_independent_devices_concurrently():
+    rec = _Recorder()
+    plan = ReconcilePlan(actions=[_step(d, "power", delay_ms=200) for d in ("a", "b", "c")])
+    devices = {d: rec.device(d) for d in ("a", "b", "c")}
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result = await execute_plan(plan, devices, parallel=True)
+    elapsed = loop.time() - started
+
+    assert result.success
+    assert [a.device_id for a in result.executed] == ["a", "b", "c"]  # plan order
+    assert elapsed < 0.45  # max of the gates, not their 0.6 s sum
+    assert critical_path_eta_ms(plan) == 200
+
+
+@pytest.mark.asyncio
+async def test_parallel_serializes_each_device_and_honours_dependencies():
+    rec = _Recorder()
+    plan = ReconcilePlan(
+        actions=[
+            _step("tv", "power", delay_ms=50),
+            _step("amp", "power", delay_ms=10),
+            _step("tv", "input"),
+            _step("amp", "input", pre_delay_ms=30),
+        ],
+        # amp.input waits for the TV to be powered (a cross-device ordering edge)
+        dependencies={3: [0]},
+    )
+    devices = {"tv": rec.device("tv"), "amp": rec.device("amp")}
+
+    result = await execute_plan(plan, devices, parallel=True)
+
+    assert result.success and not rec.overlapped
+    starts = [(d, c) for _, d, c in rec.log]
+    assert starts.index(("tv", "power_on")) < starts.index(("tv", "input_on"))
+    assert starts.index(("amp", "power_on")) < starts.index(("amp", "input_on"))
+    assert starts.index(("tv", "power_on")) < starts.index(("amp", "input_on"))
+    # tv.power (50) -> amp.input (30 pre-delay) is the critical path
+    assert critical_path_eta_ms(plan) == 80
+
+
+@pytest.mark.asyncio
+async def test_parallel_abort_skips_steps_not_yet_started():
+    rec = _Recorder()
+    plan = ReconcilePlan(actions=[
+        _step("tv", "power"),
+        _step("tv", "input"),
+        _step("amp", "power", delay_ms=50),
+        _step("amp", "input"),
+    ])
+    devices = {"tv": rec.device("tv", fail={"power_on"}), "amp": rec.device("amp")}
+
+    result = await execute_plan(plan, devices, abort_on_failure=True, parallel=True)
+
+    assert [(a.device_id, a.domain) for a, _ in result.failures] == [("tv", "power")]
+    # amp.power was already in flight and completes; nothing starts after the failure
+    assert [(a.device_id, a.domain) for a in result.executed] == [("amp", "power")]
+    assert ("start", "tv", "input_on") not in rec.log
+    assert ("start", "amp", "input_on") not in rec.log
+
+
+@pytest.mark.asyncio
+async def test_parallel_failure_without_abort_does_not_block_successors():
+    rec = _Recorder()
+    plan = ReconcilePlan(actions=[_step("tv", "power"), _step("tv", "input")])
+    result = await execute_plan(plan, {"tv": rec.device("tv", fail={"power_on"})}, parallel=True)
+
+    assert [a.domain for a, _ in result.failures] == ["power"]
+    assert [a.domain for a in result.executed] == ["input"]
+
+
+def _ir_device(device_id, location):
+    commands = {
+        name: IRCommandConfig(action=name, location=location, rom_position=str(pos), description=name)
+        for pos, name in enumerate(("power_on", "input_on"), start=1)
+    }
+    return WirenboardIRDevice(WirenboardIRDeviceConfig(
+        device_id=device_id,
+        names={"ru": device_id, "en": device_id},
+        device_class="WirenboardIRDevice",
+        config_class="WirenboardIRDeviceConfig",
+        commands=commands,
+    ))
+
+
+@pytest.mark.asyncio
+async def test_parallel_serializes_ir_devices_sharing_one_blaster():
+    """ld_player and mf_amplifier fire through the same blaster: their presses must
+    not overlap, while a device on another blaster still runs alongside them."""
+    ir = {
+        "ld_player": _ir_device("ld_player", "wb-msw-v3_207"),
+        "mf_amplifier": _ir_device("mf_amplifier", "wb-msw-v3_207"),
+        "vhs_player": _ir_device("vhs_player", "wb-msw-v3_220"),
+    }
+    busy: set = set()
+    overlapped = []
+    log = []
+
+    def wrap(device):
+        async def execute_action(command, params, source):
+            blaster = device.transport_key(command)
+            if blaster in busy:
+                overlapped.append(blaster)
+            busy.add(blaster)
+            log.append(("start", device.device_id, blaster))
+            await asyncio.sleep(0.02)
+            busy.discard(blaster)
+            return {"success": True}
+
+        return SimpleNamespace(execute_action=execute_action, transport_key=device.transport_key)
+
+    devices = {device_id: wrap(d) for device_id, d in ir.items()}
+    plan = ReconcilePlan(actions=[_step(d, "power", delay_ms=20) for d in ir])
+
+    assert ir["ld_player"].transport_key("power_on") == ir["mf_amplifier"].transport_key("power_on")
+    assert ir["ld_player"].transport_key("unknown") is None
+
+    result = await execute_plan(plan, devices, parallel=True)
+
+    assert result.success and not overlapped
+    # the other blaster did not wait for the shared one
+    assert log.index(("start", "vhs_player", "ir:wb-msw-v3_220")) < log.index(
+        ("start", "mf_amplifier", "ir:wb-msw-v3_207")
+    )
+    assert critical_path_eta_ms(plan, devices) == 40
+    assert critical_path_eta_ms(plan) == 20
+
+
+def test_critical_path_eta_on_the_real_plan_is_at_most_the_serial_sum():
+    plan = build_plan(_scenario("movie_appletv"), TOPOLOGY, _movie_appletv_devices())
+    serial = sum(
+        a.pre_delay_ms + (a.poll_timeout_ms if a.feedback and a.poll_timeout_ms else a.delay_ms)
+        for a in plan.actions
+    )
+    assert 0 < critical_path_eta_ms(plan) <= serial
+    assert all(i < j for j, deps in plan.dependencies.items() for i in deps)
+
+
+# --- TopologyIndex ----------------------------------------------------------------
+
+
+def _reference_path(topology, source, target, signal):
+    """The per-call DFS the index replaced."""
+    stack, visited = [(source, [])], set()
+    while stack:
+        node, path = stack.pop()
+        if node == target:
+            return tuple(path)
+        if node in visited:
+            continue
+        visited.add(node)
+        for link in topology.links:
+            if link.src_node == node and signal in link.carries and link.dst_node not in visited:
+                stack.append((link.dst_node, path + [link]))
+    return None
+
+
+def test_topology_index_paths_match_the_per_call_search():
+    index = TopologyIndex(TOPOLOGY)
+    nodes = {l.src_node for l in TOPOLOGY.links} | {l.dst_node for l in TOPOLOGY.links}
+    for signal in ("video", "audio", "arc"):
+        for source in sorted(nodes):
+            for target in sorted(nodes):
+                assert index.path(source, target, signal) == _reference_path(
+                    TOPOLOGY, source, target, signal
+                ), (source, target, signal)
+
+
+def test_resolve_targets_is_memoized_per_topology_and_hands_out_copies():
+    topology = load_topology(ROOT / "config" / "topology.json")
+    scenario = _scenario("movie_ld")
+
+    first = resolve_targets(scenario, topology)
+    index = TopologyIndex.of(topology)
+    assert TopologyIndex.of(topology) is index and len(index._resolved) == 1
+
+    first[0].clear()
+    first[3].clear()
+    next(iter(first[5].values())).clear()
+    assert resolve_targets(scenario, topology) == resolve_targets(scenario, TOPOLOGY)
+    assert len(index._resolved) == 1
+
+    # a reloaded topology is a new object with its own index
+    reloaded = load_topology(ROOT / "config" / "topology.json")
+    assert TopologyIndex.of(reloaded) is not index
@@ -8,12 +8,23 @@ reloaded, replacement client built by the composition root's factory and
 adopted through the rewire hook BEFORE devices re-initialize, subscriptions
 re-established, WB emulation redone, the retained catalog version republished,
 and an error never escaping the background task.
+
+The incremental path diffs the reloaded configs + capability maps against the
+live fleet and rebuilds only what changed: untouched devices keep their
+instance (and connections), the client is never replaced.
 """
+import json
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from pydantic import BaseModel
 
-from locveil_bridge.app.reload_service import ReloadService
+from locveil_bridge.app.reload_service import ReloadService, diff_fleet
+from locveil_bridge.domain.devices.service import DeviceManager
+from locveil_bridge.domain.topology.models import Topology
+from locveil_bridge.infrastructure.capabilities.loader import attach_capability_maps
+from locveil_bridge.infrastructure.mqtt.client import MQTTClient
 
 
 def _make_service(devices=None, handler=None):
@@ -96,6 +107,8 @@ async def test_reload_swaps_the_client_and_rewires_before_reinit():
     dev.setup_wb_emulation_if_enabled.assert_awaited_once()
     m.rebuild_scenario_cards.assert_awaited_once_with(m.new_client, m.wb_service)
     m.publish_catalog_version.assert_awaited_once()
+    # One reload = one new config generation (keys the manifest cache).
+    assert service.generation == 1
 
 
 @pytest.mark.asyncio
@@ -148,3 +161,182 @@ async def test_no_seeded_client_still_reloads():
     m.old_client.stop.assert_not_awaited()
     m.client_factory.assert_called_once()
     assert service.mqtt_client is m.new_client
+
+
+# --- incremental reload -----------------------------------------------------
+
+
+class _Cfg(BaseModel):
+    device_id: str
+    device_class: str = "FakeDevice"
+    host: str = "10.0.0.1"
+
+
+class FakeDevice:
+    def __init__(self, config, mqtt_client=None):
+        self.config = config
+        self.device_id = config.device_id
+        self.capabilities = None
+        self.shutdown = AsyncMock(return_value=True)
+        self.cleanup_wb_device_state = AsyncMock()
+        self.setup_wb_emulation_if_enabled = AsyncMock()
+        self.release_metrics = MagicMock()
+
+    async def setup(self):
+        return True
+
+    def subscribe_topics(self):
+        return [f"/devices/{self.device_id}/controls/power/on"]
+
+    async def handle_message(self, topic, payload):
+        return None
+
+
+def _configs(**hosts):
+    return {device_id: _Cfg(device_id=device_id, host=host) for device_id, host in hosts.items()}
+
+
+async def _incremental_service(tmp_path, configs):
+    """A ReloadService over a real DeviceManager + (never-connected) MQTTClient
+    whose fleet was brought up from ``configs``."""
+    caps = tmp_path / "capabilities"
+    caps.mkdir(exist_ok=True)
+    manager = DeviceManager()
+    manager.device_classes["FakeDevice"] = FakeDevice
+    manager.load_device_modules = AsyncMock()
+    client = MQTTClient({"host": "h", "port": 1883, "client_id": "t", "keepalive": 60, "auth": {}})
+    client.connected = True  # client.client stays None: subscribe/unsubscribe stay local
+    wb_service = MagicMock()
+
+    def prepare(devs, c, w):
+        for device in devs.values():
+            device.mqtt_client, device.wb_service = c, w
+        attach_capability_maps(devs, caps)
+
+    config_manager = MagicMock()
+    config_manager.config_dir = str(tmp_path)
+    config_manager.get_mqtt_broker_config.return_value = SimpleNamespace(model_dump=lambda: {"host": "h"})
+    config_manager.get_all_device_configs.return_value = configs
+
+    await manager.initialize_devices(configs)
+    prepare(manager.devices, client, wb_service)
+    for device_id, device in manager.devices.items():
+        for topic in device.subscribe_topics():
+            await client.subscribe(topic, device.handle_message)
+
+    service = ReloadService(
+        config_manager=config_manager,
+        device_manager=manager,
+        client_factory=MagicMock(),
+        on_new_client=MagicMock(),
+        rebuild_scenario_cards=AsyncMock(),
+        publish_catalog_version=AsyncMock(),
+        prepare_devices=prepare,
+        scenario_manager=SimpleNamespace(topology=Topology(), state_projection=MagicMock()),
+        incremental=True,
+    )
+    service.mqtt_client = client
+    service.wb_service = wb_service
+    return service, manager, client, config_manager
+
+
+@pytest.mark.asyncio
+async def test_incremental_reload_rebuilds_only_what_changed(tmp_path):
+    service, manager, client, config_manager = await _incremental_service(
+        tmp_path, _configs(tv="10.0.0.1", ir="10.0.0.2", old="10.0.0.3")
+    )
+    tv, ir, old = (manager.devices[d] for d in ("tv", "ir", "old"))
+    config_manager.get_all_device_configs.return_value = _configs(
+        amp="10.0.0.9", tv="10.0.0.1", ir="10.0.0.22"
+    )
+
+    await service.reload()
+
+    diff = service.last_diff
+    assert (diff.added, diff.changed, diff.removed, diff.unchanged) == (["amp"], ["ir"], ["old"], ["tv"])
+    # The untouched device is the same instance, never shut down.
+    assert manager.devices["tv"] is tv
+    tv.shutdown.assert_not_awaited()
+    tv.release_metrics.assert_not_called()
+    assert client.message_handlers["/devices/tv/controls/power/on"] == tv.handle_message
+    # Changed: old instance shut down, a new one built, wired and subscribed.
+    ir.shutdown.assert_awaited_once()
+    new_ir = manager.devices["ir"]
+    assert new_ir is not ir and new_ir.config.host == "10.0.0.22"
+    assert new_ir.mqtt_client is client and new_ir.capabilities is not None
+    assert client.message_handlers["/devices/ir/controls/power/on"] == new_ir.handle_message
+    new_ir.setup_wb_emulation_if_enabled.assert_awaited_once()
+    ir.cleanup_wb_device_state.assert_not_awaited()
+    ir.release_metrics.assert_called_once()
+    # Removed: shut down, WB device retired, topics dropped.
+    old.shutdown.assert_awaited_once()
+    old.cleanup_wb_device_state.assert_awaited_once()
+    old.release_metrics.assert_called_once()
+    # The scenario-state projection lets go of the retired instances.
+    service._scenario_manager.state_projection.resync.assert_called_once()
+    assert "/devices/old/controls/power/on" not in client.message_handlers
+    # Config order is kept; the client, WB service and scenario cards survive.
+    assert list(manager.devices) == ["amp", "tv", "ir"]
+    service._client_factory.assert_not_called()
+    service._rebuild_scenario_cards.assert_not_awaited()
+    assert service.mqtt_client is client
+    service._publish_catalog_version.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_capability_map_edit_rebuilds_only_that_device(tmp_path):
+    service, manager, _client, _cm = await _incremental_service(
+        tmp_path, _configs(tv="10.0.0.1", ir="10.0.0.2")
+    )
+    tv = manager.devices["tv"]
+    (tmp_path / "capabilities" / "devices").mkdir()
+    (tmp_path / "capabilities" / "devices" / "ir.json").write_text(
+        json.dumps({"power": {"kind": "stateful", "actions": {"on": {"command": "power_on"}}}})
+    )
+
+    await service.reload()
+
+    assert service.last_diff.changed == ["ir"]
+    assert manager.devices["tv"] is tv
+    assert "power" in manager.devices["ir"].capabilities.domains()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_configs_touch_nothing_but_a_changed_topology_is_swapped_in(tmp_path):
+    service, manager, _client, _cm = await _incremental_service(tmp_path, _configs(tv="10.0.0.1"))
+    tv = manager.devices["tv"]
+    (tmp_path / "topology.json").write_text(
+        json.dumps({"links": [{"from": "tv:hdmi_out", "to": "amp:hdmi1", "carries": ["video"]}]})
+    )
+
+    await service.reload()
+
+    assert service.last_diff.rebuild == [] and service.last_diff.retire == []
+    assert manager.devices["tv"] is tv
+    tv.shutdown.assert_not_awaited()
+    assert len(service._scenario_manager.topology.links) == 1
+
+
+@pytest.mark.asyncio
+async def test_broker_change_falls_back_to_a_full_reload(tmp_path):
+    service, manager, client, config_manager = await _incremental_service(tmp_path, _configs(tv="10.0.0.1"))
+    client.stop = AsyncMock()
+    settings = iter([{"host": "h"}, {"host": "other"}])
+    config_manager.get_mqtt_broker_config.return_value = SimpleNamespace(model_dump=lambda: next(settings))
+    new_client = MagicMock()
+    new_client.connect_and_subscribe = AsyncMock()
+    new_client.wait_for_connection = AsyncMock(return_value=True)
+    service._client_factory.return_value = new_client
+
+    await service.reload()
+
+    client.stop.assert_awaited_once()
+    assert service.mqtt_client is new_client and service.last_diff is None
+    service._rebuild_scenario_cards.assert_awaited_once()
+
+
+def test_diff_fleet_treats_a_configured_but_missing_device_as_added(tmp_path):
+    live = {"tv": FakeDevice(_Cfg(device_id="tv"))}
+    diff = diff_fleet(live, _configs(tv="10.0.0.1", ir="10.0.0.2"), tmp_path)
+    # `tv` never got a capability map attached: rebuilt rather than trusted.
+    assert (diff.added, diff.changed, diff.removed) == (["ir"], ["tv"], [])
@@ -53,6 +53,26 @@ def test_mqtt_window_filters_dedups_and_caps():
     assert len(w.snapshot()) == 3  # max_entries cap
 
 
+def test_mqtt_window_dedup_moves_entry_to_newest_and_ages_out(monkeypatch):
+    from locveil_bridge.domain.reports import rings
+
+    now = [1000.0]
+    monkeypatch.setattr(rings.time, "time", lambda: now[0])
+    w = MqttWindow(max_age_s=60, max_entries=10)
+    w.record("in", "/devices/a/controls/x", "1")
+    now[0] += 30
+    w.record("in", "/devices/b/controls/x", "1")
+    now[0] += 20
+    w.record("in", "/devices/a/controls/x", "2")  # refreshed: now the newest
+    assert [(e["topic"], e["payload"]) for e in w.snapshot()] == [
+        ("/devices/b/controls/x", "1"), ("/devices/a/controls/x", "2"),
+    ]
+    now[0] += 30  # b is 50 s old; a's first message would be 80 s old
+    assert [e["topic"] for e in w.snapshot()] == ["/devices/b/controls/x", "/devices/a/controls/x"]
+    now[0] += 20  # b 70 s, a 50 s
+    assert [e["topic"] for e in w.snapshot()] == ["/devices/a/controls/x"]
+
+
 # --- redaction (B-5) -----------------------------------------------------------
 
 
@@ -165,8 +185,8 @@ def _service(tmp_path: Optional[Path] = None, enabled: bool = True, sink: Option
     sm = SimpleNamespace(topology=topology, active={}, get_scenario_state=lambda sid: None)
     persisted = persisted or {}
 
-    async def _persisted_state(did: str):
-        return persisted.get(did)
+    async def _persisted_states(dids):
+        return {did: persisted[did] for did in dids if did in persisted}
 
     log_file = None
     if tmp_path is not None:
@@ -182,7 +202,7 @@ def _service(tmp_path: Optional[Path] = None, enabled: bool = True, sink: Option
         sink=sink if sink is not None else _RecordingSink(),
         dispatch_ring=ring,
         mqtt_window=MqttWindow(),
-        persisted_state=_persisted_state,
+        persisted_states=_persisted_states,
         system_config=lambda: {"mqtt_broker": {"auth": {"password": "t0psecret"}}, "log_level": "INFO"},
         catalog_version=lambda: "cafebabe",
         bridge_version="0.5.0-test",
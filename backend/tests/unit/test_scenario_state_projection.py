@@ -0,0 +1,167 @@
+"""ScenarioStateProjection — the per-room materialized ScenarioState.
+
+Built when a room's active scenario changes, then updated per device from the
+state-change callbacks; the JSON body is cached until an entry changes, and each
+change is handed to the delta observers (the scenarios SSE channel).
+"""
+
+import json
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+
+from locveil_bridge.domain.scenarios.models import ManualStep, ScenarioState
+from locveil_bridge.domain.scenarios.projection import ScenarioStateProjection
+
+pytestmark = pytest.mark.unit
+
+
+class _State(BaseModel):
+    device_id: str
+    power: Optional[str] = None
+    input: Optional[str] = None
+    volume: Optional[int] = None
+
+
+class _Device:
+    """The state-change callback chain of BaseDevice, minus everything else."""
+
+    def __init__(self, device_id: str, **state):
+        self.state = _State(device_id=device_id, **state)
+        self.callbacks = []
+        self.reads = 0
+
+    def get_current_state(self):
+        self.reads += 1
+        return self.state
+
+    def register_state_change_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def unregister_state_change_callback(self, callback):
+        if callback in self.callbacks:
+            self.callbacks.remove(callback)
+
+    def update_state(self, **updates):
+        self.state = self.state.model_copy(update=updates)
+        for callback in list(self.callbacks):
+            callback(self.state.device_id, list(updates))
+
+
+class _Polled:
+    """A device without a callback chain: can only be re-read."""
+
+    def __init__(self, **state):
+        self.state = _State(device_id="polled", **state)
+
+    def get_current_state(self):
+        return self.state
+
+
+class _DeviceManager:
+    def __init__(self, **devices):
+        self.devices = devices
+
+    def get_device(self, device_id):
+        return self.devices.get(device_id)
+
+
+@pytest.fixture
+def devices():
+    return _DeviceManager(tv=_Device("tv", power="on", input="hdmi1"), amp=_Device("amp", power="off"))
+
+
+def test_a_device_change_re_reads_only_that_device_and_emits_a_delta(devices):
+    projection = ScenarioStateProjection(devices)
+    deltas = []
+    projection.delta_observers.append(deltas.append)
+    projection.activate("living_room", "movie", ["tv", "amp"])
+    tv, amp = devices.devices["tv"], devices.devices["amp"]
+    version = projection.version("living_room")
+
+    body = projection.body("living_room", [])
+    assert projection.body("living_room", []) is body  # served from the cache
+
+    tv.update_state(input="hdmi2", volume=30)
+
+    assert (tv.reads, amp.reads) == (2, 1)
+    assert [(d.room_id, d.device_id, d.version) for d in deltas] == [("living_room", "tv", version + 1)]
+    assert deltas[0].state.input == "hdmi2" and deltas[0].state.extra == {"volume": 30}
+    state = projection.state("living_room", [])
+    assert state.devices["tv"].input == "hdmi2" and state.devices["amp"].power is False
+    assert projection.body("living_room", []) is not body
+
+    tv.update_state(volume=30)  # nothing the projection shows changed
+    assert len(deltas) == 1
+
+
+def test_the_cached_body_is_the_scenario_state_json(devices):
+    projection = ScenarioStateProjection(devices)
+    projection.activate("living_room", "movie", ["tv", "missing", "amp"])
+    steps = [ManualStep(node="dodocus_hub", instruction="Set Dodocus hub to LD")]
+
+    body = projection.body("living_room", steps)
+
+    expected = ScenarioState(
+        scenario_id="movie", devices=projection.state("living_room", steps).devices, manual_steps=steps
+    )
+    assert json.loads(body) == expected.model_dump(mode="json")
+    assert list(json.loads(body)["devices"]) == ["tv", "amp"]
+    assert json.loads(projection.body("living_room", []))["manual_steps"] == []
+
+
+def test_devices_without_callbacks_are_read_on_every_query(devices):
+    polled = _Polled(power="off")
+    devices.devices["polled"] = polled
+    projection = ScenarioStateProjection(devices)
+    projection.activate("living_room", "movie", ["tv", "polled"])
+
+    polled.state = _State(device_id="polled", power="on")
+
+    assert projection.state("living_room", []).devices["polled"].power is True
+    assert json.loads(projection.body("living_room", []))["devices"]["polled"]["power"] is True
+
+
+def test_callbacks_follow_activation_deactivation_and_device_replacement(devices):
+    projection = ScenarioStateProjection(devices)
+    tv = devices.devices["tv"]
+    projection.activate("living_room", "movie", ["tv"])
+    projection.track("living_room", "movie", ["tv"])
+    assert len(tv.callbacks) == 1
+
+    # an incremental reload rebuilt the tv under the same id
+    fresh = devices.devices["tv"] = _Device("tv", power="off")
+    assert projection.state("living_room", []).devices["tv"].power is False
+    assert (tv.callbacks, len(fresh.callbacks)) == ([], 1)
+
+    fresh.update_state(power="on")
+    assert projection.state("living_room", []).devices["tv"].power is True
+
+    projection.drop("living_room")
+    assert fresh.callbacks == []
+    with pytest.raises(KeyError):
+        projection.state("living_room", [])
+
+
+def test_resync_after_a_reload_moves_the_watch_and_emits_every_change(devices):
+    projection = ScenarioStateProjection(devices)
+    deltas = []
+    projection.delta_observers.append(deltas.append)
+    projection.activate("living_room", "movie", ["tv", "amp"])
+    tv = devices.devices["tv"]
+    version = projection.version("living_room")
+
+    # a reload rebuilt the tv under the same id and removed the amp
+    fresh = devices.devices["tv"] = _Device("tv", power="off")
+    del devices.devices["amp"]
+    projection.resync()
+
+    assert (tv.callbacks, len(fresh.callbacks)) == ([], 1)
+    fresh.update_state(power="on")  # no read in between: the callback alone carries it
+
+    assert [(d.device_id, d.version) for d in deltas] == [
+        ("tv", version + 1), ("amp", version + 2), ("tv", version + 3),
+    ]
+    assert deltas[1].state is None and deltas[2].state.power is True
+    assert projection.version("living_room") == version + 3
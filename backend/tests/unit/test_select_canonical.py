@@ -47,6 +47,10 @@ class FakeDevice:
     def register_state_change_callback(self, cb) -> None:
         self._state_change_callbacks.append(cb)
 
+    def unregister_state_change_callback(self, cb) -> None:
+        if cb in self._state_change_callbacks:
+            self._state_change_callbacks.remove(cb)
+
     def _notify(self):
         for cb in list(self._state_change_callbacks):
             cb(self.device_id, [])
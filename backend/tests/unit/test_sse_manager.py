@@ -0,0 +1,145 @@
+"""SSEManager — shared-log fan-out.
+
+Events are encoded once into a per-channel ring; each stream is a cursor into it.
+A stalled subscriber must never hold up ``broadcast``; when it falls off the ring
+it gets one ``resync``. ``Last-Event-ID`` resumes from the log.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from locveil_bridge.presentation.api.sse_manager import SSEChannel, SSEEvent, SSEManager
+
+
+class _Request:
+    def __init__(self, last_event_id=None):
+        self.headers = {"last-event-id": last_event_id} if last_event_id else {}
+
+    async def is_disconnected(self):
+        return False
+
+
+def _parse(chunk):
+    """(id, payload) per SSE event in a streamed chunk."""
+    text = chunk.decode() if isinstance(chunk, bytes) else chunk
+    events = []
+    for block in filter(None, text.split("\r\n\r\n")):
+        fields = dict(line.split(": ", 1) for line in block.split("\r\n"))
+        events.append((fields.get("id"), json.loads(fields["data"])))
+    return events
+
+
+async def _open(manager, channel=SSEChannel.DEVICES, last_event_id=None):
+    response = await manager.create_event_stream(channel, _Request(last_event_id))
+    stream = response.body_iterator
+    welcome = _parse(await stream.__anext__())
+    assert welcome[0] == (None, welcome[0][1]) and welcome[0][1]["eventType"] == "connected"
+    return stream
+
+
+async def _next(stream):
+    return _parse(await asyncio.wait_for(stream.__anext__(), timeout=2.0))
+
+
+@pytest.mark.asyncio
+async def test_event_is_encoded_once_for_every_subscriber():
+    manager = SSEManager()
+    streams = [await _open(manager) for _ in range(3)]
+    with patch.object(SSEEvent, "format", autospec=True, side_effect=SSEEvent.format) as fmt:
+        await manager.broadcast(SSEChannel.DEVICES, "state_change", {"device_id": "tv"})
+    assert fmt.call_count == 1
+    for stream in streams:
+        [(event_id, payload)] = await _next(stream)
+        assert payload == {"eventType": "state_change", "device_id": "tv"}
+        assert event_id.endswith("-1")
+        await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stalled_subscriber_does_not_block_broadcast_and_is_resynced():
+    manager = SSEManager(log_size=8)
+    stalled = await _open(manager)
+
+    # Far more events than the ring holds, with nobody reading: must not block.
+    await asyncio.wait_for(
+        asyncio.gather(*(manager.broadcast(SSEChannel.DEVICES, "state_change", {"n": i}) for i in range(100))),
+        timeout=1.0,
+    )
+
+    [(event_id, resync)] = await _next(stalled)
+    assert resync["eventType"] == "resync"
+    assert resync["reason"] == "lagged"
+    assert event_id.endswith("-100")
+    assert manager.resync_count == 1
+
+    # Back at the head: the next event arrives normally.
+    await manager.broadcast(SSEChannel.DEVICES, "state_change", {"n": 100})
+    assert [p["n"] for _, p in await _next(stalled)] == [100]
+    await stalled.aclose()
+
+
+@pytest.mark.asyncio
+async def test_backlog_within_the_ring_is_delivered_in_order():
+    manager = SSEManager(log_size=8)
+    stream = await _open(manager)
+    for i in range(5):
+        await manager.broadcast(SSEChannel.DEVICES, "state_change", {"n": i})
+    assert [p["n"] for _, p in await _next(stream)] == [0, 1, 2, 3, 4]
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_last_event_id_replays_what_followed_it():
+    manager = SSEManager()
+    for i in range(5):
+        await manager.broadcast(SSEChannel.SCENARIOS, "scenario_started", {"n": i})
+    second_id = f"{manager._epoch}-2"
+
+    stream = await _open(manager, SSEChannel.SCENARIOS, last_event_id=second_id)
+    replay = await _next(stream)
+    assert [p["n"] for _, p in replay] == [2, 3, 4]
+    assert replay[-1][0] == f"{manager._epoch}-5"
+    await stream.aclose()
+
+
+@pytest.mark.parametrize("last_event_id", ["0-3", "garbage", "{epoch}-99", "{epoch}-1"])
+@pytest.mark.asyncio
+async def test_unresumable_last_event_id_starts_with_resync(last_event_id):
+    manager = SSEManager(log_size=4)
+    for i in range(10):
+        await manager.broadcast(SSEChannel.SYSTEM, "test", {"n": i})
+
+    stream = await _open(manager, SSEChannel.SYSTEM, last_event_id=last_event_id.format(epoch=manager._epoch))
+    [(event_id, resync)] = await _next(stream)
+    assert resync["eventType"] == "resync"
+    assert event_id == f"{manager._epoch}-10"
+    await manager.broadcast(SSEChannel.SYSTEM, "test", {"n": 10})
+    assert [p["n"] for _, p in await _next(stream)] == [10]
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fresh_stream_and_resync_carry_the_channel_snapshot():
+    manager = SSEManager(log_size=2)
+    manager.set_snapshot_provider(SSEChannel.DEVICES, lambda: [("state_change", {"device_id": "tv"})])
+
+    response = await manager.create_event_stream(SSEChannel.DEVICES, _Request())
+    stream = response.body_iterator
+    await stream.__anext__()  # connected
+    assert await _next(stream) == [(None, {"eventType": "state_change", "device_id": "tv"})]
+
+    for i in range(5):
+        await manager.broadcast(SSEChannel.DEVICES, "state_delta", {"n": i})
+    resync, snapshot = await _next(stream)
+    assert resync[1]["eventType"] == "resync"
+    assert snapshot == (None, {"eventType": "state_change", "device_id": "tv"})
+    await stream.aclose()
+
+    # Resuming from a logged id replays instead of snapshotting.
+    resumed = await _open(manager, last_event_id=f"{manager._epoch}-4")
+    assert [p["n"] for _, p in await _next(resumed)] == [4]
+    await resumed.aclose()
@@ -209,7 +209,7 @@ async def test_publish_device_state_changes_emits_value_topic_with_current_state
 
     # Discard the publishes that fire during setup (meta + initial state). We only assert
     # on what publish_device_state_changes adds AFTER setup.
-    message_bus.publish.reset_mock()
+    message_bus.publish_confirmed.reset_mock()
 
     # Simulate the driver having just settled `state.power = "on"`. The chokepoint:
     state.power = "on"
@@ -226,12 +226,12 @@ async def test_publish_device_state_changes_emits_value_topic_with_current_state
     # not the incoming command payload (which the audit found was the wrong thing to publish).
     value_topic = "/devices/test_dev/controls/power"
     matching = [
-        call for call in message_bus.publish.call_args_list
+        call for call in message_bus.publish_confirmed.call_args_list
         if call.args and call.args[0] == value_topic
     ]
     assert matching, (
         f"Expected a publish to {value_topic} after publish_device_state_changes; "
-        f"got: {message_bus.publish.call_args_list}"
+        f"got: {message_bus.publish_confirmed.call_args_list}"
     )
     # At least one publish carried the resulting state value.
     payloads = [call.args[1] for call in matching]
@@ -277,7 +277,7 @@ async def test_handle_wb_message_does_not_echo_incoming_payload(wb_service, mess
     )
 
     # Reset to exclude setup-time publishes.
-    message_bus.publish.reset_mock()
+    message_bus.publish_confirmed.reset_mock()
 
     # Simulate WB UI writing "1" to the power command topic.
     handled = await wb_service.handle_wb_message(
@@ -294,7 +294,7 @@ async def test_handle_wb_message_does_not_echo_incoming_payload(wb_service, mess
 
     value_topic = "/devices/test_dev/controls/power"
     value_publishes = [
-        call for call in message_bus.publish.call_args_list
+        call for call in message_bus.publish_confirmed.call_args_list
         if call.args and call.args[0] == value_topic
     ]
     assert not value_publishes, (
@@ -358,3 +358,119 @@ def test_last_command_only_change_skips_persist_and_wb_callbacks():
         action="select", source="api", timestamp=datetime.now(), params=None
     ))
     spy.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# Test 8 — the field → control map and control metas are compiled once, at setup
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_state_changes_reuse_the_controls_compiled_at_setup(wb_service, message_bus, monkeypatch):
+    state = SimpleNamespace(power="off")
+    config = _config_dict({
+        "power": {"action": "power", "params": [
+            {"name": "value", "type": "boolean", "required": True, "default": False}
+        ]},
+    })
+    await wb_service.setup_wb_device_from_config(
+        config=config, command_executor=AsyncMock(), state_provider=lambda: state,
+    )
+    assert wb_service._active_devices["test_dev"]["state_field_controls"] == {"power": ["power"]}
+
+    def not_again(*args, **kwargs):
+        raise AssertionError("controls re-derived from the config after setup")
+
+    monkeypatch.setattr(wb_service, "build_wb_controls_from_config", not_again)
+    message_bus.publish_confirmed.reset_mock()
+
+    for value in ("on", "off", "on"):
+        state.power = value
+        await wb_service._async_publish_state_changes("test_dev", ["power"])
+    published = [c.args for c in message_bus.publish_confirmed.call_args_list]
+    assert [p for t, p in published if t == "/devices/test_dev/controls/power"] == ["on", "off", "on"]
+
+    message_bus.publish_confirmed.reset_mock()
+    await wb_service.handle_mqtt_reconnection("test_dev")
+    republished = [c.args for c in message_bus.publish_confirmed.call_args_list]
+    assert ("/devices/test_dev/controls/power", "on") in republished
+    assert any(t == "/devices/test_dev/controls/power/meta" for t, _ in republished)
+
+
+# ---------------------------------------------------------------------------
+# Test 9 — identical value writes are suppressed until the broker reconnects
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_identical_value_publishes_are_skipped_until_invalidated(wb_service, message_bus):
+    state = SimpleNamespace(volume=50)
+    config = _config_dict({
+        "volume": {"action": "volume", "params": [
+            {"name": "level", "type": "range", "required": True, "min": 0, "max": 100, "default": 50}
+        ]},
+    })
+    await wb_service.setup_wb_device_from_config(
+        config=config, command_executor=AsyncMock(), state_provider=lambda: state,
+    )
+    topic = "/devices/test_dev/controls/volume"
+    message_bus.publish_confirmed.reset_mock()
+
+    def value_publishes():
+        return [c.args[1] for c in message_bus.publish_confirmed.call_args_list if c.args[0] == topic]
+
+    # 50 is what setup published as the initial value; restore_state-style repeats of it
+    # and of each later value are dropped.
+    for value in (50, 50, 60, 60, 60, 50):
+        state.volume = value
+        await wb_service._async_publish_state_changes("test_dev", ["volume"])
+    assert value_publishes() == ["60", "50"]
+    assert wb_service.published_value_stats() == {"hits": 4, "misses": 2, "entries": 1}
+
+    # Broker (re)connect: the retained value may be gone — the next write goes through.
+    wb_service.invalidate_published_values()
+    await wb_service._async_publish_state_changes("test_dev", ["volume"])
+    assert value_publishes() == ["60", "50", "50"]
+
+    # Cleanup forgets the device's values too.
+    await wb_service.cleanup_wb_device("test_dev")
+    assert wb_service.published_value_stats()["entries"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Test 10 — update_state validates and diffs only the incoming fields
+# ---------------------------------------------------------------------------
+
+
+def test_update_state_validates_incoming_fields_and_keeps_snapshots():
+    from pydantic import ValidationError
+
+    from locveil_bridge.domain.devices.models import LgTvState, WbPassthroughState
+
+    device = _chokepoint_device()
+    device.state = LgTvState(
+        device_id="cp_dev", device_name="Chokepoint Device", mute=False, current_app=None,
+        input_source=None, connected=True, ip_address=None, mac_address=None,
+    )
+    spy = Mock()
+    device.register_state_change_callback(spy)
+
+    before = device.state
+    device.update_state(volume="12", mute=False)  # coerced; mute unchanged
+    assert device.state.volume == 12 and before.volume is None  # old object is a snapshot
+    assert spy.call_args.args[1] == ["volume"]
+
+    spy.reset_mock()
+    device.update_state(volume=12, power="off")  # echo of the current values
+    spy.assert_not_called()
+
+    with pytest.raises(ValidationError):
+        device.update_state(power="on", volume="loud")
+    assert device.state.power == "off" and device.state.volume == 12  # nothing half-applied
+
+    # extra="allow" state: dynamic fields are validated, stored and diffed the same way
+    device.state = WbPassthroughState(device_id="cp_dev", device_name="Chokepoint Device")
+    device.update_state(temperature=21.5)
+    device.update_state(temperature=21.5)
+    assert device.state.model_dump()["temperature"] == 21.5
+    assert [c.args[1] for c in spy.call_args_list] == [["temperature"]]
@@ -0,0 +1,102 @@
+"""DeviceStateCoalescer — frame-based state_change → JSON-patch state_delta stage.
+
+A burst of state changes for one device inside a frame must reach SSE as ONE
+delta carrying only the fields that differ from the last broadcast; other device
+events must not overtake a pending delta.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from locveil_bridge.presentation.api.sse_manager import SSEChannel, SSEManager
+from locveil_bridge.presentation.api.state_coalescer import DeviceStateCoalescer, state_patch
+
+
+class _RecordingSSE:
+    def __init__(self):
+        self.events = []
+        self.snapshot_providers = {}
+
+    async def publish_device_event(self, event_type, data, event_id=None):
+        self.events.append((event_type, data))
+
+    def set_snapshot_provider(self, channel, provider):
+        self.snapshot_providers[channel] = provider
+
+
+def _state_change(device_id="tv", **state):
+    return {"device_id": device_id, "device_name": device_id.upper(), "state": state, "timestamp": "t"}
+
+
+def test_state_patch_covers_add_replace_remove_and_escapes_pointers():
+    assert state_patch({"a": 1, "b": 2, "gone": 0}, {"a": 1, "b": 3, "c/~": 4}) == [
+        {"op": "replace", "path": "/b", "value": 3},
+        {"op": "add", "path": "/c~1~0", "value": 4},
+        {"op": "remove", "path": "/gone"},
+    ]
+    assert state_patch({"a": {"x": 1}}, {"a": {"x": 1}}) == []
+
+
+@pytest.mark.asyncio
+async def test_burst_inside_one_frame_becomes_one_delta_per_device():
+    sse = _RecordingSSE()
+    coalescer = DeviceStateCoalescer(sse, frame_ms=20)
+    await coalescer.publish_device_event("state_change", _state_change(power="on", volume=1, last_command=None))
+    await coalescer.flush()
+    assert sse.events == [("state_change", _state_change(power="on", volume=1, last_command=None))]
+
+    for i in range(16):
+        await coalescer.publish_device_event("state_change", _state_change(power="on", volume=i, last_command=f"c{i}"))
+    await coalescer.publish_device_event("state_change", _state_change("amp", power="off"))
+    await asyncio.sleep(0.06)
+
+    assert sse.events[1:] == [
+        ("state_delta", {
+            "device_id": "tv", "device_name": "TV", "timestamp": "t",
+            "patch": [
+                {"op": "replace", "path": "/volume", "value": 15},
+                {"op": "replace", "path": "/last_command", "value": "c15"},
+            ],
+        }),
+        ("state_change", _state_change("amp", power="off")),
+    ]
+    assert coalescer.received_count == 18
+    assert coalescer.sent_count == 3
+
+
+@pytest.mark.asyncio
+async def test_unchanged_state_sends_nothing():
+    sse = _RecordingSSE()
+    coalescer = DeviceStateCoalescer(sse, frame_ms=0)
+    await coalescer.publish_device_event("state_change", _state_change(power="on"))
+    await coalescer.publish_device_event("state_change", _state_change(power="on"))
+    assert [event_type for event_type, _ in sse.events] == ["state_change"]
+
+
+@pytest.mark.asyncio
+async def test_other_device_events_flush_that_devices_pending_delta_first():
+    sse = _RecordingSSE()
+    coalescer = DeviceStateCoalescer(sse, frame_ms=10_000)
+    await coalescer.publish_device_event("state_change", _state_change(power="off"))
+    await coalescer.flush()
+    await coalescer.publish_device_event("state_change", _state_change(power="on"))
+    await coalescer.publish_device_event("action_success", {"device_id": "tv", "message": "ok"})
+    assert [event_type for event_type, _ in sse.events] == ["state_change", "state_delta", "action_success"]
+
+
+@pytest.mark.asyncio
+async def test_install_registers_full_state_snapshot():
+    sse = _RecordingSSE()
+    DeviceStateCoalescer(sse).install(lambda: [_state_change(power="on"), _state_change("amp", power="off")])
+    snapshot = sse.snapshot_providers[SSEChannel.DEVICES]()
+    assert snapshot == [
+        ("state_change", _state_change(power="on")),
+        ("state_change", _state_change("amp", power="off")),
+    ]
+
+
+def test_negative_frame_is_rejected():
+    with pytest.raises(ValueError):
+        DeviceStateCoalescer(SSEManager(), frame_ms=-1)
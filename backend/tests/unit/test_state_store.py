@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 import pytest_asyncio
 
@@ -128,3 +130,263 @@ async def test_list_entities(test_db):
     await test_db.set("b", {"v": 2})
     entities = await test_db.list_entities()
     assert set(entities) == {"a", "b"}
+
+
+# --- write-behind (coalescing batch committer) ------------------------------------
+
+@pytest_asyncio.fixture
+async def write_behind_db(tmp_path):
+    """A file-backed store with a long window, so only explicit flush()/close() commit."""
+    store = SQLiteStateStore(
+        db_path=str(tmp_path / "state.sqlite"),
+        write_behind_ms=60_000, wal=True, synchronous="NORMAL",
+    )
+    await store.initialize()
+    try:
+        yield store
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_collapses_repeated_writes_into_one_commit(write_behind_db):
+    store = write_behind_db
+    for level in range(20):
+        await store.set("device:processor", {"volume": level})
+    await store.set("device:hvac", {"temperature": 22})
+    assert store.pending_count() == 2
+    assert store.commit_count == 0
+
+    assert await store.flush() is True
+    assert store.commit_count == 1
+    assert store.pending_count() == 0
+    assert _without_timestamp(await store.get("device:processor")) == {"volume": 19}
+
+
+@pytest.mark.asyncio
+async def test_write_behind_reads_and_lists_see_pending_values(write_behind_db):
+    store = write_behind_db
+    value = {"power": True}
+    await store.set("device:tv", value)
+    value["power"] = False  # mutating the caller's dict must not change what's persisted
+    assert _without_timestamp(await store.get("device:tv")) == {"power": True}
+    assert await store.list_entities() == ["device:tv"]
+
+
+@pytest.mark.asyncio
+async def test_write_behind_delete_drops_pending_write(write_behind_db):
+    store = write_behind_db
+    await store.set("device:tv", {"power": True})
+    await store.delete("device:tv")
+    await store.flush()
+    assert await store.get("device:tv") is None
+
+
+@pytest.mark.asyncio
+async def test_write_behind_window_flushes_on_its_own(tmp_path):
+    store = SQLiteStateStore(db_path=str(tmp_path / "state.sqlite"), write_behind_ms=10)
+    await store.initialize()
+    try:
+        await store.set("a", {"v": 1})
+        await store.set("a", {"v": 2})
+        await asyncio.sleep(0.1)
+        assert store.pending_count() == 0
+        assert store.commit_count == 1
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_writes_to_disk(tmp_path):
+    path = str(tmp_path / "state.sqlite")
+    store = SQLiteStateStore(db_path=path, write_behind_ms=60_000)
+    await store.initialize()
+    await store.set("device:tv", {"power": True})
+    await store.close()
+
+    reopened = SQLiteStateStore(db_path=path)
+    await reopened.initialize()
+    try:
+        assert _without_timestamp(await reopened.get("device:tv")) == {"power": True}
+    finally:
+        await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_bulk_save_is_one_transaction(test_db):
+    await test_db.bulk_save({f"k{i}": {"v": i} for i in range(10)})
+    assert test_db.commit_count == 1
+    assert len(await test_db.list_entities()) == 10
+
+
+@pytest.mark.asyncio
+async def test_wal_and_synchronous_pragmas_applied(write_behind_db):
+    cursor = await write_behind_db.connection.execute("PRAGMA journal_mode")
+    assert (await cursor.fetchone())[0] == "wal"
+    cursor = await write_behind_db.connection.execute("PRAGMA synchronous")
+    assert (await cursor.fetchone())[0] == 1  # NORMAL
+
+
+@pytest_asyncio.fixture
+async def fields_db():
+    store = SQLiteStateStore(db_path=":memory:", layout="fields")
+    await store.initialize()
+    try:
+        yield store
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_fields_layout_round_trip(fields_db):
+    state = {"power": True, "apps": [{"id": "netflix"}], "volume": 12, "input": None}
+    assert await fields_db.set("device:tv", state) is True
+    loaded = await fields_db.get("device:tv")
+    assert "_timestamp" in loaded
+    assert _without_timestamp(loaded) == state
+    assert await fields_db.list_entities() == ["device:tv"]
+
+
+@pytest.mark.asyncio
+async def test_fields_layout_set_replaces_dropped_fields(fields_db):
+    await fields_db.set("k", {"a": 1, "b": 2})
+    await fields_db.set("k", {"a": 3})
+    assert _without_timestamp(await fields_db.get("k")) == {"a": 3}
+
+
+@pytest.mark.asyncio
+async def test_save_fields_rewrites_only_the_given_fields(fields_db):
+    await fields_db.set("device:tv", {"power": True, "apps": ["a", "b"], "volume": 1})
+    await fields_db.save_fields("device:tv", {"volume": 7})
+
+    cursor = await fields_db.connection.execute(
+        "SELECT field, value FROM state_fields WHERE key = ? ORDER BY field", ("device:tv",)
+    )
+    rows = dict(await cursor.fetchall())
+    assert rows == {"apps": '["a", "b"]', "power": "true", "volume": "7"}
+    assert _without_timestamp(await fields_db.get("device:tv")) == {
+        "power": True, "apps": ["a", "b"], "volume": 7,
+    }
+
+
+@pytest.mark.asyncio
+async def test_fields_layout_write_behind_merges_partial_writes(tmp_path):
+    store = SQLiteStateStore(db_path=str(tmp_path / "s.sqlite"), write_behind_ms=60_000, layout="fields")
+    await store.initialize()
+    try:
+        await store.set("k", {"a": 1, "b": 2})
+        await store.save_fields("k", {"b": 3})
+        await store.save_fields("k", {"c": 4})
+        assert _without_timestamp(await store.get("k")) == {"a": 1, "b": 3, "c": 4}
+        assert await store.flush() is True
+        assert store.commit_count == 1
+        assert _without_timestamp(await store.get("k")) == {"a": 1, "b": 3, "c": 4}
+        await store.delete("k")
+        assert await store.get("k") is None
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_blob_rows_migrate_to_fields_layout_once(tmp_path):
+    path = str(tmp_path / "state.sqlite")
+    blob = SQLiteStateStore(db_path=path)
+    await blob.initialize()
+    await blob.set("device:tv", {"power": True, "volume": 5})
+    await blob.close()
+
+    fields = SQLiteStateStore(db_path=path, layout="fields")
+    await fields.initialize()
+    try:
+        assert _without_timestamp(await fields.get("device:tv")) == {"power": True, "volume": 5}
+        await fields.save_fields("device:tv", {"volume": 9})
+    finally:
+        await fields.close()
+
+    # The stale blob is not imported again over the newer field rows.
+    reopened = SQLiteStateStore(db_path=path, layout="fields")
+    await reopened.initialize()
+    try:
+        assert (await reopened.get("device:tv"))["volume"] == 9
+    finally:
+        await reopened.close()
+
+
+async def _row_count(store, table):
+    cursor = await store.connection.execute(f"SELECT COUNT(*) FROM {table}")
+    (count,) = await cursor.fetchone()
+    await cursor.close()
+    return count
+
+
+@pytest.mark.asyncio
+async def test_layout_switches_move_the_rows_and_keep_the_legacy_active_scenario(tmp_path):
+    path = str(tmp_path / "state.sqlite")
+    blob = SQLiteStateStore(db_path=path)
+    await blob.initialize()
+    await blob.set("device:tv", {"power": True})
+    await blob.set("active_scenario", "movie_ld")  # pre-SCN-6 bare-string slot
+    await blob.close()
+
+    fields = SQLiteStateStore(db_path=path, layout="fields")
+    await fields.initialize()
+    try:
+        legacy = await fields.get("active_scenario")
+        assert _without_timestamp(legacy) == {"scenario_id": "movie_ld"}
+        assert await _row_count(fields, "state_store") == 0  # not left behind to go stale
+        await fields.save_fields("device:tv", {"volume": 4})
+    finally:
+        await fields.close()
+
+    # Back to the blob layout: the field rows move back and the field table is emptied.
+    reverted = SQLiteStateStore(db_path=path)
+    await reverted.initialize()
+    try:
+        assert _without_timestamp(await reverted.get("device:tv")) == {"power": True, "volume": 4}
+        assert await _row_count(reverted, "state_fields") == 0
+    finally:
+        await reverted.close()
+
+
+def test_unknown_layout_is_rejected():
+    with pytest.raises(ValueError):
+        SQLiteStateStore(db_path=":memory:", layout="columns")
+
+
+@pytest.mark.parametrize("layout", ["blob", "fields"])
+@pytest.mark.asyncio
+async def test_bulk_reads_match_get_and_see_pending_writes(tmp_path, layout):
+    store = SQLiteStateStore(db_path=str(tmp_path / "s.sqlite"), write_behind_ms=60_000, layout=layout)
+    await store.initialize()
+    try:
+        await store.set("device:tv", {"power": True})
+        await store.set("device:amp", {"volume": 3})
+        await store.set("device;x", {"outside": "the prefix range"})
+        await store.set("active_scenario:den", {"scenario_id": "movie"})
+        assert await store.flush() is True
+        await store.set("device:amp", {"volume": 9})  # pending, must win over the stored row
+        await store.set("device:hood", {"speed": 1})  # pending only
+
+        many = await store.load_many(["device:tv", "device:amp", "device:hood", "device:missing"])
+        assert {k: _without_timestamp(v) for k, v in many.items()} == {
+            "device:tv": {"power": True},
+            "device:amp": {"volume": 9},
+            "device:hood": {"speed": 1},
+        }
+        for key, state in many.items():
+            assert state == await store.get(key)
+
+        prefixed = await store.load_prefix("device:")
+        assert sorted(prefixed) == ["device:amp", "device:hood", "device:tv"]
+        assert await store.load_many([]) == {}
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_load_many_chunks_large_key_sets(test_db):
+    keys = [f"device:d{i}" for i in range(1200)]
+    for i, key in enumerate(keys[::2]):
+        await test_db.set(key, {"n": i})
+    loaded = await test_db.load_many(keys)
+    assert sorted(loaded) == sorted(keys[::2])
@@ -201,6 +201,36 @@ def test_get_system_catalog_endpoint_returns_slice_payload(slice_managers):
         system_router.initialize(None, None, None)
 
 
+def test_get_system_catalog_is_cached_per_generation_with_etag(slice_managers):
+    """Projection runs once per config generation; a revalidating poll gets a 304."""
+    from locveil_bridge.presentation.api.manifest_cache import manifest_cache
+
+    dm, rm = slice_managers
+    system_router.initialize(cfg_manager=None, dev_manager=dm, mqt_client=None, room_mgr=rm)
+    generation = {"n": 0}
+    manifest_cache.set_generation_source(lambda: generation["n"])
+    try:
+        client = TestClient(_app())
+        first = client.get("/system/catalog")
+        etag = first.headers["etag"]
+        assert first.status_code == 200 and etag.startswith('"')
+        assert first.json() == build_catalog(dm, rm).model_dump(by_alias=True)
+
+        misses = manifest_cache.misses
+        again = client.get("/system/catalog", headers={"If-None-Match": etag})
+        assert again.status_code == 304 and again.content == b""
+        assert again.headers["etag"] == etag
+        assert manifest_cache.misses == misses
+
+        generation["n"] += 1  # a /reload
+        rebuilt = client.get("/system/catalog", headers={"If-None-Match": etag})
+        assert rebuilt.status_code == 304  # same content, same strong ETag
+        assert manifest_cache.misses == misses + 1
+    finally:
+        manifest_cache.set_generation_source(lambda: 0)
+        system_router.initialize(None, None, None)
+
+
 def test_get_system_catalog_503_when_managers_missing():
     system_router.initialize(None, None, None)
     client = TestClient(_app())
@@ -0,0 +1,179 @@
+"""TopicRouter — the segment trie behind MQTTClient's wildcard dispatch.
+
+The receive loop used to fall back to a linear `_topic_matches` scan over every
+registered handler when the exact-topic lookup missed. The trie must be a drop-in
+replacement: same match semantics as `_topic_matches`, every overlapping filter
+returned, in registration order.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from locveil_bridge.infrastructure.mqtt.client import MQTTClient
+from locveil_bridge.infrastructure.mqtt.topic_router import TopicRouter, is_wildcard_filter
+
+
+def _client() -> MQTTClient:
+    return MQTTClient({
+        "host": "localhost", "port": 1883, "client_id": "test", "keepalive": 60,
+        "auth": {},
+    })
+
+
+FILTERS = [
+    "#",
+    "/devices/#",
+    "/devices/+/meta/error",
+    "/devices/+/controls/+",
+    "/devices/+/controls/+/on",
+    "/devices/wb-mr6c_51/#",
+    "/devices/wb-mr6c_51/controls/+",
+    "+/+",
+    "/+",
+    "a/#/b",
+    "a/+/#",
+]
+
+TOPICS = [
+    "",
+    "/",
+    "a",
+    "a/b",
+    "a/#/b",
+    "a/x/b/c",
+    "/devices",
+    "/devices/wb-mr6c_51",
+    "/devices/wb-mr6c_51/meta/error",
+    "/devices/wb-mr6c_51/controls/K4",
+    "/devices/wb-mr6c_51/controls/K4/on",
+    "/devices/lg_tv_living/controls/power_on/on",
+    "/devices/lg_tv_living/meta/error",
+    "/devices/lg_tv_living/meta",
+]
+
+
+def test_match_agrees_with_linear_matcher_for_every_subset_order():
+    """Parity with `_topic_matches` — including overlap and registration order — for
+    every filter pair/triple, so no combination of subscriptions diverges."""
+    reference = _client()
+    for size in (1, 2, 3):
+        for combo in itertools.permutations(FILTERS, size):
+            router = TopicRouter()
+            for f in combo:
+                router.add(f)
+            for topic in TOPICS:
+                expected = [f for f in combo if reference._topic_matches(f, topic)]
+                assert router.match(topic) == expected, (combo, topic)
+
+
+def test_overlapping_filters_all_match_in_registration_order():
+    router = TopicRouter()
+    router.add("/devices/#")
+    router.add("/devices/+/meta/error")
+    router.add("#")
+    assert router.match("/devices/tv/meta/error") == [
+        "/devices/#", "/devices/+/meta/error", "#",
+    ]
+
+
+def test_readding_a_filter_keeps_its_original_position():
+    router = TopicRouter()
+    router.add("/devices/+/meta/error")
+    router.add("/devices/#")
+    router.add("/devices/+/meta/error")
+    assert len(router) == 2
+    assert router.match("/devices/tv/meta/error") == [
+        "/devices/+/meta/error", "/devices/#",
+    ]
+
+
+def test_remove_prunes_only_the_dropped_filter():
+    router = TopicRouter()
+    router.add("/devices/+/meta/error")
+    router.add("/devices/+/meta/#")
+    router.remove("/devices/+/meta/error")
+    router.remove("/never/added")
+    assert "/devices/+/meta/error" not in router
+    assert router.match("/devices/tv/meta/error") == ["/devices/+/meta/#"]
+    router.remove("/devices/+/meta/#")
+    assert len(router) == 0
+    assert router._root.is_empty()
+
+
+@pytest.mark.parametrize("topic_filter, expected", [
+    ("/devices/+/meta/error", True),
+    ("/devices/#", True),
+    ("#", True),
+    ("/devices/tv/controls/power_on/on", False),
+    ("/devices/a+b/controls", False),
+    ("a/#/b", False),
+])
+def test_is_wildcard_filter(topic_filter, expected):
+    assert is_wildcard_filter(topic_filter) is expected
+
+
+@pytest.mark.asyncio
+async def test_subscribe_indexes_only_wildcard_filters():
+    c = _client()
+    await c.subscribe("/devices/+/meta/error", lambda t, p: None)
+    await c.subscribe("/devices/tv/controls/power_on/on", lambda t, p: None)
+    assert "/devices/+/meta/error" in c._wildcard_router
+    assert "/devices/tv/controls/power_on/on" not in c._wildcard_router
+
+
+class _OneShotBroker:
+    """Async ctx manager whose message stream yields the given (topic, payload)
+    pairs once, then ends the loop the way a shutdown would."""
+
+    def __init__(self, messages):
+        self._messages = messages
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_a):
+        return False
+
+    async def subscribe(self, *_a, **_k):
+        return None
+
+    @property
+    def messages(self):
+        return self._gen()
+
+    async def _gen(self):
+        for topic, payload in self._messages:
+            yield SimpleNamespace(
+                topic=SimpleNamespace(value=topic), payload=payload.encode(), retain=False,
+            )
+        raise asyncio.CancelledError()
+
+
+@pytest.mark.asyncio
+async def test_receive_loop_prefers_exact_handler_then_fans_out_to_wildcards():
+    c = _client()
+    exact, meta, everything = AsyncMock(), AsyncMock(), AsyncMock()
+    await c.subscribe("/devices/tv/meta/error", exact)
+    await c.subscribe("/devices/+/meta/error", meta)
+    await c.subscribe("/devices/#", everything)
+
+    broker = _OneShotBroker([
+        ("/devices/tv/meta/error", "r"),
+        ("/devices/hvac/meta/error", "w"),
+        ("/devices/hvac/controls/temp", "21"),
+    ])
+    with patch("locveil_bridge.infrastructure.mqtt.client.Client", return_value=broker):
+        await c._run_mqtt_client({"hostname": "h", "port": 1883}, [])
+    await c._dispatcher.join()
+
+    exact.assert_awaited_once_with("/devices/tv/meta/error", "r")
+    meta.assert_awaited_once_with("/devices/hvac/meta/error", "w")
+    assert [call.args for call in everything.await_args_list] == [
+        ("/devices/hvac/meta/error", "w"),
+        ("/devices/hvac/controls/temp", "21"),
+    ]
@@ -1,5 +1,6 @@
 """Unit tests for WBVirtualDeviceService."""
 
+import asyncio
 import pytest
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -321,19 +322,111 @@ class TestWBVirtualDeviceService:
             command_executor=sample_command_executor
         )
         
-        # Clear previous calls
-        mock_message_bus.publish.reset_mock()
-        
         # Handle reconnection
         result = await wb_service.handle_mqtt_reconnection("test_device")
         
         assert result is True
         
-        # Verify device metadata and controls were republished
-        meta_calls = [call for call in mock_message_bus.publish.call_args_list 
+        # Verify device metadata and controls were republished (acknowledged publishes)
+        meta_calls = [call for call in mock_message_bus.publish_confirmed.call_args_list 
                      if "/meta" in call[0][0]]
         assert len(meta_calls) > 0
+
+    @pytest.mark.asyncio
+    async def test_resync_republishes_all_devices_with_bounded_concurrency(self, mock_message_bus, sample_device_config, sample_command_executor):
+        """Resync sends every device's retained state, at most `resync_concurrency` in flight."""
+        wb_service = WBVirtualDeviceService(mock_message_bus, resync_concurrency=3)
+        await wb_service.setup_wb_device_from_config(
+            config=sample_device_config, command_executor=sample_command_executor
+        )
+        scenario_config = {**sample_device_config, "device_id": "scenario_host"}
+        await wb_service.setup_wb_device_from_config(
+            config=scenario_config, command_executor=sample_command_executor,
+            entity_id="movie_night", entity_name="Movie Night",
+        )
+        await wb_service._update_wb_control_state("test_device", "set_volume", "70")
+
+        in_flight = peak = 0
+        published = []
+
+        async def publish_confirmed(topic, payload, qos=1, retain=False):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            published.append((topic, payload, qos, retain))
+            return not topic.endswith("/mute/meta")
+
+        mock_message_bus.publish_confirmed.side_effect = publish_confirmed
+        report = await wb_service.resync()
+
+        # Per device: device meta, meta + value per control (3), online, available.
+        assert report.devices == 2
+        assert report.messages == len(published) == 2 * (1 + 2 * 3 + 2)
+        assert (report.acked, report.failed) == (report.messages - 2, 2)
+        assert wb_service.last_resync == report and wb_service.resync_count == 1
+        assert peak == 3
+        assert all(qos == 1 and retain for _, _, qos, retain in published)
+        topics = {t: p for t, p, _, _ in published}
+        assert topics["/devices/test_device/controls/set_volume"] == "70"  # current, not initial
+        assert json.loads(topics["/devices/movie_night/meta"])["title"]["en"] == "Movie Night"
+        assert topics["/devices/movie_night/meta/available"] == "1"
+        # Republished values stay cached: an identical write is still skipped.
+        await wb_service._update_wb_control_state("test_device", "set_volume", "70")
+        assert wb_service.published_value_hits == 1
     
+    @pytest.mark.asyncio
+    async def test_resync_never_overwrites_a_value_published_while_it_runs(self, mock_message_bus, sample_device_config, sample_command_executor):
+        """A control value published after resync collected its messages is what the broker keeps."""
+        wb_service = WBVirtualDeviceService(mock_message_bus, resync_concurrency=1)
+        await wb_service.setup_wb_device_from_config(
+            config=sample_device_config, command_executor=sample_command_executor
+        )
+        await wb_service._update_wb_control_state("test_device", "set_volume", "40")
+        retained = {}
+
+        async def publish_confirmed(topic, payload, qos=1, retain=False):
+            if topic == "/devices/test_device/meta":
+                # the driver settles on a new volume while the resync is under way
+                await wb_service._update_wb_control_state("test_device", "set_volume", "70")
+            retained[topic] = payload
+            return True
+
+        mock_message_bus.publish_confirmed.side_effect = publish_confirmed
+        report = await wb_service.resync()
+
+        assert report.failed == 0
+        assert retained["/devices/test_device/controls/set_volume"] == "70"
+
+    @pytest.mark.asyncio
+    async def test_unconfirmed_value_publishes_are_not_cached(self, wb_service, mock_message_bus, sample_device_config, sample_command_executor):
+        """A value the broker did not accept is never treated as published: the next identical
+        write goes out again, whether it failed on a state update or during a resync."""
+        await wb_service.setup_wb_device_from_config(
+            config=sample_device_config, command_executor=sample_command_executor
+        )
+        topic = "/devices/test_device/controls/set_volume"
+        mock_message_bus.publish_confirmed.return_value = False
+
+        await wb_service._update_wb_control_state("test_device", "set_volume", "70")
+        await wb_service._update_wb_control_state("test_device", "set_volume", "70")
+        sent = [c.args[1] for c in mock_message_bus.publish_confirmed.call_args_list if c.args[0] == topic]
+        assert sent == ["70", "70"]
+        assert wb_service.published_value_hits == 0
+
+        mock_message_bus.publish_confirmed.return_value = True
+        await wb_service._update_wb_control_state("test_device", "set_volume", "70")
+        mock_message_bus.publish_confirmed.side_effect = lambda t, p, qos=1, retain=False: t != topic
+        report = await wb_service.resync()
+        assert report.failed == 1
+        assert ("test_device", "set_volume") not in wb_service._published_values
+
+        mock_message_bus.publish_confirmed.side_effect = None
+        mock_message_bus.publish_confirmed.reset_mock()
+        await wb_service._update_wb_control_state("test_device", "set_volume", "70")
+        mock_message_bus.publish_confirmed.assert_awaited_once_with(topic, "70", qos=1, retain=True)
+
     def test_generate_wb_control_meta_from_config_pushbutton(self, wb_service, sample_device_config):
         """Test generating WB control metadata for pushbutton."""
         cmd_config = sample_device_config["commands"]["power_on"]
@@ -1,4 +1,4 @@
-import React, { useEffect } from 'react';
+import React, { useEffect, useRef } from 'react';
 import { useQueryClient } from '@tanstack/react-query';
 import { useSettingsStore } from '../stores/useSettingsStore';
 import Navbar from '../components/Navbar';
@@ -7,6 +7,8 @@ import LogPanel from '../components/LogPanel';
 import { useDeviceSSE, useScenarioSSE, useSystemSSE } from '../hooks/useEventSource';
 import { useLogStore } from '../stores/useLogStore';
 import { useProgressStore } from '../hooks/useProgressStore';
+import { applyStatePatch, StatePatchOp } from '../utils/stateUtils';
+import type { ScenarioState } from '../types/api';
 
 interface LayoutProps {
   children: React.ReactNode;
@@ -23,6 +25,90 @@ function Layout({ children }: LayoutProps) {
   const scenarioSSE = useScenarioSSE(true);
   const systemSSE = useSystemSSE(true);
 
+  // Live device-state cache updates. Registered as a per-message handler rather than read
+  // from `deviceSSE.data`: the snapshot sent on connect/resync is a burst of events and
+  // React may render only the last `data` of a burst.
+  useEffect(() => {
+    const applyDeviceStateEvent = (event: any) => {
+      const { eventType, device_id } = event;
+      if (eventType === 'resync') {
+        // The server skipped this client past events it no longer holds (a stalled tab,
+        // or a reconnect whose Last-Event-ID aged out of the log); a full snapshot
+        // follows, but refetch anything it does not cover.
+        void queryClient.invalidateQueries({ queryKey: ['devices'] });
+        return;
+      }
+      if (!device_id) return;
+      if (eventType === 'state_change' && event.state) {
+        // Live-update the device-state cache so every reader re-renders WITHOUT a refetch.
+        // This is the single source of truth for live state (Layer-3 scenario binding): a
+        // scenario's controls read their ROLE device via ['devices', roleDeviceId, 'state'],
+        // the same key a device page reads — so a change made on a device page (or by the
+        // reconciler) is reflected on the scenario page, and vice versa.
+        queryClient.setQueryData(
+          ['devices', device_id, 'state'],
+          (prev: Record<string, unknown> | undefined) => ({ ...(prev ?? {}), ...event.state })
+        );
+      } else if (eventType === 'state_delta' && event.patch) {
+        // Coalesced change: only the fields that differ from the previous event.
+        queryClient.setQueryData(
+          ['devices', device_id, 'state'],
+          (prev: Record<string, unknown> | undefined) => applyStatePatch(prev, event.patch as StatePatchOp[])
+        );
+      }
+    };
+    deviceSSE.addHandler(applyDeviceStateEvent);
+    return () => deviceSSE.removeHandler(applyDeviceStateEvent);
+    // add/removeHandler only touch a ref, so the first render's pair stays valid.
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [queryClient]);
+
+  // Live scenario-state cache updates: between switches the scenarios channel carries one
+  // scenario_state_delta per device change of the room's active scenario. Patched into both
+  // the global ['scenario','state'] and the per-scenario query instead of refetching.
+  // `version` is per room and bumped once per change: a delta at or below the last seen
+  // version is stale and dropped; one that skips a version means a change was missed, so
+  // the cache is refetched instead of patched. scenario_switched carries the new baseline.
+  const scenarioVersions = useRef<Record<string, number>>({});
+  useEffect(() => {
+    const applyScenarioStateDelta = (event: any) => {
+      const versions = scenarioVersions.current;
+      if (event.eventType === 'resync') {
+        scenarioVersions.current = {};
+        return;
+      }
+      if (event.eventType === 'scenario_switched' || event.eventType === 'scenario_shutdown') {
+        if (event.room_id && typeof event.version === 'number') versions[event.room_id] = event.version;
+        else if (event.room_id) delete versions[event.room_id];
+        return;
+      }
+      if (event.eventType !== 'scenario_state_delta' || !event.device_id || !event.room_id) return;
+      const known = versions[event.room_id];
+      if (typeof event.version === 'number') {
+        if (known !== undefined && event.version <= known) return;
+        versions[event.room_id] = event.version;
+        if (known !== undefined && event.version > known + 1) {
+          void queryClient.invalidateQueries({ queryKey: ['scenario', 'state'] });
+          void queryClient.invalidateQueries({ queryKey: ['scenarios', 'state'] });
+          return;
+        }
+      }
+      const patch = (prev: ScenarioState | undefined) => {
+        if (!prev || prev.scenario_id !== event.scenario_id) return prev;
+        const devices = { ...(prev.devices ?? {}) };
+        // A null state: the device is gone (a reload removed it).
+        if (event.state) devices[event.device_id] = event.state;
+        else delete devices[event.device_id];
+        return { ...prev, devices };
+      };
+      queryClient.setQueryData<ScenarioState>(['scenario', 'state'], patch);
+      queryClient.setQueryData<ScenarioState>(['scenarios', 'state', event.scenario_id], patch);
+    };
+    scenarioSSE.addHandler(applyScenarioStateDelta);
+    return () => scenarioSSE.removeHandler(applyScenarioStateDelta);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [queryClient]);
+
   // Handle device events - only handle specified event types per specification
   useEffect(() => {
     if (deviceSSE.data) {
@@ -73,22 +159,11 @@ function Layout({ children }: LayoutProps) {
             shouldAddToProgress = true;
             break;
             
-          case 'state_change': {
-            // Live-update the device-state cache so every reader re-renders WITHOUT a refetch.
-            // This is the single source of truth for live state (Layer-3 scenario binding): a
-            // scenario's controls read their ROLE device via ['devices', roleDeviceId, 'state'],
-            // the same key a device page reads — so a change made on a device page (or by the
-            // reconciler) is reflected on the scenario page, and vice versa. No progress display.
-            const state = deviceSSE.data.state;
-            if (state && device_id) {
-              queryClient.setQueryData(
-                ['devices', device_id, 'state'],
-                (prev: Record<string, unknown> | undefined) => ({ ...(prev ?? {}), ...state })
-              );
-            }
+          case 'state_change':
+          case 'state_delta':
+            // Applied to the device-state cache by the handler above. No progress display.
             shouldAddToProgress = false;
             break;
-          }
             
           default:
             // UI-14 (#17): unknown event types are ignored, not surfaced in the progress
@@ -122,7 +197,7 @@ function Layout({ children }: LayoutProps) {
         });
       }
     }
-  }, [deviceSSE.data, addMessage, addLog, queryClient]);
+  }, [deviceSSE.data, addMessage, addLog]);
 
   // Handle scenario events
   useEffect(() => {
@@ -147,6 +222,7 @@ function Layout({ children }: LayoutProps) {
       // go live, not just on mount / after this client's own mutation. Prefix-invalidate both the
       // global ['scenario','state'] and the per-scenario ['scenarios','state', id] queries.
       if (
+        eventType === 'resync' ||
         eventType === 'scenario_started' ||
         eventType === 'scenario_switched' ||
         eventType === 'scenario_shutdown'
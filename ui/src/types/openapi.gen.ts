@@ -310,6 +310,9 @@ export interface paths {
          *     ``response_model_exclude_none=True`` omits null fields so the payload matches the build-time
          *     codegen contract (absent = not present). The UI checks ``content.xDropdown !== undefined``; an
          *     explicit ``null`` would read as "present" and trigger a spurious fetch (Step-2 hardening).
+         *
+         *     Served from the manifest cache (built once per config generation) with a strong ETag;
+         *     ``If-None-Match`` gets a 304.
          */
         get: operations["get_device_layout_devices__device_id__layout_get"];
         put?: never;
@@ -1036,7 +1039,8 @@ export interface paths {
          *     controls carry their canonical capability/action and dispatch against the manifest's
          *     `canonicalEntityId`; the power zone is the scenario lifecycle). Built from the
          *     scenario definition + the role devices' capability maps by the placement engine. The
-         *     `inputs` role is intentionally not rendered (reconciler-derived).
+         *     `inputs` role is intentionally not rendered (reconciler-derived). Cached per config
+         *     generation with a strong ETag, like the device layout.
          */
         get: operations["get_scenario_layout_scenario__id__layout_get"];
         put?: never;
@@ -1142,6 +1146,9 @@ export interface paths {
          *
          *     NOT the Layer-3 layout manifest -- that one is UI-shaped (panels, sliders,
          *     positions). The catalog is the contract for capability-aware callers.
+         *
+         *     Built once per config generation and served as cached bytes; the ETag is strong
+         *     and `If-None-Match` gets a 304, so polling costs no projection.
          */
         get: operations["get_system_catalog_system_catalog_get"];
         put?: never;
@@ -1871,6 +1878,43 @@ export interface components {
          * @enum {string}
          */
         DeviceCategory: "device" | "appliance";
+        /**
+         * DeviceSetupTiming
+         * @description One device's bring-up in the startup timeline.
+         */
+        DeviceSetupTiming: {
+            /**
+             * Background
+             * @description Setup finished (or is running) after bring-up stopped waiting
+             * @default false
+             */
+            background: boolean;
+            /** Device Class */
+            device_class: string;
+            /** Device Id */
+            device_id: string;
+            /**
+             * Queued Ms
+             * @description Wait for a setup slot, from the start of device bring-up
+             */
+            queued_ms: number;
+            /**
+             * Restore Ms
+             * @description Restoring the persisted state
+             */
+            restore_ms: number;
+            /**
+             * Setup Ms
+             * @description setup() duration; null while still running
+             */
+            setup_ms?: number | null;
+            /**
+             * Status
+             * @description `connecting` = setup outlasted the startup timeout and continues in the background; it later turns `ready` or `failed`.
+             * @enum {string}
+             */
+            status: "pending" | "ready" | "failed" | "connecting";
+        };
         /**
          * DeviceState
          * @description Runtime state of a device.
@@ -3062,6 +3106,31 @@ export interface components {
             /** Id */
             id: string;
         };
+        /**
+         * StartupTimeline
+         * @description Per-device setup durations of the last device bring-up (startup or /reload).
+         */
+        StartupTimeline: {
+            /**
+             * Concurrency
+             * @description Devices set up concurrently
+             */
+            concurrency: number;
+            /** Devices */
+            devices?: components["schemas"]["DeviceSetupTiming"][];
+            /**
+             * Setup Timeout S
+             * @description Per-device wait before continuing in the background
+             */
+            setup_timeout_s?: number | null;
+            /** Started At */
+            started_at: string;
+            /**
+             * Total Ms
+             * @description Until every device finished or was backgrounded
+             */
+            total_ms?: number | null;
+        };
         /** StateDefinition */
         StateDefinition: {
             /** Extends */
@@ -3163,6 +3232,8 @@ export interface components {
              * @description List of available scenarios
              */
             scenarios?: string[];
+            /** @description Device bring-up timeline; null before the first bring-up */
+            startup?: components["schemas"]["StartupTimeline"] | null;
             /**
              * Version
              * @default 0.6.0
@@ -46,4 +46,32 @@ export const createStateUpdate = <T extends BaseDeviceState>(
     ...currentState,
     ...updates,
   };
-}; 
\ No newline at end of file
+};
+
+/** One operation of a backend `state_delta` event (JSON Patch, top-level fields only). */
+export interface StatePatchOp {
+  op: 'add' | 'replace' | 'remove';
+  path: string;
+  value?: unknown;
+}
+
+/**
+ * Applies a `state_delta` patch to a cached device state. Returns `undefined` when
+ * there is no cached state to patch (the next fetch supplies the full state).
+ */
+export const applyStatePatch = (
+  prev: Record<string, unknown> | undefined,
+  patch: StatePatchOp[]
+): Record<string, unknown> | undefined => {
+  if (!prev) return undefined;
+  const next = { ...prev };
+  for (const { op, path, value } of patch) {
+    const field = path.slice(1).replace(/~1/g, '/').replace(/~0/g, '~');
+    if (op === 'remove') {
+      delete next[field];
+    } else {
+      next[field] = value;
+    }
+  }
+  return next;
+};
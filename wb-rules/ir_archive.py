@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Content-addressed IR ROM backup archive: deduplicated code blobs + one manifest per backup run.
+
+WHY: a CSV backup re-dumps and re-stores every non-empty bank on every run, and the same code
+learned into several banks (or unchanged across runs) is stored again each time. The archive keeps
+each distinct code once, named by its SHA-256, and a run only records which bank holds which code:
+
+    <archive>/blobs/<sha[:2]>/<sha256>          raw code bytes (big-endian uint16 durations)
+    <archive>/manifests/<YYYYmmddTHHMMSSZ>.json one per backup run:
+        {"format": 1, "created": "...Z",
+         "blasters": {"wb-msw-v3_207": {"modbus_address": 207,
+                                        "banks": {"5": {"size": 150, "sha256": "..."}}}}}
+
+`ir.py backup --archive DIR` writes it (dumping only banks whose size or first-frame fingerprint
+changed since the blaster's last manifest -- see ir_common.dump_if_changed). A run may cover only
+some blasters, or only some banks (--banks): each blaster's entry carries the banks it did not
+scan forward from its previous entry, and an archive dir resolves every blaster to its own newest
+entry (`Archive.latest`). `ir.py verify` and `ir.py restore` accept a manifest or an archive dir
+wherever they accept a CSV. The CSV stays the interchange format: `archive export` / `archive import` convert both ways.
+General purpose: no A/V knowledge, no bus access.
+
+Usage:
+    python3 ir.py archive list   ir_archive
+    python3 ir.py archive export ir_archive --out-dir .            # latest of each blaster -> CSVs
+    python3 ir.py archive import ir_archive ir_backup_wb-msw-v3_*.csv
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+import time
+from pathlib import Path
+
+import ir_common as ir
+
+FORMAT = 1
+
+
+class Archive:
+    """One archive directory: the blob store plus the run manifests."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.blobs = self.root / "blobs"
+        self.manifests = self.root / "manifests"
+
+    def _blob(self, sha256: str) -> Path:
+        return self.blobs / sha256[:2] / sha256
+
+    def put(self, raw: bytes) -> str:
+        """Store `raw` (once) and return its SHA-256. Written to a temp name and renamed into place,
+        so an interrupted run never leaves a truncated blob under a valid hash."""
+        sha256 = ir.code_sha256(raw)
+        path = self._blob(sha256)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".tmp{os.getpid()}")
+            tmp.write_bytes(raw)
+            tmp.replace(path)
+        return sha256
+
+    def get(self, sha256: str) -> bytes:
+        raw = self._blob(sha256).read_bytes()
+        if ir.code_sha256(raw) != sha256:
+            raise ValueError(f"blob {sha256} is corrupt (content hash differs)")
+        return raw
+
+    def manifest_paths(self) -> list[Path]:
+        """Every run manifest, oldest first: by the UTC time in the name, then by the -<n> suffix
+        of runs within the same second (a plain sort would put `...Z-2` before `...Z`)."""
+        if not self.manifests.is_dir():
+            return []
+
+        def run_order(path: Path) -> tuple[str, int]:
+            stamp, _, n = path.stem.partition("-")
+            return stamp, int(n) if n.isdigit() else 1
+
+        return sorted(self.manifests.glob("*.json"), key=run_order)
+
+    def latest(self) -> dict:
+        """A manifest holding every blaster as of the newest manifest that covers it -- a run
+        that skipped a blaster does not hide that blaster's earlier backup."""
+        blasters: dict[str, dict] = {}
+        for path in reversed(self.manifest_paths()):
+            for blaster, entry in read_manifest(path)["blasters"].items():
+                blasters.setdefault(blaster, entry)
+        return {"format": FORMAT, "blasters": blasters}
+
+    def previous(self, blaster: str) -> dict[int, bytes]:
+        """rom -> code bytes of `blaster` as of its newest manifest ({} if never archived)."""
+        entry = self.latest()["blasters"].get(blaster)
+        if entry is None:
+            return {}
+        return {int(rom): self.get(bank["sha256"]) for rom, bank in entry["banks"].items() if bank.get("sha256")}
+
+    def write_manifest(self, rows: list[dict], scanned: dict[str, tuple[int, list[int]]] | None = None) -> Path:
+        """Store the captured codes of CSV-shaped `rows` and record them as one run's manifest.
+
+        `scanned` maps each blaster the run scanned to (modbus address, banks whose size was
+        read). Its entry starts from the blaster's latest one minus those banks, so banks outside
+        a --banks subset or with an unreadable size are carried forward, and only a bank read
+        back empty is dropped. A bank whose dump failed keeps its last good code."""
+        blasters: dict[str, dict] = {}
+        latest = self.latest()["blasters"] if self.manifest_paths() else {}
+        if scanned:
+            for blaster, (address, banks) in scanned.items():
+                swept = {str(bank) for bank in banks}
+                prior = latest.get(blaster, {}).get("banks", {})
+                blasters[blaster] = {"modbus_address": address,
+                                     "banks": {rom: bank for rom, bank in prior.items() if rom not in swept}}
+        for row in rows:
+            entry = blasters.setdefault(row["blaster"], {"modbus_address": int(row["modbus_address"]),
+                                                         "banks": {}})
+            bank: dict = {"size": int(row["code_size_bytes"])}
+            if row["status"] == "ok" and row["code_base64"]:
+                bank["sha256"] = self.put(base64.b64decode(row["code_base64"]))
+            else:
+                prior = latest.get(row["blaster"], {}).get("banks", {}).get(str(row["rom"]))
+                if prior is not None and prior.get("sha256"):
+                    bank = prior  # a failed dump says nothing about the code: keep the last good one
+                else:
+                    bank["status"] = row["status"]
+            entry["banks"][str(row["rom"])] = bank
+        self.manifests.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        path = self.manifests / f"{stamp}.json"
+        n = 1
+        while path.exists():  # two runs within one second
+            n += 1
+            path = self.manifests / f"{stamp}-{n}.json"
+        manifest = {"format": FORMAT, "created": stamp, "blasters": blasters}
+        path.write_text(json.dumps(manifest, indent=1, sort_keys=True) + "\n")
+        return path
+
+    def rows(self, manifest: dict) -> list[dict]:
+        """A manifest as CSV-shaped rows (ir_common.CSV_FIELDS), codes read back from the blobs."""
+        out = []
+        for blaster, entry in manifest["blasters"].items():
+            for rom, bank in sorted(entry["banks"].items(), key=lambda item: int(item[0])):
+                sha256 = bank.get("sha256") or ""
+                out.append({
+                    "blaster": blaster, "modbus_address": entry["modbus_address"], "rom": int(rom),
+                    "code_size_bytes": bank["size"],
+                    "code_base64": base64.b64encode(self.get(sha256)).decode() if sha256 else "",
+                    "code_sha256": sha256, "status": bank.get("status", "ok"),
+                })
+        return out
+
+
+def read_manifest(path: Path) -> dict:
+    manifest = json.loads(Path(path).read_text())
+    if manifest.get("format") != FORMAT:
+        raise SystemExit(f"{path}: unsupported manifest format {manifest.get('format')!r}")
+    return manifest
+
+
+def load_source_rows(path: Path) -> list[dict]:
+    """Backup rows from a CSV, a manifest (.json inside an archive), or an archive dir (every
+    blaster's newest entry, see Archive.latest) -- what verify and restore accept as their source."""
+    path = Path(path)
+    if path.is_dir():
+        archive = Archive(path)
+        if not archive.manifest_paths():
+            raise SystemExit(f"{path}: no manifests in archive")
+        return archive.rows(archive.latest())
+    if path.suffix == ".json":
+        return Archive(path.parent.parent).rows(read_manifest(path))
+    return ir.read_csv(path)
+
+
+def add_arguments(parser) -> None:
+    sub = parser.add_subparsers(dest="archive_cmd", required=True, metavar="{list,export,import}")
+    sp = sub.add_parser("list", help="list the run manifests and the blasters/banks each holds")
+    sp.add_argument("archive", type=Path)
+    sp = sub.add_parser("export", help="write ir_backup_<blaster>.csv files from a manifest")
+    sp.add_argument("archive", type=Path)
+    sp.add_argument("--manifest", type=Path,
+                    help="manifest to export (default: every blaster's newest entry)")
+    sp.add_argument("--out-dir", type=Path, default=Path.cwd(), help="dir for the CSVs (default: cwd)")
+    sp = sub.add_parser("import", help="store backup CSV(s) as a new run manifest")
+    sp.add_argument("archive", type=Path)
+    sp.add_argument("csv", nargs="+", type=Path)
+
+
+def run(args) -> int:
+    archive = Archive(args.archive)
+    if args.archive_cmd == "import":
+        rows = [row for path in args.csv for row in ir.read_csv(path)]
+        path = archive.write_manifest(rows)
+        print(f"{len(rows)} bank(s) from {len(args.csv)} CSV(s) -> {path}")
+        return 0
+    manifests = archive.manifest_paths()
+    if not manifests:
+        raise SystemExit(f"{args.archive}: no manifests in archive")
+    if args.archive_cmd == "list":
+        for path in manifests:
+            blasters = read_manifest(path)["blasters"]
+            summary = ", ".join(f"{b} ({len(e['banks'])} bank(s))" for b, e in sorted(blasters.items()))
+            print(f"{path.name}: {summary}")
+        return 0
+    rows = archive.rows(read_manifest(args.manifest) if args.manifest else archive.latest())
+    by_blaster: dict[str, list[dict]] = {}
+    for row in rows:
+        by_blaster.setdefault(row["blaster"], []).append(row)
+    for blaster, blaster_rows in by_blaster.items():
+        out = args.out_dir / f"ir_backup_{blaster}.csv"
+        ir.write_csv(out, blaster_rows)
+        print(f"  -> {out}  ({len(blaster_rows)} bank(s))")
+    return 0
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(ap)
+    raise SystemExit(run(ap.parse_args()))
@@ -2,15 +2,17 @@
 """Back up the IR ROM banks of a WB-MSW v3 blaster to CSV, before a firmware upgrade wipes them.
 
 WHY: upgrading a WB-MSW v3 firmware WIPES its learned IR ROM banks. This dumps every ROM bank that
-HAS CONTENT (and optionally a chosen subset) to CSV (codes base64) so they survive the upgrade and
-can be written back with ir_restore.py.
+HAS CONTENT (and optionally a chosen subset) to CSV (codes base64) -- or, with --archive, into a
+content-addressed archive (ir_archive.py) -- so they survive the upgrade and can be written back
+with ir_restore.py.
 
 GENERAL PURPOSE: this scans the device itself -- it backs up every non-empty bank regardless of
 what (if anything) references it. It has no knowledge of any A/V system, device config, or
-scenario. See ir_common.py for the shared register map and the modbus_client wrapper.
+scenario. See ir_common.py for the shared register map and the Modbus RTU transports.
 
-RUNS ON THE WB CONTROLLER. It drives the controller-native `modbus_client` CLI (no Python deps) and
-needs exclusive bus access, so by default it stops `wb-mqtt-serial` for the duration and restarts
+RUNS ON THE WB CONTROLLER. It speaks Modbus RTU on the port itself (ir_common.ModbusRtu, no Python
+deps; `--transport cli` uses the controller-native `modbus_client` instead) and needs exclusive
+bus access, so by default it stops `wb-mqtt-serial` for the duration and restarts
 it after.
 
 MECHANISM (per bank N; verified on live hardware -- see ir_common.py for the full register map):
@@ -30,16 +32,20 @@ Usage (via the ir.py wrapper; `python3 ir_backup.py ...` works the same):
 
     # restrict to specific banks:
     sudo python3 ir.py backup wb-msw-v3_207 --banks 5,6,65-70 --port /dev/ttyRS485-2
+
+    # blasters on two RS-485 ports, dumped in parallel into a content-addressed archive; only
+    # banks whose size or first-frame fingerprint changed since the last run are dumped:
+    sudo python3 ir.py backup wb-msw-v3_207 wb-msw-v3_218 wb-msw-v3_220 --port /dev/ttyRS485-2 \
+        --blaster-port wb-msw-v3_220=/dev/ttyRS485-1 --archive ir_archive
 """
 from __future__ import annotations
 
 import argparse
-import csv
-import math
+import base64
 import re
-import sys
 from pathlib import Path
 
+import ir_archive
 import ir_common as ir
 
 
@@ -52,47 +58,85 @@ def derive_slave_address(blaster: str) -> int:
     return int(m.group(1))
 
 
-CSV_FIELDS = ["blaster", "modbus_address", "rom", "code_size_bytes", "code_base64", "status"]
+def load_previous(path: Path) -> dict[int, bytes]:
+    """rom -> code bytes captured in an earlier backup CSV (the --incremental baseline); {} if none."""
+    if not path.is_file():
+        return {}
+    return {int(r["rom"]): base64.b64decode(r["code_base64"])
+            for r in ir.read_csv(path) if r["status"] == "ok" and r["code_base64"]}
+
 
+def scan_blaster(blaster: str, banks: list[int], call, sizes_only: bool,
+                 previous: dict[int, bytes] | None = None,
+                 progress: ir.Progress | None = None,
+                 unread: set[int] | None = None) -> list[dict]:
+    """Backup rows (ir_common.CSV_FIELDS) for the non-empty `banks` of one blaster.
 
-def backup_blaster(blaster: str, banks: list[int], call, out_dir: Path, sizes_only: bool) -> Path | None:
+    With `previous` (rom -> code of the last backup), a bank whose size register and first-frame
+    fingerprint both match is kept from the last backup instead of being dumped again (see
+    ir_common.dump_if_changed): one size frame + one load + one read instead of the full dump.
+    Banks whose size register could not be read get no row; they are added to `unread`."""
     slave = derive_slave_address(blaster)
+    progress = progress or ir.Progress(len(banks))
+    previous = previous or {}
     rows = []
     for bank in banks:
         try:
             size = ir.read_size(call, bank)
         except Exception as e:  # one bad bank shouldn't abort the whole backup
-            print(f"  ROM{bank:<3} SIZE-ERROR: {e}", file=sys.stderr)
+            progress.say(f"  {blaster} ROM{bank:<3} SIZE-ERROR: {e}", advance=1, error=True)
+            if unread is not None:
+                unread.add(bank)
             continue
         if size == 0:
+            progress.advance()
             continue  # empty/unused bank -- nothing to back up
+        row = {"blaster": blaster, "modbus_address": slave, "rom": bank, "code_size_bytes": size,
+               "code_base64": "", "code_sha256": ""}
+        rows.append(row)
         if sizes_only:
-            print(f"  ROM{bank:<3} {size:>4} bytes")
-            rows.append({"blaster": blaster, "modbus_address": slave, "rom": bank,
-                         "code_size_bytes": size, "code_base64": "", "status": "size-only"})
+            row["status"] = "size-only"
+            progress.say(f"  {blaster} ROM{bank:<3} {size:>4} bytes", advance=1)
             continue
         try:
-            vals = ir.read_bank(call, bank, math.ceil(size / 2))
-            b64 = ir.regs_to_b64(vals, size)
-            status = "ok" if b64 else "EMPTY"
-            print(f"  ROM{bank:<3} {status:5} {size:>4} bytes")
+            raw = ir.dump_if_changed(call, bank, size, previous.get(bank))
+            if raw is None:
+                raw, status = previous[bank], "kept"
+            else:
+                status = "ok" if raw else "EMPTY"
+            progress.say(f"  {blaster} ROM{bank:<3} {status:5} {size:>4} bytes", advance=1)
         except Exception as e:
-            b64, status = "", f"ERROR: {e}"
-            print(f"  ROM{bank:<3} {status}", file=sys.stderr)
-        rows.append({"blaster": blaster, "modbus_address": slave, "rom": bank,
-                     "code_size_bytes": size, "code_base64": b64, "status": status})
+            raw, status = b"", f"ERROR: {e}"
+            progress.say(f"  {blaster} ROM{bank:<3} {status}", advance=1, error=True)
+        if raw:
+            row["code_base64"] = base64.b64encode(raw).decode()
+            row["code_sha256"] = ir.code_sha256(raw)
+        row["status"] = "ok" if status == "kept" else status
+        row["kept"] = status == "kept"
+    return rows
+
+
+def summary(rows: list[dict], sizes_only: bool) -> str:
+    ok = sum(1 for r in rows if r["status"] == "ok")
+    kept = sum(1 for r in rows if r.get("kept"))
+    captured = "inventoried" if sizes_only else f"{ok}/{len(rows)} captured"
+    if kept:
+        captured += f", {kept} unchanged since the previous backup"
+    return f"{len(rows)} non-empty bank(s); {captured}"
 
+
+def backup_blaster(blaster: str, banks: list[int], call, out_dir: Path, sizes_only: bool,
+                   previous: dict[int, bytes] | None = None,
+                   progress: ir.Progress | None = None) -> Path | None:
+    """Dump `banks` of one blaster to out_dir/ir_backup_<blaster>.csv (see scan_blaster)."""
+    progress = progress or ir.Progress(len(banks))
+    rows = scan_blaster(blaster, banks, call, sizes_only, previous, progress)
     if not rows:
-        print(f"  (no non-empty banks on {blaster})")
+        progress.say(f"  (no non-empty banks on {blaster})")
         return None
     out = out_dir / f"ir_backup_{blaster}.csv"
-    with out.open("w", newline="") as fh:
-        w = csv.DictWriter(fh, fieldnames=CSV_FIELDS)
-        w.writeheader()
-        w.writerows(rows)
-    ok = sum(1 for r in rows if r["status"] == "ok")
-    captured = "inventoried" if sizes_only else f"{ok}/{len(rows)} captured"
-    print(f"  -> {out}  ({len(rows)} non-empty bank(s); {captured})")
+    ir.write_csv(out, rows)
+    progress.say(f"  -> {out}  ({summary(rows, sizes_only)})")
     return out
 
 
@@ -106,6 +150,12 @@ def add_arguments(parser) -> None:
                                         f"default all {ir.BANK_MIN}-{ir.BANK_MAX}")
     parser.add_argument("--sizes-only", action="store_true",
                         help="inventory only: report which banks have content + sizes, do not dump codes")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only dump banks whose size register or first-frame fingerprint changed since "
+                             "the existing ir_backup_<blaster>.csv in --out-dir (always on with --archive)")
+    parser.add_argument("--archive", type=Path,
+                        help="write a content-addressed archive run (see ir_archive.py) into this dir "
+                             "instead of CSVs; only changed banks are dumped")
     ir.add_service_arg(parser)
 
 
@@ -114,15 +164,38 @@ def run(args) -> int:
     if not args.out_dir.is_dir():
         raise SystemExit(f"--out-dir not found: {args.out_dir}")
 
+    if args.archive is not None and args.sizes_only:
+        raise SystemExit("--sizes-only dumps no codes, so there is nothing to archive")
+    archive = ir_archive.Archive(args.archive) if args.archive is not None else None
+    previous: dict[str, dict[int, bytes]] = {}
     for blaster in args.blasters:
-        print(f"{blaster}: Modbus slave {derive_slave_address(blaster)}; "
+        if archive is not None:
+            previous[blaster] = archive.previous(blaster)
+        elif args.incremental and not args.sizes_only:
+            previous[blaster] = load_previous(args.out_dir / f"ir_backup_{blaster}.csv")
+        print(f"{blaster}: Modbus slave {derive_slave_address(blaster)} on {ir.port_for(args, blaster)}; "
               f"scanning banks {banks[0]}-{banks[-1]} ({len(banks)} bank(s))")
 
+    progress = ir.Progress(len(banks) * len(args.blasters))
+    unread: dict[str, set[int]] = {blaster: set() for blaster in args.blasters}
+
+    def work(bus, blaster):
+        progress.say(f"--- {blaster} ({bus.port}) ---")
+        call = bus.caller(derive_slave_address(blaster))
+        if archive is not None:
+            return scan_blaster(blaster, banks, call, False, previous[blaster], progress, unread[blaster])
+        return backup_blaster(blaster, banks, call, args.out_dir, args.sizes_only,
+                              previous.get(blaster), progress)
+
     with ir.bus_window(not args.no_toggle_service):
-        for blaster in args.blasters:
-            print(f"--- {blaster} ---")
-            call = ir.caller_for(args, derive_slave_address(blaster))
-            backup_blaster(blaster, banks, call, args.out_dir, args.sizes_only)
+        results = ir.run_per_port(args, [(ir.port_for(args, b), b) for b in args.blasters], work)
+    if archive is not None:
+        rows = [row for blaster_rows in results if blaster_rows for row in blaster_rows]
+        path = archive.write_manifest(
+            rows, {blaster: (derive_slave_address(blaster), [b for b in banks if b not in unread[blaster]])
+                   for blaster in args.blasters}
+        )
+        print(f"  -> {path}  ({summary(rows, False)})")
     return 0
 
 
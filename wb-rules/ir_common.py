@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 """Shared primitives for the WB-MSW v3 IR ROM tools (backup / restore / verify).
 
-GENERAL PURPOSE. This module knows only the WB-MSW v3 IR register map and the controller-native
-`modbus_client` CLI. It has NO knowledge of any A/V system, device config, scenario, or topology --
+GENERAL PURPOSE. This module knows only the WB-MSW v3 IR register map and Modbus RTU (natively, or
+through the controller-native `modbus_client` CLI). It has NO knowledge of any A/V system, device config, scenario, or topology --
 it is a plain "dump / write back / compare IR ROM banks" toolkit for a WB-MSW v3 blaster.
 
-RUNS ON THE WB CONTROLLER. The tools drive `modbus_client` (shipped on every Wiren Board
-controller -- no Python deps) and need exclusive bus access.
+RUNS ON THE WB CONTROLLER. The tools speak Modbus RTU on the serial port themselves (ModbusRtu:
+stdlib termios only, no Python deps) and keep the port open for the whole bus_window, so a full
+80-bank backup is one open() instead of one `modbus_client` process per frame. `--transport cli`
+(or a port that cannot be opened natively) falls back to the controller-native `modbus_client`
+CLI. Either way the tools need exclusive bus access.
 
 WB-MSW v3 IR register map (0-based wire addresses; verified on live hardware against
 /usr/share/wb-mqtt-serial/templates/config-wb-msw_v3.json and the WB support toolkit):
@@ -29,10 +32,24 @@ from __future__ import annotations
 
 import base64
 import contextlib
+import csv
+import hashlib
+import os
 import re
+import select
 import struct
 import subprocess
+import sys
+import threading
 import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, TypeVar
+
+try:
+    import termios
+except ImportError:  # not POSIX: only the modbus_client transport is available
+    termios = None  # type: ignore[assignment]
 
 # --- WB-MSW v3 IR register map (0-based wire addresses) -------------------------------------
 REG_RAM_BASE = 2000          # holding: the code buffer (one uint16 duration per register)
@@ -47,11 +64,17 @@ BANK_MIN = 1                 # WB-MSW v3 ROM banks are numbered 1..80
 BANK_MAX = 80
 
 DEFAULT_PORT = "/dev/ttyRS485-2"
+RESPONSE_TIMEOUT_MS = 2000   # a commit can be slow to answer right after a large write
 JITTER_TOL = 8               # default per-register tolerance (10 us quanta) for the verify compare;
                              # learned multi-repeat IR frames carry inherent +-~3-quantum capture
                              # jitter, so an exact byte compare is the wrong bar (see codes_match)
 
+# ir_backup_<blaster>.csv columns (older CSVs lack code_sha256; see row_sha256)
+CSV_FIELDS = ["blaster", "modbus_address", "rom", "code_size_bytes", "code_base64", "code_sha256", "status"]
+
 _PARITY = {"N": "none", "E": "even", "O": "odd"}
+_Job = TypeVar("_Job")
+_Result = TypeVar("_Result")
 _DATA_RE = re.compile(r"0x[0-9a-fA-F]+")
 
 
@@ -78,7 +101,7 @@ def make_modbus_caller(port: str, slave: int, baud: int, parity: str, stopbits:
     The 2000 ms response timeout (-o) matters: a commit can be slow right after a large write.
     """
     base = ["modbus_client", "-mrtu", f"-b{baud}", "-d8", f"-s{stopbits}",
-            f"-p{_PARITY[parity]}", "-o", "2000", port, f"-a{slave}"]
+            f"-p{_PARITY[parity]}", "-o", str(RESPONSE_TIMEOUT_MS), port, f"-a{slave}"]
 
     def call(func, addr, count=None, write_vals=None):
         cmd = base + [f"-t{func}", f"-r{addr}"]
@@ -92,12 +115,256 @@ def make_modbus_caller(port: str, slave: int, baud: int, parity: str, stopbits:
     return call
 
 
+# --- native Modbus RTU transport ----------------------------------------------------------------
+_EXCEPTION_NAMES = {1: "Illegal Function", 2: "Illegal Data Address", 3: "Illegal Data Value",
+                    4: "Slave Device Failure", 5: "Acknowledge", 6: "Slave Device Busy"}
+
+
+def _crc_table() -> list[int]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def crc16(frame: bytes) -> int:
+    """Modbus CRC-16 (poly 0xA001, init 0xFFFF). It goes on the wire little-endian."""
+    crc = 0xFFFF
+    for b in frame:
+        crc = (crc >> 8) ^ _CRC_TABLE[(crc ^ b) & 0xFF]
+    return crc
+
+
+class ModbusError(Exception):
+    """One RTU exchange failed: no/short reply, bad CRC, wrong echo, or a slave exception."""
+
+
+@dataclass
+class Reply:
+    """Result of one native exchange. ok()/parse_regs() read it exactly like modbus_client output,
+    so the tools do not care which transport produced it; str() renders it the same way too."""
+    success: bool
+    values: list[int] | None = None   # registers / coil bits for a read; None for a write
+    error: str = ""
+
+    def __str__(self) -> str:
+        if not self.success:
+            return f"ERROR: {self.error}"
+        if self.values is None:
+            return "SUCCESS: written"
+        return "Data: " + " ".join(f"0x{v:04x}" for v in self.values)
+
+
+class ModbusRtu:
+    """A Modbus RTU master on one serial port, held open across every exchange of a tool run.
+
+    Function codes 01 (read coils), 03/04 (read holding/input), 05 (write coil), 06 (write holding)
+    and 10 (write multiple). Frames are delimited by 3.5 character times of bus silence; replies
+    are length-checked, CRC-checked and matched against the request's slave and function code.
+    """
+
+    def __init__(self, port: str, baud: int = 9600, parity: str = "N", stopbits: int = 2,
+                 timeout: float = RESPONSE_TIMEOUT_MS / 1000.0):
+        self.port = port
+        self.timeout = timeout
+        # 11 bits per character (start + 8 data + parity/stop); the spec fixes 1.75 ms above 19200.
+        self._gap = max(3.5 * 11 / baud, 0.00175)
+        self._idle_since = 0.0
+        self._fd = self._open(port, baud, parity, stopbits)
+
+    @staticmethod
+    def _open(port: str, baud: int, parity: str, stopbits: int) -> int:
+        if termios is None:
+            raise OSError("termios is not available on this platform")
+        speed = getattr(termios, f"B{baud}", None)
+        if speed is None:
+            raise ValueError(f"unsupported baud rate {baud}")
+        fd = os.open(port, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            attrs = termios.tcgetattr(fd)
+            cflag = termios.CS8 | termios.CREAD | termios.CLOCAL
+            if parity != "N":
+                cflag |= termios.PARENB | (termios.PARODD if parity == "O" else 0)
+            if stopbits == 2:
+                cflag |= termios.CSTOPB
+            attrs[0] = attrs[1] = attrs[3] = 0          # raw: no input/output/line processing
+            attrs[2] = cflag
+            attrs[4] = attrs[5] = speed
+            attrs[6][termios.VMIN] = 0
+            attrs[6][termios.VTIME] = 0
+            termios.tcsetattr(fd, termios.TCSANOW, attrs)
+            termios.tcflush(fd, termios.TCIOFLUSH)
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> ModbusRtu:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _read(self, n: int, deadline: float) -> bytes:
+        buf = b""
+        while len(buf) < n:
+            left = deadline - time.monotonic()
+            if left <= 0 or not select.select([self._fd], [], [], left)[0]:
+                raise ModbusError(f"timeout after {self.timeout * 1000:.0f} ms "
+                                  f"({'no reply' if not buf else f'{len(buf)}/{n} bytes'})")
+            buf += os.read(self._fd, n - len(buf))
+        return buf
+
+    def _write(self, frame: bytes) -> None:
+        view = memoryview(frame)
+        while view:
+            select.select([], [self._fd], [], self.timeout)
+            view = view[os.write(self._fd, view):]
+        termios.tcdrain(self._fd)
+
+    def transact(self, slave: int, pdu: bytes, reply_len: int) -> bytes:
+        """Send `pdu` (function code + data) to `slave`; return the reply PDU of `reply_len` bytes.
+
+        Raises ModbusError on a timeout, a CRC/addressing mismatch, or a slave exception reply."""
+        request = bytes([slave]) + pdu
+        wait = self._idle_since + self._gap - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        termios.tcflush(self._fd, termios.TCIFLUSH)  # drop a late reply to an earlier timed-out frame
+        try:
+            self._write(request + struct.pack("<H", crc16(request)))
+            deadline = time.monotonic() + self.timeout
+            head = self._read(2, deadline)
+            if head[0] != slave:
+                raise ModbusError(f"reply from slave {head[0]}, expected {slave}")
+            if head[1] == pdu[0] | 0x80:
+                frame = head + self._read(3, deadline)
+                code = frame[2]
+                if crc16(frame[:-2]) != struct.unpack("<H", frame[-2:])[0]:
+                    raise ModbusError("CRC error in exception reply")
+                raise ModbusError(f"Modbus exception {code:02d} ({_EXCEPTION_NAMES.get(code, 'unknown')})")
+            if head[1] != pdu[0]:
+                raise ModbusError(f"reply function 0x{head[1]:02x}, expected 0x{pdu[0]:02x}")
+            frame = head + self._read(reply_len + 1, deadline)  # rest of the PDU + CRC
+            if crc16(frame[:-2]) != struct.unpack("<H", frame[-2:])[0]:
+                raise ModbusError("CRC error")
+            return frame[1:-2]
+        finally:
+            self._idle_since = time.monotonic()
+
+    def read_bits(self, slave: int, addr: int, count: int) -> list[int]:
+        """0x01: `count` coils as 0/1."""
+        nbytes = (count + 7) // 8
+        pdu = self.transact(slave, struct.pack(">BHH", 0x01, addr, count), 2 + nbytes)
+        return [(pdu[2 + i // 8] >> (i % 8)) & 1 for i in range(count)]
+
+    def read_registers(self, slave: int, func: int, addr: int, count: int) -> list[int]:
+        """0x03 (holding) / 0x04 (input): `count` uint16 registers."""
+        pdu = self.transact(slave, struct.pack(">BHH", func, addr, count), 2 + 2 * count)
+        return list(struct.unpack(f">{count}H", pdu[2:]))
+
+    def _expect_echo(self, slave: int, pdu: bytes) -> None:
+        reply = self.transact(slave, pdu, len(pdu))
+        if reply != pdu:
+            raise ModbusError(f"write not echoed (sent {pdu.hex()}, got {reply.hex()})")
+
+    def write_coil(self, slave: int, addr: int, value: int) -> None:
+        """0x05: one coil (the reply echoes the request)."""
+        self._expect_echo(slave, struct.pack(">BHH", 0x05, addr, 0xFF00 if value else 0x0000))
+
+    def write_register(self, slave: int, addr: int, value: int) -> None:
+        """0x06: one holding register (the reply echoes the request)."""
+        self._expect_echo(slave, struct.pack(">BHH", 0x06, addr, value))
+
+    def write_registers(self, slave: int, addr: int, values: list[int]) -> None:
+        """0x10: consecutive holding registers (the reply echoes address + count)."""
+        n = len(values)
+        reply = self.transact(slave, struct.pack(f">BHHB{n}H", 0x10, addr, n, 2 * n, *values), 5)
+        if reply != struct.pack(">BHH", 0x10, addr, n):
+            raise ModbusError(f"write-multiple @ {addr} x{n} not acknowledged ({reply.hex()})")
+
+
+def make_native_caller(rtu: ModbusRtu, slave: int):
+    """The same call(func, addr, count=None, write_vals=None) as make_modbus_caller, over an open
+    ModbusRtu. It returns a Reply instead of CLI text and, like the CLI, never raises on a bus or
+    slave error -- the tools' own retry loops decide what a failed exchange means."""
+
+    def call(func, addr, count=None, write_vals=None):
+        code = int(func, 16)
+        try:
+            if code == 0x01:
+                return Reply(True, rtu.read_bits(slave, addr, count or 1))
+            if code in (0x03, 0x04):
+                return Reply(True, rtu.read_registers(slave, code, addr, count or 1))
+            if code == 0x05:
+                rtu.write_coil(slave, addr, write_vals[0])
+            elif code == 0x06:
+                rtu.write_register(slave, addr, write_vals[0])
+            elif code == 0x10:
+                rtu.write_registers(slave, addr, list(write_vals))
+            else:
+                return Reply(False, error=f"unsupported function {func}")
+            return Reply(True)
+        except (ModbusError, OSError) as e:
+            return Reply(False, error=str(e))
+
+    return call
+
+
+class Bus:
+    """One RS485 port for a tool run (see bus_window / run_per_port): one native ModbusRtu
+    connection shared by every slave on the port, or the modbus_client CLI when --transport cli is
+    asked for or the port cannot be opened natively (--transport auto)."""
+
+    def __init__(self, args, port: str | None = None):
+        self.args = args
+        self.port = port or args.port
+        self.rtu: ModbusRtu | None = None
+        transport = getattr(args, "transport", "auto")
+        if transport == "cli":
+            return
+        try:
+            self.rtu = ModbusRtu(self.port, args.baud, args.parity, args.stopbits)
+        except (OSError, ValueError) as e:
+            if transport == "native":
+                raise SystemExit(f"cannot open {self.port} for native Modbus RTU: {e}")
+            print(f"Native Modbus RTU unavailable on {self.port} ({e}); falling back to modbus_client")
+
+    def caller(self, slave: int):
+        """call(func, addr, count=None, write_vals=None) for `slave` on this bus."""
+        if self.rtu is None:
+            return caller_for(self.args, slave, self.port)
+        return make_native_caller(self.rtu, slave)
+
+    def close(self) -> None:
+        if self.rtu is not None:
+            self.rtu.close()
+            self.rtu = None
+
+
 def add_bus_args(parser) -> None:
     """Add the serial-bus connection args shared by every tool (--port/--baud/--parity/--stopbits)."""
     parser.add_argument("--port", default=DEFAULT_PORT, help=f"serial port (default: {DEFAULT_PORT})")
     parser.add_argument("--baud", type=int, default=9600)
     parser.add_argument("--parity", default="N", choices=["N", "E", "O"])
     parser.add_argument("--stopbits", type=int, default=2, choices=[1, 2])
+    parser.add_argument("--blaster-port", action="append", default=[], metavar="BLASTER=PORT",
+                        help="serve BLASTER on PORT instead of --port (repeatable); blasters on "
+                             "different ports are worked in parallel")
+    parser.add_argument("--transport", default="auto", choices=["auto", "native", "cli"],
+                        help="native: in-process Modbus RTU on the port; cli: one modbus_client "
+                             "process per frame; auto (default): native, else modbus_client")
 
 
 def add_service_arg(parser) -> None:
@@ -106,38 +373,128 @@ def add_service_arg(parser) -> None:
                         help="do NOT stop/start wb-mqtt-serial (use if you stopped it yourself)")
 
 
-def caller_for(args, slave: int):
+def caller_for(args, slave: int, port: str | None = None):
     """A modbus_client caller for `slave`, built from the standard bus args (see add_bus_args)."""
-    return make_modbus_caller(args.port, slave, args.baud, args.parity, args.stopbits)
+    return make_modbus_caller(port or args.port, slave, args.baud, args.parity, args.stopbits)
+
+
+def port_for(args, blaster: str) -> str:
+    """The serial port `blaster` hangs off: its --blaster-port entry, else --port."""
+    for spec in getattr(args, "blaster_port", None) or []:
+        name, sep, port = spec.partition("=")
+        if not sep or not port:
+            raise SystemExit(f"--blaster-port expects BLASTER=PORT, got {spec!r}")
+        if name == blaster:
+            return port
+    return args.port
+
+
+class Progress:
+    """Progress + ETA over a known number of banks, shared by every port worker of a run.
+
+    say() is the one place the workers print through: it holds a lock so lines from parallel ports
+    never interleave, and tags each line with the running count and the remaining-time estimate
+    (elapsed time per finished bank, extrapolated)."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def status(self) -> str:
+        if not self.done:
+            return f"0/{self.total}"
+        left = (time.monotonic() - self._started) / self.done * (self.total - self.done)
+        return f"{self.done}/{self.total}, ETA {int(left) // 60}m{int(left) % 60:02d}s"
+
+    def advance(self, n: int = 1) -> None:
+        """Count `n` more banks as finished without printing (e.g. an empty bank)."""
+        with self._lock:
+            self.done += n
+
+    def say(self, msg: str, advance: int = 0, error: bool = False) -> None:
+        """Print `msg`; `advance` counts that many more banks as finished first."""
+        with self._lock:
+            self.done += advance
+            tag = f"  [{self.status()}]" if advance else ""
+            first, sep, rest = msg.partition("\n")  # the tag goes on the bank's own line
+            print(first + tag + sep + rest, file=sys.stderr if error else sys.stdout, flush=True)
+
+
+def run_per_port(args, jobs: list[tuple[str, _Job]],
+                 work: Callable[[Bus, _Job], _Result]) -> list[_Result | None]:
+    """Run `work(bus, job)` for every (port, job): one worker thread and one Bus per serial port.
+
+    Jobs sharing a port run strictly in order on that port's worker (one RS485 line carries one
+    frame at a time); different ports run concurrently, so three blasters on two ports finish in
+    the time of the busier port rather than the sum. Results come back in `jobs` order (None for
+    a job its port never reached); the first worker exception is re-raised once all have stopped."""
+    by_port: dict[str, list[tuple[int, _Job]]] = {}
+    for i, (port, job) in enumerate(jobs):
+        by_port.setdefault(port, []).append((i, job))
+    results: list[_Result | None] = [None] * len(jobs)
+    errors: list[BaseException] = []
+
+    def worker(port: str, items: list[tuple[int, _Job]]) -> None:
+        try:
+            bus = Bus(args, port)
+            try:
+                for i, job in items:
+                    results[i] = work(bus, job)
+            finally:
+                bus.close()
+        except BaseException as e:  # re-raised on the main thread below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=item, name=f"bus {item[0]}") for item in by_port.items()]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    return results
 
 
 @contextlib.contextmanager
-def bus_window(toggle: bool, settle: float = 2.0):
+def bus_window(toggle: bool, settle: float = 2.0, args=None):
     """Exclusive-bus context: stop wb-mqtt-serial (if `toggle`), settle, restart on exit.
 
     wb-mqtt-serial owns the RS485 bus, so a tool needs it stopped for the duration. The restart
-    runs in a finally, so the service comes back even if the body raises or breaks out early."""
+    runs in a finally, so the service comes back even if the body raises or breaks out early.
+    Given the bus `args` (see add_bus_args) it yields a Bus whose port stays open until the window
+    closes -- and is released before wb-mqtt-serial is started again."""
     started = False
+    bus = None
     if toggle:
         print("Stopping wb-mqtt-serial for exclusive bus access...")
         subprocess.run(["systemctl", "stop", "wb-mqtt-serial"], check=True)
         started = True
     try:
         time.sleep(settle)  # let the bus settle after the service releases it
-        yield
+        if args is not None:
+            bus = Bus(args)
+        yield bus
     finally:
+        if bus is not None:
+            bus.close()
         if started:
             print("Restarting wb-mqtt-serial...")
             subprocess.run(["systemctl", "start", "wb-mqtt-serial"], check=False)
 
 
-def ok(out: str) -> bool:
+def ok(out: str | Reply) -> bool:
     """modbus_client prints 'written' / 'SUCCESS' on a good write; everything else is a failure."""
+    if isinstance(out, Reply):
+        return out.success
     return ("written" in out) or ("SUCCESS" in out)
 
 
-def parse_regs(out: str) -> list[int] | None:
-    """Pull register values out of a modbus_client 'Data: 0x.. 0x..' line."""
+def parse_regs(out: str | Reply) -> list[int] | None:
+    """Pull register values out of a modbus_client 'Data: 0x.. 0x..' line (or a native Reply)."""
+    if isinstance(out, Reply):
+        return out.values
     m = re.search(r"Data:\s*(.*)", out)
     if not m:
         return None
@@ -153,12 +510,22 @@ def read_size(call, bank: int) -> int:
     return regs[0]
 
 
-def read_bank(call, bank: int, nregs: int) -> list[int]:
-    """Load ROM bank into RAM via the non-committing BANK->RAM loader, then read nregs registers."""
+def load_bank(call, bank: int) -> None:
+    """Copy ROM bank into the RAM buffer via the non-committing BANK->RAM loader."""
     if not ok(call("0x06", REG_BANK_TO_RAM, write_vals=[bank])):
         raise RuntimeError(f"BANK->RAM (reg {REG_BANK_TO_RAM}={bank}) failed")
+
+
+def read_bank(call, bank: int, nregs: int) -> list[int]:
+    """Load ROM bank into RAM via the non-committing BANK->RAM loader, then read nregs registers."""
+    load_bank(call, bank)
+    return read_ram(call, nregs)
+
+
+def read_ram(call, nregs: int, start: int = 0) -> list[int]:
+    """Read RAM registers [start, nregs) of the loaded bank, chunked at the 125-reg read cap."""
     vals: list[int] = []
-    off = 0
+    off = start
     while off < nregs:
         chunk = min(MAX_READ_REGS, nregs - off)
         r = parse_regs(call("0x03", REG_RAM_BASE + off, count=chunk))
@@ -169,12 +536,67 @@ def read_bank(call, bank: int, nregs: int) -> list[int]:
     return vals
 
 
+def regs_to_bytes(vals: list[int], size_bytes: int) -> bytes:
+    """Pack uint16 duration registers (big-endian) into the bank's first `size_bytes` bytes."""
+    return b"".join(struct.pack(">H", v) for v in vals)[:size_bytes]
+
+
 def regs_to_b64(vals: list[int], size_bytes: int) -> str:
     """Pack uint16 duration registers (big-endian) into `size_bytes` bytes and base64-encode."""
-    raw = b"".join(struct.pack(">H", v) for v in vals)[:size_bytes]
+    raw = regs_to_bytes(vals, size_bytes)
     return base64.b64encode(raw).decode() if raw else ""
 
 
+def code_sha256(raw: bytes) -> str:
+    """Content hash of a bank's code bytes (the `code_sha256` CSV column)."""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def read_csv(path: Path) -> list[dict]:
+    """The rows of a backup CSV, as written by write_csv (or an older ir_backup.py)."""
+    with Path(path).open() as fh:
+        return list(csv.DictReader(fh))
+
+
+def write_csv(path: Path, rows: list[dict]) -> None:
+    """Write backup rows (CSV_FIELDS; extra columns of older CSVs are dropped)."""
+    with Path(path).open("w", newline="") as fh:
+        w = csv.DictWriter(fh, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        w.writeheader()
+        w.writerows(rows)
+
+
+def row_sha256(row: dict) -> str:
+    """A backup CSV row's code hash; older CSVs without the column get it from code_base64."""
+    return row.get("code_sha256") or code_sha256(base64.b64decode(row.get("code_base64") or ""))
+
+
+def bank_unchanged(call, bank: int, size_bytes: int, sha256: str) -> bool:
+    """True when bank holds exactly `size_bytes` bytes hashing to `sha256`. The size register is
+    one frame and settles most banks; only a size match pays for loading and reading the code."""
+    if read_size(call, bank) != size_bytes:
+        return False
+    vals = read_bank(call, bank, (size_bytes + 1) // 2)
+    return code_sha256(regs_to_bytes(vals, size_bytes)) == sha256
+
+
+def dump_if_changed(call, bank: int, size_bytes: int, prior: bytes | None) -> bytes | None:
+    """The bank's `size_bytes` code bytes -- or None when `prior` (this bank's code in the last
+    backup) has the same size and matches the bank's first read frame, the cheap fingerprint.
+
+    The fingerprint is the first 125 registers, so a code up to 250 bytes is compared in full
+    and a longer one by its head: a re-learned code differs from its first pulses on, while a
+    stored bank reads back byte-identical every time (capture jitter is frozen into ROM). A
+    fingerprint that does not match is not wasted -- it is the first frame of the dump."""
+    nregs = (size_bytes + 1) // 2
+    load_bank(call, bank)
+    head = read_ram(call, min(MAX_READ_REGS, nregs))
+    head_bytes = regs_to_bytes(head, size_bytes)
+    if prior is not None and len(prior) == size_bytes and prior.startswith(head_bytes):
+        return None
+    return regs_to_bytes(head + read_ram(call, nregs, start=len(head)), size_bytes)
+
+
 def b64_to_regs(b64: str) -> list[int]:
     """base64 -> bytes -> uint16 big-endian duration registers (odd trailing byte zero-padded)."""
     raw = base64.b64decode(b64)
@@ -2,16 +2,19 @@
 """Restore WB-MSW v3 IR ROM banks from an ir_backup_*.csv, after a firmware upgrade wiped them.
 
 *** THIS WRITES THE DEVICE'S FLASH. *** It is the reverse of ir_backup.py. It reads the CSV(s)
-produced by ir_backup.py, decodes each bank's base64 code back into IR durations, writes it into
+(or archive manifest -- see ir_archive.py) produced by ir_backup.py, decodes each bank's base64 code back into IR durations, writes it into
 the corresponding ROM bank, then reads it back and verifies. General purpose: no A/V knowledge.
-See ir_common.py for the shared register map and the modbus_client wrapper.
+See ir_common.py for the shared register map and the Modbus RTU transports.
 
-RUNS ON THE WB CONTROLLER. Drives the controller-native `modbus_client` CLI (no Python deps) and
-needs exclusive bus access, so by default it stops `wb-mqtt-serial` for the duration.
+RUNS ON THE WB CONTROLLER. Speaks Modbus RTU on the port itself (ir_common.ModbusRtu, no Python
+deps; `--transport cli` uses the controller-native `modbus_client` instead) and needs exclusive
+bus access, so by default it stops `wb-mqtt-serial` for the duration.
 
 SAFETY:
   * It is a DRY RUN unless you pass --confirm. Without --confirm it only parses the CSV, decodes
     every code, and prints the plan -- it touches no hardware.
+  * A bank whose size and content hash already match the CSV is skipped -- nothing is written
+    (--force writes it anyway).
   * Every bank is read back and compared after writing; on a mismatch it STOPS (unless --keep-going).
   * Verify is jitter-tolerant (--tol quanta): learned multi-repeat codes carry per-repeat capture
     jitter, so an exact compare reports false mismatches (see ir_common.compare). Lengths must
@@ -37,15 +40,21 @@ Usage (via the ir.py wrapper; `python3 ir_restore.py ...` works the same):
 
     # restrict to specific banks:
     sudo python3 ir.py restore ir_backup_wb-msw-v3_207.csv --only-rom 5,6 --confirm
+
+    # blasters on two RS-485 ports are restored in parallel inside the one service-stop window:
+    sudo python3 ir.py restore ir_backup_wb-msw-v3_207.csv ir_backup_wb-msw-v3_220.csv \
+        --blaster-port wb-msw-v3_220=/dev/ttyRS485-1 --confirm
 """
 from __future__ import annotations
 
 import argparse
-import csv
 import sys
+import threading
 import time
+from dataclasses import dataclass
 from pathlib import Path
 
+import ir_archive
 import ir_common as ir
 
 VERIFY_READ_TRIES = 6        # read-back after a large-code commit can be transiently wrong; retry
@@ -62,7 +71,7 @@ def _write(call, func: str, addr: int, vals, tries: int = WRITE_RETRIES, delay:
         if ir.ok(out):
             return out
         time.sleep(delay)
-    raise RuntimeError(f"{func} @ {addr} (={vals}) failed after {tries} tries: {out.strip()[:120]}")
+    raise RuntimeError(f"{func} @ {addr} (={vals}) failed after {tries} tries: {str(out).strip()[:120]}")
 
 
 def write_bank(call, bank: int, buf: list[int], settle: float) -> None:
@@ -117,33 +126,92 @@ def clear_stuck_edit(call) -> list[int]:
     return cleared
 
 
-def load_rows(csv_paths: list[Path], only_rom: set[int] | None):
-    """Yield restorable plan entries from the backup CSV(s)."""
+def load_rows(sources: list[Path], only_rom: set[int] | None):
+    """Restorable plan entries from the backup CSV(s) / archive manifest(s)."""
     plan = []
-    for path in csv_paths:
-        with path.open() as fh:
-            for row in csv.DictReader(fh):
-                rom = int(row["rom"])
-                if only_rom is not None and rom not in only_rom:
-                    continue
-                if row["status"] != "ok" or not row["code_base64"]:
-                    print(f"  skip {row['blaster']} ROM{rom}: status={row['status']!r}")
-                    continue
-                regs = ir.b64_to_regs(row["code_base64"])
-                nbytes = int(row["code_size_bytes"])
-                if len(regs) * 2 not in (nbytes, nbytes + 1):
-                    print(f"  ! {row['blaster']} ROM{rom}: decoded {len(regs)*2}B != csv {nbytes}B",
-                          file=sys.stderr)
-                buf = ir.with_terminator(regs)
-                plan.append({
-                    "blaster": row["blaster"], "slave": int(row["modbus_address"]),
-                    "rom": rom, "buf": buf, "expected": ir.code_part(buf), "nbytes": nbytes,
-                })
+    for path in sources:
+        for row in ir_archive.load_source_rows(path):
+            rom = int(row["rom"])
+            if only_rom is not None and rom not in only_rom:
+                continue
+            if row["status"] != "ok" or not row["code_base64"]:
+                print(f"  skip {row['blaster']} ROM{rom}: status={row['status']!r}")
+                continue
+            regs = ir.b64_to_regs(row["code_base64"])
+            nbytes = int(row["code_size_bytes"])
+            if len(regs) * 2 not in (nbytes, nbytes + 1):
+                print(f"  ! {row['blaster']} ROM{rom}: decoded {len(regs)*2}B != csv {nbytes}B",
+                      file=sys.stderr)
+            buf = ir.with_terminator(regs)
+            plan.append({
+                "blaster": row["blaster"], "slave": int(row["modbus_address"]),
+                "rom": rom, "buf": buf, "expected": ir.code_part(buf), "nbytes": nbytes,
+                "sha256": ir.row_sha256(row),
+            })
     return plan
 
 
+@dataclass
+class Tally:
+    """Outcome counts of one blaster's restore (summed across the port workers by run)."""
+    attempted: int = 0
+    restored: int = 0
+    unchanged: int = 0
+    failures: int = 0
+
+
+def restore_banks(call, entries: list[dict], args, progress: ir.Progress, stop: threading.Event) -> Tally:
+    """Restore one blaster's plan entries in order. Setting `stop` (a mismatch without
+    --keep-going, on this port or another) halts every worker before its next bank."""
+    tally = Tally()
+    for e in entries:
+        if stop.is_set():
+            break
+        tally.attempted += 1
+        label = f"  {e['blaster']} ROM{e['rom']:<3}"
+        try:
+            if not args.force:
+                try:
+                    same = ir.bank_unchanged(call, e["rom"], e["nbytes"], e["sha256"])
+                except RuntimeError:
+                    same = False  # could not read it back: write it
+                if same:
+                    tally.unchanged += 1
+                    progress.say(f"{label} UNCHANGED ({e['nbytes']}B already on the device, skipped)", advance=1)
+                    continue
+            write_bank(call, e["rom"], e["buf"], args.settle)
+            # A read-back immediately after committing a LARGE code can return transient
+            # garbage for several seconds (the commit is correct, but the next read or two come
+            # back wrong). So retry the verify read, spaced out, before declaring a mismatch.
+            rep = None
+            for _ in range(VERIFY_READ_TRIES):
+                got = ir.code_part(ir.read_bank(call, e["rom"], len(e["expected"]) + 4))
+                rep = ir.compare(e["expected"], got, args.tol)
+                if rep["match"]:
+                    break
+                time.sleep(3)
+            if rep["match"]:
+                tally.restored += 1
+                note = "exact" if rep["exact"] else f"~jitter maxdev={rep['max_dev']} over {rep['n_diff']} reg(s)"
+                progress.say(f"{label} OK   ({e['nbytes']}B verified, {note})", advance=1)
+            else:
+                tally.failures += 1
+                progress.say(f"{label} VERIFY MISMATCH "
+                             f"(exp {rep['exp_len']} regs, got {rep['got_len']}, "
+                             f"maxdev={rep['max_dev']} > tol {args.tol})", advance=1, error=True)
+                if not args.keep_going:
+                    progress.say("  stopping (use --keep-going to continue past mismatches)", error=True)
+                    stop.set()
+        except Exception as ex:
+            tally.failures += 1
+            progress.say(f"{label} ERROR: {ex}", advance=1, error=True)
+            if not args.keep_going:
+                stop.set()
+    return tally
+
+
 def add_arguments(parser) -> None:
-    parser.add_argument("csv", nargs="+", type=Path, help="ir_backup_<blaster>.csv file(s) to restore from")
+    parser.add_argument("csv", nargs="+", type=Path, help="ir_backup_<blaster>.csv file(s), archive manifest(s) or archive dir(s) to restore from")
     ir.add_bus_args(parser)
     parser.add_argument("--settle", type=float, default=20.0,
                         help="seconds to wait after entering edit mode (official WB script uses 20)")
@@ -155,72 +223,57 @@ def add_arguments(parser) -> None:
                         help="actually WRITE FLASH. Without this the script is a dry run.")
     parser.add_argument("--keep-going", action="store_true",
                         help="continue to remaining banks after a verify mismatch (default: stop)")
+    parser.add_argument("--force", action="store_true",
+                        help="write every bank, even one whose size + content hash already match the CSV")
     ir.add_service_arg(parser)
 
 
 def run(args) -> int:
     for p in args.csv:
-        if not p.is_file():
-            raise SystemExit(f"CSV not found: {p}")
+        if not p.exists():
+            raise SystemExit(f"Backup not found: {p}")
     only_rom = ir.parse_banks(args.only_rom) if args.only_rom else None
 
-    print("Parsing + decoding CSV ...")
+    print("Parsing + decoding backup ...")
     plan = load_rows(args.csv, only_rom)
     if not plan:
         print("Nothing to restore.")
         return 0
     print(f"\n{len(plan)} bank(s) to restore:")
     for e in plan:
-        print(f"  {e['blaster']} (slave {e['slave']}) ROM{e['rom']:<3} {e['nbytes']:>4}B")
+        print(f"  {e['blaster']} (slave {e['slave']} on {ir.port_for(args, e['blaster'])}) "
+              f"ROM{e['rom']:<3} {e['nbytes']:>4}B")
 
     if not args.confirm:
         print("\nDRY RUN -- no hardware touched. Re-run with --confirm to write flash.")
         return 0
 
-    failures = 0
-    restored = 0
-    attempted = 0
-    with ir.bus_window(not args.no_toggle_service):
+    by_blaster: dict[str, list[dict]] = {}
+    for e in plan:
+        by_blaster.setdefault(e["blaster"], []).append(e)
+    progress = ir.Progress(len(plan))
+    stop = threading.Event()
+
+    def work(bus, blaster):
+        entries = by_blaster[blaster]
+        call = bus.caller(entries[0]["slave"])
         # Preflight: clear any bank left in edit mode by a prior failed/interrupted run -- a stuck
         # edit coil locks the blaster's entire playback (every Play -> Slave Device Busy).
-        for slave in sorted({e["slave"] for e in plan}):
-            stuck = clear_stuck_edit(ir.caller_for(args, slave))
-            if stuck:
-                print(f"  preflight: slave {slave} had bank(s) {stuck} stuck in edit mode -> cleared")
-        for e in plan:
-            attempted += 1
-            call = ir.caller_for(args, e["slave"])
-            try:
-                write_bank(call, e["rom"], e["buf"], args.settle)
-                # A read-back immediately after committing a LARGE code can return transient
-                # garbage for several seconds (the commit is correct, but the next read or two come
-                # back wrong). So retry the verify read, spaced out, before declaring a mismatch.
-                rep = None
-                for _ in range(VERIFY_READ_TRIES):
-                    got = ir.code_part(ir.read_bank(call, e["rom"], len(e["expected"]) + 4))
-                    rep = ir.compare(e["expected"], got, args.tol)
-                    if rep["match"]:
-                        break
-                    time.sleep(3)
-                if rep["match"]:
-                    restored += 1
-                    note = "exact" if rep["exact"] else f"~jitter maxdev={rep['max_dev']} over {rep['n_diff']} reg(s)"
-                    print(f"  {e['blaster']} ROM{e['rom']:<3} OK   ({e['nbytes']}B verified, {note})")
-                else:
-                    failures += 1
-                    print(f"  {e['blaster']} ROM{e['rom']:<3} VERIFY MISMATCH "
-                          f"(exp {rep['exp_len']} regs, got {rep['got_len']}, "
-                          f"maxdev={rep['max_dev']} > tol {args.tol})", file=sys.stderr)
-                    if not args.keep_going:
-                        print("  stopping (use --keep-going to continue past mismatches)", file=sys.stderr)
-                        break
-            except Exception as ex:
-                failures += 1
-                print(f"  {e['blaster']} ROM{e['rom']:<3} ERROR: {ex}", file=sys.stderr)
-                if not args.keep_going:
-                    break
+        stuck = clear_stuck_edit(call)
+        if stuck:
+            progress.say(f"  preflight: {blaster} had bank(s) {stuck} stuck in edit mode -> cleared")
+        return restore_banks(call, entries, args, progress, stop)
+
+    with ir.bus_window(not args.no_toggle_service):
+        tallies = ir.run_per_port(args, [(ir.port_for(args, b), b) for b in by_blaster], work)
+    done = [t for t in tallies if t is not None]
+    attempted = sum(t.attempted for t in done)
+    restored = sum(t.restored for t in done)
+    unchanged = sum(t.unchanged for t in done)
+    failures = sum(t.failures for t in done)
     skipped = len(plan) - attempted
     print(f"\nDone: {restored}/{len(plan)} restored & verified"
+          + (f"; {unchanged} already on the device" if unchanged else "")
           + (f"; {failures} FAILED" if failures else "")
           + (f"; {skipped} not attempted" if skipped else "") + ".")
     return 1 if failures else 0
@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
-"""Read-only: verify every captured bank in a backup CSV against what's stored on the device now.
+"""Read-only: verify every captured bank in a backup against what's stored on the device now.
 
 A definitive post-restore check, independent of ir_restore.py's in-run verify. It is READ-ONLY --
 it loads each bank via the non-committing BANK->RAM loader and reads it back; it never writes flash
 and never touches an edit coil. General purpose: no A/V knowledge. See ir_common.py for the shared
-register map and the modbus_client wrapper.
+register map and the Modbus RTU transports.
 
 The compare is jitter-tolerant (--tol quanta). WB-MSW learns IR by *capturing* a remote's pulses,
 and multi-repeat frames (long ld_player/vhs codes) carry per-repeat capture jitter of a few 10 us
@@ -17,38 +17,67 @@ RUNS ON THE WB CONTROLLER. Needs exclusive bus access, so by default it stops wb
 Usage (via the ir.py wrapper; `python3 ir_verify.py ...` works the same):
     sudo python3 ir.py verify ir_backup_wb-msw-v3_207.csv --port /dev/ttyRS485-2
     sudo python3 ir.py verify ir_backup_wb-msw-v3_207.csv --only-rom 65-70 --detail
+    sudo python3 ir.py verify ir_archive          # each blaster's newest backup (see ir_archive.py)
 """
 from __future__ import annotations
 
 import argparse
-import csv
-import sys
 import time
+from collections import Counter
 from pathlib import Path
 
+import ir_archive
 import ir_common as ir
 
 VERIFY_READ_TRIES = 6        # read-back right after a large-code commit can be transiently wrong
 
 
-def load_rows(csv_paths: list[Path], only_rom: set[int] | None):
+def load_rows(sources: list[Path], only_rom: set[int] | None):
     plan = []
-    for path in csv_paths:
-        with path.open() as fh:
-            for row in csv.DictReader(fh):
-                if row["status"] != "ok" or not row["code_base64"]:
-                    continue
-                rom = int(row["rom"])
-                if only_rom is not None and rom not in only_rom:
-                    continue
-                expected = ir.code_part(ir.with_terminator(ir.b64_to_regs(row["code_base64"])))
-                plan.append({"blaster": row["blaster"], "slave": int(row["modbus_address"]),
-                             "rom": rom, "expected": expected})
+    for path in sources:
+        for row in ir_archive.load_source_rows(path):
+            if row["status"] != "ok" or not row["code_base64"]:
+                continue
+            rom = int(row["rom"])
+            if only_rom is not None and rom not in only_rom:
+                continue
+            expected = ir.code_part(ir.with_terminator(ir.b64_to_regs(row["code_base64"])))
+            plan.append({"blaster": row["blaster"], "slave": int(row["modbus_address"]),
+                         "rom": rom, "expected": expected})
     return plan
 
 
+def verify_banks(call, entries: list[dict], args, progress: ir.Progress) -> Counter:
+    """Read back and compare one blaster's banks; counts 'exact' / 'jitter' / 'bad' verdicts."""
+    verdicts: Counter = Counter()
+    for e in entries:
+        rep = got = None
+        for _ in range(VERIFY_READ_TRIES):
+            got = ir.code_part(ir.read_bank(call, e["rom"], len(e["expected"]) + 8))
+            rep = ir.compare(e["expected"], got, args.tol)
+            if rep["match"]:
+                break
+            time.sleep(3)
+        label = f"  {e['blaster']} ROM{e['rom']:<3}"
+        if rep["exact"]:
+            verdicts["exact"] += 1
+            progress.say(f"{label} EXACT    ({rep['exp_len']} regs)", advance=1)
+        elif rep["match"]:
+            verdicts["jitter"] += 1
+            detail = f"\n{ir.diff_detail(e['expected'], got)}" if args.detail else ""
+            progress.say(f"{label} ~jitter  "
+                         f"(maxdev={rep['max_dev']} <= tol {args.tol} over {rep['n_diff']} reg(s)){detail}",
+                         advance=1)
+        else:
+            verdicts["bad"] += 1
+            progress.say(f"{label} MISMATCH (exp {rep['exp_len']} regs, got {rep['got_len']}, "
+                         f"maxdev={rep['max_dev']} > tol {args.tol})\n{ir.diff_detail(e['expected'], got)}",
+                         advance=1, error=True)
+    return verdicts
+
+
 def add_arguments(parser) -> None:
-    parser.add_argument("csv", nargs="+", type=Path, help="ir_backup_<blaster>.csv file(s) to verify against")
+    parser.add_argument("csv", nargs="+", type=Path, help="ir_backup_<blaster>.csv file(s), archive manifest(s) or archive dir(s) to verify against")
     ir.add_bus_args(parser)
     parser.add_argument("--tol", type=int, default=ir.JITTER_TOL,
                         help=f"per-register tolerance in 10us quanta (default {ir.JITTER_TOL}; 0 = byte-exact)")
@@ -59,40 +88,27 @@ def add_arguments(parser) -> None:
 
 def run(args) -> int:
     for p in args.csv:
-        if not p.is_file():
-            raise SystemExit(f"CSV not found: {p}")
+        if not p.exists():
+            raise SystemExit(f"Backup not found: {p}")
     only_rom = ir.parse_banks(args.only_rom) if args.only_rom else None
     plan = load_rows(args.csv, only_rom)
     if not plan:
         print("Nothing to verify.")
         return 0
 
-    exact = jitter = bad = 0
+    by_blaster: dict[str, list[dict]] = {}
+    for e in plan:
+        by_blaster.setdefault(e["blaster"], []).append(e)
+    progress = ir.Progress(len(plan))
+
+    def work(bus, blaster):
+        entries = by_blaster[blaster]
+        return verify_banks(bus.caller(entries[0]["slave"]), entries, args, progress)
+
     with ir.bus_window(not args.no_toggle_service):
-        for e in plan:
-            call = ir.caller_for(args, e["slave"])
-            rep = got = None
-            for _ in range(VERIFY_READ_TRIES):
-                got = ir.code_part(ir.read_bank(call, e["rom"], len(e["expected"]) + 8))
-                rep = ir.compare(e["expected"], got, args.tol)
-                if rep["match"]:
-                    break
-                time.sleep(3)
-            if rep["exact"]:
-                exact += 1
-                print(f"  {e['blaster']} ROM{e['rom']:<3} EXACT    ({rep['exp_len']} regs)")
-            elif rep["match"]:
-                jitter += 1
-                print(f"  {e['blaster']} ROM{e['rom']:<3} ~jitter  "
-                      f"(maxdev={rep['max_dev']} <= tol {args.tol} over {rep['n_diff']} reg(s))")
-                if args.detail:
-                    print(ir.diff_detail(e["expected"], got))
-            else:
-                bad += 1
-                print(f"  {e['blaster']} ROM{e['rom']:<3} MISMATCH "
-                      f"(exp {rep['exp_len']} regs, got {rep['got_len']}, maxdev={rep['max_dev']} > tol {args.tol})",
-                      file=sys.stderr)
-                print(ir.diff_detail(e["expected"], got), file=sys.stderr)
+        counts = ir.run_per_port(args, [(ir.port_for(args, b), b) for b in by_blaster], work)
+    verdicts = sum((c for c in counts if c is not None), Counter())
+    exact, jitter, bad = verdicts["exact"], verdicts["jitter"], verdicts["bad"]
     total = exact + jitter + bad
     print(f"\nVerified {exact + jitter}/{total} banks match the backup "
           f"({exact} exact, {jitter} within jitter tol {args.tol})"
@@ -1,6 +1,6 @@
 #!/bin/bash
 
-# Deploy the WB-MSW v3 IR ROM tools (ir_common / ir_backup / ir_restore / ir_verify) to a Wiren
+# Deploy the WB-MSW v3 IR ROM tools (ir_common / ir_backup / ir_restore / ir_verify / ir_archive) to a Wiren
 # Board controller. These are standalone operational tools -- NOT wb-rules engine scripts -- so
 # they get their own deploy path, separate from scp_wb_rules.sh.
 #
@@ -15,7 +15,7 @@
 #   ./scp_ir_tools.sh 192.168.110.250 root password pull     # retrieve the produced CSVs
 
 TARGET_DIR="/tmp/ir-tools"
-TOOLS="ir.py ir_common.py ir_backup.py ir_restore.py ir_verify.py"
+TOOLS="ir.py ir_common.py ir_backup.py ir_restore.py ir_verify.py ir_archive.py"
 
 if [ $# -lt 3 ]; then
     echo "Usage: $0 <remote_server> <username> <password> [push|pull]"